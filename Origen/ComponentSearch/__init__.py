@@ -1,15 +1,22 @@
 """Component Search - Search EasyEDA/JLCPCB components by keyword."""
 
+import gzip
 import json
 import logging
-import urllib.request
-import urllib.parse
-import ssl
-import sys
-import os
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    from ..HttpSession import get_session
+except ImportError:
+    from HttpSession import get_session
+
+try:
+    from .client import SearchClient
+except ImportError:
+    from client import SearchClient
+
 logger = logging.getLogger(__name__)
 
 JLCPCB_SEARCH_URL = "https://jlcpcb.com/api/overseas-pcb-order/v1/shoppingCart/smtGood/selectSmtComponentList/v2"
@@ -32,46 +39,19 @@ class SearchResult:
     lcsc_url: str
 
 
-def _create_ssl_context() -> ssl.SSLContext:
-    """Create SSL context with proper certificate handling."""
-    context = ssl.create_default_context()
-    if sys.platform == "darwin":
-        kicad_cert_paths = [
-            "/Applications/KiCad/KiCad.app/Contents/Frameworks/Python.framework/Versions/3.9/lib/python3.9/site-packages/certifi/cacert.pem",
-            "/Applications/KiCad-10.0/KiCad.app/Contents/Frameworks/Python.framework/Versions/3.9/lib/python3.9/site-packages/certifi/cacert.pem",
-        ]
-        for cert_path in kicad_cert_paths:
-            if os.path.isfile(cert_path):
-                try:
-                    context.load_verify_locations(cafile=cert_path)
-                    return context
-                except Exception:
-                    pass
-    try:
-        import certifi
-        context.load_verify_locations(cafile=certifi.where())
-    except (ImportError, Exception):
-        pass
-    return context
-
-
-_ssl_context = _create_ssl_context()
+def _load_json(body: bytes):
+    """Parse a JSON body, also when it is gzip data without a Content-Encoding."""
+    if body[:2] == b"\x1f\x8b":
+        body = gzip.decompress(body)
+    return json.loads(body)
 
 
-def search_components(keyword: str, page: int = 1, page_size: int = 30) -> List[SearchResult]:
-    """Search JLCPCB/LCSC for components by keyword.
-
-    Args:
-        keyword: Search term (e.g., "ESP32", "LM7805", "100nF 0402")
-        page: Page number (1-based)
-        page_size: Results per page (max 100)
+def _fetch_page(keyword: str, page: int, page_size: int, timeout: float = 15) -> Tuple[List[SearchResult], int]:
+    """Request one page of results; raises if the request or the JSON fails.
 
     Returns:
-        List of SearchResult objects
+        (results, total number of results for the keyword)
     """
-    if not keyword or not keyword.strip():
-        return []
-
     payload = json.dumps({
         "keyword": keyword.strip(),
         "pageSize": min(page_size, 100),
@@ -80,27 +60,18 @@ def search_components(keyword: str, page: int = 1, page_size: int = 30) -> List[
 
     headers = {
         "Content-Type": "application/json",
-        "User-Agent": "CustomImportGUI/1.0",
         "Accept": "application/json",
     }
 
-    try:
-        req = urllib.request.Request(JLCPCB_SEARCH_URL, data=payload, headers=headers)
-        with urllib.request.urlopen(req, timeout=15, context=_ssl_context) as response:
-            raw = response.read()
-            if raw[:2] == b"\x1f\x8b":
-                import gzip
-                data = json.loads(gzip.decompress(raw))
-            else:
-                data = json.loads(raw)
-    except Exception as e:
-        logger.error(f"Search request failed: {e}")
-        return []
+    response = get_session().post(JLCPCB_SEARCH_URL, data=payload, headers=headers, timeout=timeout)
+    data = _load_json(response.body)
 
     results = []
+    total = 0
     try:
-        items = data.get("data", {}).get("componentPageInfo", {}).get("list", [])
-        for item in items:
+        page_info = data.get("data", {}).get("componentPageInfo", {})
+        total = page_info.get("total", 0) or 0
+        for item in page_info.get("list", []):
             # Image will be fetched on-demand from EasyEDA API
             image_url = ""  # Populated lazily via get_component_image()
 
@@ -124,68 +95,92 @@ def search_components(keyword: str, page: int = 1, page_size: int = 30) -> List[
     except Exception as e:
         logger.error(f"Failed to parse search results: {e}")
 
+    return results, total
+
+
+def search_components(keyword: str, page: int = 1, page_size: int = 30) -> List[SearchResult]:
+    """Search JLCPCB/LCSC for components by keyword.
+
+    Args:
+        keyword: Search term (e.g., "ESP32", "LM7805", "100nF 0402")
+        page: Page number (1-based)
+        page_size: Results per page (max 100)
+
+    Returns:
+        List of SearchResult objects
+    """
+    if not keyword or not keyword.strip():
+        return []
+
+    try:
+        results, _ = _fetch_page(keyword, page, page_size)
+    except Exception as e:
+        logger.error(f"Search request failed: {e}")
+        return []
     return results
 
 
 def get_search_total(keyword: str) -> int:
     """Get total number of results for a keyword."""
-    payload = json.dumps({
-        "keyword": keyword.strip(),
-        "pageSize": 1,
-        "currentPage": 1,
-    }).encode("utf-8")
-
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "CustomImportGUI/1.0",
-        "Accept": "application/json",
-    }
-
     try:
-        req = urllib.request.Request(JLCPCB_SEARCH_URL, data=payload, headers=headers)
-        with urllib.request.urlopen(req, timeout=10, context=_ssl_context) as response:
-            data = json.loads(response.read())
-        return data.get("data", {}).get("componentPageInfo", {}).get("total", 0)
+        _, total = _fetch_page(keyword, 1, 1, timeout=10)
+        return total
     except Exception:
         return 0
 
 
-def fetch_component_image(lcsc_id: str) -> Optional[bytes]:
-    """Fetch component thumbnail image from EasyEDA API. Returns raw PNG bytes or None."""
+_client: Optional[SearchClient] = None
+_client_lock = threading.Lock()
+
+
+def get_search_client() -> SearchClient:
+    """Return the cached search client shared by the search tab."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SearchClient(_fetch_page)
+        return _client
+
+
+def download_component_image(lcsc_id: str) -> Optional[bytes]:
+    """
+    Download the thumbnail image of a component from the EasyEDA API.
+    Returns the raw PNG bytes, or None if the component has no thumbnail.
+
+    Raises:
+        HttpError: If a request fails, with the HTTP status if there is one
+        ValueError: If the EasyEDA response cannot be read
+    """
     if not lcsc_id:
         return None
 
-    try:
-        # Get component data from EasyEDA to find thumb URL
-        headers = {
-            "User-Agent": "CustomImportGUI/1.0",
-            "Accept": "application/json",
-        }
-        url = EASYEDA_API_URL.format(lcsc_id=lcsc_id)
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10, context=_ssl_context) as response:
-            data = json.loads(response.read())
-
-        # Extract thumb URL
-        result = data.get("result", {})
-        if isinstance(result, list) and result:
-            result = result[0]
-
-        thumb = result.get("thumb", "")
-        if not thumb:
-            return None
-
-        # Fix protocol-relative URL
-        if thumb.startswith("//"):
-            thumb = "https:" + thumb
-
-        # Download the image
-        req = urllib.request.Request(thumb, headers={"User-Agent": "CustomImportGUI/1.0"})
-        with urllib.request.urlopen(req, timeout=10, context=_ssl_context) as response:
-            if response.status == 200:
-                return response.read()
+    # Get component data from EasyEDA to find thumb URL
+    session = get_session()
+    url = EASYEDA_API_URL.format(lcsc_id=lcsc_id)
+    response = session.get(url, headers={"Accept": "application/json"}, timeout=10)
+    data = _load_json(response.body)
+
+    # Extract thumb URL
+    result = data.get("result", {})
+    if isinstance(result, list) and result:
+        result = result[0]
+
+    thumb = result.get("thumb", "") if isinstance(result, dict) else ""
+    if not thumb:
+        return None
 
+    # Fix protocol-relative URL
+    if thumb.startswith("//"):
+        thumb = "https:" + thumb
+
+    # Download the image
+    return session.get(thumb, timeout=10).body
+
+
+def fetch_component_image(lcsc_id: str) -> Optional[bytes]:
+    """Fetch component thumbnail image from EasyEDA API. Returns raw PNG bytes or None."""
+    try:
+        return download_component_image(lcsc_id)
     except Exception as e:
         logger.debug(f"Failed to fetch image for {lcsc_id}: {e}")
-
-    return None
+        return None
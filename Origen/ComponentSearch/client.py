@@ -0,0 +1,142 @@
+"""Cached JLCPCB search client used by the search tab.
+
+Pages are kept in a small in-memory LRU cache with a TTL, keyed by keyword,
+page and page size, so paging back and forth does not repeat requests.
+Identical requests that are already running are shared instead of being
+sent twice, and the next page can be fetched in the background while the
+current one is shown.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_TTL = 300.0  # seconds; stock and prices change
+
+CacheKey = Tuple[str, int, int]
+
+
+class SearchClient:
+    """LRU + TTL cache in front of a page fetch function, with prefetch."""
+
+    def __init__(
+        self,
+        fetch: Callable[[str, int, int], Tuple[list, int]],
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        prefetch_workers: int = 2,
+    ):
+        """
+        Args:
+            fetch: ``fetch(keyword, page, page_size) -> (results, total)``;
+                   raises on network or decoding errors. Only the results
+                   are cached
+            max_entries: Number of pages kept in memory
+            ttl: Seconds a cached page stays valid
+            prefetch_workers: Threads used for background prefetches
+        """
+        self._fetch = fetch
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prefetch_workers = prefetch_workers
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[CacheKey, Tuple[float, list]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _key(keyword: str, page: int, page_size: int) -> CacheKey:
+        return keyword.strip().casefold(), page, min(page_size, 100)
+
+    def _lookup(self, key: CacheKey) -> Optional[Tuple[float, list]]:
+        """Return a valid cache entry and mark it as recently used (lock held)."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry
+
+    def _store(self, key: CacheKey, results: list) -> None:
+        self._cache[key] = (time.monotonic(), results)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    # === QUERIES ===
+
+    def cached(self, keyword: str, page: int = 1, page_size: int = 30) -> Optional[list]:
+        """Return a cached page without fetching it, or None."""
+        with self._lock:
+            entry = self._lookup(self._key(keyword, page, page_size))
+        return list(entry[1]) if entry else None
+
+    def search(self, keyword: str, page: int = 1, page_size: int = 30) -> list:
+        """Return a page of results from the cache or the network.
+
+        Failed requests return an empty list and are not cached.
+        """
+        if not keyword or not keyword.strip():
+            return []
+
+        key = self._key(keyword, page, page_size)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return list(entry[1])
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            # The same page is already being fetched
+            try:
+                return list(future.result())
+            except Exception:
+                return []
+
+        try:
+            results, _ = self._fetch(keyword, page, page_size)
+        except Exception as e:
+            logger.error(f"Search request failed: {e}")
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            return []
+
+        with self._lock:
+            self._store(key, results)
+            del self._inflight[key]
+        future.set_result(results)
+        return list(results)
+
+    # === PREFETCH ===
+
+    def prefetch(self, keyword: str, page: int, page_size: int = 30) -> None:
+        """Fetch a page in the background unless it is cached or already running."""
+        if not keyword or not keyword.strip() or page < 1:
+            return
+        key = self._key(keyword, page, page_size)
+        with self._lock:
+            if key in self._inflight or self._lookup(key) is not None:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.prefetch_workers, thread_name_prefix="search-prefetch"
+                )
+            executor = self._executor
+        executor.submit(self.search, keyword, page, page_size)
+
+    def clear(self) -> None:
+        """Drop all cached pages."""
+        with self._lock:
+            self._cache.clear()
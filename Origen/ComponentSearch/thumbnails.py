@@ -0,0 +1,226 @@
+"""Thumbnail service for the search tab.
+
+Thumbnails are stored on disk in the shared response cache under
+``thumb/<LCSC id>`` and kept decoded in a small in-memory LRU. Requests run
+on a few worker threads: the selected row is served first, thumbnails of the
+visible page are prefetched behind it, and requests for rows that are no
+longer selected are dropped before they start. Decoding (and scaling) is
+done by the workers, so the GUI thread only displays the result.
+"""
+
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    from ..HttpSession import HttpError
+    from ..ResponseCache import ResponseCache, get_response_cache
+except ImportError:
+    from HttpSession import HttpError
+    from ResponseCache import ResponseCache, get_response_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 3
+DEFAULT_MEMORY_ITEMS = 128
+
+# HTTP statuses that mean there is no thumbnail; other errors are retried
+_NO_IMAGE_STATUSES = (404, 410)
+
+Callback = Callable[[str, Any], None]
+
+
+class _Job:
+    def __init__(self, lcsc_id: str):
+        self.lcsc_id = lcsc_id
+        self.callbacks: List[Callback] = []
+        self.prefetch = False
+
+
+class ThumbnailService:
+    """Fetches, caches and decodes component thumbnails in the background."""
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Optional[bytes]],
+        decode: Callable[[bytes], Any] = lambda data: data,
+        cache: Optional[ResponseCache] = None,
+        max_workers: int = DEFAULT_WORKERS,
+        memory_items: int = DEFAULT_MEMORY_ITEMS,
+    ):
+        """
+        Args:
+            fetch: ``fetch(lcsc_id)`` returns the image bytes, or None if
+                   there is no thumbnail; an ``HttpError`` 404 means the same,
+                   other errors are retried on the next request
+            decode: Turns image bytes into what the callbacks receive; runs
+                    on a worker thread
+            cache: On-disk cache (default: the shared response cache)
+            max_workers: Number of concurrent downloads
+            memory_items: Number of decoded thumbnails kept in memory
+        """
+        self._fetch = fetch
+        self._decode = decode
+        self._cache = cache
+        self.max_workers = max_workers
+        self.memory_items = memory_items
+        self._cond = threading.Condition()
+        self._queue: deque = deque()  # lcsc ids waiting for a worker
+        self._jobs: Dict[str, _Job] = {}  # queued or running jobs
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._missing: set = set()  # ids without a thumbnail
+        self._workers: List[threading.Thread] = []
+        self._idle = 0  # workers waiting for the queue
+        self._closed = False
+
+    # === REQUESTS ===
+
+    def get_cached(self, lcsc_id: str) -> Any:
+        """Return the decoded thumbnail if it is in memory, else None."""
+        with self._cond:
+            decoded = self._memory.get(lcsc_id)
+            if decoded is not None:
+                self._memory.move_to_end(lcsc_id)
+            return decoded
+
+    def request(self, lcsc_id: str, callback: Callback) -> None:
+        """
+        Calls ``callback(lcsc_id, decoded)`` with the thumbnail, or with None
+        if there is none. The callback runs on a worker thread unless the
+        thumbnail is already in memory.
+        """
+        if not lcsc_id:
+            return
+        with self._cond:
+            decoded = self._memory.get(lcsc_id)
+            missing = lcsc_id in self._missing
+            if decoded is None and not missing:
+                job = self._jobs.get(lcsc_id)
+                if job is None:
+                    job = self._jobs[lcsc_id] = _Job(lcsc_id)
+                    self._queue.appendleft(lcsc_id)
+                elif lcsc_id in self._queue:
+                    # Queued as a prefetch: move it to the front
+                    self._queue.remove(lcsc_id)
+                    self._queue.appendleft(lcsc_id)
+                job.callbacks.append(callback)
+                self._start_workers()
+                self._cond.notify()
+                return
+            if decoded is not None:
+                self._memory.move_to_end(lcsc_id)
+        callback(lcsc_id, decoded)
+
+    def cancel(self, lcsc_id: str) -> None:
+        """Forget the callbacks for ``lcsc_id``; a queued request is dropped
+        unless it was also prefetched."""
+        with self._cond:
+            job = self._jobs.get(lcsc_id)
+            if job is None:
+                return
+            job.callbacks.clear()
+            if not job.prefetch and lcsc_id in self._queue:
+                self._queue.remove(lcsc_id)
+                del self._jobs[lcsc_id]
+
+    def prefetch(self, lcsc_ids: Iterable[str]) -> None:
+        """Queue thumbnails behind the explicit requests."""
+        with self._cond:
+            for lcsc_id in lcsc_ids:
+                if not lcsc_id or lcsc_id in self._memory or lcsc_id in self._missing:
+                    continue
+                job = self._jobs.get(lcsc_id)
+                if job is None:
+                    job = self._jobs[lcsc_id] = _Job(lcsc_id)
+                    self._queue.append(lcsc_id)
+                job.prefetch = True
+            self._start_workers()
+            self._cond.notify_all()
+
+    def cancel_prefetch(self) -> None:
+        """Drop queued prefetches that nobody is waiting for."""
+        with self._cond:
+            for lcsc_id in list(self._queue):
+                job = self._jobs[lcsc_id]
+                job.prefetch = False
+                if not job.callbacks:
+                    self._queue.remove(lcsc_id)
+                    del self._jobs[lcsc_id]
+
+    def close(self) -> None:
+        """Stop the workers; queued requests are dropped."""
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._jobs.clear()
+            self._cond.notify_all()
+
+    # === WORKERS ===
+
+    def _start_workers(self) -> None:
+        """Start another worker if the queue outgrows the idle ones (lock held)."""
+        if len(self._queue) > self._idle and len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name="thumbnail", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._idle += 1
+                    woken = self._cond.wait(timeout=30)
+                    self._idle -= 1
+                    if not woken and not self._queue:
+                        # Idle workers exit; a new one is started when needed
+                        self._workers.remove(threading.current_thread())
+                        return
+                if self._closed:
+                    self._workers.remove(threading.current_thread())
+                    return
+                lcsc_id = self._queue.popleft()
+
+            decoded = self._load(lcsc_id)
+
+            with self._cond:
+                job = self._jobs.pop(lcsc_id, None)
+                if decoded is not None:
+                    self._memory[lcsc_id] = decoded
+                    self._memory.move_to_end(lcsc_id)
+                    while len(self._memory) > self.memory_items:
+                        self._memory.popitem(last=False)
+                callbacks = list(job.callbacks) if job else []
+
+            for callback in callbacks:
+                try:
+                    callback(lcsc_id, decoded)
+                except Exception as e:
+                    logger.debug(f"Thumbnail callback failed for {lcsc_id}: {e}")
+
+    def _load(self, lcsc_id: str) -> Any:
+        cache = self._cache if self._cache is not None else get_response_cache()
+        key = f"thumb/{lcsc_id}"
+        data = cache.get(key, allow_stale=True)
+        if data is None:
+            try:
+                data = self._fetch(lcsc_id)
+            except HttpError as e:
+                logger.debug(f"Failed to fetch thumbnail for {lcsc_id}: {e}")
+                if e.status not in _NO_IMAGE_STATUSES:
+                    return None  # Transient, the next request tries again
+                data = None
+            except Exception as e:
+                logger.debug(f"Failed to fetch thumbnail for {lcsc_id}: {e}")
+                return None
+            if not data:
+                with self._cond:
+                    self._missing.add(lcsc_id)
+                return None
+            cache.put(key, data)
+
+        try:
+            return self._decode(data)
+        except Exception as e:
+            logger.debug(f"Failed to decode thumbnail for {lcsc_id}: {e}")
+            return None
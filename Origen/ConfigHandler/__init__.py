@@ -15,6 +15,8 @@ class ConfigHandler:
             "library_name": "CustomLibrary",
             "library_variable": "${CUSTOM_LIBRARY}",
             "organize_by_category": "false",
+            "log_max_lines": "5000",
+            "log_to_file": "false",
         }
 
         # Predefined profiles (paths relative to user's home)
@@ -215,6 +217,27 @@ class ConfigHandler:
         self.config["config"]["organize_by_category"] = str(enabled).lower()
         self.save_config()
 
+    def get_log_max_lines(self):
+        """Get how many lines of import output are kept in memory."""
+        try:
+            return max(100, int(self.config["config"].get("log_max_lines", "5000")))
+        except ValueError:
+            return 5000
+
+    def set_log_max_lines(self, max_lines):
+        """Set how many lines of import output are kept in memory."""
+        self.config["config"]["log_max_lines"] = str(int(max_lines))
+        self.save_config()
+
+    def get_log_to_file(self):
+        """Get whether the full import output is also written to a log file."""
+        return self.config["config"].get("log_to_file", "false").lower() == "true"
+
+    def set_log_to_file(self, enabled):
+        """Set whether the full import output is also written to a log file."""
+        self.config["config"]["log_to_file"] = str(enabled).lower()
+        self.save_config()
+
     def _ensure_directories_exist(self):
         """Auto-create source and destination directories if they don't exist."""
         for path_str in [self.get_SRC_PATH(), self.get_DEST_PATH()]:
@@ -1,92 +1,251 @@
 import os
+import json
+import time
 import logging
+import tempfile
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 from typing import Optional
 
+try:
+    from .watcher import DirectoryWatcher, create_watcher
+except ImportError:
+    from watcher import DirectoryWatcher, create_watcher
+
 class FileHandler:
     """Monitors a directory for new ZIP files within a specific size range."""
-    
-    def __init__(self, path: str, 
+
+    def __init__(self, path: str,
                  min_size: int = 1_000,        # 1 KB
                  max_size: int = 50_000_000,   # 50 MB
-                 file_extension: str = ".zip"):
+                 file_extension: str = ".zip",
+                 settle_time: float = 1.0,
+                 state_file: Optional[Path] = None):
         """
         Initializes the FileHandler.
-        
+
         Args:
             path: Path to the directory to monitor
             min_size: Minimum file size in bytes
             max_size: Maximum file size in bytes
             file_extension: File extension to monitor
+            settle_time: Seconds a file must stay unmodified before it is
+                         reported, so downloads in progress are skipped
+            state_file: JSON file that keeps the known files per directory
+                        across restarts (default: known_files.json in the
+                        plugin folder)
         """
         self.min_size = min_size
         self.max_size = max_size
         self.file_extension = file_extension
+        self.settle_time = settle_time
+        self.state_file = Path(state_file) if state_file else (
+            Path(__file__).resolve().parent.parent / "known_files.json"
+        )
         self.path = ""
-        self.known_files = set()  # Set is more efficient for membership checks
+        self._known: Dict[str, Tuple[int, int]] = {}  # name -> (size, mtime_ns)
+        self._pending: Dict[str, Optional[int]] = {}  # name -> last seen size
+        self._watcher: Optional[DirectoryWatcher] = None
         self.logger = logging.getLogger(__name__)
-        
+
         self.change_path(path)
-    
+
+    # === KNOWN FILES ===
+
+    @property
+    def known_files(self) -> set:
+        """Names of the files that were already reported."""
+        return set(self._known)
+
+    @known_files.setter
+    def known_files(self, names) -> None:
+        """Replace the known files; assigning an empty set re-reports all files."""
+        self._known = {name: sig for name, sig in self._known.items() if name in names}
+        self._pending.clear()
+        self._save_known()
+
+    def _state_key(self) -> str:
+        return os.path.abspath(self.path)
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read known files: {e}")
+            return {}
+
+    def _load_known(self) -> None:
+        entries = self._load_state().get(self._state_key(), {})
+        self._known = {
+            name: (sig[0], sig[1]) for name, sig in entries.items()
+            if isinstance(sig, list) and len(sig) == 2
+        }
+
+    def _save_known(self) -> None:
+        state = self._load_state()
+        state[self._state_key()] = {name: list(sig) for name, sig in self._known.items()}
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.state_file.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            self.logger.warning(f"Could not save known files: {e}")
+
+    def _is_known(self, name: str, size: int, mtime_ns: int) -> bool:
+        return self._known.get(name) == (size, mtime_ns)
+
+    # === DIRECTORY ===
+
     def change_path(self, new_path: str) -> None:
         """
         Changes the directory to monitor.
-        
+
         Args:
             new_path: New directory path
         """
         path_obj = Path(new_path)
-        
+
         if not path_obj.is_dir():
             self.logger.warning(f"Path '{new_path}' is not a directory. Using current directory.")
             new_path = "."
             path_obj = Path(new_path)
-        
+
         if new_path != self.path:
+            self.stop_watching()
             self.path = new_path
-            self.known_files = set()  # Reset known files
+            self._pending.clear()
+            self._load_known()  # Known files of the new directory
             self.logger.info(f"Changed directory to '{new_path}'")
-    
+
+    def _check_candidates(self, names) -> List[str]:
+        """
+        Returns the candidates that are ready to import and keeps the files
+        that are still being written as pending.
+        """
+        now = time.time_ns()
+        settle_ns = int(self.settle_time * 1e9)
+        directory = Path(self.path)
+        new_files = []
+
+        for name in sorted(names):
+            file_path = directory / name
+            try:
+                stat = file_path.stat()
+            except OSError:
+                self._pending.pop(name, None)
+                continue
+
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            if self._is_known(name, size, mtime_ns):
+                self._pending.pop(name, None)
+                continue
+
+            # Wait until the file was not modified for settle_time and its
+            # size did not change since it was last seen
+            last_size = self._pending.get(name)
+            recently_modified = now - mtime_ns < settle_ns
+            if recently_modified or (name in self._pending and last_size != size):
+                self._pending[name] = size
+                continue
+            self._pending.pop(name, None)
+
+            # Check if the file size is within the allowed range
+            if self.min_size <= size <= self.max_size:
+                new_files.append(str(file_path.absolute()))
+            else:
+                self.logger.debug(
+                    f"File '{name}' is outside the size range "
+                    f"({size} bytes)"
+                )
+            self._known[name] = (size, mtime_ns)
+
+        return new_files
+
     def get_new_files(self, path: Optional[str] = None) -> List[str]:
         """
         Finds new files in the specified directory.
-        
+
         Args:
-            path: Optional - directory to monitor, 
+            path: Optional - directory to monitor,
                   if different from the current one
-        
+
         Returns:
             List of full paths to new files
         """
         if path is not None and path != self.path:
             self.change_path(path)
-        
+
         try:
-            # Use pathlib for better path handling
-            directory = Path(self.path)
-            files = [f for f in directory.iterdir() if f.is_file()]
-            
-            new_files = []
-            
-            for file_path in sorted(files):
-                # Check if it's a new file with the correct extension
-                if (file_path.name not in self.known_files and 
-                        file_path.name.endswith(self.file_extension)):
-                    
-                    # Check if the file size is within the allowed range
-                    file_size = file_path.stat().st_size
-                    if self.min_size <= file_size <= self.max_size:
-                        new_files.append(str(file_path.absolute()))
-                        self.known_files.add(file_path.name)
-                    else:
-                        self.logger.debug(
-                            f"File '{file_path.name}' is outside the size range "
-                            f"({file_size} bytes)"
-                        )
-            
-            return new_files
-            
+            names = set()
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.file_extension) and entry.is_file():
+                        names.add(entry.name)
         except (PermissionError, FileNotFoundError) as e:
             self.logger.error(f"Error reading directory: {e}")
-            return []
\ No newline at end of file
+            return []
+
+        known_before = dict(self._known)
+        # Forget files that were removed from the directory
+        self._known = {n: sig for n, sig in self._known.items() if n in names}
+        new_files = self._check_candidates(names | set(self._pending))
+        if self._known != known_before:
+            self._save_known()
+        return new_files
+
+    # === WATCH MODE ===
+
+    def wait_for_new_files(self, path: Optional[str] = None, timeout: float = 1.0) -> List[str]:
+        """
+        Waits up to ``timeout`` seconds for new files using a directory
+        watcher instead of rescanning the directory.
+
+        The first call scans the directory once; afterwards only the files
+        reported by the watcher and the pending ones are checked.
+
+        Args:
+            path: Optional - directory to monitor,
+                  if different from the current one
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            List of full paths to new files
+        """
+        if path is not None and path != self.path:
+            self.change_path(path)
+
+        if self._watcher is None:
+            try:
+                self._watcher = create_watcher(self.path, self.file_extension)
+            except OSError as e:
+                self.logger.error(f"Could not watch '{self.path}': {e}")
+                time.sleep(timeout)
+                return []
+            return self.get_new_files()
+
+        # Pending files are re-checked at least every settle_time
+        wait = min(timeout, self.settle_time) if self._pending else timeout
+        changed = self._watcher.changed(wait)
+        if changed is None:
+            self.stop_watching()  # lost track; rescan on the next call
+            return self.get_new_files()
+
+        candidates = changed | set(self._pending)
+        if not candidates:
+            return []
+        known_before = dict(self._known)
+        new_files = self._check_candidates(candidates)
+        if self._known != known_before:
+            self._save_known()
+        return new_files
+
+    def stop_watching(self) -> None:
+        """Stops the directory watcher of wait_for_new_files."""
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
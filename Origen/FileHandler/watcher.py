@@ -0,0 +1,168 @@
+"""Directory watchers used by FileHandler.
+
+``InotifyWatcher`` receives kernel events on Linux. ``SnapshotWatcher`` is
+the portable fallback: it only stats the directory itself and lists it again
+when the directory's mtime changes (a file was created, renamed or deleted).
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF
+
+
+class DirectoryWatcher(ABC):
+    """Reports names of directory entries that may have been added or changed."""
+
+    def __init__(self, path: str, suffix: str = ""):
+        self.path = path
+        self.suffix = suffix
+
+    @abstractmethod
+    def changed(self, timeout: float) -> Optional[Set[str]]:
+        """Wait up to ``timeout`` seconds for changes.
+
+        Returns the names of changed entries (possibly empty), or None if the
+        watcher lost track and the caller should rescan the whole directory.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+class SnapshotWatcher(DirectoryWatcher):
+    """Polls the directory mtime and rescans only when it moved."""
+
+    def __init__(self, path: str, suffix: str = ""):
+        super().__init__(path, suffix)
+        self._dir_mtime: Optional[int] = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._rescan()
+
+    def _rescan(self) -> Set[str]:
+        snapshot = {}
+        try:
+            self._dir_mtime = os.stat(self.path).st_mtime_ns
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.suffix) and entry.is_file():
+                        st = entry.stat()
+                        snapshot[entry.name] = (st.st_size, st.st_mtime_ns)
+        except OSError as e:
+            logger.debug(f"Could not scan '{self.path}': {e}")
+        changed = {n for n, sig in snapshot.items() if self._snapshot.get(n) != sig}
+        self._snapshot = snapshot
+        return changed
+
+    def changed(self, timeout: float) -> Optional[Set[str]]:
+        time.sleep(timeout)
+        try:
+            dir_mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return set()
+        if dir_mtime == self._dir_mtime:
+            return set()
+        return self._rescan()
+
+
+class InotifyWatcher(DirectoryWatcher):
+    """Linux inotify watcher for files that were closed after writing or moved in."""
+
+    _libc = None
+
+    @classmethod
+    def available(cls) -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1
+                libc.inotify_add_watch
+            except (OSError, AttributeError):
+                return False
+            cls._libc = libc
+        return True
+
+    def __init__(self, path: str, suffix: str = ""):
+        super().__init__(path, suffix)
+        if not self.available():
+            raise OSError("inotify is not available")
+        libc = self._libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, f"inotify_add_watch failed for '{path}'")
+
+    def changed(self, timeout: float) -> Optional[Set[str]]:
+        if self._fd < 0:
+            time.sleep(timeout)
+            return set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return set()
+            raise
+
+        names: Set[str] = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                logger.warning(f"Watched folder '{self.path}' was removed or moved")
+                return None
+            if name:
+                name = os.fsdecode(name)
+                if name.endswith(self.suffix):
+                    names.add(name)
+        return names
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(path: str, suffix: str = "") -> DirectoryWatcher:
+    """Return an inotify watcher where available, else a snapshot watcher."""
+    if InotifyWatcher.available():
+        try:
+            return InotifyWatcher(path, suffix)
+        except OSError as e:
+            logger.info(f"inotify unavailable for '{path}', polling instead: {e}")
+    return SnapshotWatcher(path, suffix)
@@ -0,0 +1,320 @@
+"""HTTP Session - Shared keep-alive HTTP client for the online services.
+
+EasyEDA, JLCPCB and GitLab requests go through one ``HttpSession`` that
+keeps idle connections per host, so consecutive requests (batch imports,
+paginated listings) reuse the TLS connection instead of handshaking again.
+It also decodes gzip/deflate bodies, follows redirects, honours the proxy
+environment variables and retries transient failures with backoff.
+"""
+
+import gzip
+import json
+import logging
+import os
+import ssl
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+import http.client
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "CustomImportGUI/1.0"
+
+# Certificate bundles shipped with KiCad's embedded Python on macOS
+_KICAD_CERT_PATHS = [
+    "/Applications/KiCad/KiCad.app/Contents/Frameworks/Python.framework/Versions/3.9/lib/python3.9/site-packages/certifi/cacert.pem",
+    "/Applications/KiCad-9.0/KiCad.app/Contents/Frameworks/Python.framework/Versions/3.9/lib/python3.9/site-packages/certifi/cacert.pem",
+    "/Applications/KiCad-10.0/KiCad.app/Contents/Frameworks/Python.framework/Versions/3.9/lib/python3.9/site-packages/certifi/cacert.pem",
+]
+
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+_MAX_REDIRECTS = 5
+
+# Errors of a reused keep-alive connection that the server already closed
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def create_ssl_context() -> ssl.SSLContext:
+    """Create an SSL context with best-effort certificate handling.
+
+    Prefers KiCad's certificate bundle on macOS, then the certifi package,
+    then the system certificates.
+    """
+    context = ssl.create_default_context()
+    if sys.platform == "darwin":
+        for cert_path in _KICAD_CERT_PATHS:
+            if os.path.isfile(cert_path):
+                try:
+                    context.load_verify_locations(cafile=cert_path)
+                    logger.info(f"Using KiCad certificate bundle: {cert_path}")
+                    return context
+                except Exception as e:
+                    logger.warning(f"Failed to load cert from {cert_path}: {e}")
+    try:
+        import certifi
+        context.load_verify_locations(cafile=certifi.where())
+        logger.debug("Using certifi package for SSL certificates")
+    except Exception as e:
+        logger.debug(f"certifi package not available, using system certificates: {e}")
+    return context
+
+
+class HttpError(OSError):
+    """A request failed with an HTTP error status or a connection error."""
+
+    def __init__(self, message: str, status: int = 0, url: str = ""):
+        super().__init__(message)
+        self.status = status
+        self.url = url
+
+
+class HttpResponse(NamedTuple):
+    """A completed response with its decoded body."""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    url: str
+
+    def json(self):
+        return json.loads(self.body)
+
+    def text(self, errors: str = "strict") -> str:
+        return self.body.decode("utf-8", errors=errors)
+
+
+def decode_body(body: bytes, encoding: str) -> bytes:
+    """Undo a gzip or deflate Content-Encoding."""
+    encoding = encoding.strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)  # raw deflate stream
+    return body
+
+
+class HttpSession:
+    """Thread-safe HTTP client with per-host keep-alive connection pools.
+
+    Connections are checked out for the duration of one request, so several
+    threads can use the same session. Requests that fail with a connection
+    error or one of ``RETRY_STATUSES`` are retried up to ``retries`` times,
+    waiting ``backoff * 2 ** attempt`` seconds (or the server's Retry-After,
+    capped at ``MAX_RETRY_AFTER``) in between.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRY_AFTER = 10.0
+
+    def __init__(
+        self,
+        user_agent: str = DEFAULT_USER_AGENT,
+        timeout: float = 15,
+        retries: int = 2,
+        backoff: float = 0.5,
+        max_idle_per_host: int = 4,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_idle_per_host = max_idle_per_host
+        self._ssl_context = ssl_context
+        self._idle: Dict[Tuple, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = create_ssl_context()
+        return self._ssl_context
+
+    # -- Connection pool ----------------------------------------------------
+
+    @staticmethod
+    def _proxy_for(scheme: str, host: str) -> Optional[Tuple[str, int]]:
+        proxy = urllib.request.getproxies().get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        parsed = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        return parsed.hostname, parsed.port or 8080
+
+    def _new_connection(self, key: Tuple) -> http.client.HTTPConnection:
+        scheme, host, port, proxy = key
+        if scheme == "https":
+            if proxy:
+                conn = http.client.HTTPSConnection(*proxy, context=self.ssl_context)
+                conn.set_tunnel(host, port)
+                return conn
+            return http.client.HTTPSConnection(host, port, context=self.ssl_context)
+        if proxy:
+            return http.client.HTTPConnection(*proxy)
+        return http.client.HTTPConnection(host, port)
+
+    def _acquire(self, key: Tuple) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return an idle connection for ``key`` or a new one, and whether it was reused."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(key), False
+
+    def _release(self, key: Tuple, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    # -- Requests -------------------------------------------------------------
+
+    def _send_once(
+        self, method: str, url: str, body: Optional[bytes], headers: Dict[str, str], timeout: float
+    ) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise HttpError(f"Unsupported URL: {url}", url=url)
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port, self._proxy_for(scheme, parts.hostname))
+
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        if key[3] and scheme == "http":
+            target = url  # plain HTTP proxies take the absolute URL
+
+        while True:
+            conn, reused = self._acquire(key)
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused:
+                    continue  # the server dropped an idle connection; not a failure
+                raise
+            except BaseException:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+
+            response_headers = {k.lower(): v for k, v in response.getheaders()}
+            encoding = response_headers.get("content-encoding", "")
+            if encoding and method != "HEAD":
+                data = decode_body(data, encoding)
+            return HttpResponse(response.status, response_headers, data, url)
+
+    def _retry_delay(self, attempt: int, response: Optional[HttpResponse]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("retry-after", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.MAX_RETRY_AFTER)
+        return self.backoff * (2 ** attempt)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+    ) -> HttpResponse:
+        """Send a request and return the response with its decoded body.
+
+        Raises HttpError for non-2xx statuses (after retrying the transient
+        ones) and for connection errors that persist after all retries.
+        """
+        send_headers = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        send_headers.update(headers or {})
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+
+        attempt = 0
+        redirects = 0
+        while True:
+            response = None
+            try:
+                response = self._send_once(method, url, data, send_headers, timeout)
+            except HttpError:
+                raise
+            except ssl.SSLCertVerificationError as e:
+                raise HttpError(f"{method} {url} failed: {e}", url=url) from e
+            except (OSError, http.client.HTTPException) as e:
+                if attempt >= retries:
+                    raise HttpError(f"{method} {url} failed: {e}", url=url) from e
+                logger.debug(f"Retrying {method} {url} after error: {e}")
+            else:
+                location = response.headers.get("location")
+                if response.status in _REDIRECT_STATUSES and location:
+                    redirects += 1
+                    if redirects > _MAX_REDIRECTS:
+                        raise HttpError(f"Too many redirects for {url}", response.status, url)
+                    url = urllib.parse.urljoin(url, location)
+                    if response.status == 303 or (response.status in (301, 302) and method == "POST"):
+                        method, data = "GET", None
+                    continue
+                if 200 <= response.status < 300:
+                    return response
+                if response.status not in self.RETRY_STATUSES or attempt >= retries:
+                    raise HttpError(
+                        f"HTTP {response.status} for {method} {url}", response.status, url
+                    )
+                logger.debug(f"Retrying {method} {url} after HTTP {response.status}")
+
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, data: Optional[bytes] = None, **kwargs) -> HttpResponse:
+        return self.request("POST", url, data=data, **kwargs)
+
+
+_session: Optional[HttpSession] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> HttpSession:
+    """Return the session shared by all online services of the plugin."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = HttpSession()
+        return _session
@@ -1,41 +1,106 @@
-"""Import History - Tracks all imported components with metadata."""
+"""Import History - Tracks all imported components with metadata.
+
+Entries are stored one JSON object per line in ``import_history.jsonl``, so
+recording an import appends a single line instead of rewriting the whole
+file. Lookups by component name and LCSC id and the per-source statistics
+are kept in memory and updated as entries are added. A history saved by
+older versions as ``import_history.json`` is migrated on first load.
+"""
 
 import json
 import logging
+import os
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+LCSC_ID_RE = re.compile(r"^C\d+$", re.IGNORECASE)
+
 
 class ImportHistory:
-    """Manages a JSON-based history of imported components."""
+    """Manages an append-only JSON Lines history of imported components."""
 
     def __init__(self, history_dir: Optional[Path] = None):
         if history_dir is None:
             history_dir = Path(__file__).resolve().parent.parent
-        self.history_file = Path(history_dir) / "import_history.json"
+        self.history_file = Path(history_dir) / "import_history.jsonl"
+        self.legacy_file = Path(history_dir) / "import_history.json"
+        self._lock = threading.Lock()
         self._history: List[Dict] = []
+        self._by_component: Dict[str, Dict] = {}  # upper-case name -> newest entry
+        self._by_lcsc: Dict[str, Dict] = {}  # upper-case LCSC id -> newest entry
+        self._source_counts: Dict[str, int] = {}
         self._load()
 
+    # === STORAGE ===
+
     def _load(self) -> None:
-        """Load history from disk."""
+        """Load history from disk, migrating the old JSON file if needed."""
+        if not self.history_file.exists() and self.legacy_file.exists():
+            self._migrate_legacy()
+
         try:
-            if self.history_file.exists():
-                with open(self.history_file, "r", encoding="utf-8") as f:
-                    self._history = json.load(f)
-        except (json.JSONDecodeError, OSError) as e:
+            with open(self.history_file, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable history line {line_no}")
+                        continue
+                    if isinstance(entry, dict):
+                        self._index(entry)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
             logger.warning(f"Could not load import history: {e}")
-            self._history = []
 
-    def _save(self) -> None:
-        """Save history to disk."""
+    def _migrate_legacy(self) -> None:
+        """Convert ``import_history.json`` into the JSON Lines log."""
+        try:
+            with open(self.legacy_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            if not isinstance(entries, list):
+                raise ValueError("history is not a list")
+        except (json.JSONDecodeError, ValueError, OSError) as e:
+            logger.warning(f"Could not load import history: {e}")
+            return
+
+        temp_path = self.history_file.with_suffix(".jsonl.tmp")
         try:
-            with open(self.history_file, "w", encoding="utf-8") as f:
-                json.dump(self._history, f, indent=2, ensure_ascii=False)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    if isinstance(entry, dict):
+                        f.write(self._dump(entry))
+            os.replace(temp_path, self.history_file)
+            self.legacy_file.replace(self.legacy_file.with_suffix(".json.bak"))
+            logger.info(f"Migrated {len(entries)} history entries to {self.history_file.name}")
         except OSError as e:
-            logger.error(f"Could not save import history: {e}")
+            temp_path.unlink(missing_ok=True)
+            logger.error(f"Could not migrate import history: {e}")
+
+    @staticmethod
+    def _dump(entry: Dict) -> str:
+        return json.dumps(entry, ensure_ascii=False) + "\n"
+
+    def _index(self, entry: Dict) -> None:
+        self._history.append(entry)
+        component = str(entry.get("component", "")).upper()
+        self._by_component[component] = entry
+        lcsc = str(entry.get("lcsc") or "").upper()
+        if not lcsc and LCSC_ID_RE.match(component):
+            lcsc = component
+        if lcsc:
+            self._by_lcsc[lcsc] = entry
+        source = entry.get("source", "Unknown")
+        self._source_counts[source] = self._source_counts.get(source, 0) + 1
+
+    # === RECORDING ===
 
     def add_entry(
         self,
@@ -44,6 +109,7 @@ class ImportHistory:
         library_name: str,
         zip_file: str = "",
         profile: str = "",
+        lcsc_id: str = "",
     ) -> None:
         """Record a successful import."""
         entry = {
@@ -54,16 +120,30 @@ class ImportHistory:
             "profile": profile,
             "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
-        self._history.append(entry)
-        self._save()
+        if lcsc_id:
+            entry["lcsc"] = lcsc_id
+        with self._lock:
+            self._index(entry)
+            try:
+                with open(self.history_file, "a", encoding="utf-8") as f:
+                    f.write(self._dump(entry))
+            except OSError as e:
+                logger.error(f"Could not save import history: {e}")
         logger.info(f"History: recorded import of '{component_name}' from {source}")
 
+    # === QUERIES ===
+
+    def iter_entries(self, offset: int = 0, limit: int = 0) -> Iterator[Dict]:
+        """Iterate over history entries, newest first, skipping ``offset`` entries."""
+        with self._lock:
+            end = len(self._history) - offset
+            start = max(0, end - limit) if limit > 0 else 0
+            page = self._history[start:max(0, end)]
+        return reversed(page)
+
     def get_entries(self, limit: int = 0) -> List[Dict]:
         """Return history entries, newest first. limit=0 means all."""
-        entries = list(reversed(self._history))
-        if limit > 0:
-            return entries[:limit]
-        return entries
+        return list(self.iter_entries(limit=limit))
 
     def get_count(self) -> int:
         """Return total number of imports."""
@@ -86,19 +166,15 @@ class ImportHistory:
         return "\n".join(lines)
 
     def is_already_imported(self, component_name: str) -> Optional[Dict]:
-        """Check if a component was already imported. Returns the entry or None."""
-        for entry in reversed(self._history):
-            if entry.get("component", "").upper() == component_name.upper():
-                return entry
-        return None
+        """Check if a component (or LCSC id) was already imported. Returns the entry or None."""
+        key = component_name.upper()
+        with self._lock:
+            return self._by_component.get(key) or self._by_lcsc.get(key)
 
     def get_stats_by_source(self) -> Dict[str, int]:
         """Return component count grouped by source."""
-        stats: Dict[str, int] = {}
-        for entry in self._history:
-            source = entry.get("source", "Unknown")
-            stats[source] = stats.get(source, 0) + 1
-        return stats
+        with self._lock:
+            return dict(self._source_counts)
 
     def get_summary_with_stats(self, limit: int = 50) -> str:
         """Return formatted summary with statistics."""
@@ -121,5 +197,13 @@ class ImportHistory:
 
     def clear(self) -> None:
         """Clear all history."""
-        self._history = []
-        self._save()
+        with self._lock:
+            self._history = []
+            self._by_component = {}
+            self._by_lcsc = {}
+            self._source_counts = {}
+            try:
+                with open(self.history_file, "w", encoding="utf-8"):
+                    pass
+            except OSError as e:
+                logger.error(f"Could not save import history: {e}")
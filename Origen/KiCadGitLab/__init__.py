@@ -3,68 +3,67 @@ KiCad GitLab - Browse and download symbols from KiCad's official GitLab reposito
 
 Public API (no authentication required):
   https://gitlab.com/api/v4/projects/kicad%2Flibraries%2Fkicad-symbols/
+
+Searches and downloads are served from a local mirror of the libraries (see
+``mirror.py``) once it has been synced; until then the repository is used
+directly.
 """
 
-import re
-import sys
 import logging
-import urllib.request
-import urllib.parse
-import urllib.error
-import ssl
 import json
-import os
 from pathlib import Path
 from typing import List, Dict, Optional
 
-logger = logging.getLogger(__name__)
+try:
+    from ..HttpSession import get_session
+    from ..SymbolLibFile import SymbolLibWriter, lib_version, library_header
+except ImportError:
+    from HttpSession import get_session
+    from SymbolLibFile import SymbolLibWriter, lib_version, library_header
+
+try:
+    from .mirror import (
+        GITLAB_API_BASE,
+        SYMBOLS_PROJECT,
+        SYMBOLS_RAW_URL,
+        SYMBOLS_TREE_URL,
+        SymbolMirror,
+        cli,
+        get_symbol_mirror,
+    )
+except ImportError:
+    from mirror import (
+        GITLAB_API_BASE,
+        SYMBOLS_PROJECT,
+        SYMBOLS_RAW_URL,
+        SYMBOLS_TREE_URL,
+        SymbolMirror,
+        cli,
+        get_symbol_mirror,
+    )
 
-GITLAB_API_BASE = "https://gitlab.com/api/v4"
-SYMBOLS_PROJECT = "kicad%2Flibraries%2Fkicad-symbols"
-SYMBOLS_TREE_URL = f"{GITLAB_API_BASE}/projects/{SYMBOLS_PROJECT}/repository/tree"
-SYMBOLS_RAW_URL = f"{GITLAB_API_BASE}/projects/{SYMBOLS_PROJECT}/repository/files/{{path}}/raw"
+logger = logging.getLogger(__name__)
 
 # Session-level cache
 _library_list_cache: Optional[List[Dict]] = None
 
 
-def _create_ssl_context() -> ssl.SSLContext:
-    """Create an SSL context with best-effort certificate handling."""
-    context = ssl.create_default_context()
-    if sys.platform == "darwin":
-        kicad_cert_paths = [
-            "/Applications/KiCad/KiCad.app/Contents/Frameworks/Python.framework/Versions/3.9/lib/python3.9/site-packages/certifi/cacert.pem",
-            "/Applications/KiCad-10.0/KiCad.app/Contents/Frameworks/Python.framework/Versions/3.9/lib/python3.9/site-packages/certifi/cacert.pem",
-        ]
-        for cert_path in kicad_cert_paths:
-            if os.path.isfile(cert_path):
-                try:
-                    context.load_verify_locations(cafile=cert_path)
-                    return context
-                except Exception:
-                    pass
-    try:
-        import certifi
-        context.load_verify_locations(cafile=certifi.where())
-    except Exception:
-        pass
-    return context
-
-
 def _get(url: str, timeout: int = 10) -> bytes:
-    """Perform a GET request and return raw bytes."""
-    ctx = _create_ssl_context()
-    req = urllib.request.Request(url, headers={"User-Agent": "CustomImportGUI/1.0"})
-    with urllib.request.urlopen(req, context=ctx, timeout=timeout) as resp:
-        return resp.read()
+    """Perform a GET request on the shared keep-alive session and return raw bytes."""
+    return get_session().get(url, timeout=timeout).body
 
 
 def list_symbol_libraries() -> List[Dict]:
     """Return the list of .kicad_sym files available in the official KiCad symbols repo.
 
     Returns a list of dicts: [{"name": "Amplifier_Audio.kicad_sym", "path": "Amplifier_Audio.kicad_sym"}]
-    Result is cached for the lifetime of the Python session.
+    Served from the local mirror once it is synced; otherwise the listing is
+    requested from GitLab and cached for the lifetime of the Python session.
     """
+    mirror = get_symbol_mirror()
+    if mirror.is_indexed():
+        return mirror.libraries()
+
     global _library_list_cache
     if _library_list_cache is not None:
         return _library_list_cache
@@ -75,7 +74,7 @@ def list_symbol_libraries() -> List[Dict]:
 
     try:
         while True:
-            url = f"{SYMBOLS_TREE_URL}?ref=master&per_page={per_page}&page={page}"
+            url = f"{SYMBOLS_TREE_URL}?ref={mirror.ref}&per_page={per_page}&page={page}"
             data = _get(url)
             entries = json.loads(data)
             if not entries:
@@ -94,50 +93,46 @@ def list_symbol_libraries() -> List[Dict]:
     return results
 
 
-def _fetch_library_raw(file_path: str) -> str:
-    """Download the raw content of a .kicad_sym file by its path in the repo."""
-    encoded_path = urllib.parse.quote(file_path, safe="")
-    url = SYMBOLS_RAW_URL.format(path=encoded_path) + "?ref=master"
-    data = _get(url)
-    return data.decode("utf-8", errors="replace")
-
+def sync_symbol_mirror(progress=None, force: bool = False) -> List[Dict]:
+    """Update the local mirror (at most once a day) and return the library list.
 
-def _parse_symbol_names(kicad_sym_content: str) -> List[str]:
-    """Extract symbol names from a .kicad_sym file content.
-
-    Looks for top-level symbol entries: (symbol "NAME" ...)
-    Excludes derived/unit symbols that contain a slash (unit markers).
+    Args:
+        progress: Optional ``(step, total, library)`` callback
+        force: Check the repository even if the mirror was refreshed recently
     """
-    # Match: (symbol "SYMBOL_NAME"  — the name must not contain a slash (unit markers)
-    pattern = re.compile(r'^\s*\(symbol\s+"([^"/]+)"\s', re.MULTILINE)
-    return pattern.findall(kicad_sym_content)
+    try:
+        get_symbol_mirror().refresh(force=force, progress=progress)
+    except Exception as e:
+        logger.error(f"KiCadGitLab: failed to sync symbol mirror: {e}")
+    return list_symbol_libraries()
 
 
 def search_symbols(query: str, library: str = None) -> List[Dict]:
     """Search for KiCad official symbols.
 
     Args:
-        query: Search term (case-insensitive substring match).
+        query: Search term; every word must appear (case-insensitive) in the
+               symbol's name, description, keywords, footprint filters or library.
         library: If specified (without .kicad_sym extension), search only within that library.
-                 Otherwise, match library names containing the query.
+                 Before the mirror is synced, searches without a library only
+                 match library names.
 
     Returns:
-        List of dicts: [{"name": "LM386", "library": "Amplifier_Audio", "description": ""}]
+        List of dicts: [{"name": "LM386", "library": "Amplifier_Audio", "description": "..."}]
     """
     results: List[Dict] = []
-    query_lower = query.lower()
+    mirror = get_symbol_mirror()
 
     try:
-        if library:
-            # Search within a specific library file
-            file_path = f"{library}.kicad_sym"
-            content = _fetch_library_raw(file_path)
-            symbol_names = _parse_symbol_names(content)
-            for sym in symbol_names:
-                if query_lower in sym.lower():
-                    results.append({"name": sym, "library": library, "description": ""})
+        if mirror.is_indexed():
+            results = mirror.search(query, library)
+        elif library:
+            # Mirror this one library, then search its index
+            mirror.library_text(library)
+            results = mirror.search(query, library)
         else:
             # Match against library names (fast, no file downloads)
+            query_lower = query.lower()
             libs = list_symbol_libraries()
             for lib in libs:
                 lib_name = lib["name"].replace(".kicad_sym", "")
@@ -150,10 +145,13 @@ def search_symbols(query: str, library: str = None) -> List[Dict]:
 
 
 def download_symbol(library_name: str, symbol_name: str, dest_path: str) -> bool:
-    """Download a specific symbol from KiCad's official GitLab repo.
+    """Copy a specific symbol from KiCad's official libraries into a library file.
 
-    Fetches the full .kicad_sym library file, extracts the requested symbol
-    using kiutils, and saves it to dest_path.
+    The symbol is taken from the local mirror (the library is downloaded
+    first if it is not mirrored yet) and spliced into dest_path without
+    parsing either library. A destination library in an older format than
+    the mirrored one is upgraded with kicad-cli first, so the block never
+    ends up in a file whose version predates its tokens.
 
     Args:
         library_name: Library name without extension (e.g., "Amplifier_Audio").
@@ -164,59 +162,23 @@ def download_symbol(library_name: str, symbol_name: str, dest_path: str) -> bool
         True on success, False on failure.
     """
     try:
-        file_path = f"{library_name}.kicad_sym"
-        content = _fetch_library_raw(file_path)
-
-        # Setup kiutils path
-        current_dir = Path(__file__).resolve().parent
-        kiutils_src = current_dir.parent / "kiutils" / "src"
-        if str(kiutils_src) not in sys.path:
-            sys.path.insert(0, str(kiutils_src))
-
-        from kiutils.symbol import SymbolLib
-
-        # Write content to a temporary file for kiutils to parse
-        import tempfile
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".kicad_sym", delete=False, encoding="utf-8"
-        ) as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        try:
-            src_lib = SymbolLib.from_file(tmp_path)
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except Exception:
-                pass
-
-        # Find the requested symbol
-        target_symbol = None
-        for sym in src_lib.symbols:
-            if sym.entryName == symbol_name:
-                target_symbol = sym
-                break
-
-        if target_symbol is None:
+        mirror = get_symbol_mirror()
+        block = mirror.symbol_text(library_name, symbol_name)
+        if block is None:
             logger.error(f"KiCadGitLab: symbol '{symbol_name}' not found in '{library_name}'")
             return False
 
         dest = Path(dest_path)
         dest.parent.mkdir(parents=True, exist_ok=True)
 
-        if dest.exists():
-            # Append to existing library
-            dest_lib = SymbolLib.from_file(str(dest))
-            # Remove if already present
-            dest_lib.symbols = [s for s in dest_lib.symbols if s.entryName != symbol_name]
-            dest_lib.symbols.append(target_symbol)
-            dest_lib.to_file(str(dest))
-        else:
-            # Create a new library with just this symbol
-            new_lib = SymbolLib()
-            new_lib.symbols = [target_symbol]
-            new_lib.to_file(str(dest))
+        # A new library gets the header (format version) of the source library
+        source = mirror.library_text(library_name)
+        writer = SymbolLibWriter(dest, header=library_header(source))
+        if writer.text.strip() and lib_version(writer.text) < lib_version(source):
+            if not _upgrade_library(writer, lib_version(source)):
+                return False
+        writer.put(block, overwrite=True)
+        writer.save()
 
         logger.info(f"KiCadGitLab: saved '{symbol_name}' from '{library_name}' to '{dest}'")
         return True
@@ -224,3 +186,24 @@ def download_symbol(library_name: str, symbol_name: str, dest_path: str) -> bool
     except Exception as e:
         logger.error(f"KiCadGitLab: download_symbol failed: {e}")
         return False
+
+
+def _upgrade_library(writer: SymbolLibWriter, version: int) -> bool:
+    """Upgrade the writer's library with kicad-cli to at least ``version``."""
+    if cli is None:
+        logger.error(f"KiCadGitLab: kicad-cli is needed to upgrade {writer.path}")
+        return False
+    success, upgraded, error = cli.upgrade_sym_lib_from_string(writer.text)
+    if not success:
+        logger.error(f"KiCadGitLab: could not upgrade {writer.path}: {error}")
+        return False
+    if lib_version(upgraded) < version:
+        # The installed KiCad is older than the mirrored library
+        logger.error(
+            f"KiCadGitLab: {writer.path} can only be upgraded to version "
+            f"{lib_version(upgraded)}, the symbol needs {version}"
+        )
+        return False
+    writer.text = upgraded
+    writer.modified = True
+    return True
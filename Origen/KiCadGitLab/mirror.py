@@ -0,0 +1,422 @@
+"""
+Local mirror and symbol index of KiCad's official symbol libraries.
+
+The ``.kicad_sym`` files of the kicad-symbols repository are kept in a local
+folder, next to an SQLite index of every symbol's name, description,
+keywords, footprint filters and library. A refresh first compares the head
+commit of the branch; only when it moved is the repository tree listed
+(once, all pages), and only the libraries whose blob changed are downloaded
+again, with ``If-None-Match`` so an unchanged file costs a 304.
+
+The shared mirror follows the release branch of the installed KiCad (e.g.
+``9.0``), so copied symbols are in a format that KiCad opens; ``master`` is
+only used when the KiCad version is unknown.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    from ..HttpSession import HttpError, get_session
+    from ..kicad_cli import kicad_cli
+    from ..SqliteIndex import open_index
+    from ..SymbolLibFile import find_symbol, scan_symbols, unescape_name
+except ImportError:
+    from HttpSession import HttpError, get_session
+    from kicad_cli import kicad_cli
+    from SqliteIndex import open_index
+    from SymbolLibFile import find_symbol, scan_symbols, unescape_name
+
+logger = logging.getLogger(__name__)
+
+try:
+    cli = kicad_cli()
+    logger.info("✓ kicad_cli initialized successfully")
+except Exception as e:
+    logger.error(f"Failed to initialize kicad_cli: {e}")
+    cli = None
+
+GITLAB_API_BASE = "https://gitlab.com/api/v4"
+SYMBOLS_PROJECT = "kicad%2Flibraries%2Fkicad-symbols"
+SYMBOLS_REF = "master"
+SYMBOLS_BRANCH_URL = f"{GITLAB_API_BASE}/projects/{SYMBOLS_PROJECT}/repository/branches/{{ref}}"
+SYMBOLS_TREE_URL = f"{GITLAB_API_BASE}/projects/{SYMBOLS_PROJECT}/repository/tree"
+SYMBOLS_RAW_URL = f"{GITLAB_API_BASE}/projects/{SYMBOLS_PROJECT}/repository/files/{{path}}/raw"
+
+SCHEMA_VERSION = 1
+DEFAULT_MAX_AGE = 24 * 3600  # seconds between checks for a new commit
+SEARCH_LIMIT = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS libraries (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    blob_id TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    symbol_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    library TEXT NOT NULL REFERENCES libraries(name) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    fp_filters TEXT NOT NULL,
+    search_text TEXT NOT NULL,
+    PRIMARY KEY (library, name)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Top-level properties of a symbol block; KiCad 8+ uses "Description",
+# KiCad 6/7 "ki_description"
+_PROPERTY_RE = re.compile(
+    r'\(\s*property\s+"(Description|ki_description|ki_keywords|ki_fp_filters)"\s+"((?:[^"\\]|\\.)*)"'
+)
+
+Progress = Callable[[int, int, str], None]
+
+
+def symbols_ref(kicad_major: int) -> str:
+    """Branch of kicad-symbols for a KiCad major version, master if unknown."""
+    return f"{kicad_major}.0" if kicad_major > 0 else SYMBOLS_REF
+
+
+def installed_symbols_ref() -> str:
+    """Branch of kicad-symbols matching the installed KiCad (cached probe)."""
+    major = 0
+    if cli is not None:
+        try:
+            caps = cli.probe()
+            if caps.found:
+                major = caps.version_tuple[0]
+        except Exception as e:
+            logger.debug(f"Could not determine the KiCad version: {e}")
+    return symbols_ref(major)
+
+
+def read_symbol_fields(text: str) -> List[Dict[str, str]]:
+    """Return name, description, keywords and footprint filters of every symbol."""
+    symbols = []
+    for span in scan_symbols(text):
+        props: Dict[str, str] = {}
+        for key, value in _PROPERTY_RE.findall(text, span.start, span.end):
+            key = "description" if key in ("Description", "ki_description") else key[3:]
+            props.setdefault(key, unescape_name(value))
+        symbols.append({
+            "name": span.name,
+            "description": props.get("description", ""),
+            "keywords": props.get("keywords", ""),
+            "fp_filters": props.get("fp_filters", ""),
+        })
+    return symbols
+
+
+class SymbolMirror:
+    """Local copy of the official symbol libraries with a searchable index."""
+
+    def __init__(self, mirror_dir: Optional[Path] = None, session=None, ref: str = SYMBOLS_REF):
+        if mirror_dir is None:
+            mirror_dir = Path(__file__).resolve().parent.parent / "kicad_symbols_mirror"
+        self.mirror_dir = Path(mirror_dir)
+        self.ref = ref
+        self.files_dir = self.mirror_dir / "libraries"
+        self._session = session
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._open()
+
+    # === STORAGE ===
+
+    def _open(self) -> None:
+        self._conn = open_index(
+            self.mirror_dir / "index.db", _SCHEMA, SCHEMA_VERSION, "KiCad symbol index",
+            folders=[self.files_dir], foreign_keys=True,
+        )
+        with self._lock, self._conn as conn:
+            if self._get_meta("ref") != self.ref:
+                # Libraries of another branch are downloaded again
+                conn.execute("DELETE FROM libraries")
+                conn.execute("DELETE FROM meta")
+                self._set_meta(conn, "ref", self.ref)
+
+    def _get_meta(self, key: str) -> str:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else ""
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def _file_path(self, path: str) -> Path:
+        return self.files_dir / path
+
+    def _store_library(self, name: str, path: str, text: str, blob_id: str, etag: str) -> None:
+        """Write a library file and re-index its symbols."""
+        target = self._file_path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        try:
+            symbols = read_symbol_fields(text)
+        except ValueError as e:
+            logger.warning(f"Could not index {path}: {e}")
+            symbols = []
+
+        rows = []
+        for sym in symbols:
+            search_text = "\n".join(
+                (sym["name"], sym["description"], sym["keywords"], sym["fp_filters"], name)
+            ).lower()
+            rows.append((name, sym["name"], sym["description"], sym["keywords"],
+                         sym["fp_filters"], search_text))
+
+        with self._lock, self._conn as conn:
+            conn.execute("DELETE FROM libraries WHERE name = ?", (name,))
+            conn.execute(
+                "INSERT INTO libraries VALUES (?, ?, ?, ?, ?)",
+                (name, path, blob_id, etag, len(rows)),
+            )
+            conn.executemany("INSERT OR REPLACE INTO symbols VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def _remove_library(self, name: str, path: str) -> None:
+        with self._lock, self._conn as conn:
+            conn.execute("DELETE FROM libraries WHERE name = ?", (name,))
+        self._file_path(path).unlink(missing_ok=True)
+
+    # === NETWORK ===
+
+    @property
+    def session(self):
+        return self._session if self._session is not None else get_session()
+
+    def _head_commit(self) -> str:
+        data = json.loads(self.session.get(SYMBOLS_BRANCH_URL.format(ref=self.ref), timeout=10).body)
+        return data.get("commit", {}).get("id", "")
+
+    def _list_tree(self) -> List[Dict[str, str]]:
+        """List the ``.kicad_sym`` blobs of the repository, all pages at once."""
+        entries: List[Dict[str, str]] = []
+        page = 1
+        per_page = 100
+        while True:
+            url = f"{SYMBOLS_TREE_URL}?ref={self.ref}&per_page={per_page}&page={page}"
+            items = json.loads(self.session.get(url, timeout=10).body)
+            if not items:
+                break
+            for item in items:
+                name = item.get("name", "")
+                if name.endswith(".kicad_sym") and item.get("type") == "blob":
+                    entries.append({
+                        "name": name[: -len(".kicad_sym")],
+                        "path": item.get("path", name),
+                        "blob_id": item.get("id", ""),
+                    })
+            if len(items) < per_page:
+                break
+            page += 1
+        return entries
+
+    def _download(self, path: str, etag: str = ""):
+        """GET a raw library file; returns the response, or None for 304."""
+        encoded_path = urllib.parse.quote(path, safe="")
+        url = SYMBOLS_RAW_URL.format(path=encoded_path) + f"?ref={self.ref}"
+        headers = {"If-None-Match": etag} if etag else {}
+        try:
+            return self.session.get(url, headers=headers, timeout=30)
+        except HttpError as e:
+            if e.status == 304:
+                return None
+            raise
+
+    # === REFRESH ===
+
+    def last_refresh(self) -> float:
+        with self._lock:
+            value = self._get_meta("refreshed_at")
+        return float(value) if value else 0.0
+
+    def refresh(
+        self,
+        max_age: float = DEFAULT_MAX_AGE,
+        force: bool = False,
+        progress: Optional[Progress] = None,
+    ) -> int:
+        """
+        Bring the mirror up to date with the repository.
+
+        Nothing is requested if the last refresh is younger than ``max_age``
+        (unless ``force``). Raises HttpError if the repository cannot be
+        reached; libraries that fail to download are retried next time.
+
+        Returns:
+            Number of libraries that were downloaded
+        """
+        with self._refresh_lock:
+            if not force and self.is_indexed() and time.time() - self.last_refresh() < max_age:
+                return 0
+
+            commit = self._head_commit()
+            with self._lock:
+                known_commit = self._get_meta("commit")
+                known = {
+                    name: (path, blob_id, etag)
+                    for name, path, blob_id, etag in self._conn.execute(
+                        "SELECT name, path, blob_id, etag FROM libraries"
+                    )
+                }
+
+            downloaded = 0
+            complete = True
+            if commit != known_commit or not known:
+                tree = self._list_tree()
+                total = len(tree)
+                for step, entry in enumerate(tree, 1):
+                    name, path, blob_id = entry["name"], entry["path"], entry["blob_id"]
+                    if progress:
+                        progress(step, total, name)
+                    old = known.get(name)
+                    on_disk = old is not None and self._file_path(old[0]).is_file()
+                    if on_disk and old[1] == blob_id:
+                        continue
+                    try:
+                        response = self._download(path, old[2] if on_disk else "")
+                        if response is None:
+                            # Unchanged content; remember the new blob id
+                            with self._lock, self._conn as conn:
+                                conn.execute(
+                                    "UPDATE libraries SET blob_id = ? WHERE name = ?",
+                                    (blob_id, name),
+                                )
+                            continue
+                        self._store_library(
+                            name, path, response.text(errors="replace"), blob_id,
+                            response.headers.get("etag", ""),
+                        )
+                        downloaded += 1
+                    except (OSError, sqlite3.Error) as e:
+                        logger.warning(f"KiCad symbol mirror: could not update {name}: {e}")
+                        complete = False
+
+                current = {entry["name"] for entry in tree}
+                for name, (path, _, _) in known.items():
+                    if name not in current:
+                        self._remove_library(name, path)
+
+                if progress:
+                    progress(0, 0, "")
+
+            with self._lock, self._conn as conn:
+                if complete:
+                    self._set_meta(conn, "commit", commit)
+                self._set_meta(conn, "refreshed_at", str(time.time()))
+
+            logger.info(f"KiCad symbol mirror: {downloaded} libraries updated")
+            return downloaded
+
+    # === QUERIES ===
+
+    def is_indexed(self) -> bool:
+        """True once the mirror holds a complete listing of the repository."""
+        with self._lock:
+            return bool(self._get_meta("commit"))
+
+    def libraries(self) -> List[Dict[str, str]]:
+        """Mirrored libraries as ``[{"name": "X.kicad_sym", "path": ...}]``."""
+        with self._lock:
+            rows = self._conn.execute("SELECT name, path FROM libraries ORDER BY name").fetchall()
+        return [{"name": f"{name}.kicad_sym", "path": path} for name, path in rows]
+
+    def search(self, query: str, library: Optional[str] = None, limit: int = SEARCH_LIMIT) -> List[Dict]:
+        """
+        Find symbols whose name, description, keywords, footprint filters or
+        library contain every word of ``query`` (case-insensitive).
+
+        Exact and leading name matches come first.
+        """
+        words = query.lower().split()
+        where, params = [], []
+        for word in words:
+            escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where.append("search_text LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if library:
+            where.append("library = ?")
+            params.append(library)
+        if not where:
+            return []
+
+        needle = query.strip().lower()
+        sql = (
+            "SELECT name, library, description, keywords, fp_filters FROM symbols "
+            f"WHERE {' AND '.join(where)} "
+            "ORDER BY CASE WHEN lower(name) = ? THEN 0 "
+            "WHEN instr(lower(name), ?) = 1 THEN 1 "
+            "WHEN instr(lower(name), ?) > 0 THEN 2 ELSE 3 END, library, name "
+            "LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, needle, needle, needle, limit)).fetchall()
+        return [
+            {"name": name, "library": lib, "description": description,
+             "keywords": keywords, "fp_filters": fp_filters}
+            for name, lib, description, keywords, fp_filters in rows
+        ]
+
+    def library_text(self, library: str) -> str:
+        """Return a library's text from the mirror, downloading it if missing."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path FROM libraries WHERE name = ?", (library,)
+            ).fetchone()
+        if row is not None:
+            try:
+                return self._file_path(row[0]).read_text(encoding="utf-8")
+            except OSError:
+                pass
+
+        path = f"{library}.kicad_sym"
+        response = self._download(path)
+        text = response.text(errors="replace")
+        self._store_library(library, path, text, "", response.headers.get("etag", ""))
+        return text
+
+    def symbol_text(self, library: str, symbol: str) -> Optional[str]:
+        """Return the ``(symbol ...)`` block of one symbol, or None."""
+        text = self.library_text(library)
+        span = find_symbol(text, symbol)
+        return text[span.start : span.end] if span else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_mirror: Optional[SymbolMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_symbol_mirror() -> SymbolMirror:
+    """Return the mirror shared by the KiCad Official search."""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = SymbolMirror(ref=installed_symbols_ref())
+        return _mirror
@@ -5,13 +5,18 @@
 # Samacsys, Ultralibrarian and Snapeda zipfiles using kiutils.
 # Supports KiCad 7.0 and newer.
 
+import os
 import zipfile
 import tempfile
 import shutil
 import sys
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Tuple, Union, List, Dict, Any, Optional
+from typing import Callable, Tuple, Union, List, Dict, Any, Optional
 from pathlib import Path
 
 try:
@@ -34,18 +39,44 @@ if str(kiutils_src) not in sys.path:
     sys.path.insert(0, str(kiutils_src))
 
 # Import kiutils modules directly
-from kiutils.symbol import SymbolLib, Property, Effects
+from kiutils.symbol import Symbol, SymbolLib, Property, Effects
 from kiutils.items.common import Position, Font
+from kiutils.utils import sexpr
 
 try:
     from .footprint_model_parser import FootprintModelParser
+    from .zip_index import Find, ZipEntry, ZipIndex
 except ImportError:
     from footprint_model_parser import FootprintModelParser
+    from zip_index import Find, ZipEntry, ZipIndex
 
 try:
-    from ..kicad_cli import kicad_cli
+    from ..kicad_cli import kicad_cli, UpgradeQueue
+    from ..LegacySymbolLib import convert_legacy_lib, is_legacy_lib
+    from ..LegacyFootprint import UnsupportedFootprint, needs_upgrade, upgrade_footprint
+    from ..ModelStore import ModelStore
 except ImportError:
-    from kicad_cli import kicad_cli
+    from kicad_cli import kicad_cli, UpgradeQueue
+    from LegacySymbolLib import convert_legacy_lib, is_legacy_lib
+    from LegacyFootprint import UnsupportedFootprint, needs_upgrade, upgrade_footprint
+    from ModelStore import ModelStore
+
+try:
+    from ..SymbolLibFile import (
+        SymbolLibWriter,
+        build_library,
+        lib_version,
+        library_header,
+        scan_symbols,
+    )
+except ImportError:
+    from SymbolLibFile import (
+        SymbolLibWriter,
+        build_library,
+        lib_version,
+        library_header,
+        scan_symbols,
+    )
 
 try:
     cli = kicad_cli()
@@ -74,6 +105,37 @@ class ModifiedObject:
 modified_objects = ModifiedObject()
 
 
+# Buffer for streaming 3D models into .3dshapes: the platform's preferred
+# copy size (1 MiB on Windows, 64 KiB elsewhere), but at least 1 MiB
+STREAM_BUFSIZE = max(shutil.COPY_BUFSIZE, 1024 * 1024)
+
+# Commit locks per destination library file or folder, shared by all importers
+_library_locks: Dict[str, threading.RLock] = {}
+_library_locks_guard = threading.Lock()
+
+
+def _lock_key(path) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+@contextmanager
+def library_lock(*paths):
+    """
+    Hold the commit locks of the given destination libraries
+    (.kicad_sym files, .pretty and .3dshapes folders).
+
+    Locks are always taken in the same order, so jobs writing to
+    overlapping sets of libraries cannot deadlock.
+    """
+    keys = sorted({_lock_key(path) for path in paths if path})
+    with _library_locks_guard:
+        locks = [_library_locks.setdefault(key, threading.RLock()) for key in keys]
+    with ExitStack() as stack:
+        for lock in locks:
+            stack.enter_context(lock)
+        yield
+
+
 def check_file(path: Path):
     """
     Check if file exists, if not create parent directories and touch file
@@ -110,6 +172,135 @@ class REMOTE_TYPES(Enum):
     Partial = 4  # For archives with incomplete data
 
 
+@dataclass(frozen=True)
+class VendorRule:
+    """
+    How to recognise the zip layout of one vendor and where its files are.
+
+    Lookups are tried in order; the first one that finds an entry wins. If
+    an anchor is given, the rule only applies when that directory exists and
+    the symbol, dcm and footprint lookups are limited to it.
+    """
+
+    remote_type: REMOTE_TYPES
+    anchor: Optional[Find] = None
+    symbol: Tuple[Find, ...] = ()
+    dcm: Tuple[Find, ...] = ()
+    footprint: Tuple[Find, ...] = ()
+    footprint_is_anchor: bool = False  # The anchor directory holds the footprints
+    required: Tuple[str, ...] = ()  # Files that must be found for the rule to apply
+
+
+SYMBOL_LOOKUP = (Find(".kicad_sym"), Find(".lib"))
+MODEL_LOOKUP = (Find(".step"), Find(".stp"), Find(".wrl"))
+
+# Checked in order, the first matching rule identifies the archive
+VENDOR_RULES: List[VendorRule] = [
+    VendorRule(
+        REMOTE_TYPES.Octopart,
+        symbol=(Find("device.lib"),),
+        dcm=(Find("device.dcm"),),
+        footprint=(Find(".pretty", top_level=True, is_dir=True),),
+        required=("symbol", "dcm"),
+    ),
+    VendorRule(
+        REMOTE_TYPES.Samacsys,
+        anchor=Find("KiCad", is_dir=True),
+        symbol=SYMBOL_LOOKUP,
+        dcm=(Find(".dcm"),),
+        footprint_is_anchor=True,
+    ),
+    VendorRule(
+        REMOTE_TYPES.UltraLibrarian,
+        anchor=Find("KiCAD", is_dir=True),
+        symbol=SYMBOL_LOOKUP,
+        dcm=(Find(".dcm"),),
+        footprint=(Find(".pretty"),),
+    ),
+    VendorRule(
+        REMOTE_TYPES.Snapeda,
+        symbol=SYMBOL_LOOKUP,
+        dcm=(Find(".dcm"),),
+        footprint=(Find(".kicad_mod"),),
+        required=("symbol",),
+    ),
+    # Archives with only some of the data (e.g. only 3D models)
+    VendorRule(REMOTE_TYPES.Partial, required=("model",)),
+]
+
+
+@dataclass
+class ImportJob:
+    """
+    State of a single zip file import.
+
+    A job is staged (members read from the archive, upgrades queued),
+    prepared (symbol parsed, footprint name read) and then committed to the
+    destination libraries. Keeping this state per job instead of on the
+    LibImporter lets several jobs run at the same time.
+
+    Members are read into memory; files are only written to the scratch
+    directory when kicad-cli needs a path to upgrade them.
+    """
+
+    zip_file: Optional[Path] = None
+    archive: Optional[zipfile.ZipFile] = None  # Kept open to stream the model
+    work_dir: Optional[Path] = None  # Scratch directory, see scratch_dir()
+    remote_type: REMOTE_TYPES = REMOTE_TYPES.Partial
+    symbol_text: Optional[str] = None  # Symbol library that needs no upgrade
+    symbol_dcm: Optional[str] = None  # .dcm of a legacy symbol_text
+    symbol_file: Optional[Path] = None
+    symbol_upgraded: Optional[Path] = None
+    footprint_data: Optional[bytes] = None
+    footprint_file: Optional[Path] = None  # Scratch copy for kicad-cli
+    model_path: Optional[Union[Path, zipfile.Path]] = None
+
+    # Filled in by LibImporter._prepare_job
+    symbol_lib: Optional[SymbolLib] = None
+    symbol_name: str = "unknown"
+    symbol_blocks: Optional[List[Tuple[str, str]]] = None
+    footprint_name: Optional[str] = None
+
+    # Outcome of the commit
+    lib_skipped: bool = False
+    footprint_skipped: bool = False
+    model_skipped: bool = False
+    defer_lib_upgrades: bool = False
+    written_symbols: Dict[str, List[str]] = field(default_factory=dict)
+
+    # Messages are buffered unless print_func is set, so jobs running in
+    # parallel can be reported one after the other
+    messages: List[str] = field(default_factory=list)
+    print_func: Optional[Callable[[str], None]] = None
+
+    def print(self, txt: str) -> None:
+        if self.print_func:
+            self.print_func(txt)
+        else:
+            self.messages.append(txt)
+
+    def scratch_dir(self) -> Path:
+        """Return the job's scratch directory, created on first use."""
+        if self.work_dir is None:
+            self.work_dir = Path(tempfile.mkdtemp(prefix="impart_"))
+        return self.work_dir
+
+    def close(self) -> None:
+        """Close the archive and remove the scratch directory."""
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+        if self.work_dir is not None:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            self.work_dir = None
+
+    def flush_messages(self, print_func: Callable[[str], None]) -> None:
+        """Pass the buffered messages on to print_func."""
+        for message in self.messages:
+            print_func(message)
+        self.messages = []
+
+
 class LibImporter:
     def print(self, txt):
         print("->" + txt)
@@ -119,12 +310,9 @@ class LibImporter:
         self.DEST_PATH = Path.home() / "KiCad"
         self.library_name = "CustomLibrary"
         self.sub_library_name = ""  # When set, overrides library_name for .kicad_sym file
-        self.dcm_skipped = False
-        self.lib_skipped = False
-        self.footprint_skipped = False
-        self.model_skipped = False
-        self.footprint_name = None
         self.footprint_parser = FootprintModelParser()
+        # Zip files extracted and parsed at the same time within a batch
+        self.max_workers = min(8, os.cpu_count() or 1)
         # Callbacks
         self.on_import_success = None  # callback(component_name, source, zip_file)
         self.on_progress = None  # callback(step, total, message)
@@ -151,135 +339,126 @@ class LibImporter:
         """
         Identifies the source of the component library and locates key files
 
+        The archive is indexed once and checked against VENDOR_RULES; support
+        for another vendor layout is added with a new rule.
+
         Args:
             zf: The opened zipfile object
 
         Returns:
             Tuple with remote type and dictionary of paths to important files
         """
-        root_path = zipfile.Path(zf)
-        files: dict[str, Optional[Union[Path, zipfile.Path]]] = {
-            "symbol": None,
-            "footprint": None,
-            "model": None,
-            "dcm": None,
-        }
+        index = ZipIndex(zf)
+        model = self._lookup(index, MODEL_LOOKUP)
+
+        for rule in VENDOR_RULES:
+            anchor = index.find(rule.anchor) if rule.anchor else None
+            if rule.anchor and not anchor:
+                continue
+
+            found: Dict[str, Optional[ZipEntry]] = {
+                "symbol": self._lookup(index, rule.symbol, anchor),
+                "footprint": anchor if rule.footprint_is_anchor
+                else self._lookup(index, rule.footprint, anchor),
+                "model": model,
+                "dcm": self._lookup(index, rule.dcm, anchor),
+            }
+            if not all(found[key] for key in rule.required):
+                continue
+
+            if rule.remote_type == REMOTE_TYPES.Partial:
+                logger.warning("Archive contains only partial data: 3D model found")
+            else:
+                logger.info(f"Identified as {rule.remote_type.name} format")
+            files = {key: index.path(entry) for key, entry in found.items()}
+            return rule.remote_type, files
 
-        # Check for Octopart format
-        dcm_path = find_in_zip(root_path, "device.dcm")
-        lib_path = find_in_zip(root_path, "device.lib")
-        sym_path = find_in_zip(root_path, ".kicad_sym")
-        footprint_pretty = None
-
-        # Look for .pretty directory
-        for item in root_path.iterdir():
-            if item.name.endswith(".pretty") and item.is_dir():
-                footprint_pretty = item
-                break
-
-        # Search for model files
-        model_path = find_in_zip(root_path, ".step")
-        if not model_path:
-            model_path = find_in_zip(root_path, ".stp")
-        if not model_path:
-            model_path = find_in_zip(root_path, ".wrl")
-
-        # Try to identify format based on directory structure and files
-
-        # Check for Octopart format
-        octopart_check = (
-            find_in_zip(root_path, "device.lib") is not None
-            and find_in_zip(root_path, "device.dcm") is not None
-        )
-        if octopart_check:
-            logger.info("Identified as Octopart format")
-            files["symbol"] = find_in_zip(root_path, "device.lib")
-            files["dcm"] = find_in_zip(root_path, "device.dcm")
-            files["footprint"] = footprint_pretty
-            files["model"] = model_path
-            return REMOTE_TYPES.Octopart, files
-
-        # Check for Samacsys format
-        kicad_dir = find_in_zip(root_path, "KiCad")
-        if kicad_dir and kicad_dir.is_dir():
-            logger.info("Identified as Samacsys format")
-            files["symbol"] = find_in_zip(kicad_dir, ".kicad_sym") or find_in_zip(
-                kicad_dir, ".lib"
-            )
-            files["dcm"] = find_in_zip(kicad_dir, ".dcm")
-            files["footprint"] = kicad_dir  # Footprints are stored in this directory
-            files["model"] = model_path
-            return REMOTE_TYPES.Samacsys, files
-
-        # Check for UltraLibrarian format
-        kicad_dir = find_in_zip(root_path, "KiCAD")
-        if kicad_dir and kicad_dir.is_dir():
-            logger.info("Identified as UltraLibrarian format")
-            files["symbol"] = find_in_zip(kicad_dir, ".kicad_sym") or find_in_zip(
-                kicad_dir, ".lib"
-            )
-            files["dcm"] = find_in_zip(kicad_dir, ".dcm")
-            files["footprint"] = find_in_zip(kicad_dir, ".pretty")
-            files["model"] = model_path
-            return REMOTE_TYPES.UltraLibrarian, files
-
-        # Default to Snapeda format if we have symbols and footprints
-        footprint_file = find_in_zip(root_path, ".kicad_mod")
-        symbol_file = find_in_zip(root_path, ".kicad_sym") or find_in_zip(
-            root_path, ".lib"
+        logger.error(
+            f"Unable to identify library format. Files in ZIP: {index.filenames()}"
         )
-
-        if symbol_file:
-            logger.info("Identified as Snapeda format")
-            files["symbol"] = symbol_file
-            files["dcm"] = find_in_zip(root_path, ".dcm")
-            files["footprint"] = footprint_file
-            files["model"] = model_path
-            return REMOTE_TYPES.Snapeda, files
-
-        # If we can't determine the type but have essential files, default to Snapeda
-        if sym_path or lib_path:
-            logger.warning("Defaulting to Snapeda format")
-            files["symbol"] = sym_path or lib_path
-            files["dcm"] = dcm_path
-            files["footprint"] = footprint_file
-            files["model"] = model_path
-            return REMOTE_TYPES.Snapeda, files
-
-        # Handle partial archives (e.g., only 3D models)
-        if model_path:
-            logger.warning(f"Archive contains only partial data: 3D model found")
-            files["model"] = model_path
-            return REMOTE_TYPES.Partial, files
-
-        file_list = [f.filename for f in zf.filelist[:10]]
-        logger.error(f"Unable to identify library format. Files in ZIP: {file_list}")
         raise ValueError(tr("import.zip_not_compatible"))
 
-    def extract_file_to_temp(
-        self, file_path: Optional[Union[Path, zipfile.Path]]
-    ) -> Tuple[Path, Path]:
+    @staticmethod
+    def _lookup(
+        index: ZipIndex, lookups: Tuple[Find, ...], under: Optional[ZipEntry] = None
+    ) -> Optional[ZipEntry]:
+        """Return the entry of the first lookup that finds one"""
+        for lookup in lookups:
+            entry = index.find(lookup, under)
+            if entry:
+                return entry
+        return None
+
+    def _cli_available(self) -> bool:
+        """Return True if kicad-cli can be used for upgrades."""
+        return cli is not None and cli.exists()
+
+    def _stage_symbol(
+        self,
+        symbol_path: Union[Path, zipfile.Path],
+        dcm_path: Optional[Union[Path, zipfile.Path]],
+        job: ImportJob,
+        queue: Optional[UpgradeQueue],
+    ) -> None:
         """
-        Extract a file from zipfile.Path to a temporary location
+        Queue the upgrade of a symbol library
 
-        Returns:
-            Tuple of (temp_dir, extracted_file_path)
+        Legacy ``.lib`` libraries (and their DCM file) are kept in memory and
+        converted in-process. Other libraries are only written to the job's
+        scratch directory when kicad-cli has to upgrade them; otherwise they
+        are kept in memory and parsed from there.
         """
-        if not file_path:
-            logger.error("No file path provided for extraction")
-            raise ValueError("No file path")
+        if Path(symbol_path.name).suffix == ".lib":
+            job.symbol_text = symbol_path.read_bytes().decode("utf-8", errors="replace")
+            if dcm_path:
+                try:
+                    job.symbol_dcm = dcm_path.read_bytes().decode("utf-8", errors="replace")
+                except Exception as e:
+                    logger.warning(f"Failed to read DCM file: {e}")
+            return
 
-        temp_dir = Path(tempfile.mkdtemp())
-        extracted = temp_dir / file_path.name
+        if queue is None:
+            logger.warning("KiCad CLI not available, loading file directly")
+            job.symbol_text = symbol_path.read_bytes().decode("utf-8")
+            return
 
-        try:
-            with file_path.open("rb") as src, open(extracted, "wb") as dst:
-                shutil.copyfileobj(src, dst)
-        except Exception as e:
-            logger.error(f"Failed to extract {file_path}: {e}")
-            raise
+        symbol_dir = job.scratch_dir() / "symbol"
+        symbol_dir.mkdir(parents=True, exist_ok=True)
+        extracted_path = symbol_dir / symbol_path.name
+        extracted_path.write_bytes(symbol_path.read_bytes())
+
+        # Extract DCM file to same directory if available
+        if dcm_path:
+            try:
+                (symbol_dir / dcm_path.name).write_bytes(dcm_path.read_bytes())
+            except Exception as e:
+                logger.warning(f"Failed to extract DCM file: {e}")
+
+        # Still try to upgrade to the current format, just to be sure
+        new_path = job.scratch_dir() / "upgraded" / extracted_path.name
+        new_path.parent.mkdir(exist_ok=True)
+
+        queue.add_sym_lib(extracted_path, new_path)
+        job.symbol_file, job.symbol_upgraded = extracted_path, new_path
 
-        return temp_dir, extracted
+    def _read_symbol_lib(self, job: ImportJob) -> Tuple[SymbolLib, str]:
+        """Load a staged symbol library after its upgrade ran"""
+        if job.symbol_text is not None and is_legacy_lib(job.symbol_text):
+            symbol_lib = convert_legacy_lib(job.symbol_text, job.symbol_dcm)
+        elif job.symbol_text is not None:
+            symbol_lib = SymbolLib.from_sexpr(sexpr.parse_sexp(job.symbol_text))
+        elif job.symbol_upgraded.exists():
+            symbol_lib = SymbolLib().from_file(str(job.symbol_upgraded))
+        else:
+            logger.warning(f"Upgrade failed, loading {job.symbol_file.name} directly")
+            symbol_lib = SymbolLib().from_file(str(job.symbol_file))
+
+        # Get the symbol name from the first symbol
+        if not symbol_lib.symbols:
+            logger.error("No symbols found in library")
+            raise ValueError("No symbols found in library")
+
+        return symbol_lib, symbol_lib.symbols[0].entryName
 
     def load_symbol_lib(
         self,
@@ -296,63 +475,32 @@ class LibImporter:
             logger.error("No symbol path provided")
             raise ValueError("No symbol path")
 
-        temp_dir, extracted_path = self.extract_file_to_temp(symbol_path)
-
-        # Extract DCM file to same directory if available
-        if dcm_path:
-            try:
-                _, dcm_extracted_path = self.extract_file_to_temp(dcm_path)
-                dcm_target = temp_dir / dcm_path.name
-                if dcm_extracted_path != dcm_target:
-                    shutil.copy2(dcm_extracted_path, dcm_target)
-            except Exception as e:
-                logger.warning(f"Failed to extract DCM file: {e}")
-
+        job = ImportJob()
         try:
-            # Always try to convert to new format
-            if extracted_path.suffix == ".lib":
-                if cli.exists():
-                    new_path = extracted_path.with_suffix(".kicad_sym")
-                    cli.upgrade_sym_lib(str(extracted_path), str(new_path))
-                    if new_path.exists():
-                        symbol_lib = SymbolLib().from_file(str(new_path))
-                    else:
-                        logger.error(f"Conversion failed for {extracted_path}")
-                        raise ValueError(
-                            f"Failed to convert {extracted_path} to new KiCad format"
-                        )
-                else:
-                    logger.error("KiCad CLI not available for .lib conversion")
-                    raise ValueError("KiCad CLI not available for .lib conversion")
-            else:  # .kicad_sym - still try to convert just to be sure
-                if cli.exists():
-                    new_path = extracted_path
-                    cli.upgrade_sym_lib(str(extracted_path), str(new_path))
-                    symbol_lib = SymbolLib().from_file(str(new_path))
-                else:
-                    logger.warning("KiCad CLI not available, loading file directly")
-                    symbol_lib = SymbolLib().from_file(str(extracted_path))
-
-            # Get the symbol name from the first symbol
-            if not symbol_lib.symbols:
-                logger.error("No symbols found in library")
-                raise ValueError("No symbols found in library")
-
-            symbol_name = symbol_lib.symbols[0].entryName
-            return symbol_lib, symbol_name
+            queue = UpgradeQueue(cli) if self._cli_available() else None
+            self._stage_symbol(symbol_path, dcm_path, job, queue)
+            if queue:
+                queue.flush()
+            return self._read_symbol_lib(job)
         except Exception as e:
             logger.error(f"Failed to load symbol library: {e}")
             raise
         finally:
-            shutil.rmtree(temp_dir)
+            job.close()
 
-    def extract_footprint_to_file(
-        self, footprint_path: Optional[Union[Path, zipfile.Path]], dest_file: Path
-    ) -> Optional[str]:
-        """Extract footprint to destination file with upgrade and return footprint name"""
-        if not footprint_path:
-            return None
+    def _stage_footprint(
+        self,
+        footprint_path: Union[Path, zipfile.Path],
+        job: ImportJob,
+        queue: Optional[UpgradeQueue],
+    ) -> bool:
+        """
+        Read a footprint and queue its upgrade
 
+        Legacy footprints are upgraded in-process. Only a footprint that needs
+        kicad-cli is written to the job's scratch directory; otherwise its
+        content is kept in memory.
+        """
         footprint_file = footprint_path
         if footprint_path.is_dir():
             for item in footprint_path.iterdir():
@@ -362,88 +510,75 @@ class LibImporter:
 
             if not footprint_file or footprint_file.is_dir():
                 logger.warning("No .kicad_mod file found in directory")
-                return None
+                return False
 
-        temp_dir = Path(tempfile.mkdtemp())
+        job.footprint_data = footprint_file.read_bytes()
+        content = job.footprint_data.decode("utf-8", errors="replace")
+        if not needs_upgrade(content):
+            return True
         try:
-            # Extract to temporary file
-            temp_file = temp_dir / footprint_file.name
-            with footprint_file.open("rb") as src, open(temp_file, "wb") as dst:
-                shutil.copyfileobj(src, dst)
-
-            # Upgrade footprint using CLI if available
-            if cli.exists():
-                try:
-                    # Create temporary .pretty directory for upgrade
-                    temp_pretty = temp_dir / "temp.pretty"
-                    temp_pretty.mkdir()
-
-                    # Copy footprint to .pretty structure
-                    pretty_footprint = temp_pretty / temp_file.name
-                    shutil.copy2(temp_file, pretty_footprint)
-
-                    # Upgrade in-place (no output folder)
-                    result = cli.upgrade_footprint_lib(
-                        pretty_folder=str(temp_pretty), force=True
-                    )
-
-                    if result.success:
-                        # Use upgraded file from same directory
-                        upgraded_file = temp_pretty / temp_file.name
+            job.footprint_data = upgrade_footprint(content).encode("utf-8")
+            return True
+        except UnsupportedFootprint as e:
+            logger.info(f"Upgrading {footprint_file.name} with kicad-cli: {e}")
 
-                        if upgraded_file.exists():
-                            temp_file = upgraded_file
-                            logger.info(
-                                f"Successfully upgraded footprint: {temp_file.name}"
-                            )
-                        else:
-                            logger.warning(
-                                f"Upgrade output not found for {temp_file.name}"
-                            )
-                    else:
-                        logger.warning(f"Footprint upgrade failed: {result.message}")
+        if queue is None:
+            logger.debug("KiCad CLI not available - skipping footprint upgrade")
+            return True
 
-                except Exception as upgrade_error:
-                    logger.warning(f"Footprint upgrade failed: {upgrade_error}")
-            else:
-                logger.debug("KiCad CLI not available - skipping footprint upgrade")
+        footprint_dir = job.scratch_dir() / "footprint"
+        footprint_dir.mkdir(parents=True, exist_ok=True)
+        job.footprint_file = footprint_dir / footprint_file.name
+        job.footprint_file.write_bytes(job.footprint_data)
+        queue.add_footprint(job.footprint_file)
+        return True
+
+    def _read_footprint(self, job: ImportJob) -> Optional[str]:
+        """Load a staged (upgraded) footprint and return its name"""
+        if job.footprint_file and job.footprint_file.exists():
+            job.footprint_data = job.footprint_file.read_bytes()
+        if job.footprint_data is None:
+            return None
+        content = job.footprint_data.decode("utf-8")
+        return self.footprint_parser.extract_footprint_name(content)
 
-            content = temp_file.read_text(encoding="utf-8")
-            footprint_name = self.footprint_parser.extract_footprint_name(content)
+    def extract_footprint_to_file(
+        self, footprint_path: Optional[Union[Path, zipfile.Path]], dest_file: Path
+    ) -> Optional[str]:
+        """Extract footprint to destination file with upgrade and return footprint name"""
+        if not footprint_path:
+            return None
 
+        job = ImportJob()
+        try:
+            queue = UpgradeQueue(cli) if self._cli_available() else None
+            if not self._stage_footprint(footprint_path, job, queue):
+                return None
+            if queue:
+                self._log_footprint_upgrade(
+                    queue.flush().get(str(job.footprint_file)), job.footprint_file
+                )
+            footprint_name = self._read_footprint(job)
             if not footprint_name:
                 raise ValueError("Could not extract valid footprint name")
 
-            # Copy to final destination
-            shutil.copy2(temp_file, dest_file)
-
+            dest_file.write_bytes(job.footprint_data)
             logger.info(f"Successfully extracted footprint: {footprint_name}")
             return footprint_name
-
         except Exception as e:
             logger.error(f"Failed to extract footprint: {e}")
             return None
         finally:
-            shutil.rmtree(temp_dir)
-
-    def load_model(
-        self, model_path: Optional[Union[Path, zipfile.Path]]
-    ) -> Tuple[Optional[Path], Optional[Path]]:
-        """
-        Load a 3D model from a path in a zip file
-
-        Returns:
-            Tuple of (temp_dir, extracted_model_path)
-        """
-        if not model_path:
-            return (None, None)
+            job.close()
 
-        try:
-            result = self.extract_file_to_temp(model_path)
-            return result
-        except Exception as e:
-            logger.error(f"Failed to load 3D model: {e}")
-            return (None, None)
+    def _log_footprint_upgrade(self, result, temp_file: Path) -> None:
+        """Log the outcome of a queued footprint upgrade"""
+        if result is None:
+            return
+        if result.success:
+            logger.info(f"Successfully upgraded footprint: {temp_file.name}")
+        else:
+            logger.warning(f"Footprint upgrade failed: {result.message}")
 
     def update_footprint_with_model(
         self, footprint_file: Path, model_name: str, remote_type: REMOTE_TYPES
@@ -573,92 +708,105 @@ class LibImporter:
 
         return symbol_lib
 
+    def _symbol_blocks(self, symbol_lib: SymbolLib) -> List[Tuple[str, str]]:
+        """Serialize and verify each symbol, returning (name, block) pairs"""
+        blocks = []
+        for symbol in symbol_lib.symbols:
+            block = symbol.to_sexpr(indent=0).strip()
+            try:
+                Symbol().from_sexpr(sexpr.parse_sexp(block))
+            except Exception as e:
+                raise ValueError(
+                    f"Symbol verification failed for {symbol.entryName}: {e}"
+                )
+            blocks.append((symbol.entryName, block))
+        return blocks
+
     def save_to_library(
         self,
         symbol_lib: Optional[SymbolLib],
         footprint_file_path: Optional[Path],
-        model_path: Optional[Path],
+        model_path: Optional[Union[Path, zipfile.Path]],
         remote_type: REMOTE_TYPES,
         symbol_name: str,
         overwrite_if_exists: bool = True,
+        job: Optional[ImportJob] = None,
     ) -> bool:
         """
         Save the component to the KiCad library with backup protection
 
+        The caller must hold the library_lock of the destination libraries
+        when other imports may run at the same time.
+
+        Args:
+            job: Import job that receives the messages and skip flags;
+                 without one, messages go to self.print
+
         Returns:
             True if successful, False otherwise
         """
+        if job is None:
+            job = ImportJob(print_func=self.print)
         success_items = []
         backup_files = {}  # Track backup files for rollback
+        rollback_writers = []  # Symbol libraries written by this call
 
         try:
-            # 1. Save symbol library with atomic write
+            # 1. Splice the symbols into the library with an atomic write
             if symbol_lib:
                 sym_lib_name = self.sub_library_name or self.library_name
                 lib_file_path = self.DEST_PATH / f"{sym_lib_name}.kicad_sym"
 
-                # Create backup if file exists
-                backup_path = None
-                if lib_file_path.exists():
-                    backup_path = lib_file_path.with_suffix(".kicad_sym.backup")
-                    shutil.copy2(lib_file_path, backup_path)
-                    backup_files[lib_file_path] = backup_path
-                    existing_lib = SymbolLib().from_file(str(lib_file_path))
-                else:
-                    existing_lib = SymbolLib()
+                is_new_lib = not lib_file_path.exists()
+                if is_new_lib:
                     check_file(lib_file_path)
+                sym_writer = SymbolLibWriter(
+                    lib_file_path,
+                    header=f"(kicad_symbol_lib (version {symbol_lib.version}) "
+                    f"(generator {symbol_lib.generator or 'kicad_symbol_editor'})",
+                )
 
                 # Check if symbol already exists
-                existing_names = [s.entryName for s in existing_lib.symbols]
-                symbol_exists = symbol_name in existing_names
+                symbol_exists = sym_writer.find(symbol_name) is not None
 
                 # Decide what to do
                 if symbol_exists and not overwrite_if_exists:
-                    self.print(
+                    job.print(
                         f"Symbol {symbol_name} already exists in library. Skipping."
                     )
-                    self.lib_skipped = True
+                    job.lib_skipped = True
                 else:
-                    # Single place for symbol insertion/update
-                    if symbol_exists and overwrite_if_exists:
-                        # Remove existing symbol
-                        existing_lib.symbols = [
-                            s
-                            for s in existing_lib.symbols
-                            if s.entryName != symbol_name
-                        ]
-                        action = "updated"
-                    else:
-                        action = "added" if symbol_exists == False else "created"
+                    action = "updated" if symbol_exists else (
+                        "created" if is_new_lib else "added"
+                    )
 
-                    # Add new symbols
-                    existing_lib.symbols.extend(symbol_lib.symbols)
+                    # Only the new fragments are serialized and verified
+                    blocks = job.symbol_blocks
+                    if blocks is None:
+                        blocks = self._symbol_blocks(symbol_lib)
+                    written_names = []
+                    for name, block in blocks:
+                        try:
+                            sym_writer.put(block)
+                        except Exception as e:
+                            raise ValueError(
+                                f"Symbol verification failed for {name}: {e}"
+                            )
+                        written_names.append(name)
 
-                    # Atomic write: Save to temporary file first
-                    temp_lib_path = lib_file_path.with_suffix(".tmp")
-                    existing_lib.to_file(str(temp_lib_path))
+                    sym_writer.save()
+                    rollback_writers.append(sym_writer)
 
-                    # Verify the written file
-                    try:
-                        test_lib = SymbolLib().from_file(str(temp_lib_path))
-                        if not test_lib.symbols:
-                            raise ValueError("Written library is empty")
-                    except Exception as e:
-                        if temp_lib_path.exists():
-                            temp_lib_path.unlink()
-                        raise ValueError(f"Library verification failed: {e}")
-
-                    # Replace original with temp file (atomic on most filesystems)
-                    if lib_file_path.exists():
-                        lib_file_path.unlink()
-                    temp_lib_path.rename(lib_file_path)
-
-                    result = cli.upgrade_sym_lib(str(lib_file_path), str(lib_file_path))
-                    if not result.success:
-                        raise ValueError(
-                            f"Updating {lib_file_path} failed: {result.message} "
-                            + f"details: {result.stderr}"
+                    if job.defer_lib_upgrades:
+                        job.written_symbols.setdefault(
+                            str(lib_file_path), []
+                        ).extend(written_names)
+                    else:
+                        errors = self._upgrade_library_symbols(
+                            {str(lib_file_path): written_names}
                         )
+                        if errors:
+                            raise ValueError("; ".join(errors))
 
                     modified_objects.append(lib_file_path, Modification.MODIFIED_FILE)
 
@@ -667,27 +815,27 @@ class LibImporter:
                         success_items.append(
                             f"created symbol library with {symbol_name}"
                         )
-                        self.print(f"Created new symbol library with {symbol_name}")
+                        job.print(f"Created new symbol library with {symbol_name}")
                     elif action == "updated":
                         success_items.append(f"updated symbol {symbol_name}")
-                        self.print(f"Updated symbol {symbol_name} in library")
+                        job.print(f"Updated symbol {symbol_name} in library")
                     else:  # added
                         success_items.append(f"added symbol {symbol_name}")
-                        self.print(f"Added symbol {symbol_name} to library")
+                        job.print(f"Added symbol {symbol_name} to library")
 
             # 2. Handle footprint (already extracted to destination)
             if footprint_file_path and footprint_file_path.exists():
                 if not overwrite_if_exists and footprint_file_path.exists():
-                    self.print(
+                    job.print(
                         f"Footprint {footprint_file_path.name} already exists. Skipping."
                     )
-                    self.footprint_skipped = True
+                    job.footprint_skipped = True
                 else:
                     modified_objects.append(
                         footprint_file_path, Modification.MODIFIED_FILE
                     )
                     success_items.append(f"saved footprint {footprint_file_path.stem}")
-                    self.print(f"Saved footprint {footprint_file_path.stem}")
+                    job.print(f"Saved footprint {footprint_file_path.stem}")
 
             # 3. Save 3D model
             if model_path:
@@ -699,8 +847,8 @@ class LibImporter:
                 model_file = model_dir / model_path.name
 
                 if model_file.exists() and not overwrite_if_exists:
-                    self.print(f"3D model {model_path.name} already exists. Skipping.")
-                    self.model_skipped = True
+                    job.print(f"3D model {model_path.name} already exists. Skipping.")
+                    job.model_skipped = True
                 else:
                     # Create backup if file exists
                     if model_file.exists():
@@ -710,11 +858,15 @@ class LibImporter:
                         shutil.copy2(model_file, backup_path)
                         backup_files[model_file] = backup_path
 
-                    # Copy model file
-                    shutil.copy2(model_path, model_file)
+                    # Stream the model file (possibly straight from the zip
+                    # file); identical models are linked to one stored copy
+                    with model_path.open("rb") as src:
+                        ModelStore.for_library(self.DEST_PATH).write(
+                            src, model_file, STREAM_BUFSIZE
+                        )
                     modified_objects.append(model_file, Modification.EXTRACTED_FILE)
                     success_items.append(f"saved 3D model {model_path.name}")
-                    self.print(f"Saved 3D model {model_path.name}")
+                    job.print(f"Saved 3D model {model_path.name}")
 
                     # Update footprint with model reference
                     if footprint_file_path and footprint_file_path.exists():
@@ -739,9 +891,17 @@ class LibImporter:
 
         except Exception as e:
             logger.error(f"Error during save_to_library: {e}")
-            self.print(f"Error during save: {e}")
+            job.print(f"Error during save: {e}")
 
             # Rollback: Restore original files from backups
+            for sym_writer in rollback_writers:
+                try:
+                    sym_writer.revert()
+                    logger.info(f"Restored symbol library: {sym_writer.path}")
+                except Exception as restore_error:
+                    logger.error(
+                        f"Failed to restore {sym_writer.path}: {restore_error}"
+                    )
             for original_path, backup_path in backup_files.items():
                 if backup_path and backup_path.exists():
                     try:
@@ -754,11 +914,10 @@ class LibImporter:
                             f"Failed to restore backup {backup_path}: {restore_error}"
                         )
 
-            # Clean up any remaining temporary files
-            for pattern in [f"{self.library_name}.kicad_sym.tmp", "*.tmp"]:
-                for temp_file in self.DEST_PATH.glob(pattern):
-                    if temp_file.exists():
-                        temp_file.unlink(missing_ok=True)
+            # Clean up the temporary file of this library only; other
+            # libraries in DEST_PATH may be written by other imports
+            sym_lib_name = self.sub_library_name or self.library_name
+            (self.DEST_PATH / f"{sym_lib_name}.kicad_sym.tmp").unlink(missing_ok=True)
 
             return False
 
@@ -766,176 +925,311 @@ class LibImporter:
         self, zip_file: Path, overwrite_if_exists=True, import_old_format=True
     ):
         """Import symbols, footprints, and 3D models from a zip file"""
+        return self.import_batch(
+            [zip_file],
+            overwrite_if_exists=overwrite_if_exists,
+            import_old_format=import_old_format,
+        )[0]
+
+    def import_batch(
+        self,
+        zip_files: List[Path],
+        overwrite_if_exists=True,
+        import_old_format=True,
+    ) -> List[Optional[Tuple[str]]]:
+        """
+        Import several zip files, sharing the kicad-cli upgrades of the batch
+
+        The archives are extracted and parsed on a thread pool, and their
+        symbol/footprint upgrades run in one kicad-cli invocation per format.
+        Each job is then committed in input order while holding the
+        library_lock of its destination libraries, which are upgraded once at
+        the end instead of after every component.
+
+        Returns:
+            One import_all style result per zip file
+        """
+        jobs = [ImportJob(Path(zip_file), defer_lib_upgrades=True) for zip_file in zip_files]
+        results: List[Optional[Tuple[str]]] = [None] * len(jobs)
+        queue = UpgradeQueue(cli) if self._cli_available() else None
+        written_symbols: Dict[str, List[str]] = {}
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(self.max_workers, len(jobs))),
+                thread_name_prefix="zip-import",
+            ) as pool:
+                # Extract all archives and queue their upgrades
+                futures = [pool.submit(self._stage_import, job, queue) for job in jobs]
+                staged = []
+                for index, future in enumerate(futures):
+                    if future.result():
+                        staged.append(index)
+                    jobs[index].flush_messages(self.print)
+
+                if queue:
+                    queue.flush()
+
+                # Parse the upgraded files in parallel, commit them in order
+                futures = {index: pool.submit(self._prepare_job, jobs[index]) for index in staged}
+                for done, index in enumerate(staged, 1):
+                    job = jobs[index]
+                    prepared = futures[index].result()
+                    job.flush_messages(self.print)
+                    job.print_func = self.print
+                    if prepared:
+                        results[index] = self._commit_job(job, overwrite_if_exists)
+                    for lib_file_path, names in job.written_symbols.items():
+                        written_symbols.setdefault(lib_file_path, []).extend(names)
+                    self._report_progress(done, len(staged), job.zip_file.name)
+
+            self._flush_library_upgrades(written_symbols)
+            return results
+
+        finally:
+            self._report_progress(0, 0, "")  # Reset progress
+            # Close the archives and clean up the scratch directories
+            for job in jobs:
+                job.close()
+
+    def _stage_import(self, job: ImportJob, queue: Optional[UpgradeQueue]) -> bool:
+        """Worker: identify a zip file, extract its parts and queue their upgrades"""
+        zip_file = job.zip_file
         logger.info(f"Importing {zip_file.name}")
 
         if not zipfile.is_zipfile(zip_file):
             logger.error(f"{zip_file} is not a valid zip file")
-            self.print(f"{tr('import.invalid_zip')}: {zip_file}")
-            return None
-
-        self.print(f"{tr('import.importing')}: {zip_file}")
-        self._report_progress(1, 5, "Identifying format...")
+            job.print(f"{tr('import.invalid_zip')}: {zip_file}")
+            return False
 
-        temp_dirs = []  # Track temporary directories to clean up later
+        job.print(f"{tr('import.importing')}: {zip_file}")
 
         try:
-            with zipfile.ZipFile(zip_file) as zf:
-                # Identify library type and locate files
-                remote_type, files = self.identify_remote_type(zf)
-                logger.info(f"Type: {remote_type.name}")
-                self.print(f"{tr('import.identified_as')} {remote_type.name}")
-                self._report_progress(2, 5, f"Loading {remote_type.name}...")
-
-                # Handle partial archives
-                if remote_type == REMOTE_TYPES.Partial:
-                    logger.warning(
-                        "Archive contains incomplete data - partial import only"
-                    )
-                    self.print("Warning: Archive contains incomplete data")
-                    if not files["model"]:
-                        self.print("No usable content found in archive")
-                        return None
-
-                # Load symbol library
-                symbol_lib = None
-                symbol_name = "unknown"
-                if files["symbol"]:
-                    symbol_lib, symbol_name = self.load_symbol_lib(
-                        files["symbol"], files.get("dcm")
-                    )
-                    logger.info(f"Loaded symbol: {symbol_name}")
+            job.archive = zipfile.ZipFile(zip_file)
+
+            # Identify library type and locate files
+            remote_type, files = self.identify_remote_type(job.archive)
+            job.remote_type = remote_type
+            logger.info(f"Type: {remote_type.name}")
+            job.print(f"{tr('import.identified_as')} {remote_type.name}")
+
+            # Handle partial archives
+            if remote_type == REMOTE_TYPES.Partial:
+                logger.warning(
+                    "Archive contains incomplete data - partial import only"
+                )
+                job.print("Warning: Archive contains incomplete data")
+                if not files["model"]:
+                    job.print("No usable content found in archive")
+                    return False
 
-                self._report_progress(3, 5, "Processing footprint...")
+            if files["symbol"]:
+                self._stage_symbol(files["symbol"], files.get("dcm"), job, queue)
 
-                # Handle footprint - extract directly to destination
-                footprint_file_path = None
-                if files["footprint"]:
-                    footprint_dir = self.DEST_PATH / f"{self.library_name}.pretty"
-                    if not footprint_dir.exists():
-                        footprint_dir.mkdir(parents=True, exist_ok=True)
-                        modified_objects.append(footprint_dir, Modification.MKDIR)
+            if files["footprint"]:
+                self._stage_footprint(files["footprint"], job, queue)
 
-                    # Generate initial footprint filename
-                    temp_footprint_name = None
-                    if files["footprint"].is_dir():
-                        for item in files["footprint"].iterdir():
-                            if item.name.endswith(".kicad_mod"):
-                                temp_footprint_name = self.cleanName(item.name[:-10])
-                                break
-                    else:
-                        temp_footprint_name = self.cleanName(
-                            files["footprint"].name[:-10]
-                        )
-
-                    if temp_footprint_name:
-                        footprint_file_path = (
-                            footprint_dir / f"{temp_footprint_name}.kicad_mod"
-                        )
+            # The model is streamed from the archive when it is committed
+            job.model_path = files["model"]
 
-                        # Extract footprint with upgrade
-                        extracted_name = self.extract_footprint_to_file(
-                            files["footprint"], footprint_file_path
-                        )
+            return True
 
-                        if extracted_name:
-                            self.footprint_name = extracted_name
-                            # Rename file if name changed after parsing
-                            if extracted_name != temp_footprint_name:
-                                new_footprint_path = (
-                                    footprint_dir / f"{extracted_name}.kicad_mod"
-                                )
-                                if footprint_file_path.exists():
-                                    footprint_file_path.rename(new_footprint_path)
-                                    footprint_file_path = new_footprint_path
-
-                            logger.info(
-                                f"Successfully processed footprint: {self.footprint_name}"
-                            )
-                        else:
-                            logger.warning("Failed to extract footprint")
-                            self.print("Warning: Failed to extract footprint")
-                            footprint_file_path = None
-
-                self._report_progress(4, 5, "Loading 3D model...")
-
-                # Load 3D model
-                model_temp_dir = None
-                model_path = None
-                if files["model"]:
-                    model_temp_dir, model_path = self.load_model(files["model"])
-                    if model_temp_dir:
-                        temp_dirs.append(model_temp_dir)
-                        if model_path:
-                            logger.info(f"Loaded 3D model: {model_path.name}")
+        except Exception as e:
+            logger.error(f"Import failed: {str(e)}")
+            job.print(f"{tr('import.error')}: {str(e)}")
+            logging.exception("Import error")
+            return False
 
+    def _prepare_job(self, job: ImportJob) -> bool:
+        """Worker: load the upgraded parts of a staged job and update the symbols"""
+        try:
+            # Load symbol library
+            if job.symbol_text is not None or job.symbol_file:
+                job.symbol_lib, job.symbol_name = self._read_symbol_lib(job)
+                logger.info(f"Loaded symbol: {job.symbol_name}")
+
+            # Read the footprint name from the upgraded footprint
+            if job.footprint_data is not None:
+                job.footprint_name = self._read_footprint(job)
+                if not job.footprint_name:
+                    logger.warning("Failed to extract footprint")
+                    job.print("Warning: Failed to extract footprint")
+
+            if job.model_path:
+                logger.info(f"Loaded 3D model: {job.model_path.name}")
+
+            if job.symbol_lib:
                 # Update symbol with footprint reference
-                if symbol_lib and self.footprint_name:
-                    symbol_lib = self.update_symbol_properties(
-                        symbol_lib, self.footprint_name, remote_type
+                if job.footprint_name:
+                    job.symbol_lib = self.update_symbol_properties(
+                        job.symbol_lib, job.footprint_name, job.remote_type
                     )
-
                 # Add custom metadata properties to symbols
-                if symbol_lib:
-                    symbol_lib = self._add_custom_metadata(symbol_lib, remote_type.name)
+                job.symbol_lib = self._add_custom_metadata(
+                    job.symbol_lib, job.remote_type.name
+                )
+                try:
+                    job.symbol_blocks = self._symbol_blocks(job.symbol_lib)
+                except ValueError as e:
+                    logger.debug(f"Symbols are verified again on save: {e}")
 
-                self._report_progress(5, 5, "Saving to library...")
+            return True
 
-                # Save everything to the library
-                if symbol_lib or footprint_file_path or model_path:
-                    success = self.save_to_library(
-                        symbol_lib=symbol_lib,
-                        footprint_file_path=footprint_file_path,
-                        model_path=model_path,
-                        remote_type=remote_type,
-                        symbol_name=symbol_name,
-                        overwrite_if_exists=overwrite_if_exists,
-                    )
+        except Exception as e:
+            logger.error(f"Import failed: {str(e)}")
+            job.print(f"{tr('import.error')}: {str(e)}")
+            logging.exception("Import error")
+            return False
 
-                    if success:
-                        self._notify_import_success(
-                            symbol_name, remote_type.name, str(zip_file)
+    def _commit_job(
+        self, job: ImportJob, overwrite_if_exists: bool
+    ) -> Optional[Tuple[str]]:
+        """Copy a prepared job into the destination libraries under their commit locks"""
+        sym_lib_name = self.sub_library_name or self.library_name
+        footprint_dir = self.DEST_PATH / f"{self.library_name}.pretty"
+        model_dir = self.DEST_PATH / f"{self.library_name}.3dshapes"
+
+        try:
+            with library_lock(
+                self.DEST_PATH / f"{sym_lib_name}.kicad_sym", footprint_dir, model_dir
+            ):
+                # Copy the upgraded footprint to its destination
+                footprint_file_path = None
+                if job.footprint_data is not None and job.footprint_name:
+                    if not footprint_dir.exists():
+                        footprint_dir.mkdir(parents=True, exist_ok=True)
+                        modified_objects.append(footprint_dir, Modification.MKDIR)
+                    footprint_file_path = footprint_dir / f"{job.footprint_name}.kicad_mod"
+                    try:
+                        footprint_file_path.write_bytes(job.footprint_data)
+                        logger.info(
+                            f"Successfully processed footprint: {job.footprint_name}"
                         )
-                        # Check if anything was actually changed
-                        if (
-                            self.lib_skipped
-                            and self.footprint_skipped
-                            and self.model_skipped
-                        ):
-                            logger.info("Import completed - all files already exist")
-                            self.print(tr("import.completed"))
-                            return ("OK",)
-                        elif (
-                            self.lib_skipped
-                            or self.footprint_skipped
-                            or self.model_skipped
-                        ):
-                            logger.info("Import completed with some items skipped")
-                            self.print(tr("import.success_partial"))
-                            return ("OK",)
-                        else:
-                            logger.info("Import completed successfully")
-                            self.print(tr("import.success"))
-                            return ("OK",)
-                    else:
-                        logger.warning("Import failed during save")
-                        self.print(tr("import.save_failed"))
-                        return ("Warning",)
-                else:
+                    except OSError as e:
+                        logger.error(f"Failed to extract footprint: {e}")
+                        job.print("Warning: Failed to extract footprint")
+                        footprint_file_path = None
+
+                if not (job.symbol_lib or footprint_file_path or job.model_path):
                     logger.warning("No content to import")
-                    self.print(tr("import.no_content"))
+                    job.print(tr("import.no_content"))
                     return ("Warning",)
 
+                # Save everything to the library
+                success = self.save_to_library(
+                    symbol_lib=job.symbol_lib,
+                    footprint_file_path=footprint_file_path,
+                    model_path=job.model_path,
+                    remote_type=job.remote_type,
+                    symbol_name=job.symbol_name,
+                    overwrite_if_exists=overwrite_if_exists,
+                    job=job,
+                )
+
+            if not success:
+                logger.warning("Import failed during save")
+                job.print(tr("import.save_failed"))
+                return ("Warning",)
+
+            self._notify_import_success(
+                job.symbol_name, job.remote_type.name, str(job.zip_file)
+            )
+            # Check if anything was actually changed
+            if job.lib_skipped and job.footprint_skipped and job.model_skipped:
+                logger.info("Import completed - all files already exist")
+                job.print(tr("import.completed"))
+            elif job.lib_skipped or job.footprint_skipped or job.model_skipped:
+                logger.info("Import completed with some items skipped")
+                job.print(tr("import.success_partial"))
+            else:
+                logger.info("Import completed successfully")
+                job.print(tr("import.success"))
+            return ("OK",)
+
         except Exception as e:
             logger.error(f"Import failed: {str(e)}")
-            self.print(f"{tr('import.error')}: {str(e)}")
+            job.print(f"{tr('import.error')}: {str(e)}")
             logging.exception("Import error")
             return None
+
+    def _upgrade_library_symbols(self, libraries: Dict[str, List[str]]) -> List[str]:
+        """
+        Upgrade only the given symbols of each library with one kicad-cli run
+
+        The written symbols are copied into scratch libraries, upgraded together
+        and spliced back, so the cost does not grow with the library size. A
+        library whose header is older than the upgraded symbols is upgraded as a
+        whole once, which brings it to the current format for later imports.
+
+        Returns:
+            Error messages for libraries that could not be upgraded
+        """
+        if not libraries or not self._cli_available():
+            return []
+
+        errors = []
+        scratch_dir = Path(tempfile.mkdtemp())
+        try:
+            files = {}
+            writers = {}
+            for index, (lib_file_path, names) in enumerate(sorted(libraries.items())):
+                writer = SymbolLibWriter(lib_file_path)
+                blocks = [writer.get(name) for name in dict.fromkeys(names)]
+                is_lib = writer.text.lstrip().startswith("(kicad_symbol_lib")
+                if not is_lib or not all(blocks):
+                    errors.append(f"Updating {lib_file_path} failed: symbols not found")
+                    continue
+                scratch = scratch_dir / f"{index:04d}.kicad_sym"
+                scratch.write_text(
+                    build_library(library_header(writer.text), "\t", blocks),
+                    encoding="utf-8",
+                )
+                files[str(scratch)] = str(scratch_dir / f"{index:04d}_upgraded.kicad_sym")
+                writers[str(scratch)] = writer
+
+            results = cli.upgrade_sym_libs(files)
+
+            for scratch, upgraded_file in files.items():
+                writer = writers[scratch]
+                result = results.get(scratch)
+                if not result or not result.success:
+                    details = (
+                        f"{result.message} details: {result.stderr}"
+                        if result
+                        else "not upgraded"
+                    )
+                    errors.append(f"Updating {writer.path} failed: {details}")
+                    continue
+
+                upgraded = Path(upgraded_file).read_text(encoding="utf-8")
+                if lib_version(upgraded) > lib_version(writer.text):
+                    result = cli.upgrade_sym_lib(str(writer.path), str(writer.path))
+                    if not result.success:
+                        errors.append(
+                            f"Updating {writer.path} failed: {result.message} "
+                            + f"details: {result.stderr}"
+                        )
+                    continue
+
+                for span in scan_symbols(upgraded):
+                    writer.put(upgraded[span.start : span.end])
+                writer.save()
         finally:
-            self._report_progress(0, 0, "")  # Reset progress
-            # Clean up temporary directories
-            for temp_dir in temp_dirs:
-                if temp_dir and temp_dir.exists():
-                    shutil.rmtree(temp_dir)
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        for error in errors:
+            logger.warning(error)
+        return errors
+
+    def _flush_library_upgrades(self, libraries: Dict[str, List[str]]) -> None:
+        """Upgrade the symbols written to destination libraries during a batch"""
+        if not libraries:
+            return
+
+        with library_lock(*libraries):
+            errors = self._upgrade_library_symbols(libraries)
+        for error in errors:
+            self.print(f"Warning: {error}")
 
     def _report_progress(self, step: int, total: int, message: str) -> None:
         """Report import progress via callback if set."""
@@ -0,0 +1,116 @@
+"""
+Index of the entries of a zip file, built in one pass over its central directory.
+
+Vendor format detection asks many "first entry whose name ends with ..."
+questions. Walking ``zipfile.Path`` recursively for each of them lists the
+archive again and again; the index answers them from lookup tables instead.
+"""
+
+import zipfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class ZipEntry:
+    """A file or (possibly implied) directory inside a zip file."""
+
+    path: str  # Without trailing slash
+    name: str
+    is_dir: bool
+    parent: str  # "" for top-level entries
+    depth: int
+
+
+@dataclass(frozen=True)
+class Find:
+    """
+    Lookup of the first entry whose name ends with ``suffix``, in the order a
+    depth-first walk of the archive would find it.
+    """
+
+    suffix: str
+    top_level: bool = False  # Only direct children of the search root
+    is_dir: Optional[bool] = None  # Require a directory (True) or a file (False)
+
+
+def _extension(name: str) -> str:
+    dot = name.rfind(".")
+    return name[dot:] if dot >= 0 else ""
+
+
+@dataclass
+class ZipIndex:
+    """Entries of a zip file indexed by extension and directory."""
+
+    zf: zipfile.ZipFile
+    entries: List[ZipEntry] = field(default_factory=list)
+    by_extension: Dict[str, List[ZipEntry]] = field(default_factory=dict)
+    children: Dict[str, List[ZipEntry]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        # Rank the entries like zipfile.Path lists them: the names stored in
+        # the archive first, then the implied parent directories. Sorting by
+        # the ranks along the path gives the order of a depth-first walk.
+        infos = self.zf.infolist()
+        rank: Dict[str, int] = {}
+        dirs = set()
+        for info in infos:
+            path = info.filename.rstrip("/")
+            if path:
+                rank.setdefault(path, len(rank))
+                if info.is_dir():
+                    dirs.add(path)
+        for info in infos:
+            parts = [part for part in info.filename.split("/") if part]
+            for depth in range(len(parts) - 1, 0, -1):
+                parent = "/".join(parts[:depth])
+                rank.setdefault(parent, len(rank))
+                dirs.add(parent)
+
+        keys: Dict[str, tuple] = {}
+        for path in rank:
+            parts = path.split("/")
+            keys[path] = tuple(rank.get("/".join(parts[: i + 1]), 0) for i in range(len(parts)))
+            parent = "/".join(parts[:-1])
+            entry = ZipEntry(path, parts[-1], path in dirs, parent, len(parts) - 1)
+            self.entries.append(entry)
+
+        self.entries.sort(key=lambda entry: keys[entry.path])
+        for entry in self.entries:
+            self.by_extension.setdefault(_extension(entry.name), []).append(entry)
+            self.children.setdefault(entry.parent, []).append(entry)
+
+    def find(self, lookup: Find, under: Optional[ZipEntry] = None) -> Optional[ZipEntry]:
+        """
+        Return the first entry matching ``lookup`` below ``under`` (the
+        directory itself included), or in the whole archive.
+        """
+        suffix = lookup.suffix
+        if lookup.top_level:
+            candidates = self.children.get(under.path if under else "", [])
+        elif "." in suffix:
+            # A name ending with the suffix has the same extension
+            candidates = self.by_extension.get(_extension(suffix), [])
+        else:
+            candidates = self.entries
+
+        prefix = under.path + "/" if under else ""
+        for entry in candidates:
+            if not entry.name.endswith(suffix):
+                continue
+            if lookup.is_dir is not None and entry.is_dir != lookup.is_dir:
+                continue
+            if under and entry is not under and not entry.path.startswith(prefix):
+                continue
+            return entry
+        return None
+
+    def path(self, entry: Optional[ZipEntry]) -> Optional[zipfile.Path]:
+        """Return the zipfile.Path of an entry, as used to extract it."""
+        if entry is None:
+            return None
+        return zipfile.Path(self.zf, entry.path + "/" if entry.is_dir else entry.path)
+
+    def filenames(self, limit: int = 10) -> List[str]:
+        return [info.filename for info in self.zf.infolist()[:limit]]
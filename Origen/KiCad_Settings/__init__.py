@@ -1,6 +1,7 @@
 import os
 import json
 import logging
+from contextlib import contextmanager
 from typing import List, Dict, Tuple, Any, Optional
 from pathlib import Path
 
@@ -15,7 +16,10 @@ kiutils_src = current_dir.parent / "kiutils" / "src"
 if str(kiutils_src) not in __import__("sys").path:
     __import__("sys").path.insert(0, str(kiutils_src))
 
-from kiutils.libraries import LibTable, Library
+try:
+    from .lib_tables import LibraryTable, get_library_table
+except ImportError:
+    from lib_tables import LibraryTable, get_library_table
 
 
 class KiCad_Settings:
@@ -54,75 +58,70 @@ class KiCad_Settings:
             self.SettingPath = SettingPath
 
         self.logger.info(f"Initializing KiCad_Settings with path: {SettingPath}")
+        self._batch_depth = 0
 
-    def get_sym_table(self) -> List[Dict[str, str]]:
-        path = os.path.join(self.SettingPath, "sym-lib-table")
-        self.logger.debug(f"Attempting to read symbol library table from: {path}")
+    # === LIBRARY TABLES ===
 
-        try:
-            if not os.path.exists(path):
-                self.logger.info(
-                    f"Symbol library table not found, creating empty table: {path}"
-                )
-                empty_table = LibTable()
-                empty_table.to_file(path)
+    def _sym_lib_table(self) -> LibraryTable:
+        return get_library_table(os.path.join(self.SettingPath, "sym-lib-table"))
 
-            sym_table = LibTable.from_file(path)
-            self.logger.info(
-                f"Successfully loaded symbol library table with {len(sym_table.libs)} entries"
-            )
+    def _fp_lib_table(self) -> LibraryTable:
+        return get_library_table(os.path.join(self.SettingPath, "fp-lib-table"))
 
-            # Convert libraries to dictionaries
-            result = [
-                {
-                    "name": lib.name,
-                    "type": lib.type,
-                    "uri": lib.uri,
-                    "options": lib.options,
-                    "descr": lib.description,
-                }
-                for lib in sym_table.libs
-            ]
-            return result
+    @contextmanager
+    def batch(self):
+        """
+        Queue library table changes and write each table once at the end.
 
-        except FileNotFoundError:
-            self.logger.warning(f"Symbol library table not found: {path}")
-            return []
+        Outside of a batch every change is written immediately.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the queued changes of both library tables."""
+        for table in (self._sym_lib_table(), self._fp_lib_table()):
+            table.flush()
+
+    def _changed(self, table: LibraryTable) -> None:
+        if self._batch_depth == 0:
+            table.flush()
+
+    @staticmethod
+    def _table_entries(table: LibraryTable) -> List[Dict[str, str]]:
+        return [
+            {
+                "name": lib.name,
+                "type": lib.type,
+                "uri": lib.uri,
+                "options": lib.options,
+                "descr": lib.description,
+            }
+            for lib in table.libs()
+        ]
+
+    def get_sym_table(self) -> List[Dict[str, str]]:
+        path = os.path.join(self.SettingPath, "sym-lib-table")
+        self.logger.debug(f"Reading symbol library table from: {path}")
+
+        try:
+            return self._table_entries(self._sym_lib_table())
         except Exception as e:
             self.logger.error(f"Failed to parse symbol library table from {path}: {e}")
             return []
 
     def set_sym_table(self, libname: str, libpath: str) -> None:
-        path = os.path.join(self.SettingPath, "sym-lib-table")
-        self.logger.debug(
-            f"Adding symbol library '{libname}' with path '{libpath}' to {path}"
-        )
+        self.logger.debug(f"Adding symbol library '{libname}' with path '{libpath}'")
 
         try:
-            if not os.path.exists(path):
-                self.logger.info(
-                    f"Symbol library table not found, creating empty table: {path}"
-                )
-                empty_table = LibTable()
-                empty_table.to_file(path)
-
-            sym_table = LibTable.from_file(path)
-
-            # Check if library already exists
-            for lib in sym_table.libs:
-                if lib.name == libname:
-                    self.logger.error(
-                        f"Symbol library '{libname}' already exists in table"
-                    )
-                    raise ValueError(f"Entry with the name '{libname}' already exists.")
-
-            # Create new library and add it to the table
-            new_lib = Library(
-                name=libname, type="KiCad", uri=libpath, options="", description=""
-            )
-            sym_table.libs.append(new_lib)
-            sym_table.to_file(path)
-
+            table = self._sym_lib_table()
+            table.add(libname, libpath)
+            self._changed(table)
             self.logger.info(f"Successfully added symbol library '{libname}' to table")
 
         except Exception as e:
@@ -130,30 +129,17 @@ class KiCad_Settings:
             raise
 
     def sym_table_change_entry(self, old_uri: str, new_uri: str) -> None:
-        path = os.path.join(self.SettingPath, "sym-lib-table")
         self.logger.debug(
             f"Changing symbol library URI from '{old_uri}' to '{new_uri}'"
         )
 
         try:
-            sym_table = LibTable.from_file(path)
-
-            uri_found = False
-            for lib in sym_table.libs:
-                if lib.uri == old_uri:
-                    lib.uri = new_uri
-                    uri_found = True
-                    self.logger.info(
-                        f"Changed URI for library '{lib.name}' from '{old_uri}' to '{new_uri}'"
-                    )
-                    break
-
-            if not uri_found:
-                self.logger.error(f"URI '{old_uri}' not found in symbol library table")
-                raise ValueError(f"URI '{old_uri}' not found in the file.")
-
-            sym_table.to_file(path)
-            self.logger.info(f"Successfully updated symbol library table")
+            table = self._sym_lib_table()
+            name = table.change_uri(old_uri, new_uri)
+            self.logger.info(
+                f"Changed URI for library '{name}' from '{old_uri}' to '{new_uri}'"
+            )
+            self._changed(table)
 
         except Exception as e:
             self.logger.error(f"Failed to change symbol library URI: {e}")
@@ -161,37 +147,10 @@ class KiCad_Settings:
 
     def get_lib_table(self) -> List[Dict[str, str]]:
         path = os.path.join(self.SettingPath, "fp-lib-table")
-        self.logger.debug(f"Attempting to read footprint library table from: {path}")
+        self.logger.debug(f"Reading footprint library table from: {path}")
 
         try:
-            if not os.path.exists(path):
-                self.logger.info(
-                    f"Footprint library table not found, creating empty table: {path}"
-                )
-                empty_table = LibTable()
-                empty_table.to_file(path)
-
-            fp_table = LibTable.from_file(path)
-            self.logger.info(
-                f"Successfully loaded footprint library table with {len(fp_table.libs)} entries"
-            )
-
-            # Convert libraries to dictionaries
-            result = [
-                {
-                    "name": lib.name,
-                    "type": lib.type,
-                    "uri": lib.uri,
-                    "options": lib.options,
-                    "descr": lib.description,
-                }
-                for lib in fp_table.libs
-            ]
-            return result
-
-        except FileNotFoundError:
-            self.logger.warning(f"Footprint library table not found: {path}")
-            return []
+            return self._table_entries(self._fp_lib_table())
         except Exception as e:
             self.logger.error(
                 f"Failed to parse footprint library table from {path}: {e}"
@@ -199,33 +158,13 @@ class KiCad_Settings:
             return []
 
     def set_lib_table_entry(self, libname: str) -> None:
-        path = os.path.join(self.SettingPath, "fp-lib-table")
-        self.logger.debug(f"Adding footprint library '{libname}' to {path}")
+        self.logger.debug(f"Adding footprint library '{libname}'")
 
         try:
-            if not os.path.exists(path):
-                self.logger.info(
-                    f"Footprint library table not found, creating empty table: {path}"
-                )
-                empty_table = LibTable()
-                empty_table.to_file(path)
-
-            fp_table = LibTable.from_file(path)
-
-            # Check if library already exists
-            for lib in fp_table.libs:
-                if lib.name == libname:
-                    self.logger.error(
-                        f"Footprint library '{libname}' already exists in table"
-                    )
-                    raise ValueError(f"Entry with the name '{libname}' already exists.")
-
             uri_lib = self.path_prefix + "/" + libname + ".pretty"
-            new_lib = Library(
-                name=libname, type="KiCad", uri=uri_lib, options="", description=""
-            )
-            fp_table.libs.append(new_lib)
-            fp_table.to_file(path)
+            table = self._fp_lib_table()
+            table.add(libname, uri_lib)
+            self._changed(table)
 
             self.logger.info(
                 f"Successfully added footprint library '{libname}' with URI '{uri_lib}'"
@@ -317,12 +256,11 @@ class KiCad_Settings:
     def check_footprintlib(self, SearchLib, add_if_possible=True):
         msg = ""
         try:
-            FootprintTable = self.get_lib_table()
-            FootprintLibs = {lib["name"]: lib for lib in FootprintTable}
+            footprint_lib = self._fp_lib_table().by_name(SearchLib)
 
             temp_path = self.path_prefix + "/" + SearchLib + ".pretty"
-            if SearchLib in FootprintLibs:
-                if not FootprintLibs[SearchLib]["uri"] == temp_path:
+            if footprint_lib:
+                if not footprint_lib.uri == temp_path:
                     msg += f"\n{SearchLib} {tr('lib.fp_not_correct')}"
                     msg += f"\n{tr('lib.must_import', name=SearchLib, path=temp_path)}"
                     if add_if_possible:
@@ -349,17 +287,15 @@ class KiCad_Settings:
             # Use full name without extension as the library name
             SearchLib_name = SearchLib.split(".")[0]
 
-            SymbolTable = self.get_sym_table()
-            SymbolLibs = {lib["name"]: lib for lib in SymbolTable}
-            SymbolLibsUri = {lib["uri"]: lib for lib in SymbolTable}
+            sym_table = self._sym_lib_table()
 
             temp_path = self.path_prefix + "/" + SearchLib
 
-            if temp_path not in SymbolLibsUri:
+            if not sym_table.by_uri(temp_path):
                 msg += f"\n'{temp_path}' {tr('lib.sym_not_imported')}"
                 if add_if_possible:
                     try:
-                        if SearchLib_name not in SymbolLibs:
+                        if not sym_table.by_name(SearchLib_name):
                             self.set_sym_table(SearchLib_name, temp_path)
                             msg += f"\n{tr('lib.added_success', name=SearchLib)}"
                             msg += f"\n{tr('lib.restart_required')}"
@@ -484,9 +420,10 @@ class KiCad_Settings:
             return "No libraries to migrate."
 
         msg = ""
-        for lib in libraries_to_rename:
-            msg += f"\n{lib['name']} : {lib['oldURI']} \n-> {lib['newURI']}"
-            self.sym_table_change_entry(lib["oldURI"], lib["newURI"])
+        with self.batch():
+            for lib in libraries_to_rename:
+                msg += f"\n{lib['name']} : {lib['oldURI']} \n-> {lib['newURI']}"
+                self.sym_table_change_entry(lib["oldURI"], lib["newURI"])
 
         msg += "\n\nA restart of KiCad is necessary to apply all changes."
         return msg
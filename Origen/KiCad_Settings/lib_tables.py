@@ -0,0 +1,170 @@
+"""
+Cached KiCad library tables (``sym-lib-table`` and ``fp-lib-table``).
+
+A table is parsed once and kept in memory until its file changes on disk
+(mtime or size). Libraries are looked up by name and URI through
+dictionaries. Changes can be queued and written once at the end of a batch;
+if the file was changed by KiCad in the meantime, it is re-read and the
+queued changes are applied on top of it.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from kiutils.libraries import LibTable, Library
+
+logger = logging.getLogger(__name__)
+
+
+class LibraryTable:
+    """A parsed library table with O(1) lookups and queued changes."""
+
+    def __init__(self, path) -> None:
+        self.path = str(path)
+        self.table_type = (
+            "fp_lib_table" if Path(self.path).name == "fp-lib-table" else "sym_lib_table"
+        )
+        self.lock = threading.RLock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._table: Optional[LibTable] = None
+        self._by_name: Dict[str, Library] = {}
+        self._by_uri: Dict[str, Library] = {}
+        self._pending: List[tuple] = []  # ("add", Library) or ("uri", old, new)
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def _load(self) -> None:
+        """(Re)read the file if it changed since it was last read."""
+        stamp = self._stat()
+        if stamp is None:
+            logger.info(f"Library table not found, creating empty table: {self.path}")
+            self._table = LibTable.create_new(self.table_type)
+            self._table.to_file(self.path)
+            stamp = self._stat()
+        elif self._table is not None and stamp == self._stamp:
+            return
+        else:
+            self._table = LibTable.from_file(self.path)
+            logger.info(
+                f"Loaded library table {self.path} with {len(self._table.libs)} entries"
+            )
+
+        self._stamp = stamp
+        self._index()
+        # Changes queued before the file changed on disk are applied again
+        for change in self._pending:
+            self._apply(change)
+
+    def _index(self) -> None:
+        self._by_name = {lib.name: lib for lib in self._table.libs}
+        self._by_uri = {}
+        for lib in self._table.libs:
+            self._by_uri.setdefault(lib.uri, lib)
+
+    def _apply(self, change: tuple) -> bool:
+        if change[0] == "add":
+            lib = change[1]
+            if lib.name in self._by_name:
+                return False
+            self._table.libs.append(lib)
+            self._by_name[lib.name] = lib
+            self._by_uri.setdefault(lib.uri, lib)
+            return True
+
+        _, old_uri, new_uri = change
+        lib = self._by_uri.get(old_uri)
+        if lib is None:
+            return False
+        lib.uri = new_uri
+        self._index()
+        return True
+
+    # === LOOKUPS ===
+
+    def libs(self) -> List[Library]:
+        with self.lock:
+            self._load()
+            return list(self._table.libs)
+
+    def by_name(self, name: str) -> Optional[Library]:
+        with self.lock:
+            self._load()
+            return self._by_name.get(name)
+
+    def by_uri(self, uri: str) -> Optional[Library]:
+        with self.lock:
+            self._load()
+            return self._by_uri.get(uri)
+
+    # === CHANGES ===
+
+    def add(self, name: str, uri: str) -> None:
+        """Queue a new library; raises ValueError if the name is taken."""
+        with self.lock:
+            self._load()
+            if name in self._by_name:
+                raise ValueError(f"Entry with the name '{name}' already exists.")
+            change = ("add", Library(name=name, type="KiCad", uri=uri, options="", description=""))
+            self._apply(change)
+            self._pending.append(change)
+
+    def change_uri(self, old_uri: str, new_uri: str) -> str:
+        """Queue a URI change and return the library name; raises ValueError if not found."""
+        with self.lock:
+            self._load()
+            lib = self._by_uri.get(old_uri)
+            if lib is None:
+                raise ValueError(f"URI '{old_uri}' not found in the file.")
+            change = ("uri", old_uri, new_uri)
+            self._apply(change)
+            self._pending.append(change)
+            return lib.name
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def flush(self) -> None:
+        """Write the queued changes with a single atomic write."""
+        with self.lock:
+            if not self._pending:
+                return
+            self._load()
+            temp_path = self.path + ".tmp"
+            try:
+                self._table.to_file(temp_path)
+                os.replace(temp_path, self.path)
+            except Exception:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+            logger.info(f"Wrote {len(self._pending)} change(s) to {self.path}")
+            self._pending = []
+            self._stamp = self._stat()
+
+    def discard(self) -> None:
+        """Drop the queued changes and re-read the file on the next lookup."""
+        with self.lock:
+            self._pending = []
+            self._table = None
+
+
+_tables: Dict[str, LibraryTable] = {}
+_tables_lock = threading.Lock()
+
+
+def get_library_table(path) -> LibraryTable:
+    """Return the shared cached table for ``path``."""
+    key = os.path.normcase(os.path.abspath(path))
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is None:
+            table = _tables[key] = LibraryTable(path)
+        return table
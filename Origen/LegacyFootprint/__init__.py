@@ -0,0 +1,220 @@
+"""
+In-process upgrader for legacy KiCad footprints.
+
+Footprints from KiCad 5 and older (``(module ...)``) are normalized with
+kiutils instead of a ``kicad-cli fp upgrade`` run per file: the head becomes
+``(footprint ...)``, old arcs (center, start and angle) become start/mid/end
+arcs, user-visible layer names are replaced by their canonical names, the
+implicit through-hole attribute and ``virtual`` are spelled out, and model
+offsets given in inches (``(at (xyz ...))``) are converted to mm.
+
+Footprints that are already in the KiCad 6 format or newer are left as they
+are. Constructs the upgrader does not know raise ``UnsupportedFootprint`` so
+callers can fall back to kicad-cli.
+"""
+
+import logging
+import math
+from pathlib import Path
+from typing import List, Optional
+
+current_dir = Path(__file__).resolve().parent
+kiutils_src = current_dir.parent / "kiutils" / "src"
+if str(kiutils_src) not in __import__("sys").path:
+    __import__("sys").path.insert(0, str(kiutils_src))
+
+from kiutils.footprint import Footprint
+from kiutils.utils import sexpr
+
+logger = logging.getLogger(__name__)
+
+# Version written by the upgrader; kiutils emits this format
+FOOTPRINT_VERSION = "20211014"
+GENERATOR = "CustomImportGUI"
+
+# Versions before this one had no through_hole attribute: a footprint without
+# an (attr ...) token was a through-hole footprint
+THROUGH_HOLE_ATTR_VERSION = 20200826
+
+# Arcs were (start <center>) (end <start>) (angle <degrees>) before this one
+ARC_MID_VERSION = 20210925
+
+INCH = 25.4  # mm
+
+# User-visible layer names some exporters write instead of the canonical ones
+LAYER_NAMES = {
+    "F.Silkscreen": "F.SilkS",
+    "B.Silkscreen": "B.SilkS",
+    "F.Courtyard": "F.CrtYd",
+    "B.Courtyard": "B.CrtYd",
+    "F.Adhesive": "F.Adhes",
+    "B.Adhesive": "B.Adhes",
+    "F.Fabrication": "F.Fab",
+    "B.Fabrication": "B.Fab",
+    "User.Drawings": "Dwgs.User",
+    "User.Comments": "Cmts.User",
+    "User.Eco1": "Eco1.User",
+    "User.Eco2": "Eco2.User",
+    "Top": "F.Cu",
+    "Bottom": "B.Cu",
+}
+
+# Top level tokens kiutils reads; anything else would be dropped silently
+KNOWN_TOKENS = {
+    "version", "generator", "layer", "tedit", "tstamp", "descr", "tags", "path",
+    "at", "autoplace_cost90", "autoplace_cost180", "solder_mask_margin",
+    "solder_paste_margin", "solder_paste_ratio", "clearance", "zone_connect",
+    "thermal_width", "thermal_gap", "attr", "model", "fp_text", "fp_text_box",
+    "fp_line", "fp_rect", "fp_circle", "fp_arc", "fp_poly", "fp_curve", "image",
+    "pad", "zone", "property", "group", "private_layers", "net_tie_pad_groups",
+}
+
+THROUGH_HOLE_PADS = {"thru_hole", "np_thru_hole"}
+
+
+class UnsupportedFootprint(ValueError):
+    """The footprint uses a construct the in-process upgrader cannot convert."""
+
+
+def _version(tree: list) -> Optional[int]:
+    for item in tree[2:]:
+        if isinstance(item, list) and item and item[0] == "version":
+            try:
+                return int(item[1])
+            except (IndexError, TypeError, ValueError):
+                return None
+    return None
+
+
+def _head(text: str) -> str:
+    start = text.lstrip()
+    return start[1:].split(None, 1)[0] if start.startswith("(") and len(start) > 1 else ""
+
+
+def needs_upgrade(text: str) -> bool:
+    """Return True if ``text`` is a footprint older than the KiCad 6 format."""
+    if _head(text) == "module":
+        return True
+    try:
+        tree = sexpr.parse_sexp(text)
+    except Exception:
+        return False
+    version = _version(tree) if isinstance(tree, list) else None
+    return version is None or version < int(FOOTPRINT_VERSION)
+
+
+def _round(value: float) -> float:
+    value = round(value, 6)
+    return int(value) if value.is_integer() else value
+
+
+def _rotate(cx: float, cy: float, x: float, y: float, degrees: float):
+    """Rotate (x, y) around (cx, cy); positive angles turn clockwise on screen."""
+    angle = math.radians(degrees)
+    dx, dy = x - cx, y - cy
+    return (
+        _round(cx + dx * math.cos(angle) - dy * math.sin(angle)),
+        _round(cy + dx * math.sin(angle) + dy * math.cos(angle)),
+    )
+
+
+def _convert_arc(item: list) -> list:
+    """(start <center>) (end <start>) (angle <deg>) -> (start) (mid) (end)"""
+    tokens = {t[0]: t for t in item[1:] if isinstance(t, list) and t}
+    if "angle" not in tokens or "mid" in tokens:
+        return item
+    try:
+        cx, cy = float(tokens["start"][1]), float(tokens["start"][2])
+        sx, sy = float(tokens["end"][1]), float(tokens["end"][2])
+        angle = float(tokens["angle"][1])
+    except (KeyError, IndexError, TypeError, ValueError):
+        raise UnsupportedFootprint("fp_arc without center, start and angle")
+
+    mid = _rotate(cx, cy, sx, sy, angle / 2)
+    end = _rotate(cx, cy, sx, sy, angle)
+    converted = [item[0], ["start", _round(sx), _round(sy)], ["mid", *mid], ["end", *end]]
+    for token in item[1:]:
+        if not (isinstance(token, list) and token and token[0] in ("start", "end", "angle")):
+            converted.append(token)
+    return converted
+
+
+def _convert_model(item: list) -> list:
+    """Legacy models give their offset in inches as (at (xyz ...))"""
+    converted = []
+    for token in item:
+        if isinstance(token, list) and token and token[0] == "at":
+            xyz = token[1] if len(token) > 1 and isinstance(token[1], list) else ["xyz", 0, 0, 0]
+            token = ["offset", ["xyz", *(_round(float(v) * INCH) for v in xyz[1:4])]]
+        converted.append(token)
+    return converted
+
+
+def _rename_layers(item):
+    """Replace user-visible layer names in (layer ...) and (layers ...) tokens"""
+    if not isinstance(item, list) or not item:
+        return item
+    if item[0] in ("layer", "layers"):
+        return [item[0], *(LAYER_NAMES.get(layer, layer) for layer in item[1:])]
+    return [_rename_layers(token) for token in item]
+
+
+def _convert_attributes(tree: list, version: Optional[int]) -> list:
+    """Spell out the implicit through-hole type and the old virtual attribute"""
+    attr = next((t for t in tree if isinstance(t, list) and t and t[0] == "attr"), None)
+    if attr is not None and "virtual" in attr:
+        replacement = [t for t in attr if t != "virtual"]
+        replacement += ["exclude_from_pos_files", "exclude_from_bom"]
+        return [replacement if t is attr else t for t in tree]
+
+    if attr is None and (version is None or version < THROUGH_HOLE_ATTR_VERSION):
+        pads = [t for t in tree if isinstance(t, list) and t and t[0] == "pad"]
+        if any(len(pad) > 2 and pad[2] in THROUGH_HOLE_PADS for pad in pads):
+            return [*tree, ["attr", "through_hole"]]
+    return tree
+
+
+def normalize_tree(tree: list) -> list:
+    """Convert a parsed legacy footprint to the KiCad 6 structure kiutils reads."""
+    if not isinstance(tree, list) or not tree or tree[0] not in ("module", "footprint"):
+        raise UnsupportedFootprint("Not a footprint")
+
+    version = _version(tree)
+    converted: List = ["footprint", tree[1]]
+    for item in tree[2:]:
+        if not isinstance(item, list):
+            converted.append(item)
+            continue
+        if item[0] not in KNOWN_TOKENS:
+            raise UnsupportedFootprint(f"Unsupported token '{item[0]}'")
+        if item[0] == "fp_arc" and (version is None or version < ARC_MID_VERSION):
+            item = _convert_arc(item)
+        elif item[0] == "model":
+            item = _convert_model(item)
+        converted.append(_rename_layers(item))
+    return _convert_attributes(converted, version)
+
+
+def upgrade_footprint(text: str) -> str:
+    """
+    Return ``text`` in the KiCad 6 footprint format (as written by kiutils).
+
+    Raises:
+        UnsupportedFootprint: If the footprint cannot be upgraded in-process
+    """
+    try:
+        tree = sexpr.parse_sexp(text)
+    except Exception as e:
+        raise UnsupportedFootprint(f"Unreadable footprint: {e}")
+
+    try:
+        footprint = Footprint.from_sexpr(normalize_tree(tree))
+    except UnsupportedFootprint:
+        raise
+    except Exception as e:
+        raise UnsupportedFootprint(str(e))
+
+    footprint.version = FOOTPRINT_VERSION
+    footprint.generator = GENERATOR
+    logger.debug(f"Upgraded footprint {footprint.entryName} in-process")
+    return footprint.to_sexpr()
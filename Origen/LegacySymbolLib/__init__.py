@@ -0,0 +1,546 @@
+"""
+In-process converter for legacy KiCad symbol libraries.
+
+Reads the EESchema-LIBRARY (``.lib``) and EESchema-DOCLIB (``.dcm``) formats
+of KiCad 5 and older and builds kiutils ``Symbol`` objects, so legacy
+archives and libraries can be converted without kicad-cli. The ``.lib`` is
+parsed line by line and symbols are produced one at a time, so large
+multi-part libraries are never held in memory as a whole.
+
+Coordinates are converted from mil to mm; multi-unit symbols and body styles
+become ``NAME_<unit>_<convert>`` sub-symbols and aliases become derived
+symbols (``extends``), like kicad-cli does.
+"""
+
+import copy
+import logging
+import math
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+current_dir = Path(__file__).resolve().parent
+kiutils_src = current_dir.parent / "kiutils" / "src"
+if str(kiutils_src) not in __import__("sys").path:
+    __import__("sys").path.insert(0, str(kiutils_src))
+
+from kiutils.items.common import Effects, Fill, Font, Justify, Position, Property, Stroke
+from kiutils.items.syitems import SyArc, SyCircle, SyCurve, SyPolyLine, SyRect, SyText
+from kiutils.symbol import Symbol, SymbolLib, SymbolPin
+
+try:
+    from ..SymbolLibFile import DEFAULT_HEADER
+except ImportError:
+    from SymbolLibFile import DEFAULT_HEADER
+
+logger = logging.getLogger(__name__)
+
+LIB_SIGNATURE = "EESchema-LIBRARY"
+
+# Version written by the converter; kiutils emits this format
+LIBRARY_VERSION = "20211014"
+
+MIL = 0.0254  # mm
+DEFAULT_PIN_NAME_OFFSET = 0.508  # mm, KiCad's default (pin_names (offset))
+
+PIN_TYPES = {
+    "I": "input",
+    "O": "output",
+    "B": "bidirectional",
+    "T": "tri_state",
+    "P": "passive",
+    "U": "unspecified",
+    "W": "power_in",
+    "w": "power_out",
+    "C": "open_collector",
+    "E": "open_emitter",
+    "N": "no_connect",
+}
+
+# Pin shape letters (the invisible flag "N" is removed first)
+PIN_SHAPES = {
+    "": "line",
+    "I": "inverted",
+    "C": "clock",
+    "IC": "inverted_clock",
+    "CI": "inverted_clock",
+    "L": "input_low",
+    "CL": "clock_low",
+    "LC": "clock_low",
+    "V": "output_low",
+    "F": "edge_clock_high",
+    "X": "non_logic",
+}
+
+PIN_ORIENTATIONS = {"R": 0, "U": 90, "L": 180, "D": 270}
+
+FILL_TYPES = {"F": "outline", "f": "background", "N": "none"}
+
+H_JUSTIFY = {"L": "left", "R": "right"}
+V_JUSTIFY = {"T": "top", "B": "bottom"}
+
+MANDATORY_FIELDS = ["Reference", "Value", "Footprint", "Datasheet"]
+
+# A quoted string (with backslash escapes) or a run of non-blanks
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\S+')
+
+
+@dataclass
+class LegacyDoc:
+    """Documentation of one symbol from a ``.dcm`` file."""
+
+    description: str = ""
+    keywords: str = ""
+    datasheet: str = ""
+
+
+# === HELPERS ===
+
+def is_legacy_lib(text: str) -> bool:
+    """Return True if the text is an EESchema-LIBRARY (``.lib``) file."""
+    return text.lstrip().startswith(LIB_SIGNATURE)
+
+
+def _tokens(line: str) -> List[str]:
+    return _TOKEN_RE.findall(line)
+
+
+def _unquote(token: str) -> str:
+    if len(token) >= 2 and token[0] == '"' and token[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", token[1:-1])
+    return token
+
+
+def _mm(value: str) -> float:
+    """Convert a mil value to mm, rounded to KiCad's schematic resolution."""
+    return round(float(value) * MIL, 4)
+
+
+def _position(x: str, y: str, angle: Optional[float] = None) -> Position:
+    return Position(X=_mm(x), Y=_mm(y), angle=angle)
+
+
+def _text(text: str) -> str:
+    """Legacy "~" means an empty text."""
+    return "" if text == "~" else text
+
+
+def convert_overbar(text: str) -> str:
+    """Convert the legacy ``~`` overbar toggle to KiCad's ``~{...}`` notation."""
+    if "~" not in text:
+        return text
+    result = []
+    in_overbar = False
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == "~":
+            if text[i + 1 : i + 2] == "~":
+                result.append("~")
+                i += 2
+                continue
+            result.append("}" if in_overbar else "~{")
+            in_overbar = not in_overbar
+        else:
+            result.append(char)
+        i += 1
+    if in_overbar:
+        result.append("}")
+    return "".join(result)
+
+
+def _effects(size: str, hidden: bool = False, h_justify: str = "C",
+             v_justify: str = "C", italic: bool = False, bold: bool = False) -> Effects:
+    size_mm = _mm(size)
+    return Effects(
+        font=Font(height=size_mm, width=size_mm, italic=italic, bold=bold),
+        justify=Justify(
+            horizontally=H_JUSTIFY.get(h_justify), vertically=V_JUSTIFY.get(v_justify)
+        ),
+        hide=hidden,
+    )
+
+
+def _stroke(width: str) -> Stroke:
+    return Stroke(width=_mm(width), type="default")
+
+
+def _fill(token: str) -> Fill:
+    return Fill(type=FILL_TYPES.get(token, "none"))
+
+
+def _hidden_property(key: str, value: str, id: int) -> Property:
+    return Property(
+        key=key, value=value, id=id, position=Position(angle=0),
+        effects=Effects(font=Font(height=1.27, width=1.27), hide=True),
+    )
+
+
+# === DCM ===
+
+def parse_dcm(lines: Iterable[str]) -> Dict[str, LegacyDoc]:
+    """Read the ``$CMP`` entries of a ``.dcm`` file."""
+    docs: Dict[str, LegacyDoc] = {}
+    current: Optional[LegacyDoc] = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith("$CMP "):
+            current = docs.setdefault(line[5:].strip(), LegacyDoc())
+        elif line.startswith("$ENDCMP"):
+            current = None
+        elif current is not None and len(line) >= 2 and line[1] == " ":
+            key, value = line[0], line[2:].strip()
+            if key == "D":
+                current.description = value
+            elif key == "K":
+                current.keywords = value
+            elif key == "F":
+                current.datasheet = value
+    return docs
+
+
+# === LIB ===
+
+class _SymbolBuilder:
+    """Collects the lines of one ``DEF`` ... ``ENDDEF`` block."""
+
+    def __init__(self, tokens: List[str]) -> None:
+        # DEF name reference unused text_offset draw_nums draw_names units locked flag
+        name = _unquote(tokens[1])
+        self.value_hidden = name.startswith("~")
+        self.name = name.lstrip("~")
+        self.reference = _unquote(tokens[2]) if len(tokens) > 2 else "U"
+        self.pin_name_offset = _mm(tokens[4]) if len(tokens) > 4 else DEFAULT_PIN_NAME_OFFSET
+        self.show_pin_numbers = tokens[5] != "N" if len(tokens) > 5 else True
+        self.show_pin_names = tokens[6] != "N" if len(tokens) > 6 else True
+        self.is_power = len(tokens) > 9 and tokens[9] == "P"
+        self.fields: Dict[int, Property] = {}
+        self.aliases: List[str] = []
+        self.fp_filters: List[str] = []
+        self.units: Dict[Tuple[int, int], Symbol] = {}
+
+    # --- Header lines ---
+
+    def add_field(self, tokens: List[str]) -> None:
+        # F<n> "text" x y size orient visibility hjustify vjustify+italic+bold ["name"]
+        index = int(tokens[0][1:])
+        text = _text(_unquote(tokens[1]))
+        style = tokens[8] if len(tokens) > 8 else "CNN"
+        if index < len(MANDATORY_FIELDS):
+            key = MANDATORY_FIELDS[index]
+        elif len(tokens) > 9:
+            key = _unquote(tokens[9])
+        else:
+            key = f"Field{index}"
+
+        hidden = len(tokens) > 6 and tokens[6] == "I"
+        if index == 0 and self.reference == "~":
+            hidden, text = True, ""
+        if index == 1 and self.value_hidden:
+            hidden = True
+
+        self.fields[index] = Property(
+            key=key,
+            value=text,
+            id=index,
+            position=_position(tokens[2], tokens[3], 90 if tokens[5] == "V" else 0),
+            effects=_effects(
+                tokens[4],
+                hidden=hidden,
+                h_justify=tokens[7] if len(tokens) > 7 else "C",
+                v_justify=style[0],
+                italic=style[1:2] == "I",
+                bold=style[2:3] == "B",
+            ),
+        )
+
+    # --- Draw items ---
+
+    def _unit(self, unit: str, convert: str) -> Symbol:
+        key = (int(unit), int(convert))
+        symbol = self.units.get(key)
+        if symbol is None:
+            symbol = self.units[key] = Symbol(entryName=self.name, unitId=key[0], styleId=key[1])
+        return symbol
+
+    def add_draw_item(self, tokens: List[str]) -> None:
+        kind = tokens[0]
+        try:
+            if kind == "X":
+                self._add_pin(tokens)
+            elif kind == "S":
+                # S x1 y1 x2 y2 unit convert width fill
+                self._unit(tokens[5], tokens[6]).graphicItems.append(SyRect(
+                    start=_position(tokens[1], tokens[2]),
+                    end=_position(tokens[3], tokens[4]),
+                    stroke=_stroke(tokens[7]),
+                    fill=_fill(tokens[8] if len(tokens) > 8 else "N"),
+                ))
+            elif kind == "C":
+                # C x y radius unit convert width fill
+                self._unit(tokens[4], tokens[5]).graphicItems.append(SyCircle(
+                    center=_position(tokens[1], tokens[2]),
+                    radius=_mm(tokens[3]),
+                    stroke=_stroke(tokens[6]),
+                    fill=_fill(tokens[7] if len(tokens) > 7 else "N"),
+                ))
+            elif kind == "A":
+                self._add_arc(tokens)
+            elif kind in ("P", "B"):
+                # P count unit convert width x1 y1 ... xn yn fill
+                count = int(tokens[1])
+                coords = tokens[5 : 5 + 2 * count]
+                points = [_position(coords[i], coords[i + 1]) for i in range(0, len(coords) - 1, 2)]
+                fill = _fill(tokens[5 + 2 * count] if len(tokens) > 5 + 2 * count else "N")
+                item_class = SyPolyLine if kind == "P" else SyCurve
+                self._unit(tokens[2], tokens[3]).graphicItems.append(
+                    item_class(points=points, stroke=_stroke(tokens[4]), fill=fill)
+                )
+            elif kind == "T":
+                self._add_text(tokens)
+        except (IndexError, ValueError) as e:
+            logger.warning(f"Skipping invalid draw item in {self.name}: {' '.join(tokens)} ({e})")
+
+    def _add_pin(self, tokens: List[str]) -> None:
+        # X name number x y length orientation num_size name_size unit convert type [shape]
+        shape = tokens[12] if len(tokens) > 12 else ""
+        hidden = "N" in shape
+        shape = shape.replace("N", "")
+        self._unit(tokens[9], tokens[10]).pins.append(SymbolPin(
+            electricalType=PIN_TYPES.get(tokens[11], "unspecified"),
+            graphicalStyle=PIN_SHAPES.get(shape, "line"),
+            position=_position(tokens[3], tokens[4], PIN_ORIENTATIONS.get(tokens[6], 0)),
+            length=_mm(tokens[5]),
+            name=convert_overbar(_text(tokens[1])),
+            nameEffects=_effects(tokens[8]),
+            number=_text(tokens[2]),
+            numberEffects=_effects(tokens[7]),
+            hide=hidden,
+        ))
+
+    def _add_arc(self, tokens: List[str]) -> None:
+        # A x y radius angle1 angle2 unit convert width fill [x_start y_start x_end y_end]
+        cx, cy, radius = float(tokens[1]), float(tokens[2]), float(tokens[3])
+        angle1, angle2 = int(tokens[4]), int(tokens[5])
+        # Legacy arcs never sweep more than 180 degrees
+        sweep = angle2 - angle1
+        if sweep > 1800:
+            angle2 -= 3600
+        elif sweep <= -1800:
+            angle2 += 3600
+
+        def point(tenths: float) -> Tuple[float, float]:
+            angle = math.radians(tenths / 10)
+            return cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+
+        if len(tokens) >= 14:
+            start = (float(tokens[10]), float(tokens[11]))
+            end = (float(tokens[12]), float(tokens[13]))
+        else:
+            start, end = point(angle1), point(angle2)
+        mid = point((angle1 + angle2) / 2)
+
+        self._unit(tokens[6], tokens[7]).graphicItems.append(SyArc(
+            start=Position(X=round(start[0] * MIL, 4), Y=round(start[1] * MIL, 4)),
+            mid=Position(X=round(mid[0] * MIL, 4), Y=round(mid[1] * MIL, 4)),
+            end=Position(X=round(end[0] * MIL, 4), Y=round(end[1] * MIL, 4)),
+            stroke=_stroke(tokens[8]),
+            fill=_fill(tokens[9] if len(tokens) > 9 else "N"),
+        ))
+
+    def _add_text(self, tokens: List[str]) -> None:
+        # T angle x y size hidden unit convert text [italic bold hjustify vjustify]
+        text = tokens[8]
+        text = _unquote(text) if text.startswith('"') else text.replace("~", " ")
+        italic = len(tokens) > 9 and tokens[9] == "Italic"
+        bold = len(tokens) > 10 and tokens[10] not in ("0", "")
+        self._unit(tokens[6], tokens[7]).graphicItems.append(SyText(
+            text=text,
+            position=_position(tokens[2], tokens[3], float(tokens[1]) / 10),
+            effects=_effects(
+                tokens[4],
+                hidden=tokens[5] != "0",
+                h_justify=tokens[11] if len(tokens) > 11 else "C",
+                v_justify=tokens[12] if len(tokens) > 12 else "C",
+                italic=italic,
+                bold=bold,
+            ),
+        ))
+
+    # --- Result ---
+
+    def _properties(self, value: str, doc: Optional[LegacyDoc]) -> List[Property]:
+        properties = []
+        for index, key in enumerate(MANDATORY_FIELDS):
+            field = self.fields.get(index)
+            if field is None:
+                field = _hidden_property(key, "", index)
+                field.effects.hide = index >= 2
+            properties.append(copy.copy(field))
+        properties[1] = Property(
+            key="Value", value=value, id=1,
+            position=properties[1].position, effects=properties[1].effects,
+        )
+        if doc and doc.datasheet and not properties[3].value:
+            properties[3].value = doc.datasheet
+
+        properties += [copy.copy(self.fields[index]) for index in sorted(self.fields) if index >= 4]
+        next_id = max([p.id for p in properties] + [3]) + 1
+        if doc and doc.keywords:
+            properties.append(_hidden_property("ki_keywords", doc.keywords, next_id))
+            next_id += 1
+        if doc and doc.description:
+            properties.append(_hidden_property("ki_description", doc.description, next_id))
+            next_id += 1
+        if self.fp_filters:
+            properties.append(_hidden_property("ki_fp_filters", " ".join(self.fp_filters), next_id))
+        return properties
+
+    def build(self, docs: Dict[str, LegacyDoc]) -> List[Symbol]:
+        """Return the symbol followed by one derived symbol per alias."""
+        value_field = self.fields.get(1)
+        symbol = Symbol(
+            entryName=self.name,
+            isPower=self.is_power,
+            hidePinNumbers=not self.show_pin_numbers,
+            inBom=True,
+            onBoard=True,
+        )
+        if not self.show_pin_names or self.pin_name_offset != DEFAULT_PIN_NAME_OFFSET:
+            symbol.pinNames = True
+            symbol.pinNamesHide = not self.show_pin_names
+            if self.pin_name_offset != DEFAULT_PIN_NAME_OFFSET:
+                symbol.pinNamesOffset = self.pin_name_offset
+        symbol.properties = self._properties(
+            value_field.value if value_field and value_field.value else self.name,
+            docs.get(self.name),
+        )
+        symbol.units = [self.units[key] for key in sorted(self.units)]
+
+        symbols = [symbol]
+        for alias in self.aliases:
+            derived = Symbol(entryName=alias, extends=self.name, inBom=True, onBoard=True)
+            derived.properties = self._properties(alias, docs.get(alias) or docs.get(self.name))
+            symbols.append(derived)
+        return symbols
+
+
+def iter_legacy_symbols(
+    lines: Iterable[str], docs: Optional[Dict[str, LegacyDoc]] = None
+) -> Iterator[Symbol]:
+    """
+    Parse a ``.lib`` file line by line and yield its symbols one at a time.
+
+    Args:
+        lines: Lines of the ``.lib`` file (e.g. an open file)
+        docs: Documentation from the matching ``.dcm`` file (see parse_dcm)
+    """
+    docs = docs or {}
+    builder: Optional[_SymbolBuilder] = None
+    section = ""
+    for line_number, raw_line in enumerate(lines, 1):
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        tokens = _tokens(line)
+        keyword = tokens[0]
+        if builder is None:
+            if keyword == "DEF" and len(tokens) > 1:
+                builder = _SymbolBuilder(tokens)
+                section = ""
+            continue
+
+        if keyword == "ENDDEF":
+            yield from builder.build(docs)
+            builder = None
+        elif section == "FPLIST":
+            if keyword == "$ENDFPLIST":
+                section = ""
+            else:
+                builder.fp_filters.extend(tokens)
+        elif section == "DRAW":
+            if keyword == "ENDDRAW":
+                section = ""
+            else:
+                builder.add_draw_item(tokens)
+        elif keyword == "DRAW":
+            section = "DRAW"
+        elif keyword == "$FPLIST":
+            section = "FPLIST"
+        elif keyword == "ALIAS":
+            builder.aliases.extend(tokens[1:])
+        elif re.match(r"F\d+$", keyword) and len(tokens) >= 6:
+            try:
+                builder.add_field(tokens)
+            except (IndexError, ValueError) as e:
+                logger.warning(f"Skipping invalid field on line {line_number}: {e}")
+
+    if builder is not None:
+        logger.warning(f"Symbol {builder.name} is not terminated by ENDDEF, skipped")
+
+
+def convert_legacy_lib(
+    lib: Union[str, Iterable[str]], dcm: Union[str, Iterable[str], None] = None
+) -> SymbolLib:
+    """
+    Convert a ``.lib`` (and its ``.dcm``) into a kiutils ``SymbolLib``.
+
+    Args:
+        lib: Text or lines of the ``.lib`` file
+        dcm: Text or lines of the ``.dcm`` file, optional
+
+    Raises:
+        ValueError: If ``lib`` is not an EESchema-LIBRARY file
+    """
+    lib_lines = lib.splitlines() if isinstance(lib, str) else iter(lib)
+    if isinstance(lib, str) and not is_legacy_lib(lib):
+        raise ValueError("Not an EESchema-LIBRARY file")
+    dcm_lines = dcm.splitlines() if isinstance(dcm, str) else dcm
+    docs = parse_dcm(dcm_lines) if dcm_lines is not None else {}
+
+    symbol_lib = SymbolLib(version=LIBRARY_VERSION, generator="CustomImportGUI")
+    symbol_lib.symbols = list(iter_legacy_symbols(lib_lines, docs))
+    return symbol_lib
+
+
+def convert_legacy_file(src, dest, dcm_path=None) -> int:
+    """
+    Convert a ``.lib`` file into a ``.kicad_sym`` file, streaming symbol by
+    symbol. The ``.dcm`` next to ``src`` is used unless ``dcm_path`` is given.
+    The destination is written atomically.
+
+    Returns:
+        Number of symbols written
+
+    Raises:
+        ValueError: If ``src`` is not an EESchema-LIBRARY file
+    """
+    src, dest = Path(src), Path(dest)
+    dcm_path = Path(dcm_path) if dcm_path else src.with_suffix(".dcm")
+    docs: Dict[str, LegacyDoc] = {}
+    if dcm_path.is_file():
+        with open(dcm_path, encoding="utf-8", errors="replace") as f:
+            docs = parse_dcm(f)
+
+    temp_path = dest.with_name(dest.name + ".tmp")
+    count = 0
+    try:
+        with open(src, encoding="utf-8", errors="replace") as lib_file:
+            if not lib_file.readline().lstrip().startswith(LIB_SIGNATURE):
+                raise ValueError(f"Not an EESchema-LIBRARY file: {src}")
+            with open(temp_path, "w", encoding="utf-8", newline="\n") as out:
+                out.write(DEFAULT_HEADER + "\n")
+                for symbol in iter_legacy_symbols(lib_file, docs):
+                    out.write(symbol.to_sexpr(indent=2))
+                    count += 1
+                out.write(")\n")
+        os.replace(temp_path, dest)
+    except Exception:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Converted {count} symbols from {src.name} to {dest.name}")
+    return count
@@ -0,0 +1,287 @@
+"""Library Index - Persistent SQLite index of the local component libraries.
+
+Keeps one row per symbol of every indexed ``.kicad_sym`` file, plus the
+number of footprints and 3D models per ``.pretty``/``.3dshapes`` folder.
+Files are keyed by path, mtime and size, so an update only re-reads the
+libraries that changed since the last refresh.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    from ..SqliteIndex import open_index
+except ImportError:
+    from SqliteIndex import open_index
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    item_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    reference TEXT NOT NULL,
+    footprint TEXT NOT NULL,
+    source TEXT NOT NULL,
+    import_date TEXT NOT NULL,
+    lcsc TEXT NOT NULL,
+    PRIMARY KEY (path, position)
+);
+CREATE INDEX IF NOT EXISTS files_root ON files(root);
+"""
+
+# Folder suffixes whose entries are counted, with the file extensions counted
+_COUNTED_DIRS = {
+    ".pretty": ("kicad_mod", (".kicad_mod",)),
+    ".3dshapes": ("model", (".step", ".wrl")),
+}
+
+
+class SymbolEntry(NamedTuple):
+    """One indexed symbol, as shown in the Library tab."""
+
+    path: str
+    name: str
+    reference: str
+    footprint: str
+    source: str
+    import_date: str
+    lcsc: str
+
+
+def read_symbol_entries(sym_file: Path) -> List[SymbolEntry]:
+    """Read name and properties of all symbols in a ``.kicad_sym`` file."""
+    from kiutils.symbol import SymbolLib
+
+    lib = SymbolLib.from_file(str(sym_file), lazy=True)
+    entries = []
+    for symbol in lib.symbols:
+        props = symbol.propertyDict
+        entries.append(
+            SymbolEntry(
+                path=str(sym_file),
+                name=symbol.entryName or props.get("Value", "?"),
+                reference=props.get("Reference", "?"),
+                footprint=props.get("Footprint", ""),
+                source=props.get("OriginalSource", ""),
+                import_date=props.get("ImportDate", ""),
+                lcsc=props.get("LCSC Part", ""),
+            )
+        )
+    return entries
+
+
+class LibraryIndex:
+    """Manages the SQLite index of the libraries in one or more DEST_PATHs."""
+
+    def __init__(self, index_dir: Optional[Path] = None):
+        if index_dir is None:
+            index_dir = Path(__file__).resolve().parent.parent
+        self.index_file = Path(index_dir) / "library_index.db"
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self) -> None:
+        self._conn = open_index(
+            self.index_file, _SCHEMA, SCHEMA_VERSION, "library index", foreign_keys=True
+        )
+
+    @staticmethod
+    def _scan_root(root: Path) -> Dict[str, Tuple[str, os.stat_result]]:
+        """Return ``{path: (kind, stat)}`` for the indexable entries of a root."""
+        found = {}
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith(".kicad_sym") and entry.is_file():
+                        found[entry.path] = ("kicad_sym", entry.stat())
+                        continue
+                    for suffix, (kind, _) in _COUNTED_DIRS.items():
+                        if name.endswith(suffix) and entry.is_dir():
+                            found[entry.path] = (kind, entry.stat())
+        except OSError as e:
+            logger.warning(f"Could not scan library folder {root}: {e}")
+        return found
+
+    @staticmethod
+    def _count_files(folder: str, kind: str) -> int:
+        extensions = next(ext for k, ext in _COUNTED_DIRS.values() if k == kind)
+        try:
+            with os.scandir(folder) as entries:
+                return sum(1 for e in entries if e.name.endswith(extensions))
+        except OSError:
+            return 0
+
+    def update(self, roots: Iterable[Path]) -> int:
+        """Bring the index up to date for the given DEST_PATHs.
+
+        Only files whose mtime or size changed are re-read; entries of files
+        that disappeared are removed. Returns the number of re-read entries.
+        """
+        roots = [str(Path(r)) for r in roots]
+        updated = 0
+        with self._lock, self._conn as conn:
+            for root in roots:
+                found = self._scan_root(Path(root))
+                known = {
+                    path: (mtime, size)
+                    for path, mtime, size in conn.execute(
+                        "SELECT path, mtime_ns, size FROM files WHERE root = ?", (root,)
+                    )
+                }
+
+                for path in known.keys() - found.keys():
+                    conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+                for path, (kind, stat) in found.items():
+                    if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                        continue
+
+                    conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                    if kind == "kicad_sym":
+                        try:
+                            entries = read_symbol_entries(Path(path))
+                        except Exception as e:
+                            logger.warning(f"Could not parse {Path(path).name}: {e}")
+                            entries = []
+                        item_count = len(entries)
+                    else:
+                        entries = []
+                        item_count = self._count_files(path, kind)
+
+                    conn.execute(
+                        "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                        (path, root, kind, stat.st_mtime_ns, stat.st_size, item_count),
+                    )
+                    conn.executemany(
+                        "INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(path, i, *entry[1:]) for i, entry in enumerate(entries)],
+                    )
+                    updated += 1
+        if updated:
+            logger.debug(f"Library index: re-read {updated} entries")
+        return updated
+
+    def get_symbols(self, roots: Iterable[Path]) -> List[SymbolEntry]:
+        """Return the indexed symbols of the given DEST_PATHs."""
+        roots = [str(Path(r)) for r in roots]
+        if not roots:
+            return []
+        marks = ",".join("?" * len(roots))
+        with self._lock, self._conn as conn:
+            rows = conn.execute(
+                "SELECT s.path, name, reference, footprint, source, import_date, lcsc "
+                "FROM symbols s JOIN files f ON f.path = s.path "
+                f"WHERE f.root IN ({marks}) ORDER BY s.path, s.position",
+                roots,
+            ).fetchall()
+        return [SymbolEntry(*row) for row in rows]
+
+    def get_counts(self, roots: Iterable[Path]) -> Dict[str, int]:
+        """Return the number of symbols, footprints and 3D models in the given DEST_PATHs."""
+        roots = [str(Path(r)) for r in roots]
+        counts = {"kicad_sym": 0, "kicad_mod": 0, "model": 0}
+        if not roots:
+            return counts
+        marks = ",".join("?" * len(roots))
+        with self._lock, self._conn as conn:
+            for kind, total in conn.execute(
+                f"SELECT kind, SUM(item_count) FROM files WHERE root IN ({marks}) GROUP BY kind",
+                roots,
+            ):
+                counts[kind] = total or 0
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def clear(self) -> None:
+        """Drop all indexed entries."""
+        with self._lock, self._conn as conn:
+            conn.execute("DELETE FROM files")
+
+
+class LibraryRows:
+    """In-memory column store behind the virtual Library tab list.
+
+    Rows are appended in chunks while the index is scanned. Every row gets
+    a precomputed lowercase search key, and ``set_filter`` keeps the list of
+    visible row numbers; narrowing a filter only re-checks the rows that
+    are still visible.
+    """
+
+    COLUMNS = 6
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.columns: List[List[str]] = [[] for _ in range(self.COLUMNS)]
+        self.paths: List[str] = []
+        self._keys: List[str] = []
+        self._filter = ""
+        self.view: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    @property
+    def total(self) -> int:
+        return len(self.paths)
+
+    def extend(self, rows: Iterable[Tuple[str, Tuple[str, ...]]]) -> int:
+        """Append ``(path, columns)`` rows; returns the number of new visible rows."""
+        start = len(self.paths)
+        for path, values in rows:
+            self.paths.append(path)
+            for column, value in zip(self.columns, values):
+                column.append(value)
+            self._keys.append("\0".join(values).lower())
+
+        new_rows = range(start, len(self.paths))
+        if self._filter:
+            added = [i for i in new_rows if self._filter in self._keys[i]]
+        else:
+            added = list(new_rows)
+        self.view.extend(added)
+        return len(added)
+
+    def set_filter(self, text: str) -> None:
+        """Show only rows with ``text`` in any column (case-insensitive)."""
+        text = text.lower().strip()
+        if text == self._filter:
+            return
+        if not text:
+            self.view = list(range(len(self.paths)))
+        else:
+            candidates = self.view if self._filter and self._filter in text else range(len(self.paths))
+            keys = self._keys
+            self.view = [i for i in candidates if text in keys[i]]
+        self._filter = text
+
+    def cell(self, row: int, column: int) -> str:
+        """Return the text of a visible row and column."""
+        return self.columns[column][self.view[row]]
+
+    def item(self, row: int) -> Optional[Tuple[str, str]]:
+        """Return ``(sym_file, entry_name)`` of a visible row, or None."""
+        if row < 0 or row >= len(self.view):
+            return None
+        index = self.view[row]
+        return self.paths[index], self.columns[0][index]
@@ -0,0 +1,146 @@
+"""
+Bounded log channel for the import status output.
+
+Lines are numbered with increasing sequence numbers and kept in a ring
+buffer, so readers only fetch what they have not seen yet instead of copying
+the whole log. Listeners are notified after each write, which lets the GUI
+react to new output without polling. Optionally every line is also appended
+to a log file on disk, so nothing is lost when old lines are trimmed.
+"""
+
+import logging
+import threading
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LINES = 5000
+
+
+class LogChannel:
+    """Thread-safe ring buffer of log lines with sequence numbers."""
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES, spill_file: Optional[Path] = None):
+        """
+        Args:
+            max_lines: Number of lines kept in memory (at least 1)
+            spill_file: Optional file that receives every line, including
+                        the ones trimmed from memory
+        """
+        self._lock = threading.Lock()
+        self._lines: deque = deque(maxlen=max(1, int(max_lines)))
+        self._next_seq = 0
+        self._listeners: List[Callable[[int], None]] = []
+        self._spill = None
+        self.spill_file: Optional[Path] = None
+        self.set_spill_file(spill_file)
+
+    # === CONFIGURATION ===
+
+    @property
+    def max_lines(self) -> int:
+        return self._lines.maxlen
+
+    def set_max_lines(self, max_lines: int) -> None:
+        """Change how many lines are kept; the oldest lines are dropped."""
+        with self._lock:
+            self._lines = deque(self._lines, maxlen=max(1, int(max_lines)))
+
+    def set_spill_file(self, spill_file: Optional[Path]) -> None:
+        """Start (or stop, with None) appending every line to ``spill_file``."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+            self.spill_file = Path(spill_file) if spill_file else None
+            if self.spill_file is not None:
+                try:
+                    self._spill = open(self.spill_file, "a", encoding="utf-8")
+                except OSError as e:
+                    logger.warning(f"Could not open log file '{self.spill_file}': {e}")
+                    self.spill_file = None
+
+    # === WRITING ===
+
+    def write(self, text: str) -> int:
+        """
+        Appends ``text`` as one or more lines and notifies the listeners.
+
+        Returns:
+            Sequence number after the last written line
+        """
+        lines = str(text).split("\n")
+        with self._lock:
+            for line in lines:
+                self._lines.append((self._next_seq, line))
+                self._next_seq += 1
+            seq = self._next_seq
+            if self._spill is not None:
+                try:
+                    self._spill.write("\n".join(lines) + "\n")
+                    self._spill.flush()
+                except OSError as e:
+                    logger.warning(f"Could not write log file: {e}")
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(seq)
+            except Exception as e:
+                logger.warning(f"Log listener failed: {e}")
+        return seq
+
+    # === READING ===
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number after the last written line."""
+        with self._lock:
+            return self._next_seq
+
+    def read_since(self, seq: int) -> Tuple[int, List[str], bool]:
+        """
+        Returns the lines written since ``seq``.
+
+        Returns:
+            (next_seq, lines, trimmed) - ``trimmed`` is True if some lines
+            after ``seq`` were already dropped from the ring buffer
+        """
+        with self._lock:
+            first = self._lines[0][0] if self._lines else self._next_seq
+            start = min(max(0, seq - first), len(self._lines))
+            lines = [line for _, line in islice(self._lines, start, None)]
+            return self._next_seq, lines, seq < first
+
+    def text(self) -> str:
+        """Returns all lines kept in memory, each terminated by a newline."""
+        with self._lock:
+            return "".join(line + "\n" for _, line in self._lines)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._lines)
+
+    def clear(self) -> None:
+        """Drops the lines kept in memory; sequence numbers keep counting."""
+        with self._lock:
+            self._lines.clear()
+
+    # === LISTENERS ===
+
+    def add_listener(self, listener: Callable[[int], None]) -> None:
+        """Calls ``listener(next_seq)`` from the writing thread after each write."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[int], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def close(self) -> None:
+        """Closes the log file, if any."""
+        self.set_spill_file(None)
@@ -0,0 +1,210 @@
+"""
+Content-addressed store for the 3D models of the imported libraries.
+
+Every model written into a ``.3dshapes`` folder is hashed (SHA-256) and hard
+linked to a blob in ``<DEST_PATH>/.3dmodel_store/<xx>/<hash><suffix>``. A
+model whose content is already stored replaces its copy by a link to the
+existing blob, so identical STEP/WRL files that arrive under different names
+(other vendors, sub-libraries) use the disk space once. Footprints keep their
+``(model ...)`` paths: the files in ``.3dshapes`` stay where they are.
+
+``dedup()`` runs the same over existing libraries and reports the bytes
+reclaimed. Where hard links are not possible (another file system, FAT) the
+files are simply left as copies.
+"""
+
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = ".3dmodel_store"
+HASH_BUFSIZE = 1024 * 1024
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+@dataclass
+class DedupReport:
+    files: int = 0  # model files checked
+    linked: int = 0  # copies replaced by a link to the store
+    bytes_reclaimed: int = 0
+    orphans_removed: int = 0  # blobs no library file used any more
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_BUFSIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _inode(stat: os.stat_result) -> Tuple[int, int]:
+    return stat.st_dev, stat.st_ino
+
+
+class ModelStore:
+    """Hard-link store for the 3D models below one library folder."""
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Args:
+            root: The store directory, usually ``DEST_PATH / STORE_DIR``
+        """
+        self.root = Path(root)
+
+    @classmethod
+    def for_library(cls, dest_path: Union[str, Path]) -> "ModelStore":
+        return cls(Path(dest_path) / STORE_DIR)
+
+    def blob_path(self, digest: str, suffix: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{suffix.lower()}"
+
+    # === IMPORTS ===
+
+    def write(self, src: BinaryIO, dest: Path, bufsize: int = HASH_BUFSIZE) -> Path:
+        """
+        Stream ``src`` into ``dest`` (a new file, never through an existing
+        link) while hashing it, then link it with the store.
+
+        Returns:
+            ``dest``
+        """
+        dest.unlink(missing_ok=True)
+        digest = hashlib.sha256()
+        with open(dest, "wb") as out:
+            for chunk in iter(lambda: src.read(bufsize), b""):
+                digest.update(chunk)
+                out.write(chunk)
+        self.add(dest, digest.hexdigest())
+        return dest
+
+    def add(self, path: Union[str, Path], digest: Optional[str] = None) -> int:
+        """
+        Link a model file with the store. If the content is already stored the
+        file is replaced by a link to the blob; otherwise it becomes the blob.
+
+        Returns:
+            Bytes reclaimed (the file's size if its copy was freed, else 0)
+        """
+        path = Path(path)
+        digest = digest or file_digest(path)
+        blob = self.blob_path(digest, path.suffix)
+        try:
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.link(path, blob)
+                return 0
+            stat = path.stat()
+            if _inode(stat) == _inode(blob.stat()):
+                return 0
+            # Link next to the file first, so it is never missing
+            temp = path.with_name(path.name + ".link")
+            temp.unlink(missing_ok=True)
+            os.link(blob, temp)
+            os.replace(temp, path)
+        except OSError as e:
+            logger.debug(f"Keeping {path.name} as a copy: {e}")
+            return 0
+        logger.info(f"Linked {path.name} to identical 3D model {blob.name}")
+        return stat.st_size if stat.st_nlink == 1 else 0
+
+    # === EXISTING LIBRARIES ===
+
+    def _blob_inodes(self) -> Set[Tuple[int, int]]:
+        if not self.root.is_dir():
+            return set()
+        return {_inode(blob.stat()) for blob in self.root.glob("*/*") if blob.is_file()}
+
+    def dedup(
+        self,
+        model_dirs: Iterable[Union[str, Path]],
+        dry_run: bool = False,
+        progress: Optional[ProgressCallback] = None,
+    ) -> DedupReport:
+        """
+        Link every model file in ``model_dirs`` (``.3dshapes`` folders) with
+        the store and remove blobs no file uses any more. Files that are
+        already linked to a blob are not read again.
+
+        Args:
+            dry_run: Only report what would be reclaimed
+            progress: ``progress(step, total, name)``; called with (0, 0, "")
+                      when done
+        """
+        files = sorted(
+            path
+            for model_dir in model_dirs
+            if Path(model_dir).is_dir()
+            for path in Path(model_dir).iterdir()
+            if path.is_file() and not path.name.endswith((".link", ".backup"))
+        )
+        report = DedupReport(files=len(files))
+        seen = self._blob_inodes()  # inodes that are (or would be) stored
+        pending = set()  # digests a dry run would store
+
+        for step, path in enumerate(files, 1):
+            if progress:
+                progress(step, len(files), path.name)
+            stat = path.stat()
+            if _inode(stat) in seen:
+                continue
+            digest = file_digest(path)
+            blob = self.blob_path(digest, path.suffix)
+
+            if dry_run:
+                if blob.exists() or digest in pending:
+                    report.linked += 1
+                    if stat.st_nlink == 1:
+                        report.bytes_reclaimed += stat.st_size
+                else:
+                    pending.add(digest)
+                    seen.add(_inode(stat))
+                continue
+
+            existed = blob.exists()
+            reclaimed = self.add(path, digest)
+            if existed and _inode(path.stat()) != _inode(stat):
+                report.linked += 1
+                report.bytes_reclaimed += reclaimed
+            if blob.exists():
+                seen.add(_inode(blob.stat()))
+
+        if not dry_run:
+            report.orphans_removed = self.prune()
+        if progress:
+            progress(0, 0, "")
+        logger.info(
+            f"3D model dedup: {report.linked} of {report.files} files linked, "
+            f"{report.bytes_reclaimed} bytes reclaimed"
+        )
+        return report
+
+    def prune(self) -> int:
+        """Remove blobs that are no longer linked from any library"""
+        removed = 0
+        if not self.root.is_dir():
+            return removed
+        for blob in self.root.glob("*/*"):
+            if blob.is_file() and blob.stat().st_nlink == 1:
+                blob.unlink()
+                removed += 1
+        return removed
+
+
+def dedup_libraries(
+    dest_path: Union[str, Path],
+    dry_run: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> DedupReport:
+    """Deduplicate the models of all ``.3dshapes`` folders in ``dest_path``"""
+    dest_path = Path(dest_path)
+    return ModelStore.for_library(dest_path).dedup(
+        sorted(dest_path.glob("*.3dshapes")), dry_run=dry_run, progress=progress
+    )
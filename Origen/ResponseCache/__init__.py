@@ -0,0 +1,186 @@
+"""Response Cache - Persistent cache of downloaded EasyEDA data.
+
+Responses are stored once per content hash under ``objects/`` and looked
+up through an SQLite table of keys (``cad/<LCSC id>``, ``obj/<model uuid>``,
+``step/<model uuid>``), so the many passives that share one 3D model keep a
+single copy. Entries older than the TTL are refreshed from the network but
+stay available as an offline fallback; when the cache grows beyond its size
+cap the least recently used entries are evicted.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from ..SqliteIndex import open_index
+except ImportError:
+    from SqliteIndex import open_index
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries(digest);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at);
+"""
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache with TTL, size cap and LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if cache_dir is None:
+            cache_dir = Path(__file__).resolve().parent.parent / "easyeda_cache"
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self) -> None:
+        self._conn = open_index(
+            self.cache_dir / "index.db", _SCHEMA, SCHEMA_VERSION, "EasyEDA cache index",
+            folders=[self.objects_dir],
+        )
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[bytes]:
+        """Return the cached data for ``key``, or None.
+
+        Entries older than the TTL are only returned with ``allow_stale``.
+        """
+        now = time.time()
+        with self._lock, self._conn as conn:
+            row = conn.execute(
+                "SELECT digest, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            digest, stored_at = row
+            if not allow_stale and now - stored_at > self.ttl:
+                return None
+            try:
+                data = self._blob_path(digest).read_bytes()
+            except OSError:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store ``data`` under ``key`` and evict old entries beyond the size cap."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        now = time.time()
+        with self._lock:
+            try:
+                if not path.exists():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                    try:
+                        with os.fdopen(fd, "wb") as f:
+                            f.write(data)
+                        os.replace(tmp, path)
+                    except BaseException:
+                        Path(tmp).unlink(missing_ok=True)
+                        raise
+            except OSError as e:
+                logger.warning(f"Could not cache {key}: {e}")
+                return
+
+            with self._conn as conn:
+                old = conn.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (key, digest, len(data), now, now),
+                )
+                if old and old[0] != digest:
+                    self._drop_unreferenced(conn, old[0])
+                self._evict(conn)
+
+    def _total_bytes(self, conn: sqlite3.Connection) -> int:
+        return conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT MAX(size) AS size FROM entries GROUP BY digest)"
+        ).fetchone()[0]
+
+    def _drop_unreferenced(self, conn: sqlite3.Connection, digest: str) -> bool:
+        """Delete a blob that no key refers to anymore; returns True if deleted."""
+        if conn.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+            return False
+        self._blob_path(digest).unlink(missing_ok=True)
+        return True
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = self._total_bytes(conn)
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, digest, size in conn.execute(
+            "SELECT key, digest, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            evicted += 1
+            if self._drop_unreferenced(conn, digest):
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        logger.debug(f"EasyEDA cache: evicted {evicted} entries")
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of keys, stored objects and stored bytes."""
+        with self._lock, self._conn as conn:
+            keys, objects = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT digest) FROM entries"
+            ).fetchone()
+            return {"keys": keys, "objects": objects, "bytes": self._total_bytes(conn)}
+
+    def clear(self) -> None:
+        """Drop all cached entries and objects."""
+        with self._lock, self._conn as conn:
+            digests = [row[0] for row in conn.execute("SELECT DISTINCT digest FROM entries")]
+            conn.execute("DELETE FROM entries")
+            for digest in digests:
+                self._blob_path(digest).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the cache shared by all EasyEDA imports of the plugin."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
@@ -0,0 +1,72 @@
+"""SQLite Index - Opening of the plugin's persistent SQLite indexes.
+
+The library index, the EasyEDA response cache and the KiCad symbol mirror
+keep their tables in an SQLite file versioned with ``PRAGMA user_version``.
+Tables of another schema version are dropped and created again, a corrupt
+file is deleted and rebuilt, and if the file cannot be used at all the index
+lives in memory for the session. The data behind all of them can be fetched
+or scanned again, so losing an index only costs time.
+"""
+
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+_TABLE_RE = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+)")
+
+
+def connect_index(
+    target: str, schema: str, schema_version: int, foreign_keys: bool = False
+) -> sqlite3.Connection:
+    """Connect to ``target`` and create the tables of ``schema``.
+
+    Tables written by another schema version are dropped first, children
+    before the tables they reference.
+    """
+    conn = sqlite3.connect(target, timeout=10, check_same_thread=False)
+    if foreign_keys:
+        conn.execute("PRAGMA foreign_keys = ON")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != schema_version:
+        conn.executescript(
+            "".join(f"DROP TABLE IF EXISTS {t};" for t in reversed(_TABLE_RE.findall(schema)))
+        )
+    conn.executescript(schema)
+    conn.execute(f"PRAGMA user_version = {schema_version}")
+    conn.commit()
+    return conn
+
+
+def open_index(
+    index_file: Path,
+    schema: str,
+    schema_version: int,
+    description: str,
+    folders: Iterable[Path] = (),
+    foreign_keys: bool = False,
+) -> sqlite3.Connection:
+    """Open an index file, rebuilding it if it is outdated or corrupt.
+
+    ``folders`` are created first. Falls back to an in-memory index if they
+    or the file cannot be used.
+    """
+    index_file = Path(index_file)
+    try:
+        for folder in (index_file.parent, *folders):
+            Path(folder).mkdir(parents=True, exist_ok=True)
+        return connect_index(str(index_file), schema, schema_version, foreign_keys)
+    except sqlite3.DatabaseError as e:
+        logger.warning(f"Rebuilding {description}: {e}")
+    except OSError as e:
+        logger.error(f"Could not create {description}, using memory only: {e}")
+        return connect_index(":memory:", schema, schema_version, foreign_keys)
+    try:
+        index_file.unlink(missing_ok=True)
+        return connect_index(str(index_file), schema, schema_version, foreign_keys)
+    except (sqlite3.Error, OSError) as e:
+        logger.error(f"Could not open {description}, using memory only: {e}")
+        return connect_index(":memory:", schema, schema_version, foreign_keys)
@@ -0,0 +1,306 @@
+"""
+Lightweight text helpers for KiCad symbol library files.
+
+Finds the top-level ``(symbol "NAME" ...)`` blocks of a ``.kicad_sym`` file
+without building a full S-expression tree, so callers can work on single
+symbols without parsing the whole library.
+"""
+
+import logging
+import os
+import re
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADER = '(kicad_symbol_lib (version 20211014) (generator "CustomImportGUI")'
+
+# A quoted string (with backslash escapes) or a single bracket
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[()]')
+_SYMBOL_HEAD_RE = re.compile(r'\(\s*symbol\s+"((?:[^"\\]|\\.)*)"')
+_VERSION_RE = re.compile(r"\(\s*version\s+(\d+)\s*\)")
+
+# Unit sub-symbols are named NAME_<unit>_<style>
+_UNIT_NAME_RE = re.compile(r".+_\d+_\d+$")
+
+# Legacy EESchema-LIBRARY entries: "DEF name ref ..." and "ALIAS a b c"
+_LEGACY_DEF_RE = re.compile(r"^DEF\s+(\S+)", re.MULTILINE)
+_LEGACY_ALIAS_RE = re.compile(r"^ALIAS\s+(.+)$", re.MULTILINE)
+
+
+class SymbolSpan(NamedTuple):
+    """Character range of one top-level symbol; ``text[start:end]`` is the block."""
+
+    name: str
+    start: int
+    end: int
+
+
+def unescape_name(name: str) -> str:
+    """Undo the backslash escaping KiCad applies to quoted strings."""
+    return re.sub(r"\\(.)", r"\1", name)
+
+
+def escape_name(name: str) -> str:
+    """Escape a symbol name for use inside a quoted S-expression string."""
+    return name.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def block_end(text: str, start: int) -> int:
+    """Return the index just past the bracket expression starting at ``start``."""
+    depth = 0
+    for match in _TOKEN_RE.finditer(text, start):
+        token = match.group()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise ValueError("Unbalanced brackets in symbol library")
+
+
+def find_symbol(text: str, name: str) -> Optional[SymbolSpan]:
+    """Locate one top-level symbol without scanning the whole library.
+
+    Names that look like unit sub-symbols (``NAME_1_1``) are resolved with a
+    full scan, since a nested block of another symbol could match them.
+    """
+    if _UNIT_NAME_RE.match(name):
+        for span in scan_symbols(text):
+            if span.name == name:
+                return span
+        return None
+
+    pattern = re.compile(r'\(\s*symbol\s+"' + re.escape(escape_name(name)) + '"')
+    match = pattern.search(text)
+    if not match:
+        return None
+    return SymbolSpan(name, match.start(), block_end(text, match.start()))
+
+
+def symbol_block_name(block: str) -> Optional[str]:
+    """Return the name of a ``(symbol "NAME" ...)`` block, or None."""
+    head = _SYMBOL_HEAD_RE.match(block.lstrip())
+    return unescape_name(head.group(1)) if head else None
+
+
+def verify_symbol_block(block: str) -> str:
+    """Check that a block is exactly one balanced symbol; returns its name.
+
+    Raises:
+        ValueError: If the block is not a single well-formed symbol
+    """
+    name = symbol_block_name(block)
+    if not name:
+        raise ValueError("Fragment is not a symbol definition")
+
+    prefix = "(kicad_symbol_lib\n"
+    spans = scan_symbols(f"{prefix}{block}\n)")
+    if (
+        len(spans) != 1
+        or spans[0].start != len(prefix)
+        or spans[0].end != len(prefix) + len(block)
+    ):
+        raise ValueError(f"Fragment for symbol '{name}' is not balanced")
+    return name
+
+
+def scan_symbols(text: str) -> List[SymbolSpan]:
+    """Return the spans of all top-level symbols in a ``.kicad_sym`` text.
+
+    Unit sub-symbols (nested ``symbol`` blocks) are part of their parent's span.
+    """
+    spans: List[SymbolSpan] = []
+    depth = 0
+    start = -1
+    name = ""
+
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group()
+        if token == "(":
+            depth += 1
+            if depth == 2:
+                head = _SYMBOL_HEAD_RE.match(text, match.start())
+                if head:
+                    start = match.start()
+                    name = unescape_name(head.group(1))
+        elif token == ")":
+            if depth == 2 and start >= 0:
+                spans.append(SymbolSpan(name, start, match.end()))
+                start = -1
+            depth -= 1
+
+    return spans
+
+
+def lib_version(text: str) -> int:
+    """Return the ``(version N)`` of a symbol library header, or 0 if missing."""
+    match = _VERSION_RE.search(text, 0, 500)
+    return int(match.group(1)) if match else 0
+
+
+def library_header(text: str) -> str:
+    """Return the text in front of the first symbol (or of the closing bracket)."""
+    head = _SYMBOL_HEAD_RE.search(text)
+    if head:
+        line_start = text.rfind("\n", 0, head.start()) + 1
+        return text[:line_start].rstrip() or text[: head.start()].rstrip()
+    close = text.rstrip().rfind(")")
+    return text[:close].rstrip() if close > 0 else DEFAULT_HEADER
+
+
+def split_library(text: str) -> Optional[tuple]:
+    """Split a ``.kicad_sym`` text into ``(header, indent, spans)``.
+
+    ``header`` is everything before the first symbol (or before the closing
+    bracket of an empty library) and ``indent`` the whitespace KiCad puts in
+    front of each top-level symbol. Returns None if the text is not a library.
+    """
+    stripped = text.lstrip()
+    if not stripped.startswith("(kicad_symbol_lib"):
+        return None
+
+    spans = scan_symbols(text)
+    if spans:
+        header_end = spans[0].start
+    else:
+        header_end = text.rstrip().rfind(")")
+        if header_end < 0:
+            return None
+
+    line_start = text.rfind("\n", 0, header_end) + 1
+    indent = text[line_start:header_end]
+    if indent.strip():
+        indent = "\t"
+    header = text[:line_start].rstrip() if spans else text[:header_end].rstrip()
+    return header, indent, spans
+
+
+def build_library(header: str, indent: str, blocks: List[str]) -> str:
+    """Assemble a ``.kicad_sym`` text from a header and symbol blocks."""
+    body = "".join(f"\n{indent}{block}" for block in blocks)
+    return f"{header}{body}\n)\n"
+
+
+def legacy_symbol_names(text: str) -> List[str]:
+    """Return the symbol and alias names defined in a legacy ``.lib`` text."""
+    names = [name.lstrip("~") for name in _LEGACY_DEF_RE.findall(text)]
+    for aliases in _LEGACY_ALIAS_RE.findall(text):
+        names.extend(aliases.split())
+    return names
+
+
+class SymbolLibWriter:
+    """
+    Edits a ``.kicad_sym`` file one symbol at a time.
+
+    Only the span of the affected symbol is located and spliced; the rest of
+    the library is kept byte for byte and never parsed. ``save()`` writes the
+    result atomically through a temporary file in the same directory.
+    """
+
+    def __init__(self, path, header: str = DEFAULT_HEADER) -> None:
+        self.path = Path(path)
+        self.header = header
+        try:
+            self.original: Optional[str] = self.path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self.original = None
+        self.text = self.original or ""
+        self.modified = False
+
+    def find(self, name: str) -> Optional[SymbolSpan]:
+        return find_symbol(self.text, name) if self.text.strip() else None
+
+    def get(self, name: str) -> Optional[str]:
+        """Return the text of a symbol block, or None if it does not exist."""
+        span = self.find(name)
+        return self.text[span.start : span.end] if span else None
+
+    def names(self) -> List[str]:
+        return [span.name for span in scan_symbols(self.text)]
+
+    def _symbol_indent(self) -> str:
+        """Return the indentation used in front of top-level symbols."""
+        head = _SYMBOL_HEAD_RE.search(self.text)
+        if head:
+            line_start = self.text.rfind("\n", 0, head.start()) + 1
+            indent = self.text[line_start : head.start()]
+            if not indent.strip():
+                return indent
+        return "\t"
+
+    def put(self, block: str, overwrite: bool = True) -> str:
+        """
+        Add or replace a symbol block.
+
+        Returns:
+            "created", "added", "updated" or "skipped"
+        """
+        block = block.strip()
+        name = verify_symbol_block(block)
+
+        if not self.text.strip():
+            self.text = build_library(self.header, "\t", [block])
+            self.modified = True
+            return "created"
+
+        span = self.find(name)
+        if span:
+            if not overwrite:
+                return "skipped"
+            self.text = self.text[: span.start] + block + self.text[span.end :]
+            self.modified = True
+            return "updated"
+
+        close = self.text.rstrip().rfind(")")
+        if close < 0:
+            raise ValueError(f"Invalid symbol library: {self.path}")
+        self.text = (
+            self.text[:close].rstrip()
+            + f"\n{self._symbol_indent()}{block}\n"
+            + self.text[close:]
+        )
+        self.modified = True
+        return "added"
+
+    def remove(self, name: str) -> bool:
+        """Remove a symbol block; returns False if it does not exist."""
+        span = self.find(name)
+        if not span:
+            return False
+        line_start = self.text.rfind("\n", 0, span.start)
+        start = line_start if not self.text[line_start + 1 : span.start].strip() else span.start
+        self.text = self.text[:start] + self.text[span.end :]
+        self.modified = True
+        return True
+
+    def _write(self, text: str) -> None:
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def save(self) -> None:
+        """Atomically write the library if it was modified."""
+        if self.modified:
+            self._write(self.text)
+            self.modified = False
+            logger.debug(f"Saved symbol library {self.path}")
+
+    def revert(self) -> None:
+        """Restore the file content from before this writer was created."""
+        if self.original is None:
+            self.path.unlink(missing_ok=True)
+        else:
+            self._write(self.original)
+        self.text = self.original or ""
+        self.modified = False
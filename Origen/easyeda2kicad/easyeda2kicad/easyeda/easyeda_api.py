@@ -18,14 +18,26 @@ ENDPOINT_3D_MODEL_STEP = "https://modules.easyeda.com/qAxj6KHrDKw4blvCG8QJPs7Y/{
 
 
 class EasyedaApi:
-    def __init__(self) -> None:
+    def __init__(self, session=None, cache=None) -> None:
+        """
+        ``session`` is an optional shared HTTP session with a
+        ``get(url, headers=..., timeout=...)`` method returning an object with
+        ``status`` and ``body``. Without it every request opens its own
+        connection through urllib.
+
+        ``cache`` is an optional response cache with ``get(key, allow_stale=False)``
+        and ``put(key, data)``. CAD data and 3D models are served from it while
+        fresh, and stale entries are used when the download fails.
+        """
         self.headers = {
             "Accept-Encoding": "gzip, deflate",
             "Accept": "application/json, text/javascript, */*; q=0.01",
             "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
             "User-Agent": f"easyeda2kicad v{__version__}",
         }
-        self.ssl_context = self._create_ssl_context()
+        self.session = session
+        self.cache = cache
+        self.ssl_context = None if session is not None else self._create_ssl_context()
 
     def _create_ssl_context(self) -> ssl.SSLContext:
         """Create SSL context with proper certificate handling for macOS."""
@@ -62,25 +74,30 @@ class EasyedaApi:
         logging.info("Using system default SSL certificates")
         return context
 
+    def _get(self, url: str, headers: dict) -> tuple:
+        """GET ``url`` and return ``(status, body)``."""
+        if self.session is not None:
+            response = self.session.get(url, headers=headers, timeout=30)
+            return response.status, response.body
+        req = urllib.request.Request(url=url, headers=headers)
+        with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as response:
+            return response.status, response.read()
+
     def get_info_from_easyeda_api(self, lcsc_id: str) -> dict:
         try:
-            req = urllib.request.Request(
-                url=API_ENDPOINT.format(lcsc_id=lcsc_id), headers=self.headers
-            )
-            with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as response:
-                raw_data = response.read()
-                # Handle gzip compression
-                if raw_data[:2] == b"\x1f\x8b":  # gzip magic number
-                    import gzip
-
-                    data = gzip.decompress(raw_data).decode("utf-8")
-                else:
-                    data = raw_data.decode("utf-8")
-                try:
-                    api_response = json.loads(data)
-                except json.JSONDecodeError as e:
-                    logging.error(f"Invalid JSON response from API: {e}")
-                    return {}
+            _, raw_data = self._get(API_ENDPOINT.format(lcsc_id=lcsc_id), self.headers)
+            # Handle gzip compression
+            if raw_data[:2] == b"\x1f\x8b":  # gzip magic number
+                import gzip
+
+                data = gzip.decompress(raw_data).decode("utf-8")
+            else:
+                data = raw_data.decode("utf-8")
+            try:
+                api_response = json.loads(data)
+            except json.JSONDecodeError as e:
+                logging.error(f"Invalid JSON response from API: {e}")
+                return {}
 
             if not api_response or (
                 "code" in api_response and api_response["success"] is False
@@ -89,46 +106,61 @@ class EasyedaApi:
                 return {}
 
             return api_response
-        except (urllib.error.URLError, json.JSONDecodeError) as e:
+        except (OSError, json.JSONDecodeError) as e:
             logging.error(f"API request failed: {e}")
             return {}
 
+    def _cached(self, key: str, allow_stale: bool = False):
+        if self.cache is None:
+            return None
+        return self.cache.get(key, allow_stale=allow_stale)
+
     def get_cad_data_of_component(self, lcsc_id: str) -> dict:
+        key = f"cad/{lcsc_id}"
+        cached = self._cached(key)
+        if cached is not None:
+            return json.loads(cached)["result"]
+
         cp_cad_info = self.get_info_from_easyeda_api(lcsc_id=lcsc_id)
         if cp_cad_info == {}:
-            return {}
+            cached = self._cached(key, allow_stale=True)
+            if cached is None:
+                return {}
+            logging.info(f"Using cached CAD data for {lcsc_id}")
+            return json.loads(cached)["result"]
+
+        if self.cache is not None:
+            self.cache.put(key, json.dumps(cp_cad_info).encode("utf-8"))
         return cp_cad_info["result"]
 
-    def get_raw_3d_model_obj(self, uuid: str) -> str:
+    def _download(self, key: str, url: str, what: str, uuid: str) -> bytes:
+        """GET a 3D model file, using the cache when it is fresh or the download fails."""
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
         try:
-            req = urllib.request.Request(
-                url=ENDPOINT_3D_MODEL.format(uuid=uuid),
-                headers={"User-Agent": self.headers["User-Agent"]},
-            )
-            with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as response:
-                if response.status != 200:
-                    logging.error(
-                        f"No raw 3D model data found for uuid:{uuid} on easyeda"
-                    )
-                    return None
-                return response.read().decode()
-        except urllib.error.URLError as e:
-            logging.error(f"Failed to get 3D model for uuid:{uuid}: {e}")
-            return None
+            status, body = self._get(url, {"User-Agent": self.headers["User-Agent"]})
+            if status == 200:
+                if self.cache is not None:
+                    self.cache.put(key, body)
+                return body
+            logging.error(f"No {what} data found for uuid:{uuid} on easyeda")
+        except OSError as e:
+            logging.error(f"Failed to get {what} for uuid:{uuid}: {e}")
+
+        cached = self._cached(key, allow_stale=True)
+        if cached is not None:
+            logging.info(f"Using cached {what} for uuid:{uuid}")
+        return cached
+
+    def get_raw_3d_model_obj(self, uuid: str) -> str:
+        body = self._download(
+            f"obj/{uuid}", ENDPOINT_3D_MODEL.format(uuid=uuid), "raw 3D model", uuid
+        )
+        return body.decode() if body is not None else None
 
     def get_step_3d_model(self, uuid: str) -> bytes:
-        try:
-            req = urllib.request.Request(
-                url=ENDPOINT_3D_MODEL_STEP.format(uuid=uuid),
-                headers={"User-Agent": self.headers["User-Agent"]},
-            )
-            with urllib.request.urlopen(req, timeout=30, context=self.ssl_context) as response:
-                if response.status != 200:
-                    logging.error(
-                        f"No step 3D model data found for uuid:{uuid} on easyeda"
-                    )
-                    return None
-                return response.read()
-        except urllib.error.URLError as e:
-            logging.error(f"Failed to get STEP model for uuid:{uuid}: {e}")
-            return None
+        return self._download(
+            f"step/{uuid}", ENDPOINT_3D_MODEL_STEP.format(uuid=uuid), "step 3D model", uuid
+        )
@@ -354,9 +354,15 @@ class EasyedaFootprintImporter:
 
 
 class Easyeda3dModelImporter:
-    def __init__(self, easyeda_cp_cad_data, download_raw_3d_model: bool):
+    def __init__(
+        self,
+        easyeda_cp_cad_data,
+        download_raw_3d_model: bool,
+        api: Union[EasyedaApi, None] = None,
+    ):
         self.input = easyeda_cp_cad_data
         self.download_raw_3d_model = download_raw_3d_model
+        self.api = api
         self.output = self.create_3d_model()
 
     def create_3d_model(self) -> Union[Ee3dModel, None]:
@@ -369,8 +375,9 @@ class Easyeda3dModelImporter:
         if model_3d_info := self.get_3d_model_info(ee_data=ee_data):
             model_3d: Ee3dModel = self.parse_3d_model_info(info=model_3d_info)
             if self.download_raw_3d_model:
-                model_3d.raw_obj = EasyedaApi().get_raw_3d_model_obj(uuid=model_3d.uuid)
-                model_3d.step = EasyedaApi().get_step_3d_model(uuid=model_3d.uuid)
+                api = self.api or EasyedaApi()
+                model_3d.raw_obj = api.get_raw_3d_model_obj(uuid=model_3d.uuid)
+                model_3d.step = api.get_step_3d_model(uuid=model_3d.uuid)
             return model_3d
 
         logging.warning("No 3D model available for this component")
@@ -5,8 +5,15 @@ Convert 3D model from .obj format to .wrl with colors
 from __future__ import annotations
 
 # Global imports
+import io
 import re
-import textwrap
+from dataclasses import dataclass
+from typing import Any, List, TextIO
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 from ..easyeda.parameters_easyeda import Ee3dModel
 from .parameters_kicad_footprint import Ki3dModel
@@ -15,6 +22,54 @@ VRML_HEADER = """#VRML V2.0 utf8
 # 3D model generated by easyeda2kicad.py (https://github.com/uPesy/easyeda2kicad.py)
 """
 
+# OBJ coordinates are in mm, KiCad's VRML unit is 0.1 inch
+MM_PER_VRML_UNIT = 2.54
+
+# Points / indices formatted per write call
+CHUNK_SIZE = 4096
+
+SHAPE_HEADER = """
+Shape{{
+    appearance Appearance {{
+        material  Material 	{{
+            diffuseColor {diffuse}
+            specularColor {specular}
+            ambientIntensity 0.2
+            transparency 0
+            shininess 0.5
+        }}
+    }}
+    geometry IndexedFaceSet {{
+        ccw TRUE
+        solid FALSE
+        coord DEF co Coordinate {{
+            point [
+                """
+
+SHAPE_INDEX = """
+            ]
+        }}
+        coordIndex [
+            """
+
+SHAPE_FOOTER = """
+        ]
+    }
+}"""
+
+_VERTEX_LINE = re.compile(r"^v (.*)$", re.MULTILINE)
+_FACE_LINE = re.compile(r"^f(.*)$", re.MULTILINE)
+
+# Drops the texture / normal part of a face vertex ("12/4/7", "12//7", "12//")
+_FACE_VERTEX_SUFFIX = re.compile(r"/\S*")
+
+
+@dataclass
+class ObjShape:
+    material: dict
+    points: Any  # (n, 3) coordinates in VRML units, ndarray or list of tuples
+    coord_index: Any  # local point indices, -1 after each face
+
 
 def get_materials(obj_data: str) -> dict:
 
@@ -42,85 +97,126 @@ def get_materials(obj_data: str) -> dict:
     return materials
 
 
-def get_vertices(obj_data: str) -> list:
-    vertices_regex = "v (.*?)\n"
-    matchs = re.findall(pattern=vertices_regex, string=obj_data, flags=re.DOTALL)
+def split_obj(obj_data: str):
+    """
+    Split the OBJ text into its vertex lines and, per ``usemtl`` shape, the
+    material id and the face text. Each face starts with a 0 marker (OBJ
+    indices start at 1) so faces of any size stay separable.
+    """
+    vertex_lines = _VERTEX_LINE.findall(obj_data)
+    shape_faces = []
+    for shape in obj_data.split("usemtl")[1:]:
+        material_line, *body = shape.splitlines()
+        face_text = " 0".join([""] + _FACE_LINE.findall("\n".join(body)))
+        shape_faces.append(
+            (material_line.replace(" ", ""), _FACE_VERTEX_SUFFIX.sub("", face_text))
+        )
+    return vertex_lines, shape_faces
+
+
+def _parse_obj_numpy(vertex_lines: List[str], shape_faces) -> List[tuple]:
+    vertices = np.fromstring(" ".join(vertex_lines), dtype=np.float64, sep=" ")
+    vertices = vertices.reshape(len(vertex_lines), -1)[:, :3] / MM_PER_VRML_UNIT
+
+    shapes = []
+    for material_id, face_text in shape_faces:
+        # "0 a b c 0 d e f" -> "a b c 0 d e f 0": markers now end the faces
+        flat = np.fromstring(face_text, dtype=np.int64, sep=" ")
+        sequence = np.append(flat[1:], 0)
+        face_end = sequence == 0
+        used, local = np.unique(sequence[~face_end], return_inverse=True)
+        coord_index = np.full(sequence.shape, -1, dtype=np.int64)
+        coord_index[~face_end] = local
+        shapes.append((material_id, vertices[used - 1], coord_index))
+    return shapes
+
+
+def _parse_obj_python(vertex_lines: List[str], shape_faces) -> List[tuple]:
+    vertices = [
+        tuple(float(coord) / MM_PER_VRML_UNIT for coord in line.split()[:3])
+        for line in vertex_lines
+    ]
 
+    shapes = []
+    for material_id, face_text in shape_faces:
+        sequence = [int(index) for index in face_text.split()[1:]] + [0]
+        used = sorted(set(sequence) - {0})
+        local = {index: position for position, index in enumerate(used)}
+        coord_index = [local[index] if index else -1 for index in sequence]
+        shapes.append((material_id, [vertices[index - 1] for index in used], coord_index))
+    return shapes
+
+
+def parse_obj(obj_data: str, use_numpy: bool = True) -> List[ObjShape]:
+    """
+    Parse the OBJ text into one ``ObjShape`` per material. The points of each
+    shape are the vertices its faces use, in index order, scaled to VRML units.
+    NumPy is used when it is installed.
+    """
+    materials = get_materials(obj_data=obj_data)
+    vertex_lines, shape_faces = split_obj(obj_data)
+    if use_numpy and np is not None:
+        parsed = _parse_obj_numpy(vertex_lines, shape_faces)
+    else:
+        parsed = _parse_obj_python(vertex_lines, shape_faces)
     return [
-        " ".join([str(round(float(coord) / 2.54, 4)) for coord in vertice.split(" ")])
-        for vertice in matchs
+        ObjShape(material=materials[material_id], points=points, coord_index=coord_index)
+        for material_id, points, coord_index in parsed
     ]
 
 
-def generate_wrl_model(model_3d: Ee3dModel) -> Ki3dModel:
-    materials = get_materials(obj_data=model_3d.raw_obj)
-    vertices = get_vertices(obj_data=model_3d.raw_obj)
+def _chunks(values, size: int):
+    """Yield plain Python lists of ``size`` items (rows for 2-D arrays)"""
+    for start in range(0, len(values), size):
+        chunk = values[start : start + size]
+        yield chunk.tolist() if np is not None and isinstance(chunk, np.ndarray) else chunk
 
-    raw_wrl = VRML_HEADER
-    shapes = model_3d.raw_obj.split("usemtl")[1:]
+
+def write_wrl(shapes: List[ObjShape], stream: TextIO) -> None:
+    """Stream the VRML of the parsed shapes to ``stream``"""
+    stream.write(VRML_HEADER)
     for shape in shapes:
-        lines = shape.splitlines()
-        material = materials[lines[0].replace(" ", "")]
-        index_counter = 0
-        link_dict = {}
-        coord_index = []
-        points = []
-        for line in lines[1:]:
-            if len(line) > 0:
-                face = [int(index) for index in line.replace("//", "").split(" ")[1:]]
-                face_index = []
-                for index in face:
-                    if index not in link_dict:
-                        link_dict[index] = index_counter
-                        face_index.append(str(index_counter))
-                        points.append(vertices[index - 1])
-                        index_counter += 1
-                    else:
-                        face_index.append(str(link_dict[index]))
-                face_index.append("-1")
-                coord_index.append(",".join(face_index) + ",")
-        points.insert(-1, points[-1])
-
-        shape_str = textwrap.dedent(
-            f"""
-            Shape{{
-                appearance Appearance {{
-                    material  Material 	{{
-                        diffuseColor {' '.join(material['diffuse_color'])}
-                        specularColor {' '.join(material['specular_color'])}
-                        ambientIntensity 0.2
-                        transparency 0
-                        shininess 0.5
-                    }}
-                }}
-                geometry IndexedFaceSet {{
-                    ccw TRUE
-                    solid FALSE
-                    coord DEF co Coordinate {{
-                        point [
-                            {(", ").join(points)}
-                        ]
-                    }}
-                    coordIndex [
-                        {"".join(coord_index)}
-                    ]
-                }}
-            }}"""
+        stream.write(
+            SHAPE_HEADER.format(
+                diffuse=" ".join(shape.material["diffuse_color"]),
+                specular=" ".join(shape.material["specular_color"]),
+            )
         )
+        separator = ""
+        for chunk in _chunks(shape.points, CHUNK_SIZE):
+            # Coordinates are only rounded here, so both parsers give the same text
+            coords = [coord for point in chunk for coord in point]
+            stream.write(separator + ", ".join(["%.4f %.4f %.4f"] * len(chunk)) % tuple(coords))
+            separator = ", "
+
+        stream.write(SHAPE_INDEX)
+        for chunk in _chunks(shape.coord_index, CHUNK_SIZE * 4):
+            stream.write("%d," * len(chunk) % tuple(chunk))
+        stream.write(SHAPE_FOOTER)
 
-        raw_wrl += shape_str
 
+def generate_wrl_model(model_3d: Ee3dModel) -> Ki3dModel:
+    raw_wrl = io.StringIO()
+    write_wrl(parse_obj(model_3d.raw_obj), raw_wrl)
     return Ki3dModel(
-        translation=None, rotation=None, name=model_3d.name, raw_wrl=raw_wrl
+        translation=None, rotation=None, name=model_3d.name, raw_wrl=raw_wrl.getvalue()
     )
 
 
 class Exporter3dModelKicad:
+    """
+    The OBJ model is parsed when the exporter is created; the VRML text is
+    only produced by ``export()``, streamed straight into the .wrl file.
+    """
+
     def __init__(self, model_3d: Ee3dModel):
         self.input = model_3d
+        self.shapes = (
+            parse_obj(model_3d.raw_obj) if model_3d and model_3d.raw_obj else None
+        )
         self.output = (
-            generate_wrl_model(model_3d=model_3d)
-            if model_3d and model_3d.raw_obj
+            Ki3dModel(translation=None, rotation=None, name=model_3d.name)
+            if self.shapes is not None
             else None
         )
         self.output_step = model_3d.step
@@ -132,10 +228,10 @@ class Exporter3dModelKicad:
                 mode="w",
                 encoding="utf-8",
             ) as my_lib:
-                my_lib.write(self.output.raw_wrl)
+                write_wrl(self.shapes, my_lib)
         if self.output_step:
             with open(
-                file=f"{lib_path}.3dshapes/{self.output.name}.step",
+                file=f"{lib_path}.3dshapes/{self.input.name}.step",
                 mode="wb",
             ) as my_lib:
                 my_lib.write(self.output_step)
@@ -4,7 +4,7 @@ import re
 import textwrap
 from dataclasses import dataclass, field, fields
 from enum import Enum, auto
-from typing import List, Union
+from typing import List, Optional, Sequence, Tuple, Union
 
 
 class KicadVersion(Enum):
@@ -130,6 +130,113 @@ class KiExportConfigV6(Enum):
     FIELD_OFFSET_INCREMENT = 2.54
 
 
+# Current formats, written directly in the layout KiCad itself saves, so no
+# kicad-cli upgrade is needed. Only formats checked against libraries saved by
+# that KiCad version are listed; other libraries go through kicad-cli.
+class KiSymbolFormat(Enum):
+    v9 = 20241209
+
+    @property
+    def kicad_major(self) -> int:
+        return int(self.name[1:])
+
+    @classmethod
+    def for_library_version(cls, version: int) -> Optional["KiSymbolFormat"]:
+        """Format of a library with this (version N), None if it is not a listed one"""
+        return next((fmt for fmt in cls if fmt.value == version), None)
+
+    @classmethod
+    def for_kicad_major(cls, major: int) -> Optional["KiSymbolFormat"]:
+        formats = [fmt for fmt in cls if fmt.kicad_major <= major]
+        return max(formats, key=lambda fmt: fmt.value) if formats else None
+
+    def library_header(self) -> str:
+        return (
+            "(kicad_symbol_lib\n"
+            f"\t(version {self.value})\n"
+            '\t(generator "kicad_symbol_editor")\n'
+            f'\t(generator_version "{self.kicad_major}.0")'
+        )
+
+
+# KiCad adds consecutive (xy ...) points to a line while it is shorter than
+# this many characters, indentation included
+XY_COLUMN_LIMIT = 99
+
+
+def ki_num(value: Union[int, float], digits: int = 4) -> str:
+    """Format a number like KiCad does: fixed precision without trailing zeros"""
+    text = f"{value:.{digits}f}".rstrip("0").rstrip(".")
+    return "0" if text in ("", "-0") else text
+
+
+def ki_str(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def ki_text(text: str, file_format: KiSymbolFormat) -> str:
+    # KiCad 9 saves an empty pin name or number as a lone "~"
+    return ki_str(text or "~")
+
+
+def format_sexpr(node: list, depth: int = 0) -> str:
+    """
+    Format a nested list as KiCad does: lists holding only atoms stay on one
+    line, every other list is opened on its own line with tab indentation.
+    The first line is not indented, the following ones are.
+    """
+    atoms = [item for item in node if not isinstance(item, list)]
+    children = [item for item in node if isinstance(item, list)]
+    head = "(" + " ".join(atoms)
+    if not children:
+        return head + ")"
+
+    indent = "\t" * (depth + 1)
+    lines = [head]
+    if node[0] == "pts":
+        line = indent
+        for child in children:
+            point = format_sexpr(child, depth + 1)
+            if line != indent and len(line) >= XY_COLUMN_LIMIT:
+                lines.append(line)
+                line = indent
+            line += point if line == indent else " " + point
+        lines.append(line)
+    else:
+        lines.extend(indent + format_sexpr(child, depth + 1) for child in children)
+    lines.append("\t" * depth + ")")
+    return "\n".join(lines)
+
+
+def ki_effects(font_size: float, hide: bool = False) -> list:
+    effects = ["effects", ["font", ["size", ki_num(font_size), ki_num(font_size)]]]
+    if hide:
+        effects.append(["hide", "yes"])
+    return effects
+
+
+def ki_property(key: str, value: str, pos_y: float = 0, hide: bool = False) -> list:
+    return [
+        "property",
+        ki_str(key),
+        ki_str(value),
+        ["at", "0", ki_num(pos_y, 2), "0"],
+        ki_effects(KiExportConfigV6.PROPERTY_FONT_SIZE.value, hide=hide),
+    ]
+
+
+def ki_stroke_and_fill(fill: KiBoxFill) -> List[list]:
+    return [
+        [
+            "stroke",
+            ["width", ki_num(KiExportConfigV6.DEFAULT_BOX_LINE_WIDTH.value)],
+            ["type", "default"],
+        ],
+        ["fill", ["type", fill.name]],
+    ]
+
+
 # ---------------- INFO HEADER ----------------
 @dataclass
 class KiSymbolInfo:
@@ -312,6 +419,40 @@ class KiSymbolInfo:
 
         return header
 
+    def export_sexpr(self) -> List[list]:
+        # Footprint, Datasheet and Description are mandatory fields since KiCad 8
+        field_offset_y = KiExportConfigV6.FIELD_OFFSET_START.value
+        properties = [
+            ki_property("Reference", self.prefix, self.y_high + field_offset_y),
+            ki_property("Value", self.name, self.y_low - field_offset_y),
+        ]
+        optional_fields = [
+            ("Footprint", self.package),
+            ("Datasheet", self.datasheet),
+        ]
+        for key, value in optional_fields:
+            if value:
+                field_offset_y += KiExportConfigV6.FIELD_OFFSET_INCREMENT.value
+                properties.append(
+                    ki_property(key, value, self.y_low - field_offset_y, hide=True)
+                )
+            else:
+                properties.append(ki_property(key, "", hide=True))
+        properties.append(ki_property("Description", "", hide=True))
+
+        user_fields = [
+            ("Manufacturer", self.manufacturer),
+            ("LCSC Part", self.lcsc_id),
+            ("JLC Part", self.jlc_id),
+        ]
+        for key, value in user_fields:
+            if value:
+                field_offset_y += KiExportConfigV6.FIELD_OFFSET_INCREMENT.value
+                properties.append(
+                    ki_property(key, value, self.y_low - field_offset_y, hide=True)
+                )
+        return properties
+
 
 # ---------------- PIN ----------------
 @dataclass
@@ -375,6 +516,33 @@ class KiSymbolPin:
             num_size=KiExportConfigV6.PIN_NUM_SIZE.value,
         )
 
+    def export_sexpr(self, file_format: KiSymbolFormat) -> list:
+        return [
+            "pin",
+            self.type.name[1:] if self.type.name.startswith("_") else self.type.name,
+            self.style.name,
+            [
+                "at",
+                ki_num(self.pos_x, 2),
+                ki_num(self.pos_y, 2),
+                ki_num((180 + self.orientation) % 360),
+            ],
+            ["length", ki_num(self.length)],
+            [
+                "name",
+                ki_text(
+                    apply_pin_name_style(pin_name=self.name, kicad_version=KicadVersion.v6),
+                    file_format,
+                ),
+                ki_effects(KiExportConfigV6.PIN_NAME_SIZE.value),
+            ],
+            [
+                "number",
+                ki_text(self.number, file_format),
+                ki_effects(KiExportConfigV6.PIN_NUM_SIZE.value),
+            ],
+        ]
+
 
 # ---------------- RECTANGLE ----------------
 @dataclass
@@ -411,6 +579,14 @@ class KiSymbolRectangle:
             fill=KiBoxFill.background.name,
         )
 
+    def export_sexpr(self, file_format: KiSymbolFormat) -> list:
+        return [
+            "rectangle",
+            ["start", ki_num(self.pos_x0, 2), ki_num(self.pos_y0, 2)],
+            ["end", ki_num(self.pos_x1, 2), ki_num(self.pos_y1, 2)],
+            *ki_stroke_and_fill(KiBoxFill.background),
+        ]
+
 
 # ---------------- POLYGON ----------------
 @dataclass
@@ -452,6 +628,15 @@ class KiSymbolPolygon:
             fill=KiBoxFill.background.name if self.is_closed else KiBoxFill.none.name,
         )
 
+    def export_sexpr(self, file_format: KiSymbolFormat) -> list:
+        return [
+            "polyline",
+            ["pts", *(["xy", ki_num(x, 2), ki_num(y, 2)] for x, y in self.points)],
+            *ki_stroke_and_fill(
+                KiBoxFill.background if self.is_closed else KiBoxFill.none
+            ),
+        ]
+
 
 # ---------------- CIRCLE ----------------
 @dataclass
@@ -494,6 +679,16 @@ class KiSymbolCircle:
             ),
         )
 
+    def export_sexpr(self, file_format: KiSymbolFormat) -> list:
+        return [
+            "circle",
+            ["center", ki_num(self.pos_x, 2), ki_num(self.pos_y, 2)],
+            ["radius", ki_num(self.radius, 2)],
+            *ki_stroke_and_fill(
+                KiBoxFill.background if self.background_filling else KiBoxFill.none
+            ),
+        ]
+
 
 # ---------------- ARC ----------------
 @dataclass
@@ -557,6 +752,19 @@ class KiSymbolArc:
             ),
         )
 
+    def export_sexpr(self, file_format: KiSymbolFormat) -> list:
+        return [
+            "arc",
+            ["start", ki_num(self.start_x, 2), ki_num(self.start_y, 2)],
+            ["mid", ki_num(self.middle_x, 2), ki_num(self.middle_y, 2)],
+            ["end", ki_num(self.end_x, 2), ki_num(self.end_y, 2)],
+            *ki_stroke_and_fill(
+                KiBoxFill.background
+                if self.angle_start == self.angle_end
+                else KiBoxFill.none
+            ),
+        ]
+
 
 # ---------------- BEZIER CURVE ----------------
 @dataclass
@@ -596,6 +804,15 @@ class KiSymbolBezier:
             fill=KiBoxFill.background.name if self.is_closed else KiBoxFill.none.name,
         )
 
+    def export_sexpr(self, file_format: KiSymbolFormat) -> list:
+        return [
+            "bezier",
+            ["pts", *(["xy", ki_num(x, 2), ki_num(y, 2)] for x, y in self.points)],
+            *ki_stroke_and_fill(
+                KiBoxFill.background if self.is_closed else KiBoxFill.none
+            ),
+        ]
+
 
 # ---------------- SYMBOL ----------------
 @dataclass
@@ -672,3 +889,38 @@ class KiSymbol:
     def export(self, kicad_version: KicadVersion) -> str:
         component_data = getattr(self, f"export_{kicad_version.name}")()
         return re.sub(r"\n\s*\n", "\n", component_data, re.MULTILINE)
+
+    def export_sexpr(
+        self,
+        file_format: KiSymbolFormat,
+        extra_fields: Sequence[Tuple[str, str]] = (),
+    ) -> str:
+        """
+        Return the symbol block in the given current format, indented for a
+        top-level symbol of a library. ``extra_fields`` are added as hidden
+        properties.
+        """
+        self.info.y_low = min(pin.pos_y for pin in self.pins) if self.pins else 0
+        self.info.y_high = max(pin.pos_y for pin in self.pins) if self.pins else 0
+
+        library_id = sanitize_fields(self.info.name)
+        graphic_items = itertools.chain(
+            self.rectangles, self.circles, self.arcs, self.polygons, self.beziers
+        )
+        unit_items = [item.export_sexpr(file_format) for item in graphic_items]
+        unit_items += [pin.export_sexpr(file_format) for pin in self.pins]
+
+        symbol = [
+            "symbol",
+            ki_str(library_id),
+            ["exclude_from_sim", "no"],
+            ["in_bom", "yes"],
+            ["on_board", "yes"],
+            *self.info.export_sexpr(),
+            *(ki_property(key, value, hide=True) for key, value in extra_fields),
+        ]
+        if unit_items:
+            symbol.append(["symbol", ki_str(f"{library_id}_0_1"), *unit_items])
+        if file_format.value >= KiSymbolFormat.v9.value:
+            symbol.append(["embedded_fonts", "no"])
+        return format_sexpr(symbol, depth=1)
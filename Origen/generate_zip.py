@@ -49,6 +49,15 @@ INCLUDE_FOLDERS = [
     'KiCadImport',
     'KiCadGitLab',
     'KiCadSettingsPaths',
+    'SymbolLibFile',
+    'LegacySymbolLib',
+    'LegacyFootprint',
+    'ModelStore',
+    'SqliteIndex',
+    'LibraryIndex',
+    'HttpSession',
+    'ResponseCache',
+    'LogChannel',
     'kicad_cli',
     'easyeda2kicad',
     'kiutils',
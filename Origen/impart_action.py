@@ -16,9 +16,8 @@ import re
 import socket
 import logging
 from pathlib import Path
-from time import sleep
 from threading import Thread
-from typing import Optional, List, Tuple, Any
+from typing import List, Tuple, Any
 
 # Setup paths for local imports
 script_dir = Path(__file__).resolve().parent
@@ -81,7 +80,7 @@ try:
     from .i18n import _ as tr, init as i18n_init
     from .impart_backend import ImpartBackend, check_library_import, create_backend_handler
     from .impart_frontend_search import SearchMixin
-    from .impart_frontend_library import LibraryMixin
+    from .impart_frontend_library import LibraryMixin, LibraryListCtrl
     from .impart_frontend_profile import ProfileMixin
     from .impart_frontend_kicad_search import KiCadSearchMixin
     from .impart_frontend_blocks import DesignBlocksMixin
@@ -100,7 +99,7 @@ except ImportError as e1:
         from i18n import _ as tr, init as i18n_init
         from impart_backend import ImpartBackend, check_library_import, create_backend_handler
         from impart_frontend_search import SearchMixin
-        from impart_frontend_library import LibraryMixin
+        from impart_frontend_library import LibraryMixin, LibraryListCtrl
         from impart_frontend_profile import ProfileMixin
         from impart_frontend_kicad_search import KiCadSearchMixin
         from impart_frontend_blocks import DesignBlocksMixin
@@ -122,6 +121,9 @@ except ImportError as e1:
 # Event handling
 EVT_UPDATE_ID = wx.NewIdRef()
 
+# Entries shown per page in the history tab
+HISTORY_PAGE_SIZE = 500
+
 
 def EVT_UPDATE(win: wx.Window, func: Any) -> None:
     """Bind update event to window."""
@@ -131,7 +133,7 @@ def EVT_UPDATE(win: wx.Window, func: Any) -> None:
 class ResultEvent(wx.PyEvent):
     """Custom event for thread communication."""
 
-    def __init__(self, data: str) -> None:
+    def __init__(self, data: Any) -> None:
         wx.PyEvent.__init__(self)
         self.SetEventType(EVT_UPDATE_ID)
         self.data = data
@@ -160,29 +162,6 @@ class FileDropTarget(wx.FileDropTarget):
             return False
 
 
-class PluginThread(Thread):
-    """Background thread for monitoring import status."""
-
-    def __init__(self, wx_object: wx.Window, backend) -> None:
-        Thread.__init__(self)
-        self.wx_object = wx_object
-        self.backend = backend
-        self.stop_thread = False
-        self.start()
-
-    def run(self) -> None:
-        len_str = 0
-        while not self.stop_thread:
-            current_len = len(self.backend.print_buffer)
-            if len_str != current_len:
-                self.report(self.backend.print_buffer)
-                len_str = current_len
-            sleep(0.5)
-
-    def report(self, status: str) -> None:
-        wx.PostEvent(self.wx_object, ResultEvent(status))
-
-
 instance_manager = SingleInstanceManager()
 atexit.register(instance_manager.stop_server)
 
@@ -232,12 +211,15 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
             logging.warning(f"Could not set window icon: {e}")
 
         self.backend = create_backend_handler()
-        self.thread: Optional[PluginThread] = None
+        self._log_seq = 0
+        self._log_lines_shown = 0
+        self._log_update_pending = False
+        self._easyeda_import_running = False
 
         self._setup_gui()
         self._enhance_gui()
         self._setup_events()
-        self._start_monitoring_thread()
+        self._connect_log_channel()
         self._print_initial_paths()
 
         # Check for plugin updates in the background
@@ -453,6 +435,8 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
         self._search_keyword = ""
         self._search_page = 1
         self._search_page_size = 50
+        self._search_image_id = ""
+        self._thumbnails = None
 
         # Bind search events
         self.m_search_source.Bind(wx.EVT_CHOICE, self._on_search_source_changed)
@@ -574,6 +558,12 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
         self.m_btn_lib_reorganize.Bind(wx.EVT_BUTTON, self._on_reorganize_library)
         lib_bar.Add(self.m_btn_lib_reorganize, 0, wx.ALL, 5)
 
+        self.m_btn_lib_dedup = wx.Button(
+            library_panel, wx.ID_ANY, tr("messages.library_dedup_models")
+        )
+        self.m_btn_lib_dedup.Bind(wx.EVT_BUTTON, self._on_dedup_models)
+        lib_bar.Add(self.m_btn_lib_dedup, 0, wx.ALL, 5)
+
         m_btn_refresh_lib = wx.Button(library_panel, wx.ID_ANY, tr("messages.library_refresh"))
         m_btn_refresh_lib.Bind(wx.EVT_BUTTON, self._on_refresh_library)
         lib_bar.Add(m_btn_refresh_lib, 0, wx.ALL, 5)
@@ -588,8 +578,9 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
         self.m_library_filter.Bind(wx.EVT_SEARCHCTRL_CANCEL_BTN, self._on_library_filter_clear)
         library_sizer.Add(self.m_library_filter, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 5)
 
-        # Library list
-        self.m_library_list = wx.ListCtrl(library_panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        # Library list (virtual, cells are read from self._library_rows)
+        self.m_library_list = LibraryListCtrl(library_panel, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self._library_rows = self.m_library_list.rows
         self.m_library_list.InsertColumn(0, tr("messages.library_col_name"), width=160)
         self.m_library_list.InsertColumn(1, "Ref", width=50)
         self.m_library_list.InsertColumn(2, "Sub-lib", width=140)
@@ -606,9 +597,8 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
         library_panel.SetSizer(library_sizer)
 
         # Library state
-        self._library_items = []
-        self._all_library_items = []
         self._library_count = 0
+        self._library_generation = 0
 
         # === TAB 5: DESIGN BLOCKS ===
         blocks_panel = wx.Panel(self.notebook)
@@ -681,10 +671,14 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
         m_btn_clear_history = wx.Button(history_panel, label=tr("messages.history_clear"))
         m_btn_clear_history.Bind(wx.EVT_BUTTON, self._on_clear_history)
         hist_bar.Add(m_btn_clear_history, 0, wx.ALL, 5)
+        self.m_btn_history_more = wx.Button(history_panel, label=tr("messages.history_show_older"))
+        self.m_btn_history_more.Bind(wx.EVT_BUTTON, self._on_history_show_older)
+        hist_bar.Add(self.m_btn_history_more, 0, wx.ALL, 5)
         history_sizer.Add(hist_bar, 0, wx.EXPAND)
         history_sizer.Add(self.m_history_text, 1, wx.ALL | wx.EXPAND, 5)
 
         history_panel.SetSizer(history_sizer)
+        self._history_shown = HISTORY_PAGE_SIZE
 
         # === ADD TABS ===
         self.notebook.AddPage(import_panel, tr("gui.tab_import"))
@@ -778,25 +772,18 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
         if not hasattr(self, "m_library_list"):
             return
 
-        text = text.lower().strip()
-        self.m_library_list.DeleteAllItems()
-
-        source = self._all_library_items if self._all_library_items else self._library_items
-
-        for row in source:
-            if not text or any(text in str(col).lower() for col in row):
-                idx = self.m_library_list.InsertItem(
-                    self.m_library_list.GetItemCount(), str(row[0])
-                )
-                for col_idx, val in enumerate(row[1:], start=1):
-                    self.m_library_list.SetItem(idx, col_idx, str(val))
+        self._library_rows.set_filter(text)
+        self.m_library_list.SetItemCount(len(self._library_rows))
+        self.m_library_list.Refresh()
 
     # === HISTORY METHODS ===
 
     def _refresh_history_tab(self) -> None:
         if not hasattr(self, "m_history_text"):
             return
-        entries = self.backend.history.get_entries()
+        # Only the newest entries are shown; older pages are loaded on request
+        entries = list(self.backend.history.iter_entries(limit=self._history_shown))
+        self.m_btn_history_more.Enable(len(entries) < self.backend.history.get_count())
         if not entries:
             self.m_history_text.SetValue(tr("messages.history_empty"))
             return
@@ -809,6 +796,11 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
             )
         self.m_history_text.SetValue("\n".join(lines))
 
+    def _on_history_show_older(self, event) -> None:
+        self._history_shown += HISTORY_PAGE_SIZE
+        self._refresh_history_tab()
+        event.Skip()
+
     def _on_clear_history(self, event) -> None:
         dlg = wx.MessageDialog(
             self,
@@ -911,12 +903,24 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
 
     def _import_dropped_files(self, zip_files: List[str]) -> None:
         self._update_backend_settings()
-        for zip_file in zip_files:
-            self.backend._import_single_file(zip_file)
-        self._check_and_show_library_warnings()
+        Thread(
+            target=self._import_dropped_files_worker, args=(zip_files,), daemon=True
+        ).start()
+
+    def _import_dropped_files_worker(self, zip_files: List[str]) -> None:
+        self.backend._import_files(zip_files)
+        wx.CallAfter(self._check_and_show_library_warnings)
 
-    def _start_monitoring_thread(self) -> None:
-        self.thread = PluginThread(self, self.backend)
+    def _connect_log_channel(self) -> None:
+        self.backend.log.add_listener(self._on_log_written)
+        self._on_log_written(self.backend.log.last_seq)
+
+    def _on_log_written(self, seq: int) -> None:
+        """Called from the writing thread; posts at most one pending update."""
+        if self._log_update_pending:
+            return
+        self._log_update_pending = True
+        wx.PostEvent(self, ResultEvent(seq))
 
     def _on_update_available(self, version: str, url: str) -> None:
         """Called from background thread when a newer version is found."""
@@ -963,7 +967,22 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
             self.m_button.Label = tr("gui.start")
 
     def update_display(self, status: ResultEvent) -> None:
-        self.m_text.SetValue(status.data)
+        # Clear the flag before reading, so later writes post a new event
+        self._log_update_pending = False
+        log = self.backend.log
+        seq, lines, trimmed = log.read_since(self._log_seq)
+        if seq == self._log_seq:
+            return
+        self._log_seq = seq
+
+        # Only append the new lines; rebuild the text when the log channel
+        # dropped lines we have not shown or the control grew too long
+        self._log_lines_shown += len(lines)
+        if trimmed or self._log_lines_shown > log.max_lines * 1.25:
+            self.m_text.SetValue(log.text())
+            self._log_lines_shown = len(log)
+        else:
+            self.m_text.AppendText("".join(line + "\n" for line in lines))
         self.m_text.SetInsertionPointEnd()
 
     def m_checkBoxLocalLibOnCheckBox(self, event: wx.CommandEvent) -> None:
@@ -1035,10 +1054,12 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
                 logging.warning(f"Failed to stop backend thread: {e}")
 
         try:
-            if self.thread:
-                self.thread.stop_thread = True
+            self.backend.log.remove_listener(self._on_log_written)
         except Exception as e:
-            logging.warning(f"Failed to stop monitoring thread: {e}")
+            logging.warning(f"Failed to disconnect log channel: {e}")
+
+        if getattr(self, "_thumbnails", None) is not None:
+            self._thumbnails.close()
 
         if close_ipc:
             try:
@@ -1169,10 +1190,6 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
     def ButtomManualImport(self, event: wx.CommandEvent) -> None:
         try:
             self._perform_easyeda_import()
-            self._refresh_history_tab()
-            self.notebook.SetPageText(
-                self._history_tab_idx, tr("gui.tab_history", count=self.backend.history.get_count())
-            )
         except Exception as e:
             error_msg = f"Error: {e}\nPython version: {sys.version}"
             self.backend.print_to_buffer(error_msg)
@@ -1182,10 +1199,16 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
 
     def _perform_easyeda_import(self) -> None:
         try:
-            from .impart_easyeda import import_easyeda_component, ImportConfig
+            from .impart_easyeda import (
+                EasyEDABatchImport,
+                ImportConfig,
+            )
         except ImportError:
             try:
-                from impart_easyeda import import_easyeda_component, ImportConfig
+                from impart_easyeda import (
+                    EasyEDABatchImport,
+                    ImportConfig,
+                )
             except ImportError as e:
                 error_msg = f"Failed to import EasyEDA module: {e}"
                 self.backend.print_to_buffer(error_msg)
@@ -1197,6 +1220,10 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
                 )
                 return
 
+        if self._easyeda_import_running:
+            self.backend.print_to_buffer(tr("messages.easyeda_import_running"))
+            return
+
         if self.backend.local_lib:
             if not self.kicad_project:
                 self.backend.print_to_buffer(tr("messages.error_local_no_project"))
@@ -1234,62 +1261,71 @@ class ImpartFrontend(KiCadSearchMixin, SearchMixin, LibraryMixin, ProfileMixin,
                 f"\n{tr('messages.batch_import_start', count=total)}"
             )
 
-        organize_by_cat = self.backend.config.get_organize_by_category()
-
-        success_count = 0
-        for i, component_id in enumerate(component_ids, 1):
-            if total > 1:
-                self.backend.print_to_buffer(f"\n[{i}/{total}] {component_id}")
-
-            import_config = config
-            if organize_by_cat and not self.backend.local_lib:
-                try:
-                    cat_results = search_components(component_id, page_size=1)
-                    if cat_results and cat_results[0].category:
-                        cat_name = cat_results[0].category.replace(" ", "_").replace("/", "_")
-                        sub_lib_name = f"{config.lib_name}_{cat_name}"
-                        import_config = ImportConfig(
-                            base_folder=config.base_folder,
-                            lib_name=sub_lib_name,
-                            overwrite=config.overwrite,
-                            lib_var=config.lib_var,
-                        )
-                except Exception:
-                    pass
-
-            try:
-                paths = import_easyeda_component(
-                    component_id=component_id,
-                    config=import_config,
-                    print_func=self.backend.print_to_buffer,
+        config_for = None
+        if self.backend.config.get_organize_by_category() and not self.backend.local_lib:
+
+            def config_for(component_id: str) -> ImportConfig:
+                cat_results = search_components(component_id, page_size=1)
+                if not cat_results or not cat_results[0].category:
+                    return config
+                cat_name = cat_results[0].category.replace(" ", "_").replace("/", "_")
+                return ImportConfig(
+                    base_folder=config.base_folder,
+                    lib_name=f"{config.lib_name}_{cat_name}",
+                    overwrite=config.overwrite,
+                    lib_var=config.lib_var,
                 )
-                self.backend.print_to_buffer("")
-                logging.info(f"Successfully imported EasyEDA component {component_id}")
-                self.backend.history.add_entry(
-                    component_name=component_id,
-                    source="EasyEDA",
-                    library_name=self.backend.config.get_library_name(),
-                    zip_file="",
-                    profile=self.backend.config.get_current_profile(),
-                )
-                success_count += 1
 
-            except ValueError as e:
-                self.backend.print_to_buffer(f"Error {component_id}: {e}")
-                logging.error(f"Invalid component ID {component_id}: {e}")
+        library_name = self.backend.config.get_library_name()
+        profile = self.backend.config.get_current_profile()
+
+        def add_history(component_id: str, paths) -> None:
+            self.backend.history.add_entry(
+                component_name=component_id,
+                source="EasyEDA",
+                library_name=library_name,
+                zip_file="",
+                profile=profile,
+                lcsc_id=component_id,
+            )
 
-            except RuntimeError as e:
-                self.backend.print_to_buffer(f"Error {component_id}: {e}")
-                logging.error(f"Runtime error importing {component_id}: {e}")
+        batch = EasyEDABatchImport(
+            config,
+            print_func=self.backend.print_to_buffer,
+            on_progress=self._on_progress_update,
+            on_success=add_history,
+            config_for=config_for,
+        )
+        self._easyeda_import_running = True
+        thread = Thread(
+            target=self._run_easyeda_batch, args=(batch, component_ids), daemon=True
+        )
+        thread.start()
 
-            except Exception as e:
-                self.backend.print_to_buffer(f"Error {component_id}: {e}")
-                logging.exception(f"Unexpected error importing {component_id}")
+    def _run_easyeda_batch(self, batch, component_ids: List[str]) -> None:
+        """Background thread: run an EasyEDA batch import."""
+        results = []
+        try:
+            results = batch.run(component_ids)
+        except Exception as e:
+            self.backend.print_to_buffer(f"Error: {e}")
+            logging.exception("EasyEDA batch import failed")
+        finally:
+            success = sum(1 for _, paths in results if paths is not None)
+            wx.CallAfter(self._on_easyeda_batch_done, success, len(component_ids))
 
+    def _on_easyeda_batch_done(self, success: int, total: int) -> None:
+        self._easyeda_import_running = False
         if total > 1:
             self.backend.print_to_buffer(
-                f"\n{tr('messages.batch_import_done', success=success_count, total=total)}"
+                f"\n{tr('messages.batch_import_done', success=success, total=total)}"
             )
+        self._refresh_history_tab()
+        self.notebook.SetPageText(
+            self._history_tab_idx, tr("gui.tab_history", count=self.backend.history.get_count())
+        )
+        if success:
+            self._refresh_library_tab()
 
     # === MIGRATION METHODS ===
 
@@ -7,8 +7,7 @@ import os
 import sys
 import logging
 from pathlib import Path
-from time import sleep
-from typing import Any
+from typing import Any, List
 
 # Setup imports
 script_dir = Path(__file__).resolve().parent
@@ -22,6 +21,8 @@ try:
     from .KiCadImport import LibImporter
     from .KiCadSettingsPaths import KiCadApp
     from .ImportHistory import ImportHistory
+    from .LibraryIndex import LibraryIndex
+    from .LogChannel import LogChannel
     from .i18n import _ as tr
 except ImportError:
     from FileHandler import FileHandler
@@ -30,6 +31,8 @@ except ImportError:
     from KiCadImport import LibImporter
     from KiCadSettingsPaths import KiCadApp
     from ImportHistory import ImportHistory
+    from LibraryIndex import LibraryIndex
+    from LogChannel import LogChannel
     from i18n import _ as tr
 
 
@@ -48,10 +51,15 @@ class ImpartBackend:
         logging.info("Initializing ImpartBackend")
 
         self.config_path = os.path.join(os.path.dirname(__file__), "config.ini")
+        self.log_path = os.path.join(os.path.dirname(__file__), "import_output.log")
+        self.log = LogChannel()
 
         try:
             self.kicad_app = KiCadApp(prefer_ipc=True, min_version="8.0.4")
             self.config = ConfigHandler(self.config_path)
+            self.log.set_max_lines(self.config.get_log_max_lines())
+            if self.config.get_log_to_file():
+                self.log.set_spill_file(self.log_path)
             self.kicad_settings = KiCad_Settings(self.kicad_app.settings_path)
 
             self.folder_handler = FileHandler(
@@ -65,6 +73,7 @@ class ImpartBackend:
             self.importer.set_DEST_PATH(self.config.get_DEST_PATH())
 
             self.history = ImportHistory()
+            self.library_index = LibraryIndex()
             self.importer.on_import_success = self._on_import_success
 
             logging.info("Successfully initialized all backend components")
@@ -80,7 +89,6 @@ class ImpartBackend:
         self.import_old_format = False
         self.local_lib = False
         self.auto_lib = True
-        self.print_buffer = ""
 
         try:
             self.kicad_app.check_min_version(output_func=self.print_to_buffer)
@@ -113,7 +121,12 @@ class ImpartBackend:
 
     def print_to_buffer(self, *args: Any) -> None:
         for text in args:
-            self.print_buffer += str(text) + "\n"
+            self.log.write(str(text))
+
+    @property
+    def print_buffer(self) -> str:
+        """Output lines still kept in the log channel."""
+        return self.log.text()
 
     def find_and_import_new_files(self) -> None:
         src_path = self.config.get_SRC_PATH()
@@ -122,26 +135,35 @@ class ImpartBackend:
             self.print_to_buffer(f"Source path does not exist: {src_path}")
             return
 
-        while True:
+        if not self.run_thread:
             new_files = self.folder_handler.get_new_files(src_path)
+            if new_files:
+                self._import_files(new_files)
+            return
 
-            for lib_file in new_files:
-                self._import_single_file(lib_file)
-
-            if not self.run_thread:
-                break
-            sleep(1)
+        # Auto import: block on the folder watcher instead of rescanning
+        try:
+            while self.run_thread:
+                new_files = self.folder_handler.wait_for_new_files(src_path, timeout=1.0)
+                if new_files:
+                    self._import_files(new_files)
+        finally:
+            self.folder_handler.stop_watching()
 
     def _import_single_file(self, lib_file: str) -> None:
+        self._import_files([lib_file])
+
+    def _import_files(self, lib_files: List[str]) -> None:
+        """Import several zip files as one batch, sharing kicad-cli upgrades."""
         try:
-            lib_path = Path(lib_file)
-            result = self.importer.import_all(
-                lib_path,
+            results = self.importer.import_batch(
+                [Path(lib_file) for lib_file in lib_files],
                 overwrite_if_exists=self.overwrite_import,
                 import_old_format=self.import_old_format,
             )
-            if result and len(result) > 0:
-                self.print_to_buffer(result[0])
+            for result in results:
+                if result and len(result) > 0:
+                    self.print_to_buffer(result[0])
 
         except AssertionError as e:
             self.print_to_buffer(f"Assertion Error: {e}")
@@ -152,7 +174,6 @@ class ImpartBackend:
         finally:
             self.print_to_buffer("")
 
-
 def check_library_import(backend: ImpartBackend, add_if_possible: bool = True) -> str:
     """Check and potentially add libraries to KiCad settings."""
     msg = ""
@@ -175,10 +196,12 @@ def check_library_import(backend: ImpartBackend, add_if_possible: bool = True) -
         lib_var = backend.config.get_library_variable()
         msg = kicad_settings.check_GlobalVar(dest_path, add_if_possible, var_name=lib_var)
 
-    for lib_name in ImpartBackend.SUPPORTED_LIBRARIES:
-        msg += _check_single_library(
-            kicad_settings, lib_name, dest_path, add_if_possible
-        )
+    # Registrations are written once per table after all libraries are checked
+    with kicad_settings.batch():
+        for lib_name in ImpartBackend.SUPPORTED_LIBRARIES:
+            msg += _check_single_library(
+                kicad_settings, lib_name, dest_path, add_if_possible
+            )
 
     return msg
 
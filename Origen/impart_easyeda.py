@@ -1,10 +1,14 @@
 # Simplified EasyEDA to KiCad importer
 # Based on: https://github.com/uPesy/easyeda2kicad.py/blob/master/easyeda2kicad/__main__.py
 import logging
+import shutil
 import subprocess
 import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, NamedTuple, Callable
+from typing import Optional, Tuple, NamedTuple, Callable, List, Set
 from dataclasses import dataclass
 import re
 
@@ -21,6 +25,17 @@ try:
 except ImportError:
     from kicad_cli import kicad_cli
 
+try:
+    from .HttpSession import get_session
+    from .ModelStore import ModelStore
+    from .ResponseCache import get_response_cache
+    from .SymbolLibFile import SymbolLibWriter, lib_version, symbol_block_name
+except ImportError:
+    from HttpSession import get_session
+    from ModelStore import ModelStore
+    from ResponseCache import get_response_cache
+    from SymbolLibFile import SymbolLibWriter, lib_version, symbol_block_name
+
 try:
     cli = kicad_cli()
     logger.info("✓ kicad_cli initialized successfully")
@@ -54,6 +69,7 @@ from easyeda2kicad.easyeda.easyeda_importer import (
 from easyeda2kicad.kicad.export_kicad_symbol import ExporterSymbolKicad
 from easyeda2kicad.kicad.export_kicad_footprint import ExporterFootprintKicad
 from easyeda2kicad.kicad.export_kicad_3d_model import Exporter3dModelKicad
+from easyeda2kicad.kicad.parameters_kicad_symbol import KiSymbol, KiSymbolFormat
 from easyeda2kicad.helpers import (
     KicadVersion,
     add_component_in_symbol_lib_file,
@@ -64,6 +80,33 @@ from easyeda2kicad.helpers import (
 logger.info("Successfully imported easyeda2kicad modules")
 
 
+def default_symbol_format() -> Optional[KiSymbolFormat]:
+    """
+    Format for new symbol libraries: the newest listed one the installed KiCad
+    (from the cached kicad-cli probe) opens. None if there is none, or if
+    kicad-cli was not found; the library is then created through kicad-cli.
+    """
+    major = 0
+    if cli is not None:
+        try:
+            caps = cli.probe()
+            if caps.found:
+                major = caps.version_tuple[0]
+        except Exception as e:
+            logger.debug(f"Could not determine the KiCad version: {e}")
+    return KiSymbolFormat.for_kicad_major(major) if major else None
+
+
+def symbol_format_for_library(text: str) -> Optional[KiSymbolFormat]:
+    """
+    Format new symbols are written in for a library text. Returns None for
+    libraries in other formats, which still need a kicad-cli upgrade.
+    """
+    if not text.strip():
+        return default_symbol_format()
+    return KiSymbolFormat.for_library_version(lib_version(text))
+
+
 class ImportPaths(NamedTuple):
     """Container for all generated file paths"""
 
@@ -83,17 +126,33 @@ class ImportConfig:
     lib_var: str = "${EASYEDA2KICAD}"
 
 
+@dataclass
+class PreparedComponent:
+    """Converted data of one component that has not been written yet"""
+
+    component_id: str
+    symbol_name: Optional[str] = None
+    symbol_content: Optional[str] = None
+    symbol: Optional[KiSymbol] = None
+    footprint: Optional[ExporterFootprintKicad] = None
+    model: Optional[Exporter3dModelKicad] = None
+
+
 class EasyEDAImporter:
     """EasyEDA to KiCad component importer - focused on new symbol format only"""
 
     def __init__(
-        self, config: ImportConfig, print_func: Optional[Callable[[str], None]] = None
+        self,
+        config: ImportConfig,
+        print_func: Optional[Callable[[str], None]] = None,
+        symbol_queue: Optional["EasyEDASymbolQueue"] = None,
     ):
         """Initialize importer with configuration"""
         self.print_func = print_func or (lambda x: None)
         self.config = config
+        self.symbol_queue = symbol_queue
         self.config.base_folder = Path(self.config.base_folder).expanduser()
-        self.api = EasyedaApi()
+        self.api = EasyedaApi(session=get_session(), cache=get_response_cache())
 
         # Paths that will be used
         self.symbol_lib_path = (
@@ -113,13 +172,44 @@ class EasyEDAImporter:
         self.model_dir.mkdir(exist_ok=True)
         logger.debug(f"Ensured directories exist in {self.config.base_folder}")
 
-    def _import_symbol(self, cad_data: dict) -> Tuple[bool, Optional[str]]:
-        """Import symbol and return success status and component name"""
+    def _prepare_symbol(self, cad_data: dict, prepared: PreparedComponent) -> None:
+        """Convert the symbol; the library is only touched in _write_symbol"""
         try:
             importer = EasyedaSymbolImporter(easyeda_cp_cad_data=cad_data)
             easyeda_symbol: EeSymbol = importer.get_symbol()
-            component_name = easyeda_symbol.info.name
+            prepared.symbol_name = easyeda_symbol.info.name
+
+            exporter = ExporterSymbolKicad(
+                symbol=easyeda_symbol, kicad_version=KicadVersion.v6
+            )
+            prepared.symbol_content = exporter.export(
+                footprint_lib_name=self.config.lib_name
+            )
+            prepared.symbol = exporter.output
 
+            # Check if export was successful
+            if not prepared.symbol_content:
+                self._print(f"Failed to export symbol content for: {prepared.symbol_name}")
+
+        except Exception as e:
+            self._print(f"Failed to import symbol: {e}")
+            logger.error(f"Symbol import failed: {e}")
+
+    def _write_symbol(self, prepared: PreparedComponent) -> Tuple[bool, Optional[str]]:
+        """Write a converted symbol and return success status and component name"""
+        component_name = prepared.symbol_name
+        if not prepared.symbol_content:
+            return False, component_name
+
+        try:
+            if prepared.symbol is not None:
+                writer = SymbolLibWriter(self.symbol_lib_path)
+                file_format = symbol_format_for_library(writer.text)
+                if file_format is not None:
+                    success = self._write_symbol_native(prepared.symbol, writer, file_format)
+                    return success, component_name
+
+            # Libraries in other formats go through kicad-cli
             # Check if symbol library exists first, then check if symbol already exists
             if self.symbol_lib_path.exists():
                 is_existing = id_already_in_symbol_lib(
@@ -134,18 +224,7 @@ class EasyEDAImporter:
                 self._print(f"Symbol '{component_name}' already exists.")
                 return False, component_name
 
-            # Export symbol
-            exporter = ExporterSymbolKicad(
-                symbol=easyeda_symbol, kicad_version=KicadVersion.v6
-            )
-            kicad_symbol_content = exporter.export(
-                footprint_lib_name=self.config.lib_name
-            )
-
-            # Check if export was successful
-            if not kicad_symbol_content:
-                self._print(f"Failed to export symbol content for: {component_name}")
-                return False, component_name
+            kicad_symbol_content = prepared.symbol_content
 
             # Add or update symbol in library
             if is_existing:
@@ -159,6 +238,12 @@ class EasyEDAImporter:
                     kicad_version=KicadVersion.v6,
                 )
                 self._print(f"Updated symbol: {component_name}")
+            elif self.symbol_queue is not None:
+                # Reported once the queue is flushed and the symbol is merged
+                self.symbol_queue.add(
+                    self, prepared.component_id, component_name,
+                    self._wrap_symbol(kicad_symbol_content),
+                )
             else:
                 success = self.add_symbol_to_upgraded_lib(kicad_symbol_content)
                 if success:
@@ -174,6 +259,27 @@ class EasyEDAImporter:
             logger.error(f"Symbol import failed: {e}")
             return False, None
 
+    def _write_symbol_native(
+        self, symbol: KiSymbol, writer: SymbolLibWriter, file_format: KiSymbolFormat
+    ) -> bool:
+        """Splice the symbol into the library in the library's own format."""
+        block = symbol.export_sexpr(file_format, extra_fields=self._symbol_metadata())
+        name = symbol_block_name(block)
+
+        writer.header = file_format.library_header()
+        status = writer.put(block, overwrite=self.config.overwrite)
+        if status == "skipped":
+            self._print(f"Symbol '{name}' already exists.")
+            return False
+
+        writer.save()
+        if status == "updated":
+            self._print(f"Updated symbol: {name}")
+        else:
+            self._print(f"Added symbol: {name}")
+        logger.debug(f"Wrote {name} as symbol format {file_format.value}")
+        return True
+
     def get_kicad_lib_version(self, content: str) -> int:
         """Extract version number from KiCad symbol library. Returns 0 if not found."""
         if not content:
@@ -182,12 +288,11 @@ class EasyEDAImporter:
         match = re.search(r"\(\s*version\s+(\d+)\s*\)", content[:200])
         return int(match.group(1)) if match else 0
 
-    def _add_metadata_to_symbol(self, symbol_content: str) -> str:
-        """Add custom metadata properties to a symbol."""
+    def _symbol_metadata(self) -> List[Tuple[str, str]]:
+        """Custom metadata properties added to every imported symbol."""
         from datetime import datetime
 
-        # Metadata fields to add
-        metadata = [
+        return [
             ('ImportedBy', PLUGIN_VERSION_STRING),
             ('Author', 'Samuel Flores'),
             ('Repository', 'github.com/safloresmo/CustomImportGUI'),
@@ -196,6 +301,10 @@ class EasyEDAImporter:
             ('OriginalSource', 'EasyEDA'),
         ]
 
+    def _add_metadata_to_symbol(self, symbol_content: str) -> str:
+        """Add custom metadata properties to a symbol."""
+        metadata = self._symbol_metadata()
+
         # Find the last property in the symbol
         # Properties are typically defined early in the symbol definition
         # We'll insert our metadata before the first non-property element
@@ -236,6 +345,17 @@ class EasyEDAImporter:
         # Fallback: return original if we can't find insertion point
         return symbol_content
 
+    def _wrap_symbol(self, symbol_content: str) -> str:
+        """Add metadata to an exported symbol and wrap it in a symbol library."""
+        # Add custom metadata to symbol
+        symbol_content = self._add_metadata_to_symbol(symbol_content)
+
+        return f"""(kicad_symbol_lib
+    (version 20211014)
+    (generator https://github.com/uPesy/easyeda2kicad.py)
+    {symbol_content}
+)"""
+
     def add_symbol_to_upgraded_lib(self, symbol_content: str) -> bool:
         """Add symbol to library with automatic upgrade handling."""
         try:
@@ -243,14 +363,7 @@ class EasyEDAImporter:
                 self._print("Error: Empty symbol content provided")
                 return False
 
-            # Add custom metadata to symbol
-            symbol_content = self._add_metadata_to_symbol(symbol_content)
-
-            complete_symbol_lib = f"""(kicad_symbol_lib
-    (version 20211014)
-    (generator https://github.com/uPesy/easyeda2kicad.py)
-    {symbol_content}
-)"""
+            complete_symbol_lib = self._wrap_symbol(symbol_content)
 
             success, upgraded_symbol_lib, error = cli.upgrade_sym_lib_from_string(
                 complete_symbol_lib
@@ -259,6 +372,16 @@ class EasyEDAImporter:
                 self._print(f"Failed to upgrade new symbol: {error}")
                 return False
 
+            return self.merge_upgraded_symbol(upgraded_symbol_lib)
+
+        except Exception as e:
+            self._print(f"Failed to add symbol to library: {e}")
+            logger.error(f"Symbol library integration failed: {e}")
+            return False
+
+    def merge_upgraded_symbol(self, upgraded_symbol_lib: str) -> bool:
+        """Append the symbol of an upgraded single-symbol library to the library."""
+        try:
             if self.symbol_lib_path.exists():
                 with open(self.symbol_lib_path, "r", encoding="utf-8") as f:
                     existing_lib = f.read()
@@ -310,21 +433,31 @@ class EasyEDAImporter:
             logger.error(f"Symbol library integration failed: {e}")
             return False
 
-    def _import_footprint(self, cad_data: dict) -> Optional[Path]:
-        """Import footprint and return the file path"""
+    def _prepare_footprint(self, cad_data: dict, prepared: PreparedComponent) -> None:
+        """Convert the footprint; it is written in _write_footprint"""
         try:
             importer = EasyedaFootprintImporter(easyeda_cp_cad_data=cad_data)
-            easyeda_footprint = importer.get_footprint()
+            prepared.footprint = ExporterFootprintKicad(footprint=importer.get_footprint())
+
+        except Exception as e:
+            self._print(f"Failed to import footprint: {e}")
+            logger.error(f"Footprint import failed: {e}")
+
+    def _write_footprint(self, prepared: PreparedComponent) -> Optional[Path]:
+        """Write a converted footprint and return the file path"""
+        if prepared.footprint is None:
+            return None
 
+        try:
+            exporter = prepared.footprint
             footprint_file = (
-                self.footprint_dir / f"{easyeda_footprint.info.name}.kicad_mod"
+                self.footprint_dir / f"{exporter.input.info.name}.kicad_mod"
             )
 
             if footprint_file.exists() and not self.config.overwrite:
                 self._print(f"Footprint already exists: {footprint_file.name}")
                 return None
 
-            exporter = ExporterFootprintKicad(footprint=easyeda_footprint)
             model_3d_path = f"{self.config.lib_var}/{self.config.lib_name}.3dshapes"
 
             exporter.export(
@@ -340,23 +473,36 @@ class EasyEDAImporter:
             logger.error(f"Footprint import failed: {e}")
             return None
 
-    def _import_3d_model(self, cad_data: dict) -> Tuple[Optional[Path], Optional[Path]]:
-        """Import 3D model and return paths to wrl and step files"""
+    def _prepare_3d_model(self, cad_data: dict, prepared: PreparedComponent) -> None:
+        """Download the OBJ/STEP models and convert the OBJ model to WRL"""
         try:
             model_3d = Easyeda3dModelImporter(
-                easyeda_cp_cad_data=cad_data, download_raw_3d_model=True
+                easyeda_cp_cad_data=cad_data, download_raw_3d_model=True, api=self.api
             ).output
 
             if not model_3d:
                 self._print("No 3D model available for this component.")
-                return None, None
+                return
 
             exporter = Exporter3dModelKicad(model_3d=model_3d)
 
             if not (exporter.output or exporter.output_step):
                 self._print("No exportable 3D model found.")
-                return None, None
+                return
+
+            prepared.model = exporter
 
+        except Exception as e:
+            self._print(f"Failed to import 3D model: {e}")
+            logger.error(f"3D model import failed: {e}")
+
+    def _write_3d_model(self, prepared: PreparedComponent) -> Tuple[Optional[Path], Optional[Path]]:
+        """Write converted 3D models and return paths to wrl and step files"""
+        if prepared.model is None:
+            return None, None
+
+        try:
+            exporter = prepared.model
             output_name = exporter.output.name if exporter.output else "model"
             filepath_wrl = self.model_dir / f"{output_name}.wrl"
             filepath_step = self.model_dir / f"{output_name}.step"
@@ -367,7 +513,12 @@ class EasyEDAImporter:
                     self._print("3D model files already exist.")
                     return None, None
 
-            # Export models
+            # Export models; existing files may be links to the model store,
+            # so they are replaced rather than written through
+            if exporter.output:
+                filepath_wrl.unlink(missing_ok=True)
+            if exporter.output_step:
+                filepath_step.unlink(missing_ok=True)
             exporter.export(
                 lib_path=str(self.config.base_folder / self.config.lib_name)
             )
@@ -375,6 +526,11 @@ class EasyEDAImporter:
             wrl_path = filepath_wrl if filepath_wrl.exists() else None
             step_path = filepath_step if filepath_step.exists() else None
 
+            store = ModelStore.for_library(self.config.base_folder)
+            for path in (wrl_path, step_path):
+                if path:
+                    store.add(path)
+
             if wrl_path:
                 self._print(f"Created 3D model (WRL): {wrl_path.name}")
             if step_path:
@@ -387,64 +543,85 @@ class EasyEDAImporter:
             logger.error(f"3D model import failed: {e}")
             return None, None
 
-    def import_component(self, component_id: str) -> ImportPaths:
+    def prepare_component(self, component_id: str) -> PreparedComponent:
         """
-        Import a component and all its assets.
-        Returns ImportPaths with all created file paths.
+        Fetch the CAD data and 3D models of a component and convert them.
+        Nothing is written to the library; see commit_component().
         """
-        self._print(f"Starting import for EasyEDA/LCSC component: {component_id}")
-
         # Validate component ID
         if not component_id.startswith("C"):
             error_msg = f"Invalid component ID: '{component_id}' (must start with 'C', e.g., 'C2040')"
             self._print(error_msg)
             raise ValueError(error_msg)
 
+        # Fetch CAD data
+        cad_data = self.api.get_cad_data_of_component(lcsc_id=component_id)
+
+        if not cad_data:
+            error_msg = f"Failed to fetch CAD data for component {component_id}"
+            self._print(error_msg)
+            raise RuntimeError(error_msg)
+
+        prepared = PreparedComponent(component_id)
+        self._prepare_symbol(cad_data, prepared)
+        self._prepare_footprint(cad_data, prepared)
+        self._prepare_3d_model(cad_data, prepared)
+        return prepared
+
+    def commit_component(self, prepared: PreparedComponent) -> ImportPaths:
+        """
+        Write a prepared component to the library.
+        Returns ImportPaths with all created file paths.
+        """
         # Ensure directories exist
         self._ensure_directories()
 
-        try:
-            # Fetch CAD data
-            cad_data = self.api.get_cad_data_of_component(lcsc_id=component_id)
-
-            if not cad_data:
-                error_msg = f"Failed to fetch CAD data for component {component_id}"
-                self._print(error_msg)
-                raise RuntimeError(error_msg)
-
-            # Import all parts
-            symbol_ok, component_name = self._import_symbol(cad_data)
-            footprint_path = self._import_footprint(cad_data)
-            wrl_path, step_path = self._import_3d_model(cad_data)
-
-            # Prepare result
-            result = ImportPaths(
-                symbol_lib=self.symbol_lib_path if symbol_ok else None,
-                footprint_file=footprint_path,
-                model_wrl=wrl_path,
-                model_step=step_path,
-            )
+        symbol_ok, _ = self._write_symbol(prepared)
+        footprint_path = self._write_footprint(prepared)
+        wrl_path, step_path = self._write_3d_model(prepared)
 
-            # Final status
-            created_files = sum(
-                1
-                for path in [
-                    result.symbol_lib,
-                    result.footprint_file,
-                    result.model_wrl,
-                    result.model_step,
-                ]
-                if path
+        # Prepare result
+        result = ImportPaths(
+            symbol_lib=self.symbol_lib_path if symbol_ok else None,
+            footprint_file=footprint_path,
+            model_wrl=wrl_path,
+            model_step=step_path,
+        )
+
+        # Final status
+        created_files = sum(
+            1
+            for path in [
+                result.symbol_lib,
+                result.footprint_file,
+                result.model_wrl,
+                result.model_step,
+            ]
+            if path
+        )
+
+        if created_files > 0:
+            self._print(
+                f"EasyEDA import completed successfully! ({created_files} files created)"
             )
+        else:
+            self._print("EasyEDA import completed, but no new files were created")
 
-            if created_files > 0:
-                self._print(
-                    f"EasyEDA import completed successfully! ({created_files} files created)"
-                )
-            else:
-                self._print("EasyEDA import completed, but no new files were created")
+        return result
+
+    def import_component(self, component_id: str) -> ImportPaths:
+        """
+        Import a component and all its assets.
+        Returns ImportPaths with all created file paths.
+        """
+        self._print(f"Starting import for EasyEDA/LCSC component: {component_id}")
 
-            return result
+        try:
+            prepared = self.prepare_component(component_id)
+            return self.commit_component(prepared)
+
+        except ValueError:
+            raise
 
         except Exception as e:
             error_msg = f"EasyEDA import failed: {e}"
@@ -453,10 +630,236 @@ class EasyEDAImporter:
             raise
 
 
+class EasyEDASymbolQueue:
+    """
+    Collects exported symbols of a batch import and upgrades them together.
+
+    Only symbols for libraries in a format the importer does not write itself
+    (see ``KiSymbolFormat``) are queued; the others are written directly. Each queued symbol is staged as
+    its own library; ``flush()`` upgrades all of them with a single kicad-cli
+    run and merges the results into their libraries.
+    """
+
+    def __init__(self) -> None:
+        # (importer, component id, symbol name, single-symbol library)
+        self.pending: List[Tuple[EasyEDAImporter, str, str, str]] = []
+
+    def add(
+        self,
+        importer: EasyEDAImporter,
+        component_id: str,
+        symbol_name: str,
+        symbol_lib_content: str,
+    ) -> None:
+        self.pending.append((importer, component_id, symbol_name, symbol_lib_content))
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def component_ids(self) -> Set[str]:
+        return {component_id for _, component_id, _, _ in self.pending}
+
+    def flush(self) -> Set[str]:
+        """
+        Upgrade and merge all queued symbols.
+        Returns the IDs of the components whose symbol was not written.
+        """
+        if not self.pending:
+            return set()
+
+        pending, self.pending = self.pending, []
+        stage_dir = Path(tempfile.mkdtemp(prefix="easyeda_symbols_"))
+        failed = set()
+        try:
+            files = {}
+            for index, (*_, content) in enumerate(pending):
+                input_file = stage_dir / f"{index:04d}.kicad_sym"
+                input_file.write_text(content, encoding="utf-8")
+                files[str(input_file)] = str(stage_dir / f"{index:04d}_upgraded.kicad_sym")
+
+            results = cli.upgrade_sym_libs(files)
+
+            for (importer, component_id, name, _), (input_file, output_file) in zip(
+                pending, files.items()
+            ):
+                result = results.get(input_file)
+                if not result or not result.success:
+                    message = result.message if result else "not upgraded"
+                    importer._print(f"Failed to upgrade new symbol: {message}")
+                    failed.add(component_id)
+                    continue
+
+                upgraded = Path(output_file).read_text(encoding="utf-8")
+                if importer.merge_upgraded_symbol(upgraded):
+                    importer._print(f"Added symbol: {name}")
+                else:
+                    failed.add(component_id)
+        finally:
+            shutil.rmtree(stage_dir, ignore_errors=True)
+
+        return failed
+
+
+class EasyEDABatchImport:
+    """
+    Imports a list of EasyEDA/LCSC components as a pipeline.
+
+    Fetching the CAD data and 3D models and converting them runs on a bounded
+    thread pool. The results are committed to the libraries one at a time in
+    input order on the calling thread, so the output stays readable and the
+    libraries are never written concurrently. Symbols that need kicad-cli
+    are upgraded with a single kicad-cli run at the end; components
+    with such a symbol only count as imported once it has been written.
+    """
+
+    def __init__(
+        self,
+        config: ImportConfig,
+        print_func: Optional[Callable[[str], None]] = None,
+        on_progress: Optional[Callable[[int, int, str], None]] = None,
+        on_success: Optional[Callable[[str, ImportPaths], None]] = None,
+        config_for: Optional[Callable[[str], ImportConfig]] = None,
+        max_workers: int = 4,
+    ):
+        self.config = config
+        self.print_func = print_func or (lambda x: None)
+        self.on_progress = on_progress
+        self.on_success = on_success
+        self.config_for = config_for
+        self.max_workers = max(1, max_workers)
+
+    def _report_progress(self, step: int, total: int, message: str) -> None:
+        if self.on_progress:
+            try:
+                self.on_progress(step, total, message)
+            except Exception as e:
+                logger.debug(f"Progress callback failed: {e}")
+
+    def _prepare(self, component_id: str) -> tuple:
+        """
+        Worker: fetch and convert one component, buffering its messages.
+        Returns ``(importer, messages, prepared or None, error or None)``.
+        """
+        messages: List[str] = []
+        config = self.config
+        if self.config_for:
+            try:
+                config = self.config_for(component_id)
+            except Exception as e:
+                logger.debug(f"No specific config for {component_id}: {e}")
+
+        importer = EasyEDAImporter(config, messages.append)
+        importer._print(f"Starting import for EasyEDA/LCSC component: {component_id}")
+        try:
+            return importer, messages, importer.prepare_component(component_id), None
+        except ValueError as e:
+            return importer, messages, None, e
+        except Exception as e:
+            importer._print(f"EasyEDA import failed: {e}")
+            return importer, messages, None, e
+
+    def run(self, component_ids: List[str]) -> List[Tuple[str, Optional[ImportPaths]]]:
+        """
+        Import all components.
+        Returns ``(component_id, ImportPaths or None)`` per component, in input order.
+        """
+        total = len(component_ids)
+        symbol_queue = EasyEDASymbolQueue()
+        results: List[Tuple[str, Optional[ImportPaths]]] = []
+
+        # Keep a few jobs ahead of the commit so downloads overlap, without
+        # holding the converted data of the whole batch in memory.
+        window = self.max_workers * 2
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="easyeda"
+        ) as pool:
+            ids = iter(component_ids)
+            pending: deque = deque()
+            for component_id in ids:
+                pending.append((component_id, pool.submit(self._prepare, component_id)))
+                if len(pending) >= window:
+                    break
+
+            for i in range(1, total + 1):
+                component_id, future = pending.popleft()
+                next_id = next(ids, None)
+                if next_id is not None:
+                    pending.append((next_id, pool.submit(self._prepare, next_id)))
+
+                if total > 1:
+                    self.print_func(f"\n[{i}/{total}] {component_id}")
+                results.append((component_id, self._commit(component_id, future.result(), symbol_queue)))
+                self._report_progress(i, total, component_id)
+
+        queued = symbol_queue.component_ids()
+        try:
+            failed = symbol_queue.flush()
+        except Exception as e:
+            failed = queued
+            self.print_func(f"Error: {e}")
+            logger.exception("Failed to write queued EasyEDA symbols")
+
+        for index, (component_id, paths) in enumerate(results):
+            if paths is None or component_id not in queued:
+                continue
+            if component_id in failed:
+                self.print_func(f"Error {component_id}: symbol was not written")
+                results[index] = (component_id, None)
+            else:
+                results[index] = (component_id, self._succeeded(component_id, paths))
+
+        self._report_progress(0, 0, "")
+        return results
+
+    def _succeeded(self, component_id: str, paths: ImportPaths) -> Optional[ImportPaths]:
+        """Run the success callback; a failing callback fails the component."""
+        logger.info(f"Successfully imported EasyEDA component {component_id}")
+        if not self.on_success:
+            return paths
+        try:
+            self.on_success(component_id, paths)
+            return paths
+        except Exception as e:
+            self.print_func(f"Error {component_id}: {e}")
+            logger.exception(f"Success callback failed for {component_id}")
+            return None
+
+    def _commit(self, component_id: str, prepared_result: tuple, symbol_queue: "EasyEDASymbolQueue") -> Optional[ImportPaths]:
+        """Write one prepared component; errors are reported and do not stop the batch."""
+        importer, messages, prepared, error = prepared_result
+        for message in messages:
+            self.print_func(message)
+
+        if error is not None:
+            self.print_func(f"Error {component_id}: {error}")
+            if isinstance(error, ValueError):
+                logger.error(f"Invalid component ID {component_id}: {error}")
+            else:
+                logger.error(f"Component import failed for {component_id}: {error}")
+            return None
+
+        importer.print_func = self.print_func
+        importer.symbol_queue = symbol_queue
+        try:
+            paths = importer.commit_component(prepared)
+            self.print_func("")
+            if component_id in symbol_queue.component_ids():
+                return paths  # Completed after the queue is flushed
+            return self._succeeded(component_id, paths)
+        except Exception as e:
+            self.print_func(f"EasyEDA import failed: {e}")
+            self.print_func(f"Error {component_id}: {e}")
+            logger.exception(f"Unexpected error importing {component_id}")
+            return None
+
+
 def import_easyeda_component(
-    component_id: str, config: ImportConfig, print_func: Callable[[str], None]
+    component_id: str,
+    config: ImportConfig,
+    print_func: Callable[[str], None],
+    symbol_queue: Optional[EasyEDASymbolQueue] = None,
 ) -> ImportPaths:
-    importer = EasyEDAImporter(config, print_func)
+    importer = EasyEDAImporter(config, print_func, symbol_queue)
     return importer.import_component(component_id)
 
 
@@ -10,10 +10,10 @@ from threading import Thread
 import wx
 
 try:
-    from .KiCadGitLab import list_symbol_libraries, search_symbols, download_symbol
+    from .KiCadGitLab import sync_symbol_mirror, search_symbols, download_symbol
     from .i18n import _ as tr
 except ImportError:
-    from KiCadGitLab import list_symbol_libraries, search_symbols, download_symbol
+    from KiCadGitLab import sync_symbol_mirror, search_symbols, download_symbol
     from i18n import _ as tr
 
 
@@ -108,11 +108,16 @@ class KiCadSearchMixin:
 
     def _do_load_kicad_libs(self) -> None:
         try:
-            libs = list_symbol_libraries()
+            # The first sync downloads all libraries; later ones only what changed
+            libs = sync_symbol_mirror(progress=self._on_kicad_mirror_progress)
             wx.CallAfter(self._on_kicad_libs_loaded, libs)
         except Exception as e:
             wx.CallAfter(self._on_kicad_libs_load_failed, str(e))
 
+    def _on_kicad_mirror_progress(self, step: int, total: int, library: str) -> None:
+        label = tr("messages.kicad_mirror_sync", step=step, total=total) if total else ""
+        wx.CallAfter(self.m_search_status.SetLabel, label)
+
     def _on_kicad_libs_loaded(self, libs) -> None:
         self._kicad_libs_loaded = True
         self._kicad_lib_list = libs
@@ -216,6 +221,8 @@ class KiCadSearchMixin:
         detail = f"{result['name']}\nLibrary: {result['library']}"
         if result.get("description"):
             detail += f"\n{result['description']}"
+        if result.get("keywords"):
+            detail += f"\n{result['keywords']}"
         if hasattr(self, "m_search_detail"):
             self.m_search_detail.SetValue(detail)
         if hasattr(self, "m_search_duplicate"):
@@ -1,22 +1,45 @@
 """
 Library browser tab mixin for ImpartFrontend.
-Handles library browsing, sub-libraries, move/copy/delete, and reorganization.
+Handles library browsing, sub-libraries, move/copy/delete, reorganization
+and 3D model deduplication.
 """
 
 import logging
 from pathlib import Path
+from threading import Thread
 
 import wx
 
 try:
     from .KiCad_Settings import KiCad_Settings
     from .ComponentSearch import search_components
+    from .LibraryIndex import LibraryRows
+    from .ModelStore import dedup_libraries
     from .i18n import _ as tr
 except ImportError:
     from KiCad_Settings import KiCad_Settings
     from ComponentSearch import search_components
+    from LibraryIndex import LibraryRows
+    from ModelStore import dedup_libraries
     from i18n import _ as tr
 
+# Rows handed from the scan thread to the list per wx.CallAfter
+LIBRARY_CHUNK_SIZE = 2000
+
+
+class LibraryListCtrl(wx.ListCtrl):
+    """Virtual report list that reads its cells from a LibraryRows store."""
+
+    def __init__(self, parent, style=wx.LC_REPORT):
+        super().__init__(parent, style=style | wx.LC_VIRTUAL)
+        self.rows = LibraryRows()
+
+    def OnGetItemText(self, item, column):
+        try:
+            return self.rows.cell(item, column)
+        except IndexError:
+            return ""
+
 
 class LibraryMixin:
     """Mixin providing library browser tab functionality."""
@@ -39,76 +62,85 @@ class LibraryMixin:
             self._library_count = 0
             return
 
-        self.m_library_list.DeleteAllItems()
+        # Results of older scans still in flight are dropped by generation
+        self._library_generation += 1
+        self._library_rows.clear()
         self._library_count = 0
-        fp_count = 0
-        model_count = 0
-        self._library_items = []
-        self._all_library_items = []
+        self.m_library_list.SetItemCount(0)
+        self.m_library_status.SetLabel(tr("messages.library_loading"))
 
-        all_paths = self._get_all_library_paths()
+        # Clear filter when library is refreshed
+        if hasattr(self, "m_library_filter"):
+            self.m_library_filter.SetValue("")
 
-        for dest_path in all_paths:
-            for pretty_dir in dest_path.glob("*.pretty"):
-                fp_count += len(list(pretty_dir.glob("*.kicad_mod")))
+        thread = Thread(
+            target=self._scan_library,
+            args=(self._library_generation, self._get_all_library_paths()),
+            daemon=True,
+        )
+        thread.start()
 
-            for shapes_dir in dest_path.glob("*.3dshapes"):
-                model_count += len(list(shapes_dir.glob("*.step")) + list(shapes_dir.glob("*.wrl")))
+    def _scan_library(self, generation: int, all_paths: list) -> None:
+        index = self.backend.library_index
+        try:
+            index.update(all_paths)
+        except Exception as e:
+            logging.warning(f"Could not update library index: {e}")
 
-        sym_files = []
-        for dest_path in all_paths:
-            sym_files.extend(dest_path.glob("*.kicad_sym"))
-        for sym_file in sym_files:
-            try:
-                from kiutils.symbol import SymbolLib
-                lib = SymbolLib.from_file(str(sym_file))
-                for symbol in lib.symbols:
-                    props = {p.key: p.value for p in symbol.properties}
-                    name = symbol.entryName or props.get("Value", "?")
-                    ref = props.get("Reference", "?")
-                    footprint = props.get("Footprint", "")
-                    source = props.get("OriginalSource", "")
-                    imported = props.get("ImportDate", "")
+        counts = {"kicad_sym": 0, "kicad_mod": 0, "model": 0}
+        try:
+            counts = index.get_counts(all_paths)
+            sub_libs = {}
+            chunk = []
+            for entry in index.get_symbols(all_paths):
+                if entry.path not in sub_libs:
+                    sub_libs[entry.path] = self._sub_library_label(Path(entry.path).stem)
+                chunk.append((entry.path, (
+                    entry.name, entry.reference, sub_libs[entry.path],
+                    entry.footprint, entry.source, entry.import_date,
+                )))
+                if len(chunk) >= LIBRARY_CHUNK_SIZE:
+                    wx.CallAfter(self._on_library_rows, generation, chunk)
+                    chunk = []
+            if chunk:
+                wx.CallAfter(self._on_library_rows, generation, chunk)
+        except Exception as e:
+            logging.warning(f"Could not read library index: {e}")
+        wx.CallAfter(self._on_library_scan_done, generation, counts)
 
-                    file_stem = sym_file.stem
-                    sub_lib = file_stem
-                    for pf in self.backend.config.get_available_profiles():
-                        sec = f"profile_{pf}"
-                        try:
-                            pf_lib = self.backend.config.config[sec].get("library_name", "")
-                            if pf_lib and file_stem.startswith(pf_lib + "_"):
-                                sub_lib = file_stem[len(pf_lib) + 1:].replace("_", " ")
-                                break
-                            elif file_stem == pf_lib:
-                                sub_lib = pf_lib
-                                break
-                        except Exception:
-                            pass
-
-                    idx = self.m_library_list.InsertItem(
-                        self.m_library_list.GetItemCount(), name
-                    )
-                    self.m_library_list.SetItem(idx, 1, ref)
-                    self.m_library_list.SetItem(idx, 2, sub_lib)
-                    self.m_library_list.SetItem(idx, 3, footprint)
-                    self.m_library_list.SetItem(idx, 4, source)
-                    self.m_library_list.SetItem(idx, 5, imported)
-                    self._library_items.append((str(sym_file), name))
-                    self._all_library_items.append((name, ref, sub_lib, footprint, source, imported))
-                    self._library_count += 1
-            except Exception as e:
-                logging.warning(f"Could not parse {sym_file.name}: {e}")
+    def _on_library_rows(self, generation: int, chunk: list) -> None:
+        if not self or generation != self._library_generation:
+            return
+        self._library_rows.extend(chunk)
+        self._library_count = self._library_rows.total
+        self.m_library_list.SetItemCount(len(self._library_rows))
 
+    def _on_library_scan_done(self, generation: int, counts: dict) -> None:
+        if not self or generation != self._library_generation:
+            return
+        fp_count = counts["kicad_mod"]
         self.m_library_status.SetLabel(
-            tr("messages.library_summary", sym=self._library_count, fp=fp_count, model=model_count)
+            tr("messages.library_summary", sym=self._library_count, fp=fp_count, model=counts["model"])
         )
-
         if self._library_count == 0 and fp_count == 0:
             self.m_library_status.SetLabel(tr("messages.library_empty"))
+        self.notebook.SetPageText(
+            self._library_tab_idx, tr("messages.tab_library", count=self._library_count)
+        )
+        self.m_library_list.Refresh()
 
-        # Clear filter when library is refreshed
-        if hasattr(self, "m_library_filter"):
-            self.m_library_filter.SetValue("")
+    def _sub_library_label(self, file_stem: str) -> str:
+        for pf in self.backend.config.get_available_profiles():
+            sec = f"profile_{pf}"
+            try:
+                pf_lib = self.backend.config.config[sec].get("library_name", "")
+                if pf_lib and file_stem.startswith(pf_lib + "_"):
+                    return file_stem[len(pf_lib) + 1:].replace("_", " ")
+                elif file_stem == pf_lib:
+                    return pf_lib
+            except Exception:
+                pass
+        return file_stem
 
     def _on_refresh_library(self, event) -> None:
         self._refresh_library_tab()
@@ -125,11 +157,12 @@ class LibraryMixin:
 
     def _on_library_right_click(self, event) -> None:
         idx = event.GetIndex()
-        if idx < 0 or idx >= len(self._library_items):
+        item = self._library_rows.item(idx)
+        if item is None:
             return
 
         self.m_library_list.Select(idx)
-        current_file = Path(self._library_items[idx][0])
+        current_file = Path(item[0])
 
         menu = wx.Menu()
 
@@ -182,17 +215,18 @@ class LibraryMixin:
         menu.Destroy()
 
     def _do_move_or_copy(self, idx: int, target_file: str, move: bool = True) -> None:
-        if idx < 0 or idx >= len(self._library_items):
+        item = self._library_rows.item(idx)
+        if item is None:
             return
 
-        src_file, entry_name = self._library_items[idx]
+        src_file, entry_name = item
         target_path = Path(target_file)
         target_name = target_path.stem
 
         try:
             from kiutils.symbol import SymbolLib
 
-            src_lib = SymbolLib.from_file(src_file)
+            src_lib = SymbolLib.from_file(src_file, lazy=True)
             symbol = None
             for s in src_lib.symbols:
                 if s.entryName == entry_name:
@@ -202,7 +236,7 @@ class LibraryMixin:
                 return
 
             if target_path.exists():
-                target_lib = SymbolLib.from_file(str(target_path))
+                target_lib = SymbolLib.from_file(str(target_path), lazy=True)
             else:
                 target_lib = SymbolLib()
 
@@ -234,10 +268,11 @@ class LibraryMixin:
             wx.MessageBox(f"Error: {e}", "Error", wx.OK | wx.ICON_ERROR)
 
     def _on_library_copy_new(self, idx: int) -> None:
-        if idx < 0 or idx >= len(self._library_items):
+        item = self._library_rows.item(idx)
+        if item is None:
             return
 
-        src_file, entry_name = self._library_items[idx]
+        src_file, entry_name = item
         src_dir = Path(src_file).parent
 
         base_name = Path(src_file).stem
@@ -268,10 +303,11 @@ class LibraryMixin:
         self._do_move_or_copy(idx, target_file, move=False)
 
     def _on_library_delete(self, idx: int) -> None:
-        if idx < 0 or idx >= len(self._library_items):
+        item = self._library_rows.item(idx)
+        if item is None:
             return
 
-        sym_file, entry_name = self._library_items[idx]
+        sym_file, entry_name = item
 
         dlg = wx.MessageDialog(
             self,
@@ -286,7 +322,7 @@ class LibraryMixin:
 
         try:
             from kiutils.symbol import SymbolLib
-            lib = SymbolLib.from_file(sym_file)
+            lib = SymbolLib.from_file(sym_file, lazy=True)
             lib.symbols = [s for s in lib.symbols if s.entryName != entry_name]
             lib.to_file(sym_file)
             self.backend.print_to_buffer(
@@ -379,7 +415,7 @@ class LibraryMixin:
         for sym_file in sym_files:
             try:
                 from kiutils.symbol import SymbolLib
-                lib = SymbolLib.from_file(str(sym_file))
+                lib = SymbolLib.from_file(str(sym_file), lazy=True)
                 total_symbols += len(lib.symbols)
             except Exception:
                 pass
@@ -405,82 +441,84 @@ class LibraryMixin:
 
             self.backend.print_to_buffer("Fetching component categories...")
 
-            for sym_file in sym_files:
-                lib = SymbolLib.from_file(str(sym_file))
-                file_stem = sym_file.stem
-
-                if file_stem != lib_name:
-                    continue
-
-                symbols_to_move = {}
-                symbols_to_keep = []
-
-                for symbol in lib.symbols:
-                    props = {p.key: p.value for p in symbol.properties}
-                    category = None
-
-                    lcsc_id = props.get("LCSC Part", "")
-                    if lcsc_id:
-                        try:
-                            results = search_components(lcsc_id, page_size=1)
-                            if results and results[0].category:
-                                category = results[0].category
-                                self._fill_missing_metadata(symbol, props, results[0], lcsc_id)
-                        except Exception:
-                            pass
-
-                    if not category:
-                        ref = props.get("Reference", "")
-                        ref_map = {
-                            "U": "ICs", "IC": "ICs", "R": "Resistors",
-                            "C": "Capacitors", "L": "Inductors",
-                            "D": "Diodes", "Q": "Transistors",
-                            "J": "Connectors", "P": "Connectors",
-                            "SW": "Switches", "K": "Relays",
-                            "LED": "LEDs", "F": "Fuses",
-                        }
-                        for prefix, cat in ref_map.items():
-                            if ref.startswith(prefix):
-                                category = cat
-                                break
-
-                    if category:
-                        cat_key = category.replace(" ", "_").replace("/", "_")
-                        if cat_key not in symbols_to_move:
-                            symbols_to_move[cat_key] = []
-                        symbols_to_move[cat_key].append(symbol)
-                    else:
-                        symbols_to_keep.append(symbol)
-
-                for cat_key, symbols in symbols_to_move.items():
-                    sub_lib_name = f"{lib_name}_{cat_key}"
-                    sub_file = dest_path / f"{sub_lib_name}.kicad_sym"
-
-                    if sub_file.exists():
-                        sub_lib = SymbolLib.from_file(str(sub_file))
-                    else:
-                        sub_lib = SymbolLib()
-
-                    existing_names = {s.entryName for s in sub_lib.symbols}
-                    for sym in symbols:
-                        if sym.entryName not in existing_names:
-                            sub_lib.symbols.append(sym)
-                            moved += 1
+            # New sub-libraries are registered with one sym-lib-table write
+            lib_var = self.backend.config.get_library_variable()
+            reg_settings = KiCad_Settings(
+                self.backend.kicad_settings.SettingPath, path_prefix=lib_var
+            )
+            with reg_settings.batch():
+                for sym_file in sym_files:
+                    lib = SymbolLib.from_file(str(sym_file), lazy=True)
+                    file_stem = sym_file.stem
+
+                    if file_stem != lib_name:
+                        continue
+
+                    symbols_to_move = {}
+                    symbols_to_keep = []
+
+                    for symbol in lib.symbols:
+                        props = symbol.propertyDict
+                        category = None
+
+                        lcsc_id = props.get("LCSC Part", "")
+                        if lcsc_id:
+                            try:
+                                results = search_components(lcsc_id, page_size=1)
+                                if results and results[0].category:
+                                    category = results[0].category
+                                    self._fill_missing_metadata(symbol, props, results[0], lcsc_id)
+                            except Exception:
+                                pass
+
+                        if not category:
+                            ref = props.get("Reference", "")
+                            ref_map = {
+                                "U": "ICs", "IC": "ICs", "R": "Resistors",
+                                "C": "Capacitors", "L": "Inductors",
+                                "D": "Diodes", "Q": "Transistors",
+                                "J": "Connectors", "P": "Connectors",
+                                "SW": "Switches", "K": "Relays",
+                                "LED": "LEDs", "F": "Fuses",
+                            }
+                            for prefix, cat in ref_map.items():
+                                if ref.startswith(prefix):
+                                    category = cat
+                                    break
+
+                        if category:
+                            cat_key = category.replace(" ", "_").replace("/", "_")
+                            if cat_key not in symbols_to_move:
+                                symbols_to_move[cat_key] = []
+                            symbols_to_move[cat_key].append(symbol)
                         else:
-                            symbols_to_keep.append(sym)
+                            symbols_to_keep.append(symbol)
 
-                    sub_lib.to_file(str(sub_file))
+                    for cat_key, symbols in symbols_to_move.items():
+                        sub_lib_name = f"{lib_name}_{cat_key}"
+                        sub_file = dest_path / f"{sub_lib_name}.kicad_sym"
+
+                        if sub_file.exists():
+                            sub_lib = SymbolLib.from_file(str(sub_file), lazy=True)
+                        else:
+                            sub_lib = SymbolLib()
 
-                    lib_var = self.backend.config.get_library_variable()
-                    reg_settings = KiCad_Settings(
-                        self.backend.kicad_settings.SettingPath, path_prefix=lib_var
-                    )
-                    reg_settings.check_symbollib(
-                        f"{sub_lib_name}.kicad_sym", add_if_possible=True
-                    )
+                        existing_names = {s.entryName for s in sub_lib.symbols}
+                        for sym in symbols:
+                            if sym.entryName not in existing_names:
+                                sub_lib.symbols.append(sym)
+                                moved += 1
+                            else:
+                                symbols_to_keep.append(sym)
 
-                lib.symbols = symbols_to_keep
-                lib.to_file(str(sym_file))
+                        sub_lib.to_file(str(sub_file))
+
+                        reg_settings.check_symbollib(
+                            f"{sub_lib_name}.kicad_sym", add_if_possible=True
+                        )
+
+                    lib.symbols = symbols_to_keep
+                    lib.to_file(str(sym_file))
 
             self.backend.print_to_buffer(
                 tr("messages.library_reorganize_done", moved=moved)
@@ -505,6 +543,55 @@ class LibraryMixin:
 
         event.Skip()
 
+    # === 3D MODEL DEDUPLICATION ===
+
+    def _on_dedup_models(self, event) -> None:
+        """Check the .3dshapes folders for duplicates in the background, then ask"""
+        self.m_btn_lib_dedup.Disable()
+        self.m_library_status.SetLabel(tr("messages.library_dedup_scanning"))
+        Thread(
+            target=self._dedup_models,
+            args=(self._get_all_library_paths(), True),
+            daemon=True,
+        ).start()
+        event.Skip()
+
+    def _dedup_models(self, all_paths: list, dry_run: bool) -> None:
+        reports = []
+        for dest_path in all_paths:
+            try:
+                reports.append(dedup_libraries(dest_path, dry_run=dry_run))
+            except Exception as e:
+                logging.error(f"3D model deduplication failed for {dest_path}: {e}")
+        wx.CallAfter(self._on_dedup_models_done, all_paths, reports, dry_run)
+
+    def _on_dedup_models_done(self, all_paths: list, reports: list, dry_run: bool) -> None:
+        if not self:
+            return
+        files = sum(r.files for r in reports)
+        linked = sum(r.linked for r in reports)
+        mb = f"{sum(r.bytes_reclaimed for r in reports) / 1e6:.1f}"
+
+        if not dry_run:
+            self.backend.print_to_buffer(tr("messages.library_dedup_done", linked=linked, mb=mb))
+        elif not linked:
+            self.backend.print_to_buffer(tr("messages.library_dedup_none", files=files))
+        else:
+            dlg = wx.MessageDialog(
+                self,
+                tr("messages.library_dedup_confirm", linked=linked, files=files, mb=mb),
+                tr("messages.confirm_title"),
+                wx.YES_NO | wx.NO_DEFAULT | wx.ICON_QUESTION,
+            )
+            confirmed = dlg.ShowModal() == wx.ID_YES
+            dlg.Destroy()
+            if confirmed:
+                Thread(target=self._dedup_models, args=(all_paths, False), daemon=True).start()
+                return
+
+        self.m_btn_lib_dedup.Enable()
+        self._refresh_library_tab()
+
     @staticmethod
     def _fill_missing_metadata(symbol, existing_props: dict, api_result, lcsc_id: str) -> None:
         from datetime import date
@@ -534,10 +621,11 @@ class LibraryMixin:
         event.Skip()
 
     def _on_library_move(self, idx: int) -> None:
-        if idx < 0 or idx >= len(self._library_items):
+        item = self._library_rows.item(idx)
+        if item is None:
             return
 
-        src_file, entry_name = self._library_items[idx]
+        src_file, entry_name = item
         src_dir = Path(src_file).parent
 
         base_name = Path(src_file).stem
@@ -569,7 +657,7 @@ class LibraryMixin:
         try:
             from kiutils.symbol import SymbolLib
 
-            src_lib = SymbolLib.from_file(src_file)
+            src_lib = SymbolLib.from_file(src_file, lazy=True)
             symbol = None
             for s in src_lib.symbols:
                 if s.entryName == entry_name:
@@ -579,7 +667,7 @@ class LibraryMixin:
                 return
 
             if target_file.exists():
-                target_lib = SymbolLib.from_file(str(target_file))
+                target_lib = SymbolLib.from_file(str(target_file), lazy=True)
             else:
                 target_lib = SymbolLib()
 
@@ -614,14 +702,15 @@ class LibraryMixin:
             wx.MessageBox(f"Error: {e}", "Error", wx.OK | wx.ICON_ERROR)
 
     def _on_library_edit(self, idx: int) -> None:
-        if idx < 0 or idx >= len(self._library_items):
+        item = self._library_rows.item(idx)
+        if item is None:
             return
 
-        sym_file, entry_name = self._library_items[idx]
+        sym_file, entry_name = item
 
         try:
             from kiutils.symbol import SymbolLib
-            lib = SymbolLib.from_file(sym_file)
+            lib = SymbolLib.from_file(sym_file, lazy=True)
             symbol = None
             for s in lib.symbols:
                 if s.entryName == entry_name:
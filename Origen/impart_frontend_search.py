@@ -3,18 +3,31 @@ Search tab mixin for ImpartFrontend.
 Handles JLCPCB/LCSC component search with image preview.
 """
 
+import io
 import logging
 from threading import Thread
 
 import wx
 
 try:
-    from .ComponentSearch import search_components, fetch_component_image
+    from .ComponentSearch import get_search_client, download_component_image
+    from .ComponentSearch.thumbnails import ThumbnailService
     from .i18n import _ as tr
 except ImportError:
-    from ComponentSearch import search_components, fetch_component_image
+    from ComponentSearch import get_search_client, download_component_image
+    from ComponentSearch.thumbnails import ThumbnailService
     from i18n import _ as tr
 
+THUMBNAIL_SIZE = 200
+
+
+def _decode_thumbnail(data: bytes):
+    """Decode and scale a thumbnail; runs on a thumbnail worker thread."""
+    image = wx.Image(io.BytesIO(data))
+    if not image.IsOk():
+        return None
+    return image.Scale(THUMBNAIL_SIZE, THUMBNAIL_SIZE, wx.IMAGE_QUALITY_HIGH)
+
 
 class SearchMixin:
     """Mixin providing search tab functionality."""
@@ -50,9 +63,18 @@ class SearchMixin:
         self.m_btn_search_import.Enable(False)
         self.m_btn_open_lcsc.Enable(False)
         self.m_search_image.SetBitmap(wx.NullBitmap)
+        self._select_thumbnail("")
         self.m_search_detail.SetValue("")
         self.m_search_duplicate.SetLabel("")
 
+        # Pages seen before (or prefetched) are shown without a request
+        cached = get_search_client().cached(
+            self._search_keyword, self._search_page, self._search_page_size
+        )
+        if cached is not None:
+            self._display_search_results(self._search_keyword, cached, self._search_page)
+            return
+
         thread = Thread(
             target=self._do_search,
             args=(self._search_keyword, self._search_page),
@@ -61,7 +83,7 @@ class SearchMixin:
 
     def _do_search(self, keyword: str, page: int) -> None:
         try:
-            results = search_components(keyword, page=page, page_size=self._search_page_size)
+            results = get_search_client().search(keyword, page=page, page_size=self._search_page_size)
             wx.CallAfter(self._display_search_results, keyword, results, page)
         except Exception as e:
             wx.CallAfter(self._display_search_error, str(e))
@@ -91,6 +113,15 @@ class SearchMixin:
             self.m_search_list.SetItem(idx, 4, str(r.stock))
             self.m_search_list.SetItem(idx, 5, f"${r.price:.4f}" if r.price else "")
 
+        # Thumbnails of this page are loaded while the list is looked at
+        thumbnails = self._thumbnail_service()
+        thumbnails.cancel_prefetch()
+        thumbnails.prefetch(r.lcsc_id for r in results)
+
+        # Fetch the next page while this one is being looked at
+        if len(results) >= self._search_page_size:
+            get_search_client().prefetch(keyword, page + 1, self._search_page_size)
+
     def _display_search_error(self, error: str) -> None:
         self.m_btn_search.Enable(True)
         self.m_search_status.SetLabel(f"Error: {error}")
@@ -124,10 +155,8 @@ class SearchMixin:
         else:
             self.m_search_duplicate.SetLabel("")
 
-        if result.lcsc_id:
-            self.m_search_image.SetBitmap(wx.NullBitmap)
-            thread = Thread(target=self._load_search_image, args=(result.lcsc_id,))
-            thread.start()
+        self.m_search_image.SetBitmap(wx.NullBitmap)
+        self._select_thumbnail(result.lcsc_id)
 
         event.Skip()
 
@@ -141,23 +170,32 @@ class SearchMixin:
             webbrowser.open(result.lcsc_url)
         event.Skip()
 
-    def _load_search_image(self, lcsc_id: str) -> None:
-        try:
-            image_data = fetch_component_image(lcsc_id)
-            if image_data:
-                wx.CallAfter(self._display_search_image, image_data)
-        except Exception:
-            pass
+    # === THUMBNAILS ===
+
+    def _thumbnail_service(self) -> ThumbnailService:
+        if getattr(self, "_thumbnails", None) is None:
+            self._thumbnails = ThumbnailService(download_component_image, decode=_decode_thumbnail)
+        return self._thumbnails
+
+    def _select_thumbnail(self, lcsc_id: str) -> None:
+        """Request the thumbnail of the selected row and drop the previous request."""
+        previous = getattr(self, "_search_image_id", "")
+        self._search_image_id = lcsc_id
+        if previous and previous != lcsc_id:
+            self._thumbnail_service().cancel(previous)
+        if lcsc_id:
+            self._thumbnail_service().request(lcsc_id, self._on_thumbnail_ready)
 
-    def _display_search_image(self, image_data: bytes) -> None:
+    def _on_thumbnail_ready(self, lcsc_id: str, image) -> None:
+        wx.CallAfter(self._display_search_image, lcsc_id, image)
+
+    def _display_search_image(self, lcsc_id: str, image) -> None:
+        # Ignore thumbnails of rows that are no longer selected
+        if image is None or lcsc_id != self._search_image_id:
+            return
         try:
-            import io
-            stream = io.BytesIO(image_data)
-            image = wx.Image(stream)
-            if image.IsOk():
-                image = image.Scale(200, 200, wx.IMAGE_QUALITY_HIGH)
-                self.m_search_image.SetBitmap(wx.Bitmap(image))
-                self.m_search_image.GetParent().Layout()
+            self.m_search_image.SetBitmap(wx.Bitmap(image))
+            self.m_search_image.GetParent().Layout()
         except Exception as e:
             logging.debug(f"Failed to display image: {e}")
 
@@ -172,9 +210,4 @@ class SearchMixin:
 
         self._perform_easyeda_import()
 
-        self._refresh_history_tab()
-        self.notebook.SetPageText(
-            self._history_tab_idx, tr("gui.tab_history", count=self.backend.history.get_count())
-        )
-
         event.Skip()
@@ -1,13 +1,16 @@
 from pathlib import Path
 import logging
+import shutil
 from typing import Union
 
 logger = logging.getLogger(__name__)
 
 try:
     from .kicad_cli import kicad_cli
+    from .LegacySymbolLib import convert_legacy_file
 except ImportError:
     from kicad_cli import kicad_cli
+    from LegacySymbolLib import convert_legacy_file
 
 try:
     cli = kicad_cli()
@@ -89,6 +92,35 @@ def find_old_lib_files(
     return found_files
 
 
+def _convert_file(SRC: Path, DES: Path) -> bool:
+    """
+    Legacy .lib files are converted in-process. Old .kicad_sym files are
+    upgraded with kicad-cli when it is available, else copied as they are
+    (KiCad reads the older format).
+    """
+    if SRC.suffix == ".lib":
+        try:
+            convert_legacy_file(SRC, DES)
+        except Exception as e:
+            logger.error(f"Converting {SRC.name} to {DES.name} failed: {e}")
+            return False
+        return True
+
+    if cli is None or not cli.exists():
+        logger.warning(f"kicad_cli not found, copying {SRC.name} without upgrade")
+        shutil.copyfile(SRC, DES)
+        return True
+
+    result = cli.upgrade_sym_lib(str(SRC), str(DES))
+    if not result.success:
+        logger.error(f"Converting {SRC.name} to {DES.name} failed: {result.message}")
+        if result.stderr:
+            logger.error(f"Conversion error details: {result.stderr}")
+        return False
+    logger.info(f"Successfully converted {SRC.name} to {DES.name}: {result.message}")
+    return True
+
+
 def convert_lib(SRC: Path, DES: Path, drymode=True):
 
     BLK_file = SRC.with_suffix(SRC.suffix + ".blk")  # Backup
@@ -106,18 +138,8 @@ def convert_lib(SRC: Path, DES: Path, drymode=True):
         if DES_dcm.exists() and DES_dcm.is_file():
             return []
 
-        result = cli.upgrade_sym_lib(str(SRC), str(DES))
-        if not result.success:
-            logger.error(
-                f"Converting {SRC.name} to {DES.name} failed: {result.message}"
-            )
-            if result.stderr:
-                logger.error(f"Conversion error details: {result.stderr}")
+        if not _convert_file(SRC, DES):
             return []
-        else:
-            logger.info(
-                f"Successfully converted {SRC.name} to {DES.name}: {result.message}"
-            )
         msg.append([SRC.stem, DES.stem])
 
         if SRC_dcm.exists() and SRC_dcm.is_file():
@@ -131,10 +153,6 @@ def convert_lib(SRC: Path, DES: Path, drymode=True):
 
 def convert_lib_list(libs_dict, drymode=True):
 
-    if not cli.exists():
-        logger.error("kicad_cli not found! Conversion is not possible.")
-        drymode = True
-
     convertlist = []
     for lib, paths in libs_dict.items():
 
@@ -3,10 +3,29 @@ import sys
 import logging
 import shutil
 import os
-from typing import Optional, List, Tuple
-from dataclasses import dataclass
+import re
+import json
+import threading
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict
+from dataclasses import dataclass, field, asdict
 import tempfile
 
+try:
+    from ..SymbolLibFile import (
+        build_library,
+        legacy_symbol_names,
+        lib_version,
+        split_library,
+    )
+except ImportError:
+    from SymbolLibFile import (
+        build_library,
+        legacy_symbol_names,
+        lib_version,
+        split_library,
+    )
+
 
 @dataclass
 class CommandResult:
@@ -19,11 +38,74 @@ class CommandResult:
     message: str = ""
 
 
+@dataclass
+class KiCadCliCapabilities:
+    """Result of probing a kicad-cli binary."""
+
+    path: str
+    mtime: float = 0.0
+    found: bool = False
+    version: str = ""
+    available: bool = False
+    subcommands: List[str] = field(default_factory=list)
+
+    @property
+    def version_tuple(self) -> Tuple[int, int, int]:
+        return kicad_cli.version_to_tuple(self.version)
+
+    def supports(self, *command: str) -> bool:
+        """Check for a subcommand, e.g. ``supports("sym", "upgrade")``."""
+        return " ".join(command) in self.subcommands
+
+
+# Probes shared by all kicad_cli instances, keyed by resolved binary path
+_probe_cache: Dict[str, KiCadCliCapabilities] = {}
+_probe_lock = threading.Lock()
+
+# Indented "name   description" lines below a "Subcommands:" heading
+_SUBCOMMAND_RE = re.compile(r"^\s{2,}([a-z][\w-]*)(?:\s{2,}|$)")
+
+# Subcommand groups whose own subcommands are probed as well
+_PROBED_GROUPS = ["sym", "fp"]
+
+
+@dataclass
+class _BatchSymLib:
+    """One symbol library staged for a batched upgrade."""
+
+    input_file: str
+    output_file: str
+    kind: Tuple[str, str]
+    names: List[str]
+    body: str
+    dcm_body: str = ""
+
+
+def _partition_unique(items: list, keys_of) -> List[list]:
+    """Split items into batches whose key sets do not overlap (first fit)."""
+    batches: List[Tuple[set, list]] = []
+    for item in items:
+        keys = set(keys_of(item))
+        for used, batch in batches:
+            if not used & keys:
+                used |= keys
+                batch.append(item)
+                break
+        else:
+            batches.append((keys, [item]))
+    return [batch for _, batch in batches]
+
+
 class kicad_cli:
-    def __init__(self) -> None:
+    MIN_VERSION = "8.0.4"
+
+    def __init__(self, cache_file: Optional[Path] = None) -> None:
         """Initialize the KiCad CLI wrapper with logger and command discovery."""
         self.logger: logging.Logger = logging.getLogger(__name__)
         self.kicad_cmd: str = self._find_kicad_cli()
+        if cache_file is None:
+            cache_file = Path(__file__).resolve().parent.parent / "kicad_cli_probe.json"
+        self.cache_file = Path(cache_file)
 
     def _find_kicad_cli(self) -> str:
         """Find KiCad CLI command across different platforms."""
@@ -104,7 +186,8 @@ class kicad_cli:
             self.logger.error(error_msg)
             return CommandResult(False, "", str(e), -1, error_msg)
 
-    def version_to_tuple(self, version_str: str) -> Tuple[int, int, int]:
+    @staticmethod
+    def version_to_tuple(version_str: str) -> Tuple[int, int, int]:
         """Convert a version string like '8.0.4' or '8.0.4-rc1' to tuple."""
         try:
             clean_version: str = version_str.split("-")[0]
@@ -115,8 +198,14 @@ class kicad_cli:
         except (ValueError, AttributeError, TypeError, IndexError):
             return (0, 0, 0)
 
-    def exists(self) -> bool:
-        """Check if KiCad CLI exists and meets minimum version requirements."""
+    def _resolve_binary(self) -> Optional[str]:
+        """Return the absolute path of the kicad-cli binary, or None if missing."""
+        if os.path.isfile(self.kicad_cmd):
+            return os.path.abspath(self.kicad_cmd)
+        return shutil.which(self.kicad_cmd)
+
+    def _run_probe_command(self, args: List[str]) -> Optional[str]:
+        """Run kicad-cli with args for probing; returns stdout or None on failure."""
         try:
             creation_flags = (
                 subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
@@ -128,7 +217,7 @@ class kicad_cli:
             env["LC_ALL"] = "en_US.UTF-8"
 
             result = subprocess.run(
-                [self.kicad_cmd, "--version"],
+                [self.kicad_cmd] + args,
                 check=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
@@ -137,26 +226,127 @@ class kicad_cli:
                 creationflags=creation_flags,
                 env=env,
             )
-            version: str = result.stdout.strip()
-            min_version: str = "8.0.4"
-            kicad_vers: Tuple[int, int, int] = self.version_to_tuple(version)
-
-            self.logger.info(f"KiCad Version: {version}")
-            if not kicad_vers or kicad_vers < self.version_to_tuple(min_version):
-                self.logger.warning(f"Minimum required KiCad version is: {min_version}")
-                return False
-            else:
-                return True
+            return result.stdout
 
         except subprocess.TimeoutExpired:
-            self.logger.error("Timeout checking KiCad version")
-            return False
+            self.logger.error(f"Timeout running kicad-cli {' '.join(args)}")
         except (subprocess.CalledProcessError, FileNotFoundError):
             self.logger.error("kicad-cli does not exist or is not accessible")
-            return False
         except Exception as e:
             self.logger.error(f"Unexpected error checking KiCad: {e}")
-            return False
+        return None
+
+    @staticmethod
+    def _parse_subcommands(help_text: str) -> List[str]:
+        """Extract subcommand names from kicad-cli --help output."""
+        names: List[str] = []
+        in_section = False
+        for line in help_text.splitlines():
+            if line.strip().lower().startswith("subcommands"):
+                in_section = True
+                continue
+            if in_section:
+                match = _SUBCOMMAND_RE.match(line)
+                if match:
+                    names.append(match.group(1))
+                elif line.strip():
+                    in_section = False
+        return names
+
+    def _load_cached_probe(self, path: str, mtime: float) -> Optional[KiCadCliCapabilities]:
+        """Return the persisted probe for this binary if its mtime still matches."""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                entry = json.load(f).get(path)
+            if entry and entry.get("mtime") == mtime:
+                return KiCadCliCapabilities(**entry)
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+        return None
+
+    def _save_cached_probe(self, caps: KiCadCliCapabilities) -> None:
+        """Persist a probe result next to the other plugin data files."""
+        try:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    data = {}
+            except (OSError, ValueError):
+                data = {}
+            data[caps.path] = asdict(caps)
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            self.logger.warning(f"Could not save kicad-cli probe: {e}")
+
+    def _probe_binary(self, path: str, mtime: float) -> KiCadCliCapabilities:
+        """Run kicad-cli to find its version and subcommands."""
+        caps = KiCadCliCapabilities(path=path, mtime=mtime, found=True)
+
+        version_output = self._run_probe_command(["--version"])
+        if version_output is None:
+            caps.found = False
+            return caps
+
+        caps.version = version_output.strip()
+        kicad_vers = self.version_to_tuple(caps.version)
+        self.logger.info(f"KiCad Version: {caps.version}")
+        if not kicad_vers or kicad_vers < self.version_to_tuple(self.MIN_VERSION):
+            self.logger.warning(f"Minimum required KiCad version is: {self.MIN_VERSION}")
+        else:
+            caps.available = True
+
+        top_level = self._parse_subcommands(self._run_probe_command(["--help"]) or "")
+        caps.subcommands = list(top_level)
+        for group in _PROBED_GROUPS:
+            if group in top_level:
+                group_help = self._run_probe_command([group, "--help"]) or ""
+                caps.subcommands.extend(
+                    f"{group} {name}" for name in self._parse_subcommands(group_help)
+                )
+        return caps
+
+    def probe(self, refresh: bool = False) -> KiCadCliCapabilities:
+        """
+        Return the capabilities of the kicad-cli binary.
+
+        The probe runs once per binary path for the life of the process and is
+        persisted to disk keyed by the binary's mtime, so later sessions only
+        stat the binary.
+        """
+        path = self._resolve_binary()
+        if path is None:
+            key = self.kicad_cmd
+            with _probe_lock:
+                if refresh or key not in _probe_cache:
+                    self.logger.error("kicad-cli does not exist or is not accessible")
+                    _probe_cache[key] = KiCadCliCapabilities(path=key)
+                return _probe_cache[key]
+
+        with _probe_lock:
+            if not refresh and path in _probe_cache:
+                return _probe_cache[path]
+
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                mtime = 0.0
+
+            caps = None if refresh else self._load_cached_probe(path, mtime)
+            if caps is None:
+                caps = self._probe_binary(path, mtime)
+                if caps.found:
+                    self._save_cached_probe(caps)
+            else:
+                self.logger.info(f"KiCad Version: {caps.version} (cached)")
+
+            _probe_cache[path] = caps
+            return caps
+
+    def exists(self) -> bool:
+        """Check if KiCad CLI exists and meets minimum version requirements."""
+        return self.probe().available
 
     def _is_valid_symbol_file(self, filepath: str) -> bool:
         """Check if file appears to be a valid KiCad symbol file."""
@@ -430,6 +620,308 @@ class kicad_cli:
         return result
 
 
+    # === BATCHED UPGRADES ===
+
+    def _stage_sym_lib(
+        self, input_file: str, output_file: str
+    ) -> Optional[_BatchSymLib]:
+        """Read a symbol library for batching, or None if it must run on its own."""
+        try:
+            with open(input_file, "r", encoding="utf-8") as f:
+                text = f.read()
+        except (IOError, UnicodeDecodeError):
+            return None
+
+        if input_file.endswith(".lib"):
+            lines = text.splitlines()
+            if not lines or not lines[0].startswith("EESchema-LIBRARY"):
+                return None
+            body = "\n".join(
+                line
+                for line in lines[1:]
+                if not line.startswith("#encoding") and line.strip() != "#End Library"
+            )
+            dcm_body = ""
+            dcm_file = os.path.splitext(input_file)[0] + ".dcm"
+            if os.path.exists(dcm_file):
+                try:
+                    with open(dcm_file, "r", encoding="utf-8") as f:
+                        dcm_lines = f.read().splitlines()
+                    dcm_body = "\n".join(
+                        line
+                        for line in dcm_lines[1:]
+                        if line.strip() != "#End Doc Library"
+                    )
+                except (IOError, UnicodeDecodeError):
+                    return None
+            names = legacy_symbol_names(text)
+            kind = ("lib", lines[0].strip())
+        else:
+            parts = split_library(text)
+            if parts is None:
+                return None
+            _, _, spans = parts
+            names = [span.name for span in spans]
+            body = "\n".join(text[span.start : span.end] for span in spans)
+            dcm_body = ""
+            kind = ("kicad_sym", str(lib_version(text)))
+
+        if not names:
+            return None
+        return _BatchSymLib(input_file, output_file, kind, names, body, dcm_body)
+
+    def _upgrade_sym_batch(
+        self, batch: List[_BatchSymLib], force: bool
+    ) -> Optional[Dict[str, CommandResult]]:
+        """Upgrade several staged libraries in one kicad-cli run.
+
+        Returns None if the batch could not be upgraded or split back, so the
+        caller can fall back to upgrading the files one by one.
+        """
+        kind, header = batch[0].kind
+        stage_dir = tempfile.mkdtemp(prefix="kicad_batch_")
+        try:
+            merged_in = os.path.join(stage_dir, f"batch.{kind}")
+            merged_out = os.path.join(stage_dir, "batch_upgraded.kicad_sym")
+
+            with open(merged_in, "w", encoding="utf-8") as f:
+                if kind == "lib":
+                    f.write(f"{header}\n#encoding utf-8\n")
+                    f.write("\n".join(entry.body for entry in batch))
+                    f.write("\n#End Library\n")
+                else:
+                    with open(batch[0].input_file, "r", encoding="utf-8") as src:
+                        lib_header, _, _ = split_library(src.read())
+                    f.write(
+                        build_library(
+                            lib_header, "\t", [entry.body for entry in batch]
+                        )
+                    )
+
+            if kind == "lib" and any(entry.dcm_body for entry in batch):
+                merged_dcm = os.path.join(stage_dir, "batch.dcm")
+                with open(merged_dcm, "w", encoding="utf-8") as f:
+                    f.write("EESchema-DOCLIB  Version 2.0\n")
+                    f.write("\n".join(e.dcm_body for e in batch if e.dcm_body))
+                    f.write("\n#End Doc Library\n")
+
+            result = self.upgrade_sym_lib(merged_in, merged_out, force=force)
+            if not result.success:
+                self.logger.warning(f"Batched symbol upgrade failed: {result.message}")
+                return None
+
+            with open(merged_out, "r", encoding="utf-8") as f:
+                upgraded = f.read()
+            parts = split_library(upgraded)
+            if parts is None:
+                return None
+            out_header, out_indent, spans = parts
+            blocks = {span.name: upgraded[span.start : span.end] for span in spans}
+
+            outputs = {}
+            for entry in batch:
+                if not all(name in blocks for name in entry.names):
+                    self.logger.warning(
+                        f"Batched upgrade lost symbols of {entry.input_file}"
+                    )
+                    return None
+                outputs[entry.output_file] = build_library(
+                    out_header, out_indent, [blocks[name] for name in entry.names]
+                )
+
+            results = {}
+            for entry in batch:
+                with open(entry.output_file, "w", encoding="utf-8") as f:
+                    f.write(outputs[entry.output_file])
+                results[entry.input_file] = CommandResult(
+                    success=True,
+                    stdout=result.stdout,
+                    stderr=result.stderr,
+                    return_code=result.return_code,
+                    message=f"Upgraded in batch of {len(batch)} libraries",
+                )
+            return results
+
+        except Exception as e:
+            self.logger.warning(f"Batched symbol upgrade failed: {e}")
+            return None
+        finally:
+            shutil.rmtree(stage_dir, ignore_errors=True)
+
+    def upgrade_sym_libs(
+        self, files: Dict[str, str], force: bool = True
+    ) -> Dict[str, CommandResult]:
+        """
+        Upgrade many symbol libraries with as few kicad-cli runs as possible.
+
+        Libraries of the same format are merged into one staged library,
+        upgraded in a single invocation and split back by symbol name.
+        Libraries upgraded in place, or whose symbol names collide, are
+        handled separately; a failed batch falls back to per-file upgrades.
+
+        Args:
+            files: Mapping of input file to output file
+
+        Returns:
+            Mapping of input file to its CommandResult
+        """
+        results: Dict[str, CommandResult] = {}
+        groups: Dict[Tuple[str, str], List[_BatchSymLib]] = {}
+
+        for input_file, output_file in files.items():
+            input_file, output_file = str(input_file), str(output_file)
+            entry = None
+            if input_file != output_file and os.path.exists(input_file):
+                entry = self._stage_sym_lib(input_file, output_file)
+            if entry is None:
+                results[input_file] = self.upgrade_sym_lib(
+                    input_file, output_file, force=force
+                )
+            else:
+                groups.setdefault(entry.kind, []).append(entry)
+
+        for entries in groups.values():
+            for batch in _partition_unique(entries, lambda e: e.names):
+                batch_results = None
+                if len(batch) > 1:
+                    batch_results = self._upgrade_sym_batch(batch, force)
+                if batch_results is None:
+                    for entry in batch:
+                        results[entry.input_file] = self.upgrade_sym_lib(
+                            entry.input_file, entry.output_file, force=force
+                        )
+                else:
+                    results.update(batch_results)
+
+        return results
+
+    def upgrade_footprints(
+        self, files: List[str], force: bool = True
+    ) -> Dict[str, CommandResult]:
+        """
+        Upgrade many footprint files in place with as few kicad-cli runs as possible.
+
+        The files are copied into one staged ``.pretty`` folder (files with the
+        same name go to separate batches), upgraded together and copied back.
+        A failed batch falls back to upgrading its files one by one.
+
+        Returns:
+            Mapping of footprint file to its CommandResult
+        """
+        results: Dict[str, CommandResult] = {}
+        missing = [str(f) for f in files if not os.path.isfile(str(f))]
+        for footprint_file in missing:
+            error_msg = f"Footprint file does not exist: {footprint_file}"
+            self.logger.error(error_msg)
+            results[footprint_file] = CommandResult(False, "", error_msg, -1, error_msg)
+
+        pending = [str(f) for f in files if str(f) not in results]
+        for batch in _partition_unique(pending, lambda f: [os.path.basename(f)]):
+            batch_results = self._upgrade_footprint_batch(batch, force)
+            if not batch_results and len(batch) > 1:
+                for footprint_file in batch:
+                    batch_results.update(
+                        self._upgrade_footprint_batch([footprint_file], force)
+                    )
+            results.update(batch_results)
+
+        return results
+
+    def _upgrade_footprint_batch(
+        self, batch: List[str], force: bool
+    ) -> Dict[str, CommandResult]:
+        """Upgrade footprints with unique file names through one staged library.
+
+        Returns an empty dict if a multi-file batch failed.
+        """
+        stage_dir = tempfile.mkdtemp(prefix="kicad_batch_")
+        try:
+            pretty = os.path.join(stage_dir, "batch.pretty")
+            os.mkdir(pretty)
+            for footprint_file in batch:
+                shutil.copy2(footprint_file, pretty)
+
+            result = self.upgrade_footprint_lib(pretty, force=force)
+            if not result.success:
+                if len(batch) > 1:
+                    self.logger.warning(
+                        f"Batched footprint upgrade failed: {result.message}"
+                    )
+                    return {}
+                return {batch[0]: result}
+
+            results = {}
+            for footprint_file in batch:
+                staged = os.path.join(pretty, os.path.basename(footprint_file))
+                if os.path.exists(staged):
+                    shutil.copy2(staged, footprint_file)
+                    results[footprint_file] = CommandResult(
+                        True,
+                        result.stdout,
+                        result.stderr,
+                        result.return_code,
+                        f"Upgraded in batch of {len(batch)} footprints",
+                    )
+                else:
+                    error_msg = f"Upgrade output not found for {footprint_file}"
+                    self.logger.warning(error_msg)
+                    results[footprint_file] = CommandResult(
+                        False, result.stdout, result.stderr, result.return_code, error_msg
+                    )
+            return results
+
+        except Exception as e:
+            error_msg = f"Unexpected error during footprint upgrade: {e}"
+            self.logger.error(error_msg)
+            if len(batch) > 1:
+                return {}
+            return {batch[0]: CommandResult(False, "", str(e), -1, error_msg)}
+        finally:
+            shutil.rmtree(stage_dir, ignore_errors=True)
+
+
+@dataclass
+class UpgradeQueue:
+    """
+    Collects symbol and footprint upgrades and runs them together.
+
+    Import paths add files while staging a batch and call ``flush()`` once,
+    so a whole batch costs one kicad-cli run per format instead of one per file.
+    """
+
+    cli: kicad_cli
+    force: bool = True
+    sym_libs: Dict[str, str] = field(default_factory=dict)
+    footprints: List[str] = field(default_factory=list)
+
+    def add_sym_lib(self, input_file, output_file=None) -> None:
+        """Queue a symbol library upgrade (in place if no output is given)."""
+        input_file = str(input_file)
+        self.sym_libs[input_file] = str(output_file) if output_file else input_file
+
+    def add_footprint(self, footprint_file) -> None:
+        """Queue an in-place upgrade of a single ``.kicad_mod`` file."""
+        footprint_file = str(footprint_file)
+        if footprint_file not in self.footprints:
+            self.footprints.append(footprint_file)
+
+    def __len__(self) -> int:
+        return len(self.sym_libs) + len(self.footprints)
+
+    def flush(self) -> Dict[str, CommandResult]:
+        """Run all queued upgrades and return the results keyed by input file."""
+        results: Dict[str, CommandResult] = {}
+        if self.sym_libs:
+            results.update(self.cli.upgrade_sym_libs(self.sym_libs, force=self.force))
+        if self.footprints:
+            results.update(
+                self.cli.upgrade_footprints(self.footprints, force=self.force)
+            )
+        self.sym_libs = {}
+        self.footprints = []
+        return results
+
+
 if __name__ == "__main__":
     logging.basicConfig(
         level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
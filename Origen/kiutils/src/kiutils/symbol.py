@@ -506,6 +506,121 @@ class Symbol():
         expression += f'{indents}){endline}'
         return expression
 
+# A quoted string (backslash escapes included) or a single bracket
+_BRACKET_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[()]')
+_SYMBOL_HEAD = re.compile(r'\(\s*symbol\s+"((?:[^"\\]|\\.)*)"')
+_PROPERTY_HEAD = re.compile(r'\(\s*property\s+"((?:[^"\\]|\\.)*)"\s+"((?:[^"\\]|\\.)*)"')
+
+class LazySymbol():
+    """A top-level symbol of a lazily loaded ``SymbolLib`` that keeps its source text and is only
+    parsed into a ``Symbol`` when needed.
+
+    ``entryName``, ``libId`` and ``propertyDict`` are read from the source text. Any other attribute
+    access (and any attribute assignment) is forwarded to the parsed ``Symbol``, which is created
+    on first use. ``to_sexpr()`` re-emits the source text verbatim as long as the parsed symbol
+    would serialize the same as right after parsing.
+    """
+    __slots__ = ('text', '_libId', '_entryName', '_properties', '_symbol', '_baseline')
+
+    def __init__(self, text: str, libId: str, properties: Optional[dict] = None):
+        """Create a lazy symbol
+
+        Args:
+            - text (str): Source text of the ``(symbol ...)`` block
+            - libId (str): Unquoted ID of the symbol, as written in the block head
+            - properties (dict, optional): Property keys and values of the symbol. Defaults to None,
+              in which case they are read from ``text`` when first requested.
+        """
+        object.__setattr__(self, 'text', text)
+        object.__setattr__(self, '_libId', libId)
+        probe = Symbol()
+        probe.libId = libId
+        object.__setattr__(self, '_entryName', probe.entryName)
+        object.__setattr__(self, '_properties', properties)
+        object.__setattr__(self, '_symbol', None)
+        object.__setattr__(self, '_baseline', None)
+
+    @classmethod
+    def from_text(cls, text: str) -> LazySymbol:
+        """Create a lazy symbol from the source text of a single ``(symbol ...)`` block
+
+        Raises:
+            - Exception: When the text does not start with a symbol head
+        """
+        head = _SYMBOL_HEAD.match(text)
+        if not head:
+            raise Exception("Expression does not have the correct type")
+        return cls(text, head.group(1).replace('\\"', '"'))
+
+    @property
+    def isParsed(self) -> bool:
+        """True once the full ``Symbol`` was built"""
+        return self._symbol is not None
+
+    @property
+    def symbol(self) -> Symbol:
+        """The parsed ``Symbol``, built on first access"""
+        if self._symbol is None:
+            symbol = Symbol().from_sexpr(sexpr.parse_sexp(self.text))
+            object.__setattr__(self, '_symbol', symbol)
+            object.__setattr__(self, '_baseline', symbol.to_sexpr(indent=0))
+        return self._symbol
+
+    @property
+    def libId(self) -> str:
+        return self._symbol.libId if self._symbol is not None else self._libId
+
+    @property
+    def entryName(self) -> str:
+        return self._symbol.entryName if self._symbol is not None else self._entryName
+
+    @property
+    def propertyDict(self) -> dict:
+        """Property keys and values of the symbol, without parsing the whole symbol"""
+        if self._symbol is not None:
+            return {p.key: p.value for p in self._symbol.properties}
+        if self._properties is None:
+            properties = {}
+            for match in _PROPERTY_HEAD.finditer(self.text):
+                properties[match.group(1).replace('\\"', '"')] = match.group(2).replace('\\"', '"')
+            object.__setattr__(self, '_properties', properties)
+        return dict(self._properties)
+
+    @property
+    def isModified(self) -> bool:
+        """True if the parsed symbol no longer serializes to what was parsed"""
+        return self._symbol is not None and self._symbol.to_sexpr(indent=0) != self._baseline
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.symbol, name)
+
+    def __setattr__(self, name, value):
+        if name in LazySymbol.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.symbol, name, value)
+
+    def __repr__(self) -> str:
+        return f'LazySymbol(libId={self.libId!r}, parsed={self.isParsed})'
+
+    def to_sexpr(self, indent: int = 2, newline: bool = True) -> str:
+        """Generate the S-Expression representing this object. Unmodified symbols are returned as
+        their source text, indented on the first line only.
+
+        Args:
+            - indent (int): Number of whitespaces used to indent the output. Defaults to 2.
+            - newline (bool): Adds a newline to the end of the output. Defaults to True.
+
+        Returns:
+            - str: S-Expression of this object
+        """
+        if self.isModified:
+            return self._symbol.to_sexpr(indent, newline)
+        endline = '\n' if newline else ''
+        return f'{" "*indent}{self.text}{endline}'
+
 @dataclass
 class SymbolLib():
     """A symbol library defines the common format of ``.kicad_sym`` files. A symbol library may contain
@@ -521,14 +636,15 @@ class SymbolLib():
     """The ``generator`` token attribute defines the program used to write the file"""
 
     symbols: List[Symbol] = field(default_factory=list)
-    """The ``symbols`` token defines a list of zero or more symbols that are part of the symbol library"""
+    """The ``symbols`` token defines a list of zero or more symbols that are part of the symbol library.
+    Libraries loaded with ``lazy=True`` hold ``LazySymbol`` objects instead."""
 
     filePath: Optional[str] = None
     """The ``filePath`` token defines the path-like string to the library file. Automatically set when
     ``self.from_file()`` is used. Allows the use of ``self.to_file()`` without parameters."""
 
     @classmethod
-    def from_file(cls, filepath: str, encoding: Optional[str] = None) -> SymbolLib:
+    def from_file(cls, filepath: str, encoding: Optional[str] = None, lazy: bool = False) -> SymbolLib:
         """Load a symbol library directly from a KiCad footprint file (`.kicad_sym`) and sets the
         ``self.filePath`` attribute to the given file path.
 
@@ -536,6 +652,8 @@ class SymbolLib():
             - filepath (str): Path or path-like object that points to the file
             - encoding (str, optional): Encoding of the input file. Defaults to None (platform
                                         dependent encoding).
+            - lazy (bool, optional): Only index the top-level symbols and fill ``self.symbols`` with
+                                     ``LazySymbol`` objects. Defaults to False.
 
         Raises:
             - Exception: If the given path is not a file
@@ -547,9 +665,61 @@ class SymbolLib():
             raise Exception("Given path is not a file!")
 
         with open(filepath, 'r', encoding=encoding) as infile:
-            item = cls.from_sexpr(sexpr.parse_sexp(infile.read()))
-            item.filePath = filepath
-            return item
+            text = infile.read()
+        item = cls.from_text_lazy(text) if lazy else cls.from_sexpr(sexpr.parse_sexp(text))
+        item.filePath = filepath
+        return item
+
+    @classmethod
+    def from_text_lazy(cls, text: str) -> SymbolLib:
+        """Index the given ``.kicad_sym`` text without parsing its symbols. Each top-level symbol
+        becomes a ``LazySymbol`` holding its source text and property values.
+
+        Args:
+            - text (str): Content of a ``.kicad_sym`` file
+
+        Raises:
+            - Exception: When the text is not a symbol library or its brackets are unbalanced
+
+        Returns:
+            - SymbolLib: Object of the class with ``LazySymbol`` objects in ``self.symbols``
+        """
+        if not text.lstrip().startswith('(kicad_symbol_lib'):
+            raise Exception("Expression does not have the correct type")
+
+        object = cls()
+        depth = 0
+        start = -1
+        properties = {}
+        for match in _BRACKET_TOKEN.finditer(text):
+            token = match.group()
+            if token == '(':
+                depth += 1
+                if depth == 2:
+                    start = match.start()
+                elif depth == 3 and text.startswith('(property', match.start()):
+                    prop = _PROPERTY_HEAD.match(text, match.start())
+                    if prop:
+                        properties[prop.group(1).replace('\\"', '"')] = prop.group(2).replace('\\"', '"')
+            elif token == ')':
+                if depth == 2:
+                    block = text[start:match.end()]
+                    head = _SYMBOL_HEAD.match(block)
+                    if head:
+                        object.symbols.append(
+                            LazySymbol(block, head.group(1).replace('\\"', '"'), properties))
+                    else:
+                        item = sexpr.parse_sexp(block)
+                        if item[0] == 'version': object.version = str(item[1])
+                        if item[0] == 'generator': object.generator = item[1]
+                    properties = {}
+                depth -= 1
+                if depth < 0:
+                    break
+
+        if depth != 0:
+            raise Exception("Unbalanced brackets in symbol library")
+        return object
 
     @classmethod
     def from_sexpr(cls, exp: list) -> SymbolLib:
@@ -3,6 +3,7 @@
 # Originally taken from: https://gitlab.com/kicad/libraries/kicad-library-utils/-/blob/master/common/sexpr.py
 
 import re
+import sys
 
 dbg = False
 
@@ -15,7 +16,53 @@ term_regex = r'''(?mx)
         (?P<s>[^(^)\s]+)
        )'''
 
-def parse_sexp(sexp):
+# Fast tokenizer: the same alternatives as term_regex, except that numbers are
+# recognized after tokenizing (they always cover a whole atom) and the atom
+# class does not exclude '^' (inputs containing '^' use the reference parser).
+# An atom ending in a digit takes along a following whitespace other than a
+# space: term_regex only reads a number when it is followed by ' ' or ')'.
+_token_regex = re.compile(
+    r'\s*([()]|"(?:[^"]|(?<=\\)")*"(?=\)|\s)|[^()\s]+(?:(?<=\d)[^\S ])?)'
+)
+_num_regex = re.compile(r'[+-]?\d+\.\d+|-?\d+')
+_sq_regex = re.compile(r'"(?:[^"]|(?<=\\)")*"')
+
+# A digit directly followed by '(' (searched from the rare '(' side)
+_digit_paren_regex = re.compile(r'\((?<=\d\()')
+
+_OPEN = object()
+_CLOSE = object()
+
+
+class _AtomCache(dict):
+    """Maps token text to its parsed value; atoms repeat a lot in KiCad files."""
+
+    def __missing__(self, token):
+        if token[-1].isspace():
+            value = sys.intern(token[:-1])
+        elif token[0] == '"' and _sq_regex.fullmatch(token):
+            value = token[1:-1].replace(r'\"', '"')
+        elif _num_regex.fullmatch(token):
+            value = float(token)
+            if value.is_integer(): value = int(value)
+        else:
+            value = sys.intern(token)
+        self[token] = value
+        return value
+
+
+def _needs_reference_parser(sexp):
+    """True for inputs where the fast tokenizer could differ from term_regex."""
+    return (
+        '^' in sexp
+        or '"(' in sexp
+        or not sexp.rstrip().endswith(')')
+        or _digit_paren_regex.search(sexp) is not None
+    )
+
+
+def parse_sexp_regex(sexp):
+    """Reference parser driven directly by term_regex."""
     stack = []
     out = []
     if dbg: print("%-6s %-14s %-44s %-s" % tuple("term value out stack".split()))
@@ -40,4 +87,28 @@ def parse_sexp(sexp):
         else:
             raise NotImplementedError("Error: %r" % (term, value))
     assert not stack, "Trouble with nesting of brackets"
-    return out[0]
\ No newline at end of file
+    return out[0]
+
+
+def parse_sexp(sexp):
+    """Parse an S-expression; same result as parse_sexp_regex, several times faster."""
+    if dbg or _needs_reference_parser(sexp):
+        return parse_sexp_regex(sexp)
+
+    atoms = _AtomCache({'(': _OPEN, ')': _CLOSE})
+    stack = []
+    out = []
+    push = stack.append
+    pop = stack.pop
+    for value in map(atoms.__getitem__, _token_regex.findall(sexp)):
+        if value is _OPEN:
+            push(out)
+            out = []
+        elif value is _CLOSE:
+            assert stack, "Trouble with nesting of brackets"
+            tmpout, out = out, pop()
+            out.append(tmpout)
+        else:
+            out.append(value)
+    assert not stack, "Trouble with nesting of brackets"
+    return out[0]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-file vs batched kicad-cli upgrades.
+
+Generates N old-format symbol libraries and footprints, then upgrades them
+once with one kicad-cli run per file and once through the batched API.
+
+Usage:
+    python benchmarks/bench_kicad_cli_batch.py [N]
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Origen"))
+
+from kicad_cli import kicad_cli  # noqa: E402
+
+SYMBOL_TEMPLATE = """(kicad_symbol_lib (version 20211014) (generator bench)
+  (symbol "{name}" (in_bom yes) (on_board yes)
+    (property "Reference" "U" (id 0) (at 0 2.54 0)
+      (effects (font (size 1.27 1.27))))
+    (property "Value" "{name}" (id 1) (at 0 -2.54 0)
+      (effects (font (size 1.27 1.27))))
+    (symbol "{name}_0_1"
+      (rectangle (start -5.08 5.08) (end 5.08 -5.08)
+        (stroke (width 0.254) (type default) (color 0 0 0 0))
+        (fill (type background))))
+    (symbol "{name}_1_1"
+      (pin passive line (at -7.62 0 0) (length 2.54)
+        (name "A" (effects (font (size 1.27 1.27))))
+        (number "1" (effects (font (size 1.27 1.27))))))
+  )
+)
+"""
+
+FOOTPRINT_TEMPLATE = """(module {name} (layer F.Cu) (tedit 5B307E4C)
+  (fp_text reference REF** (at 0 -2) (layer F.SilkS)
+    (effects (font (size 1 1) (thickness 0.15))))
+  (fp_text value {name} (at 0 2) (layer F.Fab)
+    (effects (font (size 1 1) (thickness 0.15))))
+  (pad 1 smd rect (at -1 0) (size 1 1) (layers F.Cu F.Paste F.Mask))
+  (pad 2 smd rect (at 1 0) (size 1 1) (layers F.Cu F.Paste F.Mask))
+)
+"""
+
+
+def _generate(root: Path, count: int):
+    symbols = {}
+    footprints = []
+    for i in range(count):
+        name = f"PART_{i:04d}"
+        src = root / f"{name}.kicad_sym"
+        src.write_text(SYMBOL_TEMPLATE.format(name=name), encoding="utf-8")
+        symbols[str(src)] = str(root / f"{name}_upgraded.kicad_sym")
+
+        fp = root / f"FP_{i:04d}.kicad_mod"
+        fp.write_text(FOOTPRINT_TEMPLATE.format(name=f"FP_{i:04d}"), encoding="utf-8")
+        footprints.append(str(fp))
+    return symbols, footprints
+
+
+def _per_file(cli: kicad_cli, symbols, footprints) -> float:
+    start = time.perf_counter()
+    for input_file, output_file in symbols.items():
+        cli.upgrade_sym_lib(input_file, output_file)
+    for footprint in footprints:
+        cli.upgrade_footprints([footprint])
+    return time.perf_counter() - start
+
+
+def _batched(cli: kicad_cli, symbols, footprints) -> float:
+    start = time.perf_counter()
+    cli.upgrade_sym_libs(symbols)
+    cli.upgrade_footprints(footprints)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    cli = kicad_cli()
+    if not cli.exists():
+        print("kicad-cli not found or too old - skipping benchmark")
+        return 0
+
+    results = {}
+    for label, runner in [("per-file", _per_file), ("batched", _batched)]:
+        root = Path(tempfile.mkdtemp(prefix="bench_kicad_cli_"))
+        try:
+            symbols, footprints = _generate(root, count)
+            results[label] = runner(cli, symbols, footprints)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(f"{count} symbol libraries + {count} footprints")
+    for label, seconds in results.items():
+        print(f"  {label:<9} {seconds:8.2f} s")
+    if results["batched"] > 0:
+        print(f"  speedup   {results['per-file'] / results['batched']:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: kiutils reference S-expression parser vs the fast tokenizer.
+
+Without arguments, generates a large .kicad_sym and .kicad_pcb in KiCad 8
+layout (tab indentation, one token group per line). Any paths given on the
+command line are benchmarked instead.
+
+Usage:
+    python benchmarks/bench_sexpr.py [FILE ...]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Origen" / "kiutils" / "src"))
+
+from kiutils.utils import sexpr  # noqa: E402
+
+FONT = "(effects\n\t\t\t\t(font\n\t\t\t\t\t(size 1.27 1.27)\n\t\t\t\t)\n\t\t\t)"
+
+
+def _symbol(i: int) -> str:
+    pins = "".join(
+        f"\n\t\t\t(pin passive line\n\t\t\t\t(at {-7.62 if p % 2 else 7.62} {p * 2.54:.2f} {0 if p % 2 else 180})"
+        f'\n\t\t\t\t(length 2.54)\n\t\t\t\t(name "P{p}"\n\t\t\t\t\t{FONT}\n\t\t\t\t)'
+        f'\n\t\t\t\t(number "{p}"\n\t\t\t\t\t{FONT}\n\t\t\t\t)\n\t\t\t)'
+        for p in range(1, 17)
+    )
+    return (
+        f'\t(symbol "PART_{i}"\n\t\t(exclude_from_sim no)\n\t\t(in_bom yes)\n\t\t(on_board yes)'
+        f'\n\t\t(property "Reference" "U"\n\t\t\t(at 0 2.54 0)\n\t\t\t{FONT}\n\t\t)'
+        f'\n\t\t(property "Description" "Part \\"{i}\\""\n\t\t\t(at 0 0 0)\n\t\t\t{FONT}\n\t\t)'
+        f'\n\t\t(symbol "PART_{i}_0_1"\n\t\t\t(rectangle\n\t\t\t\t(start -5.08 5.08)\n\t\t\t\t(end 5.08 -5.08)'
+        f"\n\t\t\t\t(stroke\n\t\t\t\t\t(width 0.254)\n\t\t\t\t\t(type default)\n\t\t\t\t)"
+        f"\n\t\t\t\t(fill\n\t\t\t\t\t(type background)\n\t\t\t\t)\n\t\t\t)\n\t\t)"
+        f'\n\t\t(symbol "PART_{i}_1_1"{pins}\n\t\t)\n\t)\n'
+    )
+
+
+def _symbol_lib(count: int) -> str:
+    body = "".join(_symbol(i) for i in range(count))
+    return f'(kicad_symbol_lib\n\t(version 20231120)\n\t(generator "kicad_symbol_editor")\n{body})\n'
+
+
+def _pcb(count: int) -> str:
+    items = []
+    for i in range(count):
+        x, y = 10 + (i % 100) * 2.5, 10 + (i // 100) * 2.5
+        items.append(
+            f'\t(footprint "Resistor_SMD:R_0603"\n\t\t(layer "F.Cu")\n\t\t(uuid "{i:08x}-0000-4000-8000-000000000000")'
+            f"\n\t\t(at {x:.2f} {y:.2f} 90)"
+            f'\n\t\t(property "Reference" "R{i}"\n\t\t\t(at 0 -1.43 90)\n\t\t\t(layer "F.SilkS")\n\t\t\t{FONT}\n\t\t)'
+            f'\n\t\t(pad "1" smd roundrect\n\t\t\t(at -0.825 0 90)\n\t\t\t(size 0.8 0.95)'
+            f'\n\t\t\t(layers "F.Cu" "F.Paste" "F.Mask")\n\t\t\t(roundrect_rratio 0.25)\n\t\t\t(net {i % 50} "N{i % 50}")\n\t\t)'
+            f'\n\t\t(pad "2" smd roundrect\n\t\t\t(at 0.825 0 90)\n\t\t\t(size 0.8 0.95)'
+            f'\n\t\t\t(layers "F.Cu" "F.Paste" "F.Mask")\n\t\t\t(roundrect_rratio 0.25)\n\t\t\t(net {(i + 1) % 50} "N{(i + 1) % 50}")\n\t\t)\n\t)\n'
+            f'\t(segment\n\t\t(start {x:.3f} {y:.3f})\n\t\t(end {x + 2.5:.3f} {y:.3f})\n\t\t(width 0.25)'
+            f'\n\t\t(layer "F.Cu")\n\t\t(net {i % 50})\n\t\t(uuid "{i:08x}-1111-4000-8000-000000000000")\n\t)\n'
+        )
+    return f'(kicad_pcb\n\t(version 20240108)\n\t(generator "pcbnew")\n{"".join(items)})\n'
+
+
+def _best_of(func, text: str, runs: int = 3) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    if len(sys.argv) > 1:
+        files = [Path(p) for p in sys.argv[1:]]
+    else:
+        root = Path(tempfile.mkdtemp(prefix="bench_sexpr_"))
+        files = [root / "Large.kicad_sym", root / "Large.kicad_pcb"]
+        files[0].write_text(_symbol_lib(2000), encoding="utf-8")
+        files[1].write_text(_pcb(8000), encoding="utf-8")
+
+    for path in files:
+        text = path.read_text(encoding="utf-8")
+        if sexpr.parse_sexp(text) != sexpr.parse_sexp_regex(text):
+            print(f"{path.name}: parsers disagree!")
+            return 1
+        reference = _best_of(sexpr.parse_sexp_regex, text)
+        fast = _best_of(sexpr.parse_sexp, text)
+        print(f"{path.name} ({len(text) / 1e6:.1f} MB)")
+        print(f"  reference {reference:8.3f} s")
+        print(f"  fast      {fast:8.3f} s")
+        print(f"  speedup   {reference / fast:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
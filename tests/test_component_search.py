@@ -2,15 +2,21 @@
 
 import json
 import gzip
+import threading
+import time
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
+from HttpSession import HttpError, HttpResponse
 from ComponentSearch import (
     SearchResult,
     search_components,
     JLCPCB_SEARCH_URL,
     EASYEDA_API_URL,
+    download_component_image,
     fetch_component_image,
+    get_search_total,
 )
+from ComponentSearch.client import SearchClient
 
 
 # ---------------------------------------------------------------------------
@@ -76,13 +82,13 @@ def _make_jlcpcb_response(items):
     }).encode("utf-8")
 
 
-def _mock_urlopen(raw_bytes):
-    """Return a context-manager mock that yields raw_bytes on .read()."""
-    mock_response = MagicMock()
-    mock_response.read.return_value = raw_bytes
-    mock_response.__enter__ = lambda s: s
-    mock_response.__exit__ = MagicMock(return_value=False)
-    return mock_response
+# Requests go through the shared HttpSession; its request() is replaced
+HTTP_REQUEST = "HttpSession.HttpSession.request"
+
+
+def _mock_response(raw_bytes, status=200):
+    """Return an HttpResponse whose body is raw_bytes."""
+    return HttpResponse(status, {}, raw_bytes, "https://example.com")
 
 
 SAMPLE_ITEM = {
@@ -103,7 +109,7 @@ SAMPLE_ITEM = {
 def test_search_components_parses_single_result(monkeypatch):
     raw = _make_jlcpcb_response([SAMPLE_ITEM])
 
-    with patch("urllib.request.urlopen", return_value=_mock_urlopen(raw)):
+    with patch(HTTP_REQUEST, return_value=_mock_response(raw)):
         results = search_components("ESP32")
 
     assert len(results) == 1
@@ -119,7 +125,7 @@ def test_search_components_parses_multiple_results(monkeypatch):
     items = [dict(SAMPLE_ITEM, componentCode=f"C{i}") for i in range(5)]
     raw = _make_jlcpcb_response(items)
 
-    with patch("urllib.request.urlopen", return_value=_mock_urlopen(raw)):
+    with patch(HTTP_REQUEST, return_value=_mock_response(raw)):
         results = search_components("chip")
 
     assert len(results) == 5
@@ -128,7 +134,7 @@ def test_search_components_parses_multiple_results(monkeypatch):
 def test_search_components_handles_empty_list(monkeypatch):
     raw = _make_jlcpcb_response([])
 
-    with patch("urllib.request.urlopen", return_value=_mock_urlopen(raw)):
+    with patch(HTTP_REQUEST, return_value=_mock_response(raw)):
         results = search_components("nothing")
 
     assert results == []
@@ -138,7 +144,7 @@ def test_search_components_handles_missing_prices(monkeypatch):
     item = dict(SAMPLE_ITEM, componentPrices=[])
     raw = _make_jlcpcb_response([item])
 
-    with patch("urllib.request.urlopen", return_value=_mock_urlopen(raw)):
+    with patch(HTTP_REQUEST, return_value=_mock_response(raw)):
         results = search_components("ESP32")
 
     assert results[0].price == 0
@@ -148,7 +154,7 @@ def test_search_components_truncates_long_description(monkeypatch):
     item = dict(SAMPLE_ITEM, describe="x" * 300)
     raw = _make_jlcpcb_response([item])
 
-    with patch("urllib.request.urlopen", return_value=_mock_urlopen(raw)):
+    with patch(HTTP_REQUEST, return_value=_mock_response(raw)):
         results = search_components("ESP32")
 
     assert len(results[0].description) <= 200
@@ -158,7 +164,7 @@ def test_search_components_handles_gzip_response(monkeypatch):
     raw_json = _make_jlcpcb_response([SAMPLE_ITEM])
     compressed = gzip.compress(raw_json)
 
-    with patch("urllib.request.urlopen", return_value=_mock_urlopen(compressed)):
+    with patch(HTTP_REQUEST, return_value=_mock_response(compressed)):
         results = search_components("ESP32")
 
     assert len(results) == 1
@@ -170,15 +176,13 @@ def test_search_components_handles_gzip_response(monkeypatch):
 # ---------------------------------------------------------------------------
 
 def test_search_components_returns_empty_on_network_error(monkeypatch):
-    with patch("urllib.request.urlopen", side_effect=Exception("network down")):
+    with patch(HTTP_REQUEST, side_effect=Exception("network down")):
         results = search_components("ESP32")
     assert results == []
 
 
 def test_search_components_returns_empty_on_malformed_json(monkeypatch):
-    mock_response = _mock_urlopen(b"not json at all {{{")
-
-    with patch("urllib.request.urlopen", return_value=mock_response):
+    with patch(HTTP_REQUEST, return_value=_mock_response(b"not json at all {{{")):
         results = search_components("ESP32")
 
     assert results == []
@@ -200,22 +204,132 @@ def test_fetch_component_image_returns_bytes_on_success(monkeypatch):
 
     call_count = 0
 
-    def fake_urlopen(req, timeout=None, context=None):
+    def fake_request(method, url, **kwargs):
         nonlocal call_count
         call_count += 1
         if call_count == 1:
-            return _mock_urlopen(easyeda_payload)
-        mock = _mock_urlopen(image_bytes)
-        mock.status = 200
-        return mock
+            return _mock_response(easyeda_payload)
+        assert url == "https://example.com/img.png"
+        return _mock_response(image_bytes)
 
-    with patch("urllib.request.urlopen", side_effect=fake_urlopen):
+    with patch(HTTP_REQUEST, side_effect=fake_request):
         result = fetch_component_image("C14663")
 
     assert result == image_bytes
 
 
 def test_fetch_component_image_returns_none_on_error(monkeypatch):
-    with patch("urllib.request.urlopen", side_effect=Exception("timeout")):
+    with patch(HTTP_REQUEST, side_effect=Exception("timeout")):
         result = fetch_component_image("C14663")
     assert result is None
+
+
+def test_download_component_image_raises_on_error():
+    with patch(HTTP_REQUEST, side_effect=HttpError("timed out")):
+        with pytest.raises(HttpError):
+            download_component_image("C14663")
+
+
+def test_download_component_image_without_thumb_returns_none():
+    payload = json.dumps({"result": [{"thumb": ""}]}).encode("utf-8")
+    with patch(HTTP_REQUEST, return_value=_mock_response(payload)):
+        assert download_component_image("C14663") is None
+
+
+def test_get_search_total_reads_total_from_page(monkeypatch):
+    raw = _make_jlcpcb_response([SAMPLE_ITEM, SAMPLE_ITEM])
+    with patch(HTTP_REQUEST, return_value=_mock_response(raw)):
+        assert get_search_total("ESP32") == 2
+
+
+# ---------------------------------------------------------------------------
+# SearchClient - cache, coalescing and prefetch
+# ---------------------------------------------------------------------------
+
+class FakeFetch:
+    """Page fetch function that records its calls."""
+
+    def __init__(self, gate=None, fail=False):
+        self.calls = []
+        self.gate = gate
+        self.fail = fail
+
+    def __call__(self, keyword, page, page_size):
+        self.calls.append((keyword, page, page_size))
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise OSError("network down")
+        return [f"{keyword}-{page}-{i}" for i in range(page_size)], 1000
+
+
+def test_client_caches_pages():
+    fetch = FakeFetch()
+    client = SearchClient(fetch)
+    first = client.search("ESP32", page=2, page_size=3)
+    assert client.search(" esp32 ", page=2, page_size=3) == first
+    assert client.cached("ESP32", page=2, page_size=3) == first
+    assert client.cached("ESP32", page=3, page_size=3) is None
+    assert len(fetch.calls) == 1
+
+
+def test_client_expires_and_evicts_pages(monkeypatch):
+    fetch = FakeFetch()
+    client = SearchClient(fetch, max_entries=2, ttl=60)
+    client.search("A", page_size=1)
+    client.search("B", page_size=1)
+    client.search("A", page_size=1)  # A is now the most recently used
+    client.search("C", page_size=1)  # evicts B
+    assert client.cached("A", page_size=1) is not None
+    assert client.cached("B", page_size=1) is None
+
+    now = time.monotonic()
+    monkeypatch.setattr("ComponentSearch.client.time.monotonic", lambda: now + 61)
+    assert client.cached("A", page_size=1) is None
+    client.search("A", page_size=1)
+    assert [call[0] for call in fetch.calls] == ["A", "B", "C", "A"]
+
+
+def test_client_does_not_cache_failures():
+    fetch = FakeFetch(fail=True)
+    client = SearchClient(fetch)
+    assert client.search("ESP32") == []
+    assert client.search("ESP32") == []
+    assert len(fetch.calls) == 2
+
+
+def test_client_coalesces_identical_requests():
+    gate = threading.Event()
+    fetch = FakeFetch(gate=gate)
+    client = SearchClient(fetch)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(client.search("ESP32", page_size=2)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.time() + 5
+    while not fetch.calls and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(fetch.calls) == 1
+    assert results == [["ESP32-1-0", "ESP32-1-1"]] * 4
+
+
+def test_client_prefetches_in_background():
+    fetch = FakeFetch()
+    client = SearchClient(fetch)
+    client.prefetch("ESP32", page=2, page_size=2)
+    deadline = time.time() + 5
+    while client.cached("ESP32", page=2, page_size=2) is None and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert client.cached("ESP32", page=2, page_size=2) == ["ESP32-2-0", "ESP32-2-1"]
+    client.prefetch("ESP32", page=2, page_size=2)  # already cached
+    assert client.search("ESP32", page=2, page_size=2) == ["ESP32-2-0", "ESP32-2-1"]
+    assert len(fetch.calls) == 1
@@ -0,0 +1,154 @@
+"""Tests for the OBJ to VRML conversion of EasyEDA 3D models."""
+
+import io
+import random
+import re
+
+import pytest
+
+import impart_easyeda  # noqa: F401  (puts the bundled easyeda2kicad on sys.path)
+from easyeda2kicad.easyeda.parameters_easyeda import Ee3dModel, Ee3dModelBase
+from easyeda2kicad.kicad import export_kicad_3d_model
+from easyeda2kicad.kicad.export_kicad_3d_model import (
+    Exporter3dModelKicad,
+    generate_wrl_model,
+    parse_obj,
+    write_wrl,
+)
+
+OBJ = """newmtl mat0
+Ka 0.1 0.1 0.1
+Kd 0.2 0.3 0.4
+Ks 0.5 0.5 0.5
+d 1
+endmtl
+newmtl mat1
+Kd 0.9 0.8 0.7
+Ks 0.1 0.1 0.1
+endmtl
+v 0 0 0
+v 2.54 0 0
+v 2.54 5.08 0
+v 0 5.08 1.27
+v 10 10 10
+v 1 2 3
+usemtl mat0
+f 1// 2// 3//
+f 3// 4// 1//
+usemtl mat1
+f 6//6 4//4 2//2 3//3
+"""
+
+
+def _realistic_obj(vertices=20000, faces=30000, seed=7):
+    """A model the size of a large EasyEDA part, with exporter-style coordinates"""
+    rng = random.Random(seed)
+    lines = ["newmtl mat0", "Kd 0.2 0.3 0.4", "Ks 0.5 0.5 0.5", "endmtl",
+             "newmtl mat1", "Kd 0.9 0.8 0.7", "Ks 0.1 0.1 0.1", "endmtl"]
+    lines += [
+        "v %s %s %s" % tuple(repr(round(rng.uniform(-20, 20), rng.randint(1, 9))) for _ in "xyz")
+        for _ in range(vertices)
+    ]
+    for material in ("mat0", "mat1"):
+        lines.append(f"usemtl {material}")
+        for _ in range(faces // 2):
+            corners = rng.sample(range(1, vertices + 1), rng.choice((3, 4)))
+            lines.append("f " + " ".join(f"{c}//{c}" for c in corners))
+    return "\n".join(lines) + "\n"
+
+
+def _model(raw_obj=OBJ, step=None):
+    origin = Ee3dModelBase()
+    return Ee3dModel(
+        name="Part", uuid="uuid", translation=origin, rotation=origin, raw_obj=raw_obj, step=step
+    )
+
+
+def _faces(wrl):
+    """Resolve every face of every shape in the VRML text to its points"""
+    faces = []
+    for points, indices in re.findall(r"point \[\s*(.*?)\s*\].*?coordIndex \[\s*(.*?)\s*\]", wrl, re.S):
+        coords = [tuple(float(c) for c in p.split()) for p in points.split(", ")]
+        face = []
+        for index in (int(i) for i in indices.rstrip(",").split(",")):
+            if index == -1:
+                faces.append(face)
+                face = []
+            else:
+                face.append(coords[index])
+    return faces
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def test_shapes_keep_only_their_vertices():
+    mat0, mat1 = parse_obj(OBJ, use_numpy=False)
+
+    assert mat0.material["diffuse_color"] == ["0.2", "0.3", "0.4"]
+    assert mat0.points == [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 2.0, 0.0), (0.0, 2.0, 0.5)]
+    assert mat0.coord_index == [0, 1, 2, -1, 2, 3, 0, -1]
+
+    # Vertex 5 is unused; the quad keeps its four corners
+    assert mat1.points[:3] == [(1.0, 0.0, 0.0), (1.0, 2.0, 0.0), (0.0, 2.0, 0.5)]
+    assert mat1.points[3] == pytest.approx((1 / 2.54, 2 / 2.54, 3 / 2.54))
+    assert mat1.coord_index == [3, 2, 0, 1, -1]
+
+
+def test_crlf_obj_parses_like_lf():
+    crlf = parse_obj(OBJ.replace("\n", "\r\n"), use_numpy=False)
+    lf = parse_obj(OBJ, use_numpy=False)
+
+    assert [shape.material for shape in crlf] == [shape.material for shape in lf]
+    assert [shape.points for shape in crlf] == [shape.points for shape in lf]
+    assert [shape.coord_index for shape in crlf] == [shape.coord_index for shape in lf]
+
+
+def test_numpy_and_python_write_the_same_vrml():
+    pytest.importorskip("numpy")
+    obj = _realistic_obj()
+    for text in (obj, obj.replace("\n", "\r\n")):
+        with_numpy, without = io.StringIO(), io.StringIO()
+        write_wrl(parse_obj(text), with_numpy)
+        write_wrl(parse_obj(text, use_numpy=False), without)
+        assert with_numpy.getvalue() == without.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# VRML output
+# ---------------------------------------------------------------------------
+
+def test_vrml_faces_match_the_obj(monkeypatch):
+    monkeypatch.setattr(export_kicad_3d_model, "CHUNK_SIZE", 1)  # several writes per list
+    wrl = generate_wrl_model(_model()).raw_wrl
+
+    assert wrl.startswith(export_kicad_3d_model.VRML_HEADER)
+    assert wrl.count("Shape{") == 2
+    assert "diffuseColor 0.2 0.3 0.4" in wrl
+    assert _faces(wrl) == [
+        [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 2.0, 0.0)],
+        [(1.0, 2.0, 0.0), (0.0, 2.0, 0.5), (0.0, 0.0, 0.0)],
+        [(0.3937, 0.7874, 1.1811), (0.0, 2.0, 0.5), (1.0, 0.0, 0.0), (1.0, 2.0, 0.0)],
+    ]
+
+
+def test_exporter_streams_wrl_and_step(tmp_path):
+    (tmp_path / "Lib.3dshapes").mkdir()
+    exporter = Exporter3dModelKicad(_model(step=b"STEP"))
+    assert exporter.output.name == "Part"
+
+    exporter.export(str(tmp_path / "Lib"))
+
+    wrl = (tmp_path / "Lib.3dshapes" / "Part.wrl").read_text(encoding="utf-8")
+    assert wrl == generate_wrl_model(_model()).raw_wrl
+    assert (tmp_path / "Lib.3dshapes" / "Part.step").read_bytes() == b"STEP"
+
+
+def test_step_only_model(tmp_path):
+    (tmp_path / "Lib.3dshapes").mkdir()
+    exporter = Exporter3dModelKicad(_model(raw_obj=None, step=b"STEP"))
+    assert exporter.output is None
+
+    exporter.export(str(tmp_path / "Lib"))
+    assert [p.name for p in (tmp_path / "Lib.3dshapes").iterdir()] == ["Part.step"]
@@ -0,0 +1,204 @@
+"""Tests for the pipelined EasyEDA batch import.
+
+The fetch/convert and write stages of EasyEDAImporter are replaced by fakes,
+so no network access or kicad-cli is needed.
+"""
+
+import threading
+import time
+
+import pytest
+
+import impart_easyeda
+from impart_easyeda import (
+    EasyEDABatchImport,
+    EasyEDAImporter,
+    ImportConfig,
+    ImportPaths,
+    PreparedComponent,
+)
+from kicad_cli import CommandResult
+from ResponseCache import ResponseCache
+
+
+@pytest.fixture
+def fake_stages(monkeypatch, tmp_path):
+    """Record how prepare and commit are called."""
+    state = {"active": 0, "peak": 0, "commits": [], "threads": set(), "libs": {}}
+    lock = threading.Lock()
+
+    def prepare(self, component_id):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            self._print(f"fetched {component_id}")
+            # Later IDs finish first, so the commit order must be restored
+            time.sleep(0.02 if component_id.endswith("1") else 0.005)
+            if not component_id.startswith("C"):
+                raise ValueError(f"Invalid component ID: '{component_id}'")
+            if component_id == "C404":
+                raise RuntimeError("Failed to fetch CAD data for component C404")
+            return PreparedComponent(component_id)
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    def commit(self, prepared):
+        state["commits"].append(prepared.component_id)
+        state["threads"].add(threading.get_ident())
+        state["libs"][prepared.component_id] = self.config.lib_name
+        self._print(f"written {prepared.component_id}")
+        return ImportPaths(self.symbol_lib_path, None, None, None)
+
+    cache = ResponseCache(cache_dir=tmp_path / "cache")
+    monkeypatch.setattr(impart_easyeda, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(EasyEDAImporter, "prepare_component", prepare)
+    monkeypatch.setattr(EasyEDAImporter, "commit_component", commit)
+    return state
+
+
+def _batch(tmp_path, **kwargs):
+    output = []
+    batch = EasyEDABatchImport(
+        ImportConfig(base_folder=tmp_path, lib_name="Lib"), print_func=output.append, **kwargs
+    )
+    return batch, output
+
+
+# ---------------------------------------------------------------------------
+# Ordering and concurrency
+# ---------------------------------------------------------------------------
+
+def test_commits_in_input_order_on_calling_thread(tmp_path, fake_stages):
+    ids = [f"C{i}" for i in range(1, 13)]
+    batch, output = _batch(tmp_path, max_workers=3)
+
+    results = batch.run(ids)
+
+    assert [cid for cid, _ in results] == ids
+    assert all(paths is not None for _, paths in results)
+    assert fake_stages["commits"] == ids
+    assert fake_stages["threads"] == {threading.get_ident()}
+    assert 1 < fake_stages["peak"] <= 3
+
+
+def test_messages_are_grouped_per_component(tmp_path, fake_stages):
+    batch, output = _batch(tmp_path)
+    batch.run(["C1", "C2"])
+
+    assert output[:4] == [
+        "\n[1/2] C1",
+        "Starting import for EasyEDA/LCSC component: C1",
+        "fetched C1",
+        "written C1",
+    ]
+    assert output.index("\n[2/2] C2") > output.index("written C1")
+
+
+# ---------------------------------------------------------------------------
+# Errors, progress and callbacks
+# ---------------------------------------------------------------------------
+
+def test_failed_components_do_not_stop_the_batch(tmp_path, fake_stages):
+    succeeded = []
+    batch, output = _batch(tmp_path, on_success=lambda cid, paths: succeeded.append(cid))
+
+    results = batch.run(["C1", "X2", "C404", "C3"])
+
+    assert [paths is not None for _, paths in results] == [True, False, False, True]
+    assert succeeded == fake_stages["commits"] == ["C1", "C3"]
+    assert "Error X2: Invalid component ID: 'X2'" in output
+    assert "Error C404: Failed to fetch CAD data for component C404" in output
+
+
+def test_progress_is_reported_per_item_and_reset(tmp_path, fake_stages):
+    progress = []
+    batch, _ = _batch(tmp_path, on_progress=lambda *args: progress.append(args))
+    batch.run(["C1", "C2", "C3"])
+    assert progress == [(1, 3, "C1"), (2, 3, "C2"), (3, 3, "C3"), (0, 0, "")]
+
+
+def test_config_for_selects_library_per_component(tmp_path, fake_stages):
+    def config_for(component_id):
+        if component_id == "C2":
+            raise OSError("lookup failed")
+        return ImportConfig(base_folder=tmp_path, lib_name=f"Lib_{component_id}")
+
+    batch, _ = _batch(tmp_path, config_for=config_for)
+    batch.run(["C1", "C2"])
+    assert fake_stages["libs"] == {"C1": "Lib_C1", "C2": "Lib"}
+
+
+def test_queued_symbols_are_flushed_once(tmp_path, fake_stages, monkeypatch):
+    flushed = []
+    monkeypatch.setattr(
+        impart_easyeda.EasyEDASymbolQueue, "flush", lambda self: flushed.append(len(self)) or set()
+    )
+    batch, _ = _batch(tmp_path)
+    batch.run(["C1", "C2"])
+    assert flushed == [0]
+
+
+class FakeBatchCli:
+    """Upgrades the staged symbol libraries; symbols named in ``failing`` fail."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+
+    def upgrade_sym_libs(self, files):
+        results = {}
+        for input_file, output_file in files.items():
+            text = open(input_file, encoding="utf-8").read()
+            if any(f'"{name}"' in text for name in self.failing):
+                results[input_file] = CommandResult(False, "", "", 1, "upgrade failed")
+                continue
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(text.replace("(version 20211014)", "(version 20241209)"))
+            results[input_file] = CommandResult(True, "", "", 0)
+        return results
+
+
+@pytest.fixture
+def queued_symbols(fake_stages, monkeypatch):
+    """Commit queues a legacy symbol per component, as for a KiCad 7 library."""
+
+    def commit(self, prepared):
+        fake_stages["commits"].append(prepared.component_id)
+        self.symbol_queue.add(
+            self, prepared.component_id, f"Sym_{prepared.component_id}",
+            f'(kicad_symbol_lib (version 20211014) (symbol "Sym_{prepared.component_id}"))',
+        )
+        return ImportPaths(self.symbol_lib_path, None, None, None)
+
+    monkeypatch.setattr(EasyEDAImporter, "commit_component", commit)
+
+
+def test_queued_symbol_outcome_follows_the_flush(tmp_path, queued_symbols, monkeypatch):
+    monkeypatch.setattr(impart_easyeda, "cli", FakeBatchCli(failing={"Sym_C2"}))
+    succeeded = []
+    batch, output = _batch(tmp_path, on_success=lambda cid, paths: succeeded.append(cid))
+
+    results = batch.run(["C1", "C2", "C3"])
+
+    assert [paths is not None for _, paths in results] == [True, False, True]
+    assert succeeded == ["C1", "C3"]
+    assert "Added symbol: Sym_C1" in output and "Added symbol: Sym_C3" in output
+    assert "Added symbol: Sym_C2" not in output
+    assert "Error C2: symbol was not written" in output
+    assert '"Sym_C2"' not in (tmp_path / "Lib.kicad_sym").read_text(encoding="utf-8")
+
+
+def test_failing_flush_fails_every_queued_component(tmp_path, queued_symbols, monkeypatch):
+    def broken(self):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(impart_easyeda.EasyEDASymbolQueue, "flush", broken)
+    succeeded = []
+    batch, output = _batch(tmp_path, on_success=lambda cid, paths: succeeded.append(cid))
+
+    results = batch.run(["C1", "C2"])
+
+    assert [paths for _, paths in results] == [None, None]
+    assert succeeded == []
+    assert "Error: disk full" in output
@@ -0,0 +1,330 @@
+"""Tests for the native KiCad symbol emitter and how the EasyEDA importer
+writes symbols with it.
+
+The layout is checked against ``golden/kicad9_saved``: the ``lib_symbols`` of
+two schematics saved by eeschema 9.0, taken from the reference projects of
+kicad-sch-api 0.5.6 (MIT license). KiCad writes those symbols with the same
+code as symbol libraries. The ``easyeda_symbol_*`` golden files hold the
+emitter's own output and only guard against changes; where kicad-cli is
+installed they are also compared with a ``kicad-cli sym upgrade`` re-save.
+"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+import impart_easyeda
+from impart_easyeda import EasyEDAImporter, ImportConfig, PreparedComponent
+from kicad_cli import KiCadCliCapabilities, kicad_cli
+from ResponseCache import ResponseCache
+from SymbolLibFile import build_library, lib_version, scan_symbols
+
+from easyeda2kicad.kicad.parameters_kicad_symbol import (
+    KicadVersion,
+    KiBoxFill,
+    KiPinStyle,
+    KiPinType,
+    KiSymbol,
+    KiSymbolArc,
+    KiSymbolCircle,
+    KiSymbolFormat,
+    KiSymbolInfo,
+    KiSymbolPin,
+    KiSymbolPolygon,
+    KiSymbolRectangle,
+    format_sexpr,
+    ki_property,
+)
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+KICAD9_SAVED = sorted((GOLDEN_DIR / "kicad9_saved").glob("*.lib_symbols"))
+
+METADATA = [("ImportedBy", "CustomImportGUI"), ("OriginalSource", "EasyEDA")]
+
+
+def _pin(name, number, x, y, orientation, type_=KiPinType._input, style=KiPinStyle.line):
+    return KiSymbolPin(
+        name=name, number=number, style=style, length=2.54, type=type_,
+        orientation=orientation, pos_x=x, pos_y=y,
+    )
+
+
+def _ne555():
+    """A symbol like the one easyeda2kicad converts for C46749."""
+    return KiSymbol(
+        info=KiSymbolInfo(
+            name="NE555DR", prefix="U", package="EasyEDA:SOIC-8_L5.0-W4.0-P1.27-LS6.0-BL",
+            manufacturer="TI", datasheet="https://lcsc.com/datasheet/C46749.pdf",
+            lcsc_id="C46749", jlc_id="",
+        ),
+        pins=[
+            _pin("GND", "1", -10.16, 3.81, 0, KiPinType.power_in),
+            _pin("TRIG#", "2", -10.16, 1.27, 0, style=KiPinStyle.inverted),
+            _pin("OUT", "3", 10.16, 1.27, 180, KiPinType.output),
+            _pin("", "", 0, -8.89, 90, KiPinType.unspecified),
+        ],
+        rectangles=[KiSymbolRectangle(pos_x0=-7.62, pos_y0=6.35, pos_x1=7.62, pos_y1=-6.35)],
+        circles=[KiSymbolCircle(pos_x=-5.08, pos_y=5.08, radius=0.381, background_filling=True)],
+        arcs=[KiSymbolArc(start_x=2.54, start_y=0, middle_x=3.81, middle_y=1.27, end_x=5.08, end_y=0,
+                          angle_start=0, angle_end=180)],
+        polygons=[KiSymbolPolygon(
+            points=[[x * 0.635, (x % 2) * 0.635] for x in range(14)], points_number=14,
+        )],
+    )
+
+
+def _library(file_format, *symbols):
+    blocks = [symbol.export_sexpr(file_format, METADATA) for symbol in symbols]
+    return build_library(file_format.library_header(), "\t", blocks)
+
+
+# ---------------------------------------------------------------------------
+# Layout saved by KiCad 9
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()]+')
+
+
+def _parse(text):
+    """Nested lists of the tokens of an s-expression, strings kept quoted"""
+    stack = [[]]
+    for token in _TOKEN_RE.findall(text):
+        if token == "(":
+            stack.append([])
+        elif token == ")":
+            node = stack.pop()
+            stack[-1].append(node)
+        else:
+            stack[-1].append(token)
+    return stack[0][0]
+
+
+def _saved_block(text, head):
+    """The lines of the first block starting with ``head``, as saved"""
+    start = text.index(head)
+    indent = text[text.rindex("\n", 0, start) + 1 : start]
+    end = text.index("\n" + indent + ")", start) + len(indent) + 2
+    return text[start:end]
+
+
+@pytest.mark.parametrize("saved", KICAD9_SAVED, ids=lambda path: path.stem)
+def test_formatter_reproduces_kicad9_save(saved):
+    text = saved.read_text(encoding="utf-8")
+    # lib_symbols is a top-level token of the schematic, one tab deep
+    assert "\t" + format_sexpr(_parse(text), depth=1) == text.rstrip("\n")
+
+
+def test_pin_and_property_match_kicad9_save():
+    text = (GOLDEN_DIR / "kicad9_saved" / "resistor_divider.lib_symbols").read_text(encoding="utf-8")
+    pin = _pin("", "1", 0, 3.81, 90, KiPinType.passive)
+    pin.length = 1.27
+    saved_pin = _saved_block(text, "(pin passive line\n\t\t\t\t\t(at 0 3.81 270)")
+    assert format_sexpr(pin.export_sexpr(KiSymbolFormat.v9), depth=4) == saved_pin
+
+    saved_datasheet = _saved_block(text, '(property "Datasheet" "~"')
+    assert format_sexpr(ki_property("Datasheet", "~", hide=True), depth=3) == saved_datasheet
+
+
+def test_symbol_tokens_are_in_kicad9_order():
+    saved = _parse((GOLDEN_DIR / "kicad9_saved" / "resistor_divider.lib_symbols").read_text(encoding="utf-8"))
+    device_r = next(node for node in saved[1:] if node[1] == '"Device:R"')
+    emitted = _parse(_ne555().export_sexpr(KiSymbolFormat.v9))
+
+    def heads(symbol):
+        order = []
+        for node in symbol[2:]:
+            if node[0] not in order and node[0] not in ("pin_numbers", "pin_names"):
+                order.append(node[0])
+        return order
+
+    assert heads(emitted) == heads(device_r)
+
+
+# ---------------------------------------------------------------------------
+# Golden files
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("file_format", list(KiSymbolFormat), ids=lambda f: f.name)
+def test_output_matches_golden_file(file_format):
+    golden = GOLDEN_DIR / f"easyeda_symbol_{file_format.name}.kicad_sym"
+    assert _library(file_format, _ne555()) == golden.read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def installed_cli(tmp_path_factory):
+    cli = kicad_cli(cache_file=tmp_path_factory.mktemp("probe") / "kicad_cli_probe.json")
+    if not cli.exists():
+        pytest.skip("kicad-cli is not installed")
+    return cli
+
+
+def test_golden_file_matches_kicad_cli_resave(installed_cli, tmp_path):
+    major = installed_cli.probe().version_tuple[0]
+    file_format = KiSymbolFormat.for_kicad_major(major)
+    if file_format is None or file_format.kicad_major != major:
+        pytest.skip(f"No symbol format is listed for KiCad {major}")
+    emitted = _library(file_format, _ne555())
+    source, resaved = tmp_path / "emitted.kicad_sym", tmp_path / "resaved.kicad_sym"
+    source.write_text(emitted, encoding="utf-8")
+
+    result = installed_cli.upgrade_sym_lib(source, resaved, force=True)
+
+    assert result.success, result.stderr
+    text = resaved.read_text(encoding="utf-8")
+    assert text == emitted
+    assert text == (GOLDEN_DIR / f"easyeda_symbol_{file_format.name}.kicad_sym").read_text(
+        encoding="utf-8"
+    )
+
+
+def test_output_is_one_balanced_symbol_block():
+    text = _library(KiSymbolFormat.v9, _ne555())
+    assert [span.name for span in scan_symbols(text)] == ["NE555DR"]
+    assert lib_version(text) == 20241209
+
+
+# ---------------------------------------------------------------------------
+# Format selection
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("version, expected", [
+    (20211014, None),
+    (20231120, None),
+    (20241209, KiSymbolFormat.v9),
+    (20250114, None),
+    (20260101, None),
+])
+def test_format_follows_library_version(version, expected):
+    assert KiSymbolFormat.for_library_version(version) is expected
+
+
+@pytest.mark.parametrize("version, expected", [
+    ("8.0.4", None),
+    ("9.0.1", KiSymbolFormat.v9),
+    ("10.0.0", KiSymbolFormat.v9),
+    ("", None),
+])
+def test_new_library_format_follows_installed_kicad(monkeypatch, version, expected):
+    caps = KiCadCliCapabilities(path="kicad-cli", found=bool(version), version=version)
+    monkeypatch.setattr(impart_easyeda, "cli", FakeCli(caps))
+    assert impart_easyeda.symbol_format_for_library("") is expected
+
+
+# ---------------------------------------------------------------------------
+# Importer
+# ---------------------------------------------------------------------------
+
+class FakeCli:
+    """kicad-cli stand-in that records upgrades and bumps the version."""
+
+    def __init__(self, caps=None):
+        self.caps = caps or KiCadCliCapabilities(path="kicad-cli", found=True, version="9.0.1")
+        self.upgrades = []
+
+    def probe(self):
+        return self.caps
+
+    def upgrade_sym_lib_from_string(self, text):
+        self.upgrades.append(text)
+        return True, re.sub(r"\(version \d+\)", "(version 20241209)", text, count=1), None
+
+
+@pytest.fixture
+def fake_cli(monkeypatch):
+    cli = FakeCli()
+    monkeypatch.setattr(impart_easyeda, "cli", cli)
+    return cli
+
+
+@pytest.fixture
+def importer(tmp_path, monkeypatch):
+    cache = ResponseCache(cache_dir=tmp_path / "cache")
+    monkeypatch.setattr(impart_easyeda, "get_response_cache", lambda: cache)
+    output = []
+    importer = EasyEDAImporter(ImportConfig(base_folder=tmp_path, lib_name="EasyEDA"), output.append)
+    importer.output = output
+    monkeypatch.setattr(importer, "_symbol_metadata", lambda: METADATA)
+    yield importer
+    cache.close()
+
+
+def _prepared(symbol):
+    return PreparedComponent(
+        "C46749", symbol.info.name,
+        symbol_content=symbol.export(kicad_version=KicadVersion.v6), symbol=symbol,
+    )
+
+
+def _other_symbol(name="R"):
+    return KiSymbol(
+        info=KiSymbolInfo(name=name, prefix="R", package="", manufacturer="", datasheet="",
+                          lcsc_id="", jlc_id=""),
+        pins=[_pin("~", "1", 0, 3.81, 270, KiPinType.passive)],
+    )
+
+
+def test_symbol_is_spliced_into_library_without_kicad_cli(importer, fake_cli):
+    existing = build_library(
+        KiSymbolFormat.v9.library_header(), "\t",
+        [_other_symbol().export_sexpr(KiSymbolFormat.v9)],
+    )
+    importer.symbol_lib_path.write_text(existing, encoding="utf-8")
+
+    assert importer._write_symbol(_prepared(_ne555())) == (True, "NE555DR")
+
+    text = importer.symbol_lib_path.read_text(encoding="utf-8")
+    assert fake_cli.upgrades == []
+    assert text == build_library(
+        KiSymbolFormat.v9.library_header(), "\t",
+        [_other_symbol().export_sexpr(KiSymbolFormat.v9),
+         _ne555().export_sexpr(KiSymbolFormat.v9, METADATA)],
+    )
+    assert importer.output == ["Added symbol: NE555DR"]
+
+
+def test_library_in_unlisted_format_goes_through_kicad_cli(importer, fake_cli):
+    kicad8 = '(kicad_symbol_lib\n\t(version 20231120)\n\t(generator "kicad_symbol_editor")\n)\n'
+    importer.symbol_lib_path.write_text(kicad8, encoding="utf-8")
+
+    importer._write_symbol(_prepared(_ne555()))
+
+    assert len(fake_cli.upgrades) == 2  # the new symbol and the existing library
+    text = importer.symbol_lib_path.read_text(encoding="utf-8")
+    assert lib_version(text) == 20241209
+    assert [span.name for span in scan_symbols(text)] == ["NE555DR"]
+
+
+def test_new_library_is_created_in_installed_format(importer, fake_cli):
+    importer._write_symbol(_prepared(_ne555()))
+    text = importer.symbol_lib_path.read_text(encoding="utf-8")
+    assert text == _library(KiSymbolFormat.v9, _ne555())
+
+
+def test_existing_symbol_is_kept_unless_overwrite(importer, fake_cli):
+    importer._write_symbol(_prepared(_ne555()))
+    before = importer.symbol_lib_path.read_text(encoding="utf-8")
+
+    changed = _ne555()
+    changed.info.manufacturer = "Texas Instruments"
+    assert importer._write_symbol(_prepared(changed)) == (False, "NE555DR")
+    assert importer.symbol_lib_path.read_text(encoding="utf-8") == before
+    assert importer.output[-1] == "Symbol 'NE555DR' already exists."
+
+    importer.config.overwrite = True
+    assert importer._write_symbol(_prepared(changed)) == (True, "NE555DR")
+    text = importer.symbol_lib_path.read_text(encoding="utf-8")
+    assert '"Texas Instruments"' in text and [s.name for s in scan_symbols(text)] == ["NE555DR"]
+    assert importer.output[-1] == "Updated symbol: NE555DR"
+
+
+def test_library_older_than_kicad8_still_uses_kicad_cli(importer, fake_cli):
+    legacy = '(kicad_symbol_lib (version 20211014) (generator kicad_symbol_editor)\n)\n'
+    importer.symbol_lib_path.write_text(legacy, encoding="utf-8")
+
+    importer._write_symbol(_prepared(_ne555()))
+
+    assert len(fake_cli.upgrades) == 2  # the new symbol and the existing library
+    text = importer.symbol_lib_path.read_text(encoding="utf-8")
+    assert lib_version(text) == 20241209
+    assert [span.name for span in scan_symbols(text)] == ["NE555DR"]
@@ -0,0 +1,136 @@
+"""Tests for FileHandler - settled-file detection, persistence and watchers."""
+
+import os
+import time
+
+import pytest
+
+from FileHandler import FileHandler
+from FileHandler.watcher import InotifyWatcher, SnapshotWatcher, create_watcher
+
+
+def _write(path, size=2_000, age=10.0):
+    """Write a file of ``size`` bytes whose mtime is ``age`` seconds old."""
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def src(tmp_path):
+    src = tmp_path / "downloads"
+    src.mkdir()
+    return src
+
+
+@pytest.fixture
+def handler(tmp_path, src):
+    return FileHandler(str(src), settle_time=0.2, state_file=tmp_path / "known_files.json")
+
+
+# ---------------------------------------------------------------------------
+# get_new_files
+# ---------------------------------------------------------------------------
+
+def test_reports_each_settled_zip_once(handler, src):
+    _write(src / "b.zip")
+    _write(src / "a.zip")
+    _write(src / "notes.txt")
+    _write(src / "tiny.zip", size=10)
+
+    assert handler.get_new_files() == [str(src / "a.zip"), str(src / "b.zip")]
+    assert handler.get_new_files() == []
+    assert handler.known_files == {"a.zip", "b.zip", "tiny.zip"}
+
+
+def test_file_still_being_written_is_deferred(handler, src):
+    part = src / "part.zip"
+    _write(part, size=1_500, age=0)
+    assert handler.get_new_files() == []
+
+    _write(part, size=3_000, age=0.5)  # grew since it was last seen
+    assert handler.get_new_files() == []
+    assert handler.get_new_files() == [str(part)]
+
+
+def test_replaced_file_is_reported_again(handler, src):
+    _write(src / "a.zip")
+    handler.get_new_files()
+    _write(src / "a.zip", size=4_000, age=5)
+    assert handler.get_new_files() == [str(src / "a.zip")]
+
+
+def test_known_files_persist_across_instances(tmp_path, src, handler):
+    _write(src / "a.zip")
+    handler.get_new_files()
+
+    again = FileHandler(str(src), settle_time=0.2, state_file=tmp_path / "known_files.json")
+    assert again.get_new_files() == []
+    _write(src / "b.zip")
+    assert again.get_new_files() == [str(src / "b.zip")]
+
+
+def test_resetting_known_files_reports_everything_again(tmp_path, src, handler):
+    _write(src / "a.zip")
+    handler.get_new_files()
+    handler.known_files = set()
+    assert handler.get_new_files() == [str(src / "a.zip")]
+
+
+def test_known_files_are_kept_per_directory(tmp_path, src, handler):
+    other = tmp_path / "other"
+    other.mkdir()
+    _write(src / "a.zip")
+    _write(other / "a.zip")
+    handler.get_new_files()
+
+    assert handler.get_new_files(str(other)) == [str(other / "a.zip")]
+    assert handler.get_new_files(str(src)) == []
+
+
+def test_corrupt_state_file_is_ignored(tmp_path, src):
+    (tmp_path / "known_files.json").write_text("{not json")
+    _write(src / "a.zip")
+    handler = FileHandler(str(src), state_file=tmp_path / "known_files.json")
+    assert handler.get_new_files() == [str(src / "a.zip")]
+
+
+# ---------------------------------------------------------------------------
+# Watch mode
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("watcher_cls", [SnapshotWatcher, InotifyWatcher])
+def test_watcher_reports_new_files(src, watcher_cls):
+    if watcher_cls is InotifyWatcher and not InotifyWatcher.available():
+        pytest.skip("inotify not available")
+    watcher = watcher_cls(str(src), ".zip")
+    try:
+        assert watcher.changed(0.05) == set()
+        time.sleep(0.02)  # make sure the directory mtime moves
+        _write(src / "new.zip")
+        _write(src / "other.txt")
+        assert watcher.changed(0.5) == {"new.zip"}
+    finally:
+        watcher.close()
+
+
+def test_wait_for_new_files_uses_watcher_events(handler, src, monkeypatch):
+    _write(src / "old.zip")
+    assert handler.wait_for_new_files(timeout=0.05) == [str(src / "old.zip")]
+
+    # After the first scan, only watcher events and pending files are checked
+    monkeypatch.setattr(handler, "get_new_files", lambda *a: pytest.fail("directory was rescanned"))
+    _write(src / "new.zip", age=0)
+    found = []
+    deadline = time.time() + 5
+    while not found and time.time() < deadline:
+        found = handler.wait_for_new_files(timeout=0.1)
+    assert found == [str(src / "new.zip")]
+    handler.stop_watching()
+
+
+def test_create_watcher_falls_back_to_snapshot(src, monkeypatch):
+    monkeypatch.setattr(InotifyWatcher, "available", classmethod(lambda cls: False))
+    watcher = create_watcher(str(src), ".zip")
+    assert isinstance(watcher, SnapshotWatcher)
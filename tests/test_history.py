@@ -1,4 +1,4 @@
-"""Tests for ImportHistory - add, get, clear, is_already_imported."""
+"""Tests for ImportHistory - add, get, clear, is_already_imported, migration."""
 
 import json
 import pytest
@@ -128,22 +128,98 @@ def test_history_persists_to_disk(tmp_path):
     assert h2.get_entries()[0]["component"] == "Diode"
 
 
-def test_history_file_is_valid_json(tmp_path):
+def test_history_file_is_json_lines(tmp_path):
     h = ImportHistory(history_dir=tmp_path)
     h.add_entry("Transistor", "Samacsys", "MyLib")
-    history_file = tmp_path / "import_history.json"
-    data = json.loads(history_file.read_text(encoding="utf-8"))
-    assert isinstance(data, list)
-    assert data[0]["component"] == "Transistor"
+    h.add_entry("Diode", "Snapeda", "MyLib")
+    history_file = tmp_path / "import_history.jsonl"
+    lines = history_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["component"] for line in lines] == ["Transistor", "Diode"]
+
+
+def test_add_entry_appends_to_file(tmp_path):
+    h = ImportHistory(history_dir=tmp_path)
+    h.add_entry("First", "EasyEDA", "MyLib")
+    history_file = tmp_path / "import_history.jsonl"
+    before = history_file.read_bytes()
+    h.add_entry("Second", "EasyEDA", "MyLib")
+    assert history_file.read_bytes().startswith(before)
 
 
-def test_clear_writes_empty_json(tmp_path):
+def test_clear_empties_history_file(tmp_path):
     h = ImportHistory(history_dir=tmp_path)
     h.add_entry("X", "Y", "Z")
     h.clear()
-    history_file = tmp_path / "import_history.json"
-    data = json.loads(history_file.read_text(encoding="utf-8"))
-    assert data == []
+    history_file = tmp_path / "import_history.jsonl"
+    assert history_file.read_text(encoding="utf-8") == ""
+    assert ImportHistory(history_dir=tmp_path).get_count() == 0
+
+
+# ---------------------------------------------------------------------------
+# Migration from import_history.json
+# ---------------------------------------------------------------------------
+
+def test_legacy_json_is_migrated(tmp_path):
+    legacy = [
+        {"component": "Old1", "source": "EasyEDA", "library": "L", "date": "2024-01-01 00:00:00"},
+        {"component": "Old2", "source": "Snapeda", "library": "L", "date": "2024-01-02 00:00:00"},
+    ]
+    (tmp_path / "import_history.json").write_text(json.dumps(legacy, indent=2), encoding="utf-8")
+
+    h = ImportHistory(history_dir=tmp_path)
+    assert [e["component"] for e in h.get_entries()] == ["Old2", "Old1"]
+    assert not (tmp_path / "import_history.json").exists()
+    assert (tmp_path / "import_history.json.bak").exists()
+
+    h.add_entry("New", "EasyEDA", "L")
+    again = ImportHistory(history_dir=tmp_path)
+    assert [e["component"] for e in again.get_entries()] == ["New", "Old2", "Old1"]
+
+
+def test_unreadable_line_is_skipped(tmp_path):
+    history_file = tmp_path / "import_history.jsonl"
+    history_file.write_text(
+        '{"component": "A", "source": "S"}\n{"component": "B", "sou\n', encoding="utf-8"
+    )
+    h = ImportHistory(history_dir=tmp_path)
+    assert [e["component"] for e in h.get_entries()] == ["A"]
+
+
+# ---------------------------------------------------------------------------
+# Indexes, counters and paging
+# ---------------------------------------------------------------------------
+
+def test_is_already_imported_returns_newest_entry(history):
+    history.add_entry("ESP32", "EasyEDA", "Old")
+    history.add_entry("ESP32", "EasyEDA", "New")
+    assert history.is_already_imported("esp32")["library"] == "New"
+
+
+def test_is_already_imported_by_lcsc_id(history):
+    history.add_entry("NE555", "EasyEDA", "MyLib", lcsc_id="C7593")
+    history.add_entry("C2040", "EasyEDA", "MyLib")
+    assert history.is_already_imported("c7593")["component"] == "NE555"
+    assert history.is_already_imported("C2040")["component"] == "C2040"
+
+
+def test_stats_by_source_are_kept_up_to_date(tmp_path):
+    h = ImportHistory(history_dir=tmp_path)
+    h.add_entry("A", "EasyEDA", "L")
+    h.add_entry("B", "EasyEDA", "L")
+    h.add_entry("C", "Snapeda", "L")
+    assert h.get_stats_by_source() == {"EasyEDA": 2, "Snapeda": 1}
+    assert ImportHistory(history_dir=tmp_path).get_stats_by_source() == {"EasyEDA": 2, "Snapeda": 1}
+    h.clear()
+    assert h.get_stats_by_source() == {}
+
+
+def test_iter_entries_pages_newest_first(history):
+    for i in range(7):
+        history.add_entry(f"C{i}", "EasyEDA", "MyLib")
+    assert [e["component"] for e in history.iter_entries(limit=3)] == ["C6", "C5", "C4"]
+    assert [e["component"] for e in history.iter_entries(offset=3, limit=3)] == ["C3", "C2", "C1"]
+    assert [e["component"] for e in history.iter_entries(offset=6, limit=3)] == ["C0"]
+    assert list(history.iter_entries(offset=10, limit=3)) == []
 
 
 # ---------------------------------------------------------------------------
@@ -155,3 +231,4 @@ def test_corrupt_json_file_results_in_empty_history(tmp_path):
     history_file.write_text("this is not valid json", encoding="utf-8")
     h = ImportHistory(history_dir=tmp_path)
     assert h.get_count() == 0
+    assert history_file.exists()  # left alone so nothing is lost
@@ -0,0 +1,180 @@
+"""Tests for HttpSession - keep-alive pooling, decoding, redirects and retries.
+
+The requests go to a local HTTP/1.1 server, no network access is needed.
+"""
+
+import gzip
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from HttpSession import HttpError, HttpSession
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        server.connections.add(self.client_address)
+        if self.path == "/json":
+            self._reply(200, json.dumps({"ok": True}).encode())
+        elif self.path == "/gzip":
+            self._reply(200, gzip.compress(b"zipped"), {"Content-Encoding": "gzip"})
+        elif self.path == "/deflate":
+            self._reply(200, zlib.compress(b"deflated"), {"Content-Encoding": "deflate"})
+        elif self.path == "/redirect":
+            self._reply(302, headers={"Location": "/json"})
+        elif self.path == "/flaky":
+            server.flaky += 1
+            if server.flaky < 3:
+                self._reply(503, b"busy", {"Retry-After": "0"})
+            else:
+                self._reply(200, b"recovered")
+        elif self.path == "/drop":
+            self._reply(200, b"dropped")
+            self.close_connection = True  # without telling the client
+        elif self.path == "/close":
+            self._reply(200, b"bye", {"Connection": "close"})
+        else:
+            self._reply(404, b"missing")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.requests.append(self.path)
+        self._reply(200, body[::-1])
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.requests = []
+    server.connections = set()
+    server.flaky = 0
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "*")
+    session = HttpSession(backoff=0)
+    yield session
+    session.close()
+
+
+# ---------------------------------------------------------------------------
+# Connection reuse
+# ---------------------------------------------------------------------------
+
+def test_consecutive_requests_reuse_one_connection(server, session):
+    base, srv = server
+    for _ in range(5):
+        assert session.get(f"{base}/json").json() == {"ok": True}
+    assert len(srv.connections) == 1
+
+
+def test_connection_close_is_not_pooled(server, session):
+    base, srv = server
+    assert session.get(f"{base}/close").body == b"bye"
+    assert session.get(f"{base}/json").status == 200
+    assert len(srv.connections) == 2
+
+
+def test_stale_pooled_connection_is_replaced(server, session):
+    base, srv = server
+    session.get(f"{base}/drop")
+    # The dropped connection is reused first; that must not count as a retry
+    assert session.get(f"{base}/json", retries=0).status == 200
+    assert len(srv.connections) == 2
+
+
+def test_parallel_requests_share_the_pool(server, session):
+    base, _ = server
+    results = []
+
+    def fetch():
+        results.append(session.get(f"{base}/json").status)
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [200] * 8
+    assert sum(len(c) for c in session._idle.values()) <= session.max_idle_per_host
+
+
+# ---------------------------------------------------------------------------
+# Bodies, redirects and errors
+# ---------------------------------------------------------------------------
+
+def test_compressed_bodies_are_decoded(server, session):
+    base, _ = server
+    assert session.get(f"{base}/gzip").body == b"zipped"
+    assert session.get(f"{base}/deflate").body == b"deflated"
+
+
+def test_post_sends_body(server, session):
+    base, _ = server
+    assert session.post(f"{base}/echo", data=b"abc").body == b"cba"
+
+
+def test_redirect_is_followed(server, session):
+    base, srv = server
+    response = session.get(f"{base}/redirect")
+    assert response.json() == {"ok": True}
+    assert response.url == f"{base}/json"
+    assert srv.requests == ["/redirect", "/json"]
+
+
+def test_transient_status_is_retried(server, session):
+    base, srv = server
+    assert session.get(f"{base}/flaky").body == b"recovered"
+    assert srv.requests == ["/flaky"] * 3
+
+
+def test_retries_are_bounded(server, session):
+    base, srv = server
+    with pytest.raises(HttpError) as info:
+        session.get(f"{base}/flaky", retries=1)
+    assert info.value.status == 503
+    assert len(srv.requests) == 2
+
+
+def test_client_errors_are_not_retried(server, session):
+    base, srv = server
+    with pytest.raises(HttpError) as info:
+        session.get(f"{base}/nothing")
+    assert info.value.status == 404
+    assert srv.requests == ["/nothing"]
+
+
+def test_connection_errors_raise_after_retries(session):
+    with pytest.raises(HttpError):
+        session.get("http://127.0.0.1:9/", retries=1, timeout=2)
+
+
+def test_unsupported_url(session):
+    with pytest.raises(HttpError):
+        session.get("ftp://example.com/file")
@@ -0,0 +1,430 @@
+"""Tests for the batched kicad-cli upgrade API and the symbol span scanner.
+
+kicad-cli itself is replaced by a fake ``run_kicad_cli`` so the tests count
+invocations and check how staged libraries are merged and split back.
+"""
+
+import re
+import zipfile
+from pathlib import Path
+
+from kicad_cli import kicad_cli, CommandResult, UpgradeQueue
+from SymbolLibFile import scan_symbols, split_library, legacy_symbol_names
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _sym_lib(*names, version=20211014):
+    symbols = "".join(
+        f'\n  (symbol "{name}" (in_bom yes)\n'
+        f'    (property "Reference" "U" (at 0 0 0))\n'
+        f'    (symbol "{name}_0_1" (rectangle (start 0 0) (end 1 1)))\n'
+        f"  )"
+        for name in names
+    )
+    return f"(kicad_symbol_lib (version {version}) (generator test){symbols}\n)\n"
+
+
+class FakeCli(kicad_cli):
+    """kicad_cli whose subprocess calls are recorded and simulated."""
+
+    def __init__(self, fail_batches=False):
+        super().__init__()
+        self.commands = []
+        self.fail_batches = fail_batches
+
+    def run_kicad_cli(self, command):
+        self.commands.append(command)
+        if command[:2] == ["sym", "upgrade"]:
+            source = command[2]
+            target = command[4] if "-o" in command else source
+            if self.fail_batches and "batch" in source:
+                return CommandResult(False, "", "error", 1, "failed")
+            with open(source, encoding="utf-8") as f:
+                text = f.read()
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(re.sub(r"\(version \d+\)", "(version 20231120)", text))
+        return CommandResult(True, "Successfully upgraded", "", 0, "")
+
+
+# ---------------------------------------------------------------------------
+# SymbolLibFile scanner
+# ---------------------------------------------------------------------------
+
+def test_scan_symbols_finds_top_level_only():
+    text = _sym_lib("A", "B")
+    spans = scan_symbols(text)
+    assert [s.name for s in spans] == ["A", "B"]
+    assert text[spans[0].start:spans[0].end].startswith('(symbol "A"')
+    assert text[spans[0].start:spans[0].end].endswith(")")
+
+
+def test_scan_symbols_ignores_brackets_in_strings():
+    text = '(kicad_symbol_lib (version 1)\n  (symbol "X(1)" (property "V" "a)\\"b"))\n)'
+    spans = scan_symbols(text)
+    assert [s.name for s in spans] == ["X(1)"]
+    assert text[spans[0].start:spans[0].end] == '(symbol "X(1)" (property "V" "a)\\"b"))'
+
+
+def test_split_library_of_empty_lib():
+    header, _, spans = split_library("(kicad_symbol_lib (version 20231120) (generator x)\n)\n")
+    assert spans == []
+    assert header == "(kicad_symbol_lib (version 20231120) (generator x)"
+
+
+def test_split_library_rejects_other_files():
+    assert split_library("EESchema-LIBRARY Version 2.4") is None
+
+
+def test_legacy_symbol_names_include_aliases():
+    text = "EESchema-LIBRARY Version 2.4\nDEF ~R R 0 0 N Y 1 F N\nALIAS R1 R2\nENDDEF\n"
+    assert legacy_symbol_names(text) == ["R", "R1", "R2"]
+
+
+# ---------------------------------------------------------------------------
+# upgrade_sym_libs
+# ---------------------------------------------------------------------------
+
+def test_upgrade_sym_libs_runs_once_for_batch(tmp_path):
+    fake = FakeCli()
+    files = {}
+    for name in ["A", "B", "C"]:
+        src = tmp_path / f"{name}.kicad_sym"
+        src.write_text(_sym_lib(name), encoding="utf-8")
+        files[str(src)] = str(tmp_path / f"{name}_out.kicad_sym")
+
+    results = fake.upgrade_sym_libs(files)
+
+    assert len(fake.commands) == 1
+    assert all(r.success for r in results.values())
+    for name in ["A", "B", "C"]:
+        out = (tmp_path / f"{name}_out.kicad_sym").read_text(encoding="utf-8")
+        assert "(version 20231120)" in out
+        assert [s.name for s in scan_symbols(out)] == [name]
+
+
+def test_upgrade_sym_libs_splits_colliding_names(tmp_path):
+    fake = FakeCli()
+    files = {}
+    for i, names in enumerate([("A",), ("A", "B"), ("C",)]):
+        src = tmp_path / f"lib{i}.kicad_sym"
+        src.write_text(_sym_lib(*names), encoding="utf-8")
+        files[str(src)] = str(tmp_path / f"lib{i}_out.kicad_sym")
+
+    fake.upgrade_sym_libs(files)
+
+    # lib0 + lib2 share one batch, lib1 runs on its own
+    assert len(fake.commands) == 2
+    out1 = (tmp_path / "lib1_out.kicad_sym").read_text(encoding="utf-8")
+    assert [s.name for s in scan_symbols(out1)] == ["A", "B"]
+
+
+def test_upgrade_sym_libs_falls_back_per_file(tmp_path):
+    fake = FakeCli(fail_batches=True)
+    files = {}
+    for name in ["A", "B"]:
+        src = tmp_path / f"{name}.kicad_sym"
+        src.write_text(_sym_lib(name), encoding="utf-8")
+        files[str(src)] = str(tmp_path / f"{name}_out.kicad_sym")
+
+    results = fake.upgrade_sym_libs(files)
+
+    assert len(fake.commands) == 3
+    assert all(r.success for r in results.values())
+
+
+def test_upgrade_sym_libs_in_place_runs_alone(tmp_path):
+    fake = FakeCli()
+    lib = tmp_path / "Dest.kicad_sym"
+    lib.write_text(_sym_lib("A"), encoding="utf-8")
+
+    results = fake.upgrade_sym_libs({str(lib): str(lib)})
+
+    assert results[str(lib)].success
+    assert fake.commands == [["sym", "upgrade", str(lib), "--force"]]
+
+
+# ---------------------------------------------------------------------------
+# upgrade_footprints / UpgradeQueue
+# ---------------------------------------------------------------------------
+
+def test_upgrade_footprints_single_invocation(tmp_path):
+    fake = FakeCli()
+    paths = []
+    for i in range(3):
+        d = tmp_path / f"d{i}"
+        d.mkdir()
+        fp = d / f"FP{i % 2}.kicad_mod"
+        fp.write_text(f'(footprint "FP{i}")', encoding="utf-8")
+        paths.append(str(fp))
+
+    results = fake.upgrade_footprints(paths)
+
+    # FP0 appears twice, so two staged libraries are needed
+    assert len(fake.commands) == 2
+    assert all(cmd[:2] == ["fp", "upgrade"] for cmd in fake.commands)
+    assert all(r.success for r in results.values())
+
+
+def test_upgrade_queue_flush_clears(tmp_path):
+    fake = FakeCli()
+    src = tmp_path / "A.kicad_sym"
+    src.write_text(_sym_lib("A"), encoding="utf-8")
+    fp = tmp_path / "X.kicad_mod"
+    fp.write_text('(footprint "X")', encoding="utf-8")
+
+    queue = UpgradeQueue(fake)
+    queue.add_sym_lib(src, tmp_path / "A_out.kicad_sym")
+    queue.add_footprint(fp)
+    queue.add_footprint(fp)
+    assert len(queue) == 2
+
+    results = queue.flush()
+    assert set(results) == {str(src), str(fp)}
+    assert len(queue) == 0
+    assert len(fake.commands) == 2
+
+
+# ---------------------------------------------------------------------------
+# LibImporter.import_batch
+# ---------------------------------------------------------------------------
+
+def _snapeda_zip(path, name, footprint_extra=""):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(f"{name}.kicad_sym", _sym_lib(name))
+        zf.writestr(
+            f"{name}_FP.kicad_mod",
+            f'(footprint "{name}_FP" (layer "F.Cu"){footprint_extra})\n',
+        )
+    return path
+
+
+def test_import_batch_flushes_upgrades_once(tmp_path, monkeypatch):
+    import KiCadImport
+
+    fake = FakeCli()
+    monkeypatch.setattr(fake, "exists", lambda: True)
+    monkeypatch.setattr(KiCadImport, "cli", fake)
+
+    zips = [_snapeda_zip(tmp_path / f"{n}.zip", n) for n in ["PartA", "PartB", "PartC"]]
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    importer = KiCadImport.LibImporter()
+    importer.print = lambda txt: None
+    importer.set_DEST_PATH(dest)
+    results = importer.import_batch(zips)
+
+    assert results == [("OK",), ("OK",), ("OK",)]
+    # one batched sym upgrade and one destination upgrade; footprints are
+    # upgraded in-process
+    assert [cmd[:2] for cmd in fake.commands] == [
+        ["sym", "upgrade"],
+        ["sym", "upgrade"],
+    ]
+    lib_text = (dest / "CustomLibrary.kicad_sym").read_text(encoding="utf-8")
+    assert [s.name for s in scan_symbols(lib_text)] == ["PartA", "PartB", "PartC"]
+    assert sorted(p.name for p in (dest / "CustomLibrary.pretty").iterdir()) == [
+        "PartA_FP.kicad_mod",
+        "PartB_FP.kicad_mod",
+        "PartC_FP.kicad_mod",
+    ]
+
+
+def test_import_batch_batches_footprints_the_upgrader_cannot_handle(tmp_path, monkeypatch):
+    import KiCadImport
+
+    fake = FakeCli()
+    monkeypatch.setattr(fake, "exists", lambda: True)
+    monkeypatch.setattr(KiCadImport, "cli", fake)
+
+    unknown = " (dimension 1 (layer Dwgs.User))"
+    zips = [_snapeda_zip(tmp_path / f"{n}.zip", n, unknown) for n in ["PartA", "PartB"]]
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    importer = KiCadImport.LibImporter()
+    importer.print = lambda txt: None
+    importer.set_DEST_PATH(dest)
+
+    assert importer.import_batch(zips) == [("OK",), ("OK",)]
+    assert [cmd[:2] for cmd in fake.commands] == [
+        ["sym", "upgrade"],
+        ["fp", "upgrade"],
+        ["sym", "upgrade"],
+    ]
+
+
+def test_import_batch_keeps_existing_library_bytes(tmp_path, monkeypatch):
+    import KiCadImport
+
+    fake = FakeCli()
+    monkeypatch.setattr(fake, "exists", lambda: True)
+    monkeypatch.setattr(KiCadImport, "cli", fake)
+
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    existing = _sym_lib("Old1", "Old2", version=20231120)
+    (dest / "CustomLibrary.kicad_sym").write_text(existing, encoding="utf-8")
+
+    importer = KiCadImport.LibImporter()
+    importer.print = lambda txt: None
+    importer.set_DEST_PATH(dest)
+    importer.import_batch([_snapeda_zip(tmp_path / "New.zip", "New")])
+
+    lib_text = (dest / "CustomLibrary.kicad_sym").read_text(encoding="utf-8")
+    assert lib_text.startswith(existing[: existing.rstrip().rfind(")")].rstrip())
+    assert [s.name for s in scan_symbols(lib_text)] == ["Old1", "Old2", "New"]
+    # the destination library itself is never handed to kicad-cli
+    assert all(str(dest) not in " ".join(cmd) for cmd in fake.commands)
+
+
+# ---------------------------------------------------------------------------
+# Parallel import jobs
+# ---------------------------------------------------------------------------
+
+def _importer(dest, monkeypatch, output=None):
+    import KiCadImport
+
+    fake = FakeCli()
+    monkeypatch.setattr(fake, "exists", lambda: True)
+    monkeypatch.setattr(KiCadImport, "cli", fake)
+
+    importer = KiCadImport.LibImporter()
+    importer.print = output.append if output is not None else (lambda txt: None)
+    importer.set_DEST_PATH(dest)
+    return importer
+
+
+def test_import_batch_keeps_input_order_with_workers(tmp_path, monkeypatch):
+    names = [f"Part{i:02d}" for i in range(12)]
+    zips = [_snapeda_zip(tmp_path / f"{n}.zip", n) for n in names]
+    (tmp_path / "broken.zip").write_bytes(b"not a zip")
+    zips.insert(3, tmp_path / "broken.zip")
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    output = []
+    succeeded = []
+
+    importer = _importer(dest, monkeypatch, output)
+    importer.max_workers = 4
+    importer.on_import_success = lambda name, source, zip_file: succeeded.append(name)
+    results = importer.import_batch(zips)
+
+    assert results[3] is None
+    assert results[:3] + results[4:] == [("OK",)] * 12
+    assert succeeded == names
+    lib_text = (dest / "CustomLibrary.kicad_sym").read_text(encoding="utf-8")
+    assert [s.name for s in scan_symbols(lib_text)] == names
+    # staging messages of each zip file stay together and in input order
+    importing = [line for line in output if str(tmp_path) in line]
+    assert [line.rsplit("/", 1)[-1] for line in importing][:4] == [
+        "Part00.zip", "Part01.zip", "Part02.zip", "broken.zip"
+    ]
+
+
+def test_concurrent_batches_do_not_lose_symbols(tmp_path, monkeypatch):
+    import threading
+
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    batches = [
+        [_snapeda_zip(tmp_path / f"{b}{i}.zip", f"{b}{i}") for i in range(5)]
+        for b in "AB"
+    ]
+    importer = _importer(dest, monkeypatch)
+    importer.max_workers = 2
+
+    threads = [threading.Thread(target=importer.import_batch, args=(zips,)) for zips in batches]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    lib_text = (dest / "CustomLibrary.kicad_sym").read_text(encoding="utf-8")
+    assert sorted(s.name for s in scan_symbols(lib_text)) == [
+        f"{b}{i}" for b in "AB" for i in range(5)
+    ]
+    assert len(list((dest / "CustomLibrary.pretty").iterdir())) == 10
+
+
+def test_library_lock_is_shared_per_path(tmp_path):
+    import threading
+    from KiCadImport import library_lock
+
+    entered = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def holder():
+        with library_lock(tmp_path / "Lib.kicad_sym", tmp_path / "Lib.pretty"):
+            entered.set()
+            release.wait(5)
+            order.append("holder")
+
+    t = threading.Thread(target=holder)
+    t.start()
+    entered.wait(5)
+    with library_lock(tmp_path / "Other.kicad_sym"):
+        order.append("other")  # unrelated library is not blocked
+    release.set()
+    with library_lock(tmp_path / "sub" / ".." / "Lib.pretty"):
+        order.append("same")
+    t.join()
+    assert order == ["other", "holder", "same"]
+
+
+# ---------------------------------------------------------------------------
+# Member access and scratch directories
+# ---------------------------------------------------------------------------
+
+def _counting_mkdtemp(monkeypatch):
+    import tempfile
+
+    created = []
+    real_mkdtemp = tempfile.mkdtemp
+
+    def mkdtemp(*args, **kwargs):
+        created.append(real_mkdtemp(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(tempfile, "mkdtemp", mkdtemp)
+    return created
+
+
+def test_import_without_cli_stays_in_memory(tmp_path, monkeypatch):
+    import KiCadImport
+
+    monkeypatch.setattr(KiCadImport, "cli", None)
+    created = _counting_mkdtemp(monkeypatch)
+    zip_path = _snapeda_zip(tmp_path / "Part.zip", "Part")
+    with zipfile.ZipFile(zip_path, "a") as zf:
+        zf.writestr("3d/Part.step", b"STEP" * 100_000)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    importer = KiCadImport.LibImporter()
+    importer.print = lambda txt: None
+    importer.set_DEST_PATH(dest)
+    assert importer.import_batch([zip_path]) == [("OK",)]
+
+    assert created == []
+    assert (dest / "CustomLibrary.3dshapes" / "Part.step").read_bytes() == b"STEP" * 100_000
+    footprint = (dest / "CustomLibrary.pretty" / "Part_FP.kicad_mod").read_text(encoding="utf-8")
+    assert "CustomLibrary.3dshapes/Part.step" in footprint
+
+
+def test_upgrades_use_one_scratch_dir_per_job(tmp_path, monkeypatch):
+    created = _counting_mkdtemp(monkeypatch)
+    zips = [_snapeda_zip(tmp_path / f"{n}.zip", n) for n in ["PartA", "PartB"]]
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    importer = _importer(dest, monkeypatch)
+    importer.import_batch(zips)
+
+    scratch = [d for d in created if Path(d).name.startswith("impart_")]
+    assert len(scratch) == 2
+    assert not any(Path(d).exists() for d in created)
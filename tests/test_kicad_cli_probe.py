@@ -0,0 +1,140 @@
+"""Tests for the cached kicad-cli capabilities probe."""
+
+import os
+import subprocess
+import pytest
+from unittest.mock import patch
+
+import kicad_cli as kicad_cli_module
+from kicad_cli import kicad_cli, KiCadCliCapabilities
+
+
+HELP_TEXT = """Usage: kicad-cli [--help] [--version] {fp,pcb,sch,sym,version}
+
+Subcommands:
+  fp             Footprint and Footprint Libraries
+  pcb            PCB
+  sch            Schematics
+  sym            Symbol and Symbol Libraries
+  version        Reports version info in a variety of formats
+"""
+
+SYM_HELP = """Usage: sym [--help] {export,upgrade}
+
+Subcommands:
+  export         Export utilities (svg)
+  upgrade        Upgrades the symbol library to the current kicad version format
+"""
+
+FP_HELP = """Usage: fp [--help] {export,upgrade}
+
+Subcommands:
+  export         Export utilities (svg)
+  upgrade        Upgrades the footprint library to the current kicad version format
+"""
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def clear_probe_cache():
+    kicad_cli_module._probe_cache.clear()
+    yield
+    kicad_cli_module._probe_cache.clear()
+
+
+@pytest.fixture
+def fake_binary(tmp_path):
+    binary = tmp_path / "kicad-cli"
+    binary.write_text("#!/bin/sh\n")
+    return binary
+
+
+def _fake_run(version="9.0.1"):
+    outputs = {
+        ("--version",): version,
+        ("--help",): HELP_TEXT,
+        ("sym", "--help"): SYM_HELP,
+        ("fp", "--help"): FP_HELP,
+    }
+
+    def run(command, **kwargs):
+        return subprocess.CompletedProcess(command, 0, outputs[tuple(command[1:])], "")
+
+    return run
+
+
+def _make_cli(binary, cache_file):
+    cli = kicad_cli(cache_file=cache_file)
+    cli.kicad_cmd = str(binary)
+    return cli
+
+
+# ---------------------------------------------------------------------------
+# probe / exists
+# ---------------------------------------------------------------------------
+
+def test_probe_reports_version_and_subcommands(fake_binary, tmp_path):
+    cli = _make_cli(fake_binary, tmp_path / "probe.json")
+    with patch("subprocess.run", side_effect=_fake_run()):
+        caps = cli.probe()
+    assert caps.found and caps.available
+    assert caps.version == "9.0.1"
+    assert caps.version_tuple == (9, 0, 1)
+    assert caps.supports("sym", "upgrade")
+    assert caps.supports("fp", "upgrade")
+    assert not caps.supports("jobset")
+
+
+def test_exists_probes_only_once_per_process(fake_binary, tmp_path):
+    cli = _make_cli(fake_binary, tmp_path / "probe.json")
+    with patch("subprocess.run", side_effect=_fake_run()) as run:
+        assert cli.exists()
+        calls = run.call_count
+        assert cli.exists()
+        assert _make_cli(fake_binary, tmp_path / "probe.json").exists()
+    assert run.call_count == calls
+
+
+def test_probe_is_persisted_by_mtime(fake_binary, tmp_path):
+    cache_file = tmp_path / "probe.json"
+    with patch("subprocess.run", side_effect=_fake_run()):
+        _make_cli(fake_binary, cache_file).probe()
+
+    # New process: in-memory cache is empty but the file on disk is still valid
+    kicad_cli_module._probe_cache.clear()
+    with patch("subprocess.run") as run:
+        caps = _make_cli(fake_binary, cache_file).probe()
+    run.assert_not_called()
+    assert caps.version == "9.0.1"
+
+
+def test_probe_reruns_when_binary_changes(fake_binary, tmp_path):
+    cache_file = tmp_path / "probe.json"
+    with patch("subprocess.run", side_effect=_fake_run()):
+        _make_cli(fake_binary, cache_file).probe()
+
+    kicad_cli_module._probe_cache.clear()
+    stat = os.stat(fake_binary)
+    os.utime(fake_binary, (stat.st_atime, stat.st_mtime + 10))
+    with patch("subprocess.run", side_effect=_fake_run("10.0.0")):
+        caps = _make_cli(fake_binary, cache_file).probe()
+    assert caps.version == "10.0.0"
+
+
+def test_old_version_is_not_available(fake_binary, tmp_path):
+    cli = _make_cli(fake_binary, tmp_path / "probe.json")
+    with patch("subprocess.run", side_effect=_fake_run("7.0.11")):
+        assert not cli.exists()
+    assert cli.probe().found
+
+
+def test_missing_binary(tmp_path):
+    cli = _make_cli(tmp_path / "missing-kicad-cli", tmp_path / "probe.json")
+    with patch("subprocess.run") as run:
+        caps = cli.probe()
+    run.assert_not_called()
+    assert caps == KiCadCliCapabilities(path=str(tmp_path / "missing-kicad-cli"))
+    assert not (tmp_path / "probe.json").exists()
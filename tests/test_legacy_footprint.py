@@ -0,0 +1,147 @@
+"""Tests for the in-process footprint upgrader."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "Origen" / "kiutils" / "src"))
+
+from kiutils.footprint import Footprint  # noqa: E402
+from kiutils.utils import sexpr  # noqa: E402
+
+from LegacyFootprint import (  # noqa: E402
+    FOOTPRINT_VERSION,
+    UnsupportedFootprint,
+    needs_upgrade,
+    upgrade_footprint,
+)
+
+MODULE = """(module DIP-8_W7.62mm (layer F.Cu) (tedit 5A02E8C5)
+  (descr "8-lead though-hole mounted DIP package")
+  (tags "THT DIP DIL PDIP")
+  (fp_text reference REF** (at 3.81 -2.33) (layer F.SilkS)
+    (effects (font (size 1 1) (thickness 0.15)))
+  )
+  (fp_text value DIP-8 (at 3.81 9.95) (layer F.Fab) hide
+    (effects (font (size 1 1) (thickness 0.15)))
+  )
+  (fp_arc (start 3.81 -1.33) (end 2.81 -1.33) (angle -180) (layer F.SilkS) (width 0.12))
+  (fp_line (start 1.16 -1.33) (end 1.16 8.95) (layer F.Silkscreen) (width 0.12))
+  (fp_line (start -1.1 -1.55) (end -1.1 9.15) (layer F.CrtYd) (width 0.05))
+  (pad 1 thru_hole rect (at 0 0) (size 1.6 1.6) (drill 0.8) (layers *.Cu *.Mask))
+  (pad 2 thru_hole oval (at 0 2.54) (size 1.6 1.6) (drill 0.8) (layers *.Cu *.Mask))
+  (model ${KISYS3DMOD}/Package_DIP.3dshapes/DIP-8_W7.62mm.wrl
+    (at (xyz 0.1 0 0))
+    (scale (xyz 1 1 1))
+    (rotate (xyz 0 0 90))
+  )
+)
+"""
+
+
+def _upgraded(text=MODULE):
+    return Footprint.from_sexpr(sexpr.parse_sexp(upgrade_footprint(text)))
+
+
+# ---------------------------------------------------------------------------
+# Detection
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("text, expected", [
+    (MODULE, True),
+    ('(footprint "X" (version 20171130) (layer "F.Cu"))', True),
+    ('(footprint "X" (layer "F.Cu"))', True),
+    ('(footprint "X" (version 20211014) (generator pcbnew) (layer "F.Cu"))', False),
+    ('(footprint "X" (version 20240108) (generator "pcbnew") (layer "F.Cu"))', False),
+])
+def test_needs_upgrade(text, expected):
+    assert needs_upgrade(text) is expected
+
+
+# ---------------------------------------------------------------------------
+# Upgrade
+# ---------------------------------------------------------------------------
+
+def test_module_becomes_a_current_footprint():
+    text = upgrade_footprint(MODULE)
+    assert text.startswith('(footprint "DIP-8_W7.62mm" (version 20211014)')
+    assert not needs_upgrade(text)
+
+    footprint = _upgraded()
+    assert footprint.version == int(FOOTPRINT_VERSION)
+    assert footprint.description == "8-lead though-hole mounted DIP package"
+    assert [p.number for p in footprint.pads] == ["1", "2"]
+    assert footprint.pads[0].drill.diameter == 0.8
+
+
+def test_missing_attribute_means_through_hole():
+    assert _upgraded().attributes.type == "through_hole"
+
+    smd = '(module R_0603 (layer F.Cu) (pad 1 smd rect (at 0 0) (size 1 1) (layers F.Cu)))'
+    assert _upgraded(smd).attributes.type is None
+
+    virtual = '(module Logo (layer F.Cu) (attr virtual))'
+    attributes = _upgraded(virtual).attributes
+    assert attributes.excludeFromBom and attributes.excludeFromPosFiles
+
+
+def test_layer_names_are_canonical():
+    lines = [item for item in _upgraded().graphicItems if type(item).__name__ == "FpLine"]
+    assert [line.layer for line in lines] == ["F.SilkS", "F.CrtYd"]
+
+
+def test_old_arc_becomes_start_mid_end():
+    arc = next(item for item in _upgraded().graphicItems if type(item).__name__ == "FpArc")
+    # Pin 1 notch: center (3.81, -1.33), from (2.81, -1.33), -180 degrees into the body
+    assert (arc.start.X, arc.start.Y) == (2.81, -1.33)
+    assert (arc.mid.X, arc.mid.Y) == (3.81, -0.33)
+    assert (arc.end.X, arc.end.Y) == (4.81, -1.33)
+    assert arc.layer == "F.SilkS"
+
+
+def test_model_offset_is_converted_from_inches():
+    model = _upgraded().models[0]
+    assert model.path.endswith("DIP-8_W7.62mm.wrl")
+    assert (model.pos.X, model.pos.Y, model.pos.Z) == (2.54, 0, 0)
+    assert model.rotate.Z == 90
+
+
+@pytest.mark.parametrize("text", [
+    '(module X (layer F.Cu) (dimension 1 (width 0.1)))',
+    '(kicad_pcb (version 20171130))',
+    '(module X (layer F.Cu)',
+])
+def test_unsupported_footprints_are_reported(text):
+    with pytest.raises(UnsupportedFootprint):
+        upgrade_footprint(text)
+
+
+# ---------------------------------------------------------------------------
+# Import without kicad-cli
+# ---------------------------------------------------------------------------
+
+def test_import_upgrades_footprint_without_kicad_cli(tmp_path, monkeypatch):
+    import KiCadImport
+
+    monkeypatch.setattr(KiCadImport, "cli", None)
+    source = tmp_path / "DIP-8_W7.62mm.kicad_mod"
+    source.write_text(MODULE, encoding="utf-8")
+    dest = tmp_path / "out.kicad_mod"
+
+    importer = KiCadImport.LibImporter()
+    assert importer.extract_footprint_to_file(source, dest) == "DIP-8_W7.62mm"
+    assert dest.read_text(encoding="utf-8").startswith('(footprint "DIP-8_W7.62mm" (version 20211014)')
+
+
+def test_current_footprint_is_kept_byte_for_byte(tmp_path, monkeypatch):
+    import KiCadImport
+
+    monkeypatch.setattr(KiCadImport, "cli", None)
+    text = '(footprint "X"\n\t(version 20240108)\n\t(generator "pcbnew")\n\t(layer "F.Cu")\n)\n'
+    source = tmp_path / "X.kicad_mod"
+    source.write_text(text, encoding="utf-8")
+    dest = tmp_path / "out.kicad_mod"
+
+    assert KiCadImport.LibImporter().extract_footprint_to_file(source, dest) == "X"
+    assert dest.read_text(encoding="utf-8") == text
@@ -0,0 +1,235 @@
+"""Tests for the in-process .lib/.dcm converter and its users
+(zip import and library migration), all without kicad-cli."""
+
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "Origen" / "kiutils" / "src"))
+
+from kiutils.symbol import SymbolLib  # noqa: E402
+
+from LegacySymbolLib import (  # noqa: E402
+    convert_legacy_file,
+    convert_legacy_lib,
+    convert_overbar,
+    iter_legacy_symbols,
+    parse_dcm,
+)
+from SymbolLibFile import scan_symbols  # noqa: E402
+
+LIB = """EESchema-LIBRARY Version 2.4
+#encoding utf-8
+#
+# LM358
+#
+DEF LM358 U 0 20 Y Y 2 L N
+F0 "U" 0 200 50 H V L CNN
+F1 "LM358" 0 -200 50 H V L CNN
+F2 "" 0 0 50 H I C CNN
+F3 "" 0 0 50 H I C CNN
+F4 "Texas Instruments" 0 0 50 H I C CNN "Manufacturer"
+ALIAS LM2904 MC1458
+$FPLIST
+ SOIC*3.9x4.9mm*
+ DIP*W7.62mm*
+$ENDFPLIST
+DRAW
+P 4 1 1 10 -200 200 200 0 -200 -200 -200 200 f
+A 0 0 100 900 -900 0 1 0 N 0 100 0 -100
+T 0 0 100 50 0 1 0 Dual~Amp Italic 1 L B
+X + 3 -300 100 100 R 50 50 1 1 I
+X ~CS~/CLK 2 -300 -100 100 R 50 50 1 1 I IC
+X V- 4 -100 -300 150 U 50 50 2 1 W N
+ENDDRAW
+ENDDEF
+#
+# GND
+#
+DEF GND #PWR 0 0 Y Y 1 F P
+F0 "#PWR" 0 -250 50 H I C CNN
+F1 "GND" 0 -150 50 H V C CNN
+DRAW
+X GND 1 0 0 0 D 50 50 1 1 W N
+ENDDRAW
+ENDDEF
+#
+#End Library
+"""
+
+DCM = """EESchema-DOCLIB  Version 2.0
+#
+$CMP LM358
+D Low-Power, Dual Operational Amplifiers
+K dual opamp
+F http://www.ti.com/lit/ds/symlink/lm2904-n.pdf
+$ENDCMP
+#
+$CMP MC1458
+D Dual opamp (Motorola)
+$ENDCMP
+#
+#End Doc Library
+"""
+
+
+def _props(symbol):
+    return {p.key: p.value for p in symbol.properties}
+
+
+# ---------------------------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------------------------
+
+def test_units_fields_and_documentation():
+    lib = convert_legacy_lib(LIB, DCM)
+    assert [s.libId for s in lib.symbols] == ["LM358", "LM2904", "MC1458", "GND"]
+
+    lm358 = lib.symbols[0]
+    assert [u.libId for u in lm358.units] == ["LM358_0_1", "LM358_1_0", "LM358_1_1", "LM358_2_1"]
+    assert _props(lm358) == {
+        "Reference": "U",
+        "Value": "LM358",
+        "Footprint": "",
+        "Datasheet": "http://www.ti.com/lit/ds/symlink/lm2904-n.pdf",
+        "Manufacturer": "Texas Instruments",
+        "ki_keywords": "dual opamp",
+        "ki_description": "Low-Power, Dual Operational Amplifiers",
+        "ki_fp_filters": "SOIC*3.9x4.9mm* DIP*W7.62mm*",
+    }
+    assert not lm358.pinNames  # 20 mil is KiCad's default offset
+
+
+def test_aliases_become_derived_symbols_with_their_own_docs():
+    lib = convert_legacy_lib(LIB, DCM)
+    lm2904, mc1458 = lib.symbols[1], lib.symbols[2]
+    assert lm2904.extends == mc1458.extends == "LM358"
+    assert _props(lm2904)["Value"] == "LM2904"
+    assert _props(lm2904)["ki_description"] == "Low-Power, Dual Operational Amplifiers"
+    assert _props(mc1458)["ki_description"] == "Dual opamp (Motorola)"
+    assert _props(lib.symbols[0])["Value"] == "LM358"
+
+
+def test_geometry_is_converted_to_mm():
+    lm358 = convert_legacy_lib(LIB).symbols[0]
+    unit_1 = lm358.units[2]
+
+    plus, clk = unit_1.pins
+    assert (plus.position.X, plus.position.Y, plus.position.angle) == (-7.62, 2.54, 0)
+    assert plus.length == 2.54 and plus.electricalType == "input"
+    assert clk.name == "~{CS}/CLK" and clk.graphicalStyle == "inverted_clock"
+
+    power_pin = lm358.units[3].pins[0]
+    assert power_pin.hide and power_pin.electricalType == "power_in"
+    assert power_pin.position.angle == 90 and power_pin.length == 3.81
+
+    polyline = unit_1.graphicItems[0]
+    assert [(p.X, p.Y) for p in polyline.points][:2] == [(-5.08, 5.08), (5.08, 0.0)]
+    assert polyline.fill.type == "background" and polyline.stroke.width == 0.254
+
+    arc = lm358.units[0].graphicItems[0]
+    assert (arc.start.X, arc.start.Y) == (0.0, 2.54)
+    assert (arc.mid.X, arc.mid.Y) == (-2.54, 0.0)
+    assert (arc.end.X, arc.end.Y) == (0.0, -2.54)
+
+    text = lm358.units[1].graphicItems[0]
+    assert text.text == "Dual Amp"
+    assert text.effects.font.italic and text.effects.font.bold
+
+
+def test_power_symbol():
+    gnd = convert_legacy_lib(LIB).symbols[-1]
+    assert gnd.isPower
+    reference = gnd.properties[0]
+    assert reference.value == "#PWR" and reference.effects.hide
+    assert gnd.pinNames and gnd.pinNamesOffset == 0
+
+
+@pytest.mark.parametrize("legacy, expected", [
+    ("RESET", "RESET"),
+    ("~RESET", "~{RESET}"),
+    ("~CS~/CLK", "~{CS}/CLK"),
+    ("A~~B", "A~B"),
+])
+def test_overbar_notation(legacy, expected):
+    assert convert_overbar(legacy) == expected
+
+
+def test_parse_dcm():
+    docs = parse_dcm(DCM.splitlines())
+    assert docs["LM358"].keywords == "dual opamp"
+    assert docs["MC1458"].datasheet == ""
+
+
+def test_symbols_are_produced_while_reading():
+    consumed = []
+
+    def lines():
+        for line in LIB.splitlines():
+            consumed.append(line)
+            yield line
+
+    first = next(iter_legacy_symbols(lines()))
+    assert first.libId == "LM358"
+    assert not any(line.startswith("DEF GND") for line in consumed)
+
+
+def test_not_a_legacy_library():
+    with pytest.raises(ValueError):
+        convert_legacy_lib("(kicad_symbol_lib (version 20211014))")
+
+
+# ---------------------------------------------------------------------------
+# Files, migration and zip import
+# ---------------------------------------------------------------------------
+
+def test_convert_legacy_file_uses_dcm_next_to_it(tmp_path):
+    (tmp_path / "Octopart.lib").write_text(LIB, encoding="utf-8")
+    (tmp_path / "Octopart.dcm").write_text(DCM, encoding="utf-8")
+    dest = tmp_path / "Octopart.kicad_sym"
+
+    assert convert_legacy_file(tmp_path / "Octopart.lib", dest) == 4
+
+    text = dest.read_text(encoding="utf-8")
+    assert [s.name for s in scan_symbols(text)] == ["LM358", "LM2904", "MC1458", "GND"]
+    loaded = SymbolLib.from_file(str(dest))
+    assert _props(loaded.symbols[0])["ki_keywords"] == "dual opamp"
+    assert not (tmp_path / "Octopart.kicad_sym.tmp").exists()
+
+
+def test_migration_works_without_kicad_cli(tmp_path, monkeypatch):
+    import impart_migration
+
+    monkeypatch.setattr(impart_migration, "cli", None)
+    (tmp_path / "Octopart_old.lib").write_text(LIB, encoding="utf-8")
+    (tmp_path / "Octopart_old.dcm").write_text(DCM, encoding="utf-8")
+
+    found = impart_migration.find_old_lib_files(tmp_path)
+    assert impart_migration.convert_lib_list(found, drymode=True)
+    result = impart_migration.convert_lib_list(found, drymode=False)
+
+    assert result == [["Octopart_old", "Octopart"], ["Octopart_old.lib", "Octopart_old.lib.blk"]]
+    text = (tmp_path / "Octopart.kicad_sym").read_text(encoding="utf-8")
+    assert len(scan_symbols(text)) == 4
+    assert (tmp_path / "Octopart.dcm").exists()
+    assert (tmp_path / "Octopart_old.lib.blk").exists()
+
+
+def test_octopart_zip_imports_without_kicad_cli(tmp_path, monkeypatch):
+    import KiCadImport
+
+    monkeypatch.setattr(KiCadImport, "cli", None)
+    zip_path = tmp_path / "LM358.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("LM358/device.lib", LIB)
+        zf.writestr("LM358/device.dcm", DCM)
+
+    importer = KiCadImport.LibImporter()
+    with zipfile.ZipFile(zip_path) as zf:
+        symbol_lib, name = importer.load_symbol_lib(
+            zipfile.Path(zf, "LM358/device.lib"), zipfile.Path(zf, "LM358/device.dcm")
+        )
+    assert name == "LM358"
+    assert _props(symbol_lib.symbols[0])["ki_description"].startswith("Low-Power")
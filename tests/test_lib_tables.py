@@ -0,0 +1,153 @@
+"""Tests for the cached KiCad library tables and KiCad_Settings batching."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "Origen" / "kiutils" / "src"))
+
+from kiutils.libraries import LibTable  # noqa: E402
+
+from KiCad_Settings import KiCad_Settings  # noqa: E402
+from KiCad_Settings.lib_tables import LibraryTable  # noqa: E402
+
+
+SYM_TABLE = """(sym_lib_table
+  (version 7)
+  (lib (name "Existing")(type "KiCad")(uri "${KICAD_3RD_PARTY}/Existing.kicad_sym")(options "")(descr ""))
+)
+"""
+
+
+@pytest.fixture
+def settings_dir(tmp_path):
+    (tmp_path / "sym-lib-table").write_text(SYM_TABLE)
+    return tmp_path
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    """Count how often a library table file is parsed."""
+    calls = []
+    original = LibTable.from_file.__func__
+
+    def counting(cls, filepath, *args, **kwargs):
+        calls.append(filepath)
+        return original(cls, filepath, *args, **kwargs)
+
+    monkeypatch.setattr(LibTable, "from_file", classmethod(counting))
+    return calls
+
+
+def _write_count(monkeypatch):
+    calls = []
+    original = LibTable.to_file
+
+    def counting(self, filepath=None, *args, **kwargs):
+        calls.append(filepath)
+        return original(self, filepath, *args, **kwargs)
+
+    monkeypatch.setattr(LibTable, "to_file", counting)
+    return calls
+
+
+# ---------------------------------------------------------------------------
+# LibraryTable
+# ---------------------------------------------------------------------------
+
+def test_table_is_parsed_once(settings_dir, parse_count):
+    table = LibraryTable(settings_dir / "sym-lib-table")
+    assert table.by_name("Existing").uri == "${KICAD_3RD_PARTY}/Existing.kicad_sym"
+    assert table.by_uri("${KICAD_3RD_PARTY}/Existing.kicad_sym").name == "Existing"
+    assert [lib.name for lib in table.libs()] == ["Existing"]
+    assert len(parse_count) == 1
+
+
+def test_external_change_is_reloaded(settings_dir, parse_count):
+    path = settings_dir / "sym-lib-table"
+    table = LibraryTable(path)
+    assert table.by_name("Other") is None
+
+    path.write_text(SYM_TABLE.replace(
+        "\n)", '\n  (lib (name "Other")(type "KiCad")(uri "x.kicad_sym")(options "")(descr ""))\n)'
+    ))
+    assert table.by_name("Other").uri == "x.kicad_sym"
+    assert len(parse_count) == 2
+
+
+def test_pending_changes_survive_external_change(settings_dir):
+    path = settings_dir / "sym-lib-table"
+    table = LibraryTable(path)
+    table.add("Mine", "${KICAD_3RD_PARTY}/Mine.kicad_sym")
+
+    path.write_text(SYM_TABLE.replace(
+        "\n)", '\n  (lib (name "Theirs")(type "KiCad")(uri "t.kicad_sym")(options "")(descr ""))\n)'
+    ))
+    table.flush()
+
+    names = [lib.name for lib in LibTable.from_file(str(path)).libs]
+    assert names == ["Existing", "Theirs", "Mine"]
+    assert not table.dirty
+
+
+def test_duplicate_name_raises(settings_dir):
+    table = LibraryTable(settings_dir / "sym-lib-table")
+    with pytest.raises(ValueError):
+        table.add("Existing", "somewhere.kicad_sym")
+    assert not table.dirty
+
+
+def test_missing_table_is_created(tmp_path):
+    table = LibraryTable(tmp_path / "fp-lib-table")
+    assert table.libs() == []
+    assert LibTable.from_file(str(tmp_path / "fp-lib-table")).type == "fp_lib_table"
+
+
+def test_discard_drops_queued_changes(settings_dir):
+    table = LibraryTable(settings_dir / "sym-lib-table")
+    table.add("Mine", "Mine.kicad_sym")
+    table.discard()
+    assert table.by_name("Mine") is None
+
+
+# ---------------------------------------------------------------------------
+# KiCad_Settings
+# ---------------------------------------------------------------------------
+
+def test_check_libs_add_missing_entries(settings_dir):
+    settings = KiCad_Settings(str(settings_dir))
+    settings.check_symbollib("New.kicad_sym")
+    settings.check_footprintlib("New")
+
+    sym = LibTable.from_file(str(settings_dir / "sym-lib-table"))
+    fp = LibTable.from_file(str(settings_dir / "fp-lib-table"))
+    assert [lib.name for lib in sym.libs] == ["Existing", "New"]
+    assert fp.libs[0].uri == "${KICAD_3RD_PARTY}/New.pretty"
+    assert settings.check_symbollib("New.kicad_sym") == ""
+
+
+def test_batch_writes_each_table_once(settings_dir, monkeypatch):
+    settings = KiCad_Settings(str(settings_dir))
+    settings.get_lib_table()  # creates the empty fp-lib-table
+    writes = _write_count(monkeypatch)
+
+    with settings.batch():
+        for name in ("A", "B", "C"):
+            settings.check_symbollib(f"{name}.kicad_sym")
+            settings.check_footprintlib(name)
+        assert writes == []
+
+    assert len(writes) == 2
+    assert [e["name"] for e in settings.get_sym_table()] == ["Existing", "A", "B", "C"]
+    assert [e["name"] for e in settings.get_lib_table()] == ["A", "B", "C"]
+
+
+def test_change_uri_updates_lookup(settings_dir):
+    settings = KiCad_Settings(str(settings_dir))
+    settings.sym_table_change_entry(
+        "${KICAD_3RD_PARTY}/Existing.kicad_sym", "${KICAD_3RD_PARTY}/Moved.kicad_sym"
+    )
+    assert settings.get_sym_table()[0]["uri"] == "${KICAD_3RD_PARTY}/Moved.kicad_sym"
+    with pytest.raises(ValueError):
+        settings.sym_table_change_entry("missing.kicad_sym", "x.kicad_sym")
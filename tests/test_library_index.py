@@ -0,0 +1,171 @@
+"""Tests for LibraryIndex - incremental SQLite index of local libraries."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+kiutils_src = Path(__file__).parent.parent / "Origen" / "kiutils" / "src"
+if str(kiutils_src) not in sys.path:
+    sys.path.insert(0, str(kiutils_src))
+
+import LibraryIndex as library_index_module  # noqa: E402
+from LibraryIndex import LibraryIndex, LibraryRows  # noqa: E402
+
+
+def _sym_lib(*parts):
+    symbols = "".join(
+        f'\n\t(symbol "{name}" (in_bom yes)\n'
+        f'\t\t(property "Reference" "{ref}" (at 0 0 0))\n'
+        f'\t\t(property "Value" "{name}" (at 0 0 0))\n'
+        f'\t\t(property "Footprint" "Lib:{name}_FP" (at 0 0 0))\n'
+        f'\t\t(property "LCSC Part" "C{len(name)}" (at 0 0 0))\n'
+        f"\t)"
+        for name, ref in parts
+    )
+    return f"(kicad_symbol_lib (version 20231120) (generator test){symbols}\n)\n"
+
+
+def _touch(path, text):
+    """Rewrite a file and make sure its mtime moves even on coarse clocks."""
+    old = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(old + 1_000_000_000, old + 1_000_000_000))
+
+
+@pytest.fixture
+def dest(tmp_path):
+    dest = tmp_path / "lib"
+    dest.mkdir()
+    (dest / "MyLib.kicad_sym").write_text(_sym_lib(("R1K", "R"), ("LM358", "U")), encoding="utf-8")
+    pretty = dest / "MyLib.pretty"
+    pretty.mkdir()
+    (pretty / "A.kicad_mod").write_text("(footprint A)")
+    (pretty / "B.kicad_mod").write_text("(footprint B)")
+    shapes = dest / "MyLib.3dshapes"
+    shapes.mkdir()
+    (shapes / "A.step").write_text("step")
+    return dest
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = LibraryIndex(index_dir=tmp_path)
+    yield index
+    index.close()
+
+
+# ---------------------------------------------------------------------------
+# update / get_symbols / get_counts
+# ---------------------------------------------------------------------------
+
+def test_update_indexes_symbols_and_counts(index, dest):
+    assert index.update([dest]) == 3
+
+    symbols = index.get_symbols([dest])
+    assert [(s.name, s.reference, s.footprint, s.lcsc) for s in symbols] == [
+        ("R1K", "R", "Lib:R1K_FP", "C3"),
+        ("LM358", "U", "Lib:LM358_FP", "C5"),
+    ]
+    assert index.get_counts([dest]) == {"kicad_sym": 2, "kicad_mod": 2, "model": 1}
+
+
+def test_unchanged_files_are_not_reread(index, dest, monkeypatch):
+    index.update([dest])
+    calls = []
+    monkeypatch.setattr(library_index_module, "read_symbol_entries", lambda p: calls.append(p))
+    assert index.update([dest]) == 0
+    assert calls == []
+
+
+def test_changed_file_is_reindexed(index, dest):
+    index.update([dest])
+    _touch(dest / "MyLib.kicad_sym", _sym_lib(("C100N", "C")))
+    (dest / "Other.kicad_sym").write_text(_sym_lib(("D1", "D")), encoding="utf-8")
+
+    assert index.update([dest]) == 2
+    assert [s.name for s in index.get_symbols([dest])] == ["C100N", "D1"]
+
+
+def test_deleted_files_are_removed(index, dest):
+    index.update([dest])
+    (dest / "MyLib.kicad_sym").unlink()
+    index.update([dest])
+    assert index.get_symbols([dest]) == []
+    assert index.get_counts([dest])["kicad_sym"] == 0
+
+
+def test_index_persists_between_instances(tmp_path, dest):
+    first = LibraryIndex(index_dir=tmp_path)
+    first.update([dest])
+    first.close()
+
+    second = LibraryIndex(index_dir=tmp_path)
+    assert [s.name for s in second.get_symbols([dest])] == ["R1K", "LM358"]
+    assert second.update([dest]) == 0
+    second.close()
+
+
+def test_corrupt_index_is_rebuilt(tmp_path, dest):
+    (tmp_path / "library_index.db").write_bytes(b"not a database" * 100)
+    index = LibraryIndex(index_dir=tmp_path)
+    assert index.update([dest]) == 3
+    index.close()
+
+
+def test_unparsable_library_is_skipped(index, dest):
+    (dest / "Broken.kicad_sym").write_text("(kicad_symbol_lib (symbol", encoding="utf-8")
+    index.update([dest])
+    assert [s.name for s in index.get_symbols([dest])] == ["R1K", "LM358"]
+
+
+# ---------------------------------------------------------------------------
+# LibraryRows
+# ---------------------------------------------------------------------------
+
+def _rows(count):
+    return [
+        (f"/lib/L{i % 3}.kicad_sym", (f"Part{i}", "R" if i % 2 else "U", "Sub", f"FP{i}", "EasyEDA", ""))
+        for i in range(count)
+    ]
+
+
+def test_rows_extend_in_chunks():
+    rows = LibraryRows()
+    data = _rows(10)
+    assert rows.extend(data[:4]) == 4
+    assert rows.extend(data[4:]) == 6
+    assert len(rows) == rows.total == 10
+    assert rows.cell(3, 0) == "Part3"
+    assert rows.item(3) == ("/lib/L0.kicad_sym", "Part3")
+    assert rows.item(10) is None and rows.item(-1) is None
+
+
+def test_rows_filter_matches_any_column_case_insensitive():
+    rows = LibraryRows()
+    rows.extend(_rows(30))
+    rows.set_filter("  PART1")
+    assert [rows.cell(i, 0) for i in range(len(rows))] == ["Part1"] + [f"Part{i}" for i in range(10, 20)]
+    rows.set_filter("part12")  # narrowed from the visible rows
+    assert [rows.item(i)[1] for i in range(len(rows))] == ["Part12"]
+    rows.set_filter("fp2")
+    assert len(rows) == 11
+    rows.set_filter("")
+    assert len(rows) == 30
+
+
+def test_rows_filter_applies_to_streamed_rows():
+    rows = LibraryRows()
+    rows.set_filter("part2")
+    data = _rows(25)
+    assert rows.extend(data[:20]) == 1
+    assert rows.extend(data[20:]) == 5
+    assert rows.item(0)[1] == "Part2"
+
+
+def test_rows_filter_does_not_match_across_columns():
+    rows = LibraryRows()
+    rows.extend([("/lib/A.kicad_sym", ("AB", "CD", "", "", "", ""))])
+    rows.set_filter("bc")
+    assert len(rows) == 0
@@ -0,0 +1,98 @@
+"""Tests for LogChannel - sequence numbers, trimming, listeners and log file."""
+
+import threading
+
+from LogChannel import LogChannel
+
+
+# ---------------------------------------------------------------------------
+# Reading and trimming
+# ---------------------------------------------------------------------------
+
+def test_read_since_returns_only_new_lines():
+    log = LogChannel()
+    seq = log.write("one")
+    log.write("two\nthree")
+
+    assert log.read_since(0) == (3, ["one", "two", "three"], False)
+    assert log.read_since(seq) == (3, ["two", "three"], False)
+    assert log.read_since(3) == (3, [], False)
+    assert log.text() == "one\ntwo\nthree\n"
+
+
+def test_old_lines_are_trimmed():
+    log = LogChannel(max_lines=3)
+    for i in range(5):
+        log.write(f"line {i}")
+
+    assert len(log) == 3
+    assert log.read_since(0) == (5, ["line 2", "line 3", "line 4"], True)
+    assert log.read_since(3) == (5, ["line 3", "line 4"], False)
+
+
+def test_set_max_lines_keeps_newest_lines():
+    log = LogChannel()
+    for i in range(10):
+        log.write(str(i))
+    log.set_max_lines(2)
+    assert log.text() == "8\n9\n"
+    assert log.max_lines == 2
+
+
+def test_clear_keeps_counting():
+    log = LogChannel()
+    log.write("a")
+    log.clear()
+    assert log.text() == ""
+    assert log.write("b") == 2
+    assert log.read_since(1) == (2, ["b"], False)
+
+
+# ---------------------------------------------------------------------------
+# Listeners and log file
+# ---------------------------------------------------------------------------
+
+def test_listeners_are_called_after_each_write():
+    log = LogChannel()
+    seen = []
+    log.add_listener(seen.append)
+    log.write("a")
+    log.write("b\nc")
+    log.remove_listener(seen.append)
+    log.write("d")
+    assert seen == [1, 3]
+
+
+def test_failing_listener_does_not_break_writes():
+    log = LogChannel()
+    log.add_listener(lambda seq: 1 / 0)
+    assert log.write("a") == 1
+    assert log.text() == "a\n"
+
+
+def test_trimmed_lines_are_kept_in_log_file(tmp_path):
+    log_file = tmp_path / "output.log"
+    log = LogChannel(max_lines=2, spill_file=log_file)
+    for i in range(5):
+        log.write(f"line {i}")
+    log.close()
+
+    assert log.text() == "line 3\nline 4\n"
+    assert log_file.read_text(encoding="utf-8").splitlines() == [f"line {i}" for i in range(5)]
+
+
+def test_concurrent_writers_get_unique_sequence_numbers():
+    log = LogChannel(max_lines=10_000)
+
+    def writer(n):
+        for i in range(200):
+            log.write(f"{n}:{i}")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    seq, lines, trimmed = log.read_since(0)
+    assert seq == 800 and len(lines) == 800 and not trimmed
@@ -0,0 +1,153 @@
+"""Tests for the content-addressed 3D model store and the dedup pass."""
+
+import io
+import zipfile
+
+import pytest
+
+import ModelStore
+from ModelStore import STORE_DIR, ModelStore as Store, dedup_libraries
+
+STEP = b"ISO-10303-21;" + b"x" * 10_000
+OTHER = b"ISO-10303-21;" + b"y" * 5_000
+
+
+def _same_file(a, b):
+    return a.stat().st_ino == b.stat().st_ino
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Two .3dshapes folders with the same model under three names"""
+    vendor_a = tmp_path / "Octopart.3dshapes"
+    vendor_b = tmp_path / "CustomLibrary.3dshapes"
+    vendor_a.mkdir()
+    vendor_b.mkdir()
+    (vendor_a / "SOIC-8.step").write_bytes(STEP)
+    (vendor_b / "SOIC8_TI.step").write_bytes(STEP)
+    (vendor_b / "soic_8.STEP").write_bytes(STEP)
+    (vendor_b / "QFN-16.step").write_bytes(OTHER)
+    return tmp_path
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+def test_identical_models_share_one_blob(tmp_path):
+    store = Store.for_library(tmp_path)
+    first, second = tmp_path / "a.step", tmp_path / "b.step"
+    first.write_bytes(STEP)
+    second.write_bytes(STEP)
+
+    assert store.add(first) == 0
+    assert store.add(second) == len(STEP)
+    assert store.add(second) == 0
+
+    blobs = list((tmp_path / STORE_DIR).glob("*/*"))
+    assert len(blobs) == 1 and blobs[0].suffix == ".step"
+    assert _same_file(first, second) and _same_file(first, blobs[0])
+    assert second.read_bytes() == STEP
+
+
+def test_write_never_changes_other_links(tmp_path):
+    store = Store.for_library(tmp_path)
+    kept, replaced = tmp_path / "kept.step", tmp_path / "replaced.step"
+    store.write(io.BytesIO(STEP), kept)
+    store.write(io.BytesIO(STEP), replaced)
+    assert _same_file(kept, replaced)
+
+    store.write(io.BytesIO(OTHER), replaced)
+    assert kept.read_bytes() == STEP
+    assert replaced.read_bytes() == OTHER
+
+
+# ---------------------------------------------------------------------------
+# Dedup pass
+# ---------------------------------------------------------------------------
+
+def test_dry_run_reports_without_changes(library):
+    report = dedup_libraries(library, dry_run=True)
+    assert (report.files, report.linked, report.bytes_reclaimed) == (4, 2, 2 * len(STEP))
+    assert not (library / STORE_DIR).exists()
+    assert not _same_file(
+        library / "Octopart.3dshapes" / "SOIC-8.step",
+        library / "CustomLibrary.3dshapes" / "SOIC8_TI.step",
+    )
+
+
+def test_dedup_links_duplicates_and_reports_bytes(library):
+    report = dedup_libraries(library)
+    assert (report.files, report.linked, report.bytes_reclaimed) == (4, 2, 2 * len(STEP))
+
+    soic = [
+        library / "Octopart.3dshapes" / "SOIC-8.step",
+        library / "CustomLibrary.3dshapes" / "SOIC8_TI.step",
+        library / "CustomLibrary.3dshapes" / "soic_8.STEP",
+    ]
+    assert all(_same_file(soic[0], path) for path in soic[1:])
+    assert all(path.read_bytes() == STEP for path in soic)
+    assert (library / "CustomLibrary.3dshapes" / "QFN-16.step").read_bytes() == OTHER
+    assert len(list((library / STORE_DIR).glob("*/*"))) == 2
+
+
+def test_second_pass_reads_nothing(library, monkeypatch):
+    dedup_libraries(library)
+    hashed = []
+    real_digest = ModelStore.file_digest
+    monkeypatch.setattr(ModelStore, "file_digest", lambda p: hashed.append(p) or real_digest(p))
+
+    report = dedup_libraries(library)
+    assert (report.linked, report.bytes_reclaimed) == (0, 0)
+    assert hashed == []
+
+
+def test_unused_blobs_are_pruned(library):
+    dedup_libraries(library)
+    (library / "CustomLibrary.3dshapes" / "QFN-16.step").unlink()
+
+    report = dedup_libraries(library)
+    assert report.orphans_removed == 1
+    assert len(list((library / STORE_DIR).glob("*/*"))) == 1
+
+
+def test_progress_is_reported(library):
+    steps = []
+    dedup_libraries(library, progress=lambda step, total, name: steps.append((step, total)))
+    assert steps == [(1, 4), (2, 4), (3, 4), (4, 4), (0, 0)]
+
+
+# ---------------------------------------------------------------------------
+# Imports
+# ---------------------------------------------------------------------------
+
+def test_imported_models_are_linked(tmp_path, monkeypatch):
+    import KiCadImport
+
+    monkeypatch.setattr(KiCadImport, "cli", None)
+    zips = []
+    for name in ("PartA", "PartB"):
+        zip_path = tmp_path / f"{name}.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.writestr(
+                f"{name}.kicad_sym",
+                f'(kicad_symbol_lib (version 20211014) (generator test)\n'
+                f'  (symbol "{name}" (property "Reference" "U" (at 0 0 0)))\n)\n',
+            )
+            zf.writestr(f"{name}.kicad_mod", f'(footprint "{name}" (version 20240108) (layer "F.Cu"))\n')
+            zf.writestr(f"3d/{name}.step", STEP)
+        zips.append(zip_path)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    importer = KiCadImport.LibImporter()
+    importer.print = lambda txt: None
+    importer.set_DEST_PATH(dest)
+    assert importer.import_batch(zips) == [("OK",), ("OK",)]
+
+    models = dest / "CustomLibrary.3dshapes"
+    assert _same_file(models / "PartA.step", models / "PartB.step")
+    assert (models / "PartB.step").read_bytes() == STEP
+    assert "CustomLibrary.3dshapes/PartB.step" in (
+        dest / "CustomLibrary.pretty" / "PartB.kicad_mod"
+    ).read_text(encoding="utf-8")
@@ -0,0 +1,156 @@
+"""Tests for ResponseCache and its use by the vendored EasyedaApi."""
+
+import json
+import os
+
+import pytest
+
+import impart_easyeda  # noqa: F401  (puts the vendored easyeda2kicad on sys.path)
+from easyeda2kicad.easyeda.easyeda_api import EasyedaApi
+from HttpSession import HttpError, HttpResponse
+from ResponseCache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path / "cache")
+    yield cache
+    cache.close()
+
+
+def _age(cache, key, seconds):
+    """Pretend an entry was stored ``seconds`` ago."""
+    with cache._conn as conn:
+        conn.execute(
+            "UPDATE entries SET stored_at = stored_at - ?, accessed_at = accessed_at - ? WHERE key = ?",
+            (seconds, seconds, key),
+        )
+
+
+# ---------------------------------------------------------------------------
+# ResponseCache
+# ---------------------------------------------------------------------------
+
+def test_put_and_get(cache):
+    assert cache.get("cad/C1") is None
+    cache.put("cad/C1", b"data")
+    assert cache.get("cad/C1") == b"data"
+
+
+def test_identical_content_is_stored_once(cache):
+    cache.put("obj/a", b"model")
+    cache.put("obj/b", b"model")
+    assert cache.stats() == {"keys": 2, "objects": 1, "bytes": 5}
+    assert len(list((cache.cache_dir / "objects").rglob("*"))) == 2  # one folder, one file
+
+
+def test_expired_entries_are_only_used_when_allowed(cache):
+    cache.put("cad/C1", b"old")
+    _age(cache, "cad/C1", cache.ttl + 1)
+    assert cache.get("cad/C1") is None
+    assert cache.get("cad/C1", allow_stale=True) == b"old"
+
+
+def test_replaced_content_drops_the_old_object(cache):
+    cache.put("cad/C1", b"one")
+    cache.put("cad/C1", b"two")
+    assert cache.get("cad/C1") == b"two"
+    assert cache.stats()["objects"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path, max_bytes=30)
+    for age, name in zip((300, 200, 100), "abc"):
+        cache.put(name, name.encode() * 10)
+        _age(cache, name, age)
+    cache.get("a")  # a is now the most recently used
+
+    cache.put("d", b"d" * 10)
+    assert cache.get("b") is None
+    assert [cache.get(name) for name in "acd"] == [b"a" * 10, b"c" * 10, b"d" * 10]
+    assert cache.stats()["bytes"] == 30
+    cache.close()
+
+
+def test_missing_object_file_is_a_miss(cache):
+    cache.put("cad/C1", b"data")
+    for path in (cache.cache_dir / "objects").rglob("*"):
+        if path.is_file():
+            os.remove(path)
+    assert cache.get("cad/C1") is None
+    assert cache.stats()["keys"] == 0
+
+
+def test_cache_persists_and_survives_corrupt_index(tmp_path):
+    first = ResponseCache(cache_dir=tmp_path)
+    first.put("cad/C1", b"data")
+    first.close()
+
+    second = ResponseCache(cache_dir=tmp_path)
+    assert second.get("cad/C1") == b"data"
+    second.close()
+
+    (tmp_path / "index.db").write_bytes(b"garbage" * 100)
+    third = ResponseCache(cache_dir=tmp_path)
+    assert third.get("cad/C1") is None
+    third.put("cad/C1", b"again")
+    assert third.get("cad/C1") == b"again"
+    third.close()
+
+
+# ---------------------------------------------------------------------------
+# EasyedaApi with a cache
+# ---------------------------------------------------------------------------
+
+class FakeSession:
+    def __init__(self):
+        self.urls = []
+        self.offline = False
+
+    def get(self, url, headers=None, timeout=None):
+        self.urls.append(url)
+        if self.offline:
+            raise HttpError("network down", url=url)
+        if "/api/products/" in url:
+            body = json.dumps({"success": True, "result": {"lcsc": url.split("/")[5]}}).encode()
+        else:
+            body = b"v 0 0 0\n" if "3dmodel" in url else b"STEP"
+        return HttpResponse(200, {}, body, url)
+
+
+@pytest.fixture
+def api(cache):
+    return EasyedaApi(session=FakeSession(), cache=cache)
+
+
+def test_cad_data_is_served_from_cache(api):
+    assert api.get_cad_data_of_component("C2040") == {"lcsc": "C2040"}
+    assert api.get_cad_data_of_component("C2040") == {"lcsc": "C2040"}
+    assert len(api.session.urls) == 1
+
+
+def test_shared_model_uuid_is_downloaded_once(api):
+    for _ in range(3):
+        assert api.get_raw_3d_model_obj("uuid1") == "v 0 0 0\n"
+        assert api.get_step_3d_model("uuid1") == b"STEP"
+    assert len(api.session.urls) == 2
+
+
+def test_offline_reimport_uses_stale_entries(api, cache):
+    api.get_cad_data_of_component("C2040")
+    api.get_step_3d_model("uuid1")
+    for key in ("cad/C2040", "step/uuid1"):
+        _age(cache, key, cache.ttl + 1)
+
+    api.session.offline = True
+    assert api.get_cad_data_of_component("C2040") == {"lcsc": "C2040"}
+    assert api.get_step_3d_model("uuid1") == b"STEP"
+    assert api.get_raw_3d_model_obj("other") is None
+    assert api.get_cad_data_of_component("C1") == {}
+
+
+def test_api_without_cache_still_downloads():
+    api = EasyedaApi(session=FakeSession())
+    api.get_step_3d_model("uuid1")
+    api.get_step_3d_model("uuid1")
+    assert len(api.session.urls) == 2
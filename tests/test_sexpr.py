@@ -0,0 +1,76 @@
+"""Parity tests for the fast kiutils S-expression tokenizer."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+kiutils_src = Path(__file__).parent.parent / "Origen" / "kiutils" / "src"
+if str(kiutils_src) not in sys.path:
+    sys.path.insert(0, str(kiutils_src))
+
+from kiutils.utils import sexpr  # noqa: E402
+
+
+def _both(text):
+    fast = sexpr.parse_sexp(text)
+    assert repr(fast) == repr(sexpr.parse_sexp_regex(text))
+    return fast
+
+
+# ---------------------------------------------------------------------------
+# Atoms
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("text, expected", [
+    ('(a "b c" d)', ["a", "b c", "d"]),
+    (r'(p "a\"b")', ["p", 'a"b']),
+    ('(at 1.0 -2 0.5)', ["at", 1, -2, 0.5]),
+    ('(n +5 -0 007)', ["n", "+5", 0, 7]),
+    ('(x "ab"c" y)', ["x", '"ab"c"', "y"]),
+    ('(x\n\t1.5\n\t2)', ["x", "1.5", 2]),
+    ('(big 123456789012345678901)', ["big", 123456789012345683968]),
+    ('(v 1e5 .5 5.)', ["v", "1e5", ".5", "5."]),
+])
+def test_atoms_match_reference(text, expected):
+    assert _both(text) == expected
+
+
+def test_nested_lists():
+    assert _both('(kicad_symbol_lib (version 20231120) (symbol "R" (pin (at 0 0))))') == [
+        "kicad_symbol_lib", ["version", 20231120], ["symbol", "R", ["pin", ["at", 0, 0]]],
+    ]
+
+
+@pytest.mark.parametrize("text", ["(a ^b)", '(a "(" b)', "(a 1(b))", "(a) trailing"])
+def test_unusual_inputs_fall_back_to_reference(text):
+    assert sexpr._needs_reference_parser(text)
+    _both(text)
+
+
+@pytest.mark.parametrize("text", ["(a (b)", "(a))"])
+def test_unbalanced_brackets(text):
+    with pytest.raises((AssertionError, IndexError)):
+        sexpr.parse_sexp(text)
+
+
+# ---------------------------------------------------------------------------
+# Randomized parity
+# ---------------------------------------------------------------------------
+
+def test_random_inputs_match_reference():
+    rng = random.Random(4)
+    pieces = ["a", "1", "-2", "+3", "0.5", "-1.25", '"q"', r'"x\"y"', '"a b"', "^", "_1_1",
+              " ", " ", "\t", "\n", "(", ")", "((", "))"]
+    checked = 0
+    for _ in range(3000):
+        body = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 25)))
+        text = f"(root {body})"
+        try:
+            expected = repr(sexpr.parse_sexp_regex(text))
+        except (AssertionError, IndexError):
+            continue
+        assert repr(sexpr.parse_sexp(text)) == expected, text
+        checked += 1
+    assert checked > 500
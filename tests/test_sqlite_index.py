@@ -0,0 +1,62 @@
+"""Tests for the shared opening of the SQLite indexes."""
+
+from SqliteIndex import connect_index, open_index
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parents (name TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS children (
+    parent TEXT NOT NULL REFERENCES parents(name) ON DELETE CASCADE,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_same_version_keeps_rows(tmp_path):
+    conn = open_index(tmp_path / "index.db", SCHEMA, 1, "test index")
+    with conn:
+        conn.execute("INSERT INTO parents VALUES ('a')")
+    conn.close()
+
+    conn = open_index(tmp_path / "index.db", SCHEMA, 1, "test index")
+    assert conn.execute("SELECT name FROM parents").fetchall() == [("a",)]
+    conn.close()
+
+
+def test_other_version_drops_the_schema_tables(tmp_path):
+    conn = connect_index(str(tmp_path / "index.db"), SCHEMA, 1, foreign_keys=True)
+    with conn:
+        conn.execute("INSERT INTO parents VALUES ('a')")
+        conn.execute("INSERT INTO children VALUES ('a', 'x')")
+        conn.execute("CREATE TABLE unrelated (id INTEGER)")
+    conn.close()
+
+    conn = open_index(tmp_path / "index.db", SCHEMA, 2, "test index", foreign_keys=True)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM parents").fetchone()[0] == 0
+    assert _tables(conn) == {"parents", "children", "unrelated"}
+    conn.close()
+
+
+def test_corrupt_file_is_rebuilt_and_folders_created(tmp_path):
+    (tmp_path / "index.db").write_bytes(b"not a database" * 100)
+
+    conn = open_index(tmp_path / "index.db", SCHEMA, 1, "test index", folders=[tmp_path / "objects"])
+
+    assert _tables(conn) == {"parents", "children"}
+    assert (tmp_path / "objects").is_dir()
+    conn.close()
+
+
+def test_unusable_folder_falls_back_to_memory(tmp_path):
+    (tmp_path / "file").write_text("not a folder")
+
+    conn = open_index(tmp_path / "file" / "index.db", SCHEMA, 1, "test index")
+
+    assert conn.execute("PRAGMA database_list").fetchone()[2] == ""
+    assert _tables(conn) == {"parents", "children"}
+    conn.close()
@@ -0,0 +1,108 @@
+"""Tests for the lazy kiutils SymbolLib mode."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+kiutils_src = Path(__file__).parent.parent / "Origen" / "kiutils" / "src"
+if str(kiutils_src) not in sys.path:
+    sys.path.insert(0, str(kiutils_src))
+
+from kiutils.symbol import LazySymbol, Symbol, SymbolLib  # noqa: E402
+
+
+def _block(name, value):
+    return (
+        f'(symbol "{name}"\n'
+        f'\t\t(in_bom yes)\n'
+        f'\t\t(on_board yes)\n'
+        f'\t\t(property "Reference" "U"\n\t\t\t(at 0 0 0)\n\t\t)\n'
+        f'\t\t(property "Value" "{value}"\n\t\t\t(at 0 -2.54 0)\n\t\t)\n'
+        f'\t\t(symbol "{name}_0_1"\n\t\t\t(rectangle\n\t\t\t\t(start 0 0)\n\t\t\t\t(end 1 1)\n\t\t\t)\n\t\t)\n'
+        f"\t)"
+    )
+
+
+QUOTED = 'with \\"quote\\"'
+
+LIB_TEXT = (
+    '(kicad_symbol_lib\n\t(version 20231120)\n\t(generator "kicad_symbol_editor")\n'
+    f'\t{_block("A", "10k")}\n\t{_block("B", QUOTED)}\n)\n'
+)
+
+
+@pytest.fixture
+def lib_file(tmp_path):
+    path = tmp_path / "Lib.kicad_sym"
+    path.write_text(LIB_TEXT, encoding="utf-8")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Indexing
+# ---------------------------------------------------------------------------
+
+def test_lazy_load_indexes_without_parsing(lib_file):
+    lib = SymbolLib.from_file(str(lib_file), lazy=True)
+    assert lib.version == "20231120"
+    assert lib.generator == "kicad_symbol_editor"
+    assert [s.entryName for s in lib.symbols] == ["A", "B"]
+    assert all(isinstance(s, LazySymbol) and not s.isParsed for s in lib.symbols)
+    assert lib.symbols[1].propertyDict == {"Reference": "U", "Value": 'with "quote"'}
+    assert not lib.symbols[1].isParsed
+
+
+def test_lazy_properties_match_eager(lib_file):
+    eager = SymbolLib.from_file(str(lib_file))
+    lazy = SymbolLib.from_file(str(lib_file), lazy=True)
+    for full, indexed in zip(eager.symbols, lazy.symbols):
+        assert {p.key: p.value for p in full.properties} == indexed.propertyDict
+        assert indexed.symbol == full
+
+
+def test_lazy_rejects_other_files():
+    with pytest.raises(Exception):
+        SymbolLib.from_text_lazy("(footprint x)")
+    with pytest.raises(Exception):
+        SymbolLib.from_text_lazy('(kicad_symbol_lib (symbol "A" (in_bom yes)')
+
+
+# ---------------------------------------------------------------------------
+# Access and save
+# ---------------------------------------------------------------------------
+
+def test_untouched_symbols_are_written_verbatim(lib_file, tmp_path):
+    lib = SymbolLib.from_file(str(lib_file), lazy=True)
+    lib.symbols[0].symbol  # parsed but unchanged
+    lib.to_file(str(tmp_path / "Out.kicad_sym"))
+
+    out = (tmp_path / "Out.kicad_sym").read_text()
+    assert _block("A", "10k") in out
+    assert _block("B", QUOTED) in out
+
+
+def test_modified_symbol_is_reserialized(lib_file):
+    lib = SymbolLib.from_file(str(lib_file), lazy=True)
+    symbol = lib.symbols[0]
+    symbol.properties[1].value = "22k"  # forwarded to the parsed Symbol
+    symbol.entryName = "A2"
+    assert symbol.isModified
+    lib.to_file()
+
+    reloaded = SymbolLib.from_file(str(lib_file))
+    assert [s.entryName for s in reloaded.symbols] == ["A2", "B"]
+    assert {p.key: p.value for p in reloaded.symbols[0].properties}["Value"] == "22k"
+    assert _block("B", QUOTED) in lib_file.read_text()
+
+
+def test_lazy_symbol_moves_between_libraries(lib_file, tmp_path):
+    src = SymbolLib.from_file(str(lib_file), lazy=True)
+    target = SymbolLib()
+    target.symbols.append(Symbol.create_new("X", "R", "1k"))
+    target.symbols.append(src.symbols[1])
+    target.to_file(str(tmp_path / "Target.kicad_sym"))
+
+    reloaded = SymbolLib.from_file(str(tmp_path / "Target.kicad_sym"))
+    assert [s.entryName for s in reloaded.symbols] == ["X", "B"]
+    assert reloaded.symbols[1] == src.symbols[1].symbol
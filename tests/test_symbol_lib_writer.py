@@ -0,0 +1,131 @@
+"""Tests for SymbolLibWriter - span-splicing edits of .kicad_sym files."""
+
+import pytest
+
+from SymbolLibFile import (
+    SymbolLibWriter,
+    find_symbol,
+    scan_symbols,
+    verify_symbol_block,
+)
+
+
+def _block(name, value="1"):
+    return (
+        f'(symbol "{name}" (in_bom yes)\n'
+        f'\t\t(property "Value" "{value}" (at 0 0 0))\n'
+        f'\t\t(symbol "{name}_0_1" (rectangle (start 0 0) (end 1 1)))\n'
+        f"\t)"
+    )
+
+
+def _lib(*blocks):
+    body = "".join(f"\n\t{b}" for b in blocks)
+    return f"(kicad_symbol_lib\n\t(version 20231120)\n\t(generator \"kicad_symbol_editor\"){body}\n)\n"
+
+
+@pytest.fixture
+def lib_file(tmp_path):
+    path = tmp_path / "Lib.kicad_sym"
+    path.write_text(_lib(_block("A"), _block("B"), _block("C")), encoding="utf-8")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# find / verify
+# ---------------------------------------------------------------------------
+
+def test_find_symbol_returns_exact_span(lib_file):
+    text = lib_file.read_text(encoding="utf-8")
+    span = find_symbol(text, "B")
+    assert text[span.start:span.end] == _block("B")
+
+
+def test_find_symbol_with_unit_like_name():
+    text = _lib(_block("R"), _block("R_0_1"))
+    span = find_symbol(text, "R_0_1")
+    assert text[span.start:span.end] == _block("R_0_1")
+
+
+def test_find_symbol_missing(lib_file):
+    assert find_symbol(lib_file.read_text(encoding="utf-8"), "Z") is None
+
+
+def test_verify_symbol_block_rejects_unbalanced():
+    with pytest.raises(ValueError):
+        verify_symbol_block('(symbol "X" (property "V" "1")')
+    with pytest.raises(ValueError):
+        verify_symbol_block('(symbol "X") (symbol "Y")')
+    with pytest.raises(ValueError):
+        verify_symbol_block("(footprint x)")
+
+
+# ---------------------------------------------------------------------------
+# put / remove / save
+# ---------------------------------------------------------------------------
+
+def test_put_appends_without_touching_other_symbols(lib_file):
+    before = lib_file.read_text(encoding="utf-8")
+    writer = SymbolLibWriter(lib_file)
+    assert writer.put(_block("D")) == "added"
+    writer.save()
+
+    after = lib_file.read_text(encoding="utf-8")
+    assert after.startswith(before[: before.rstrip().rfind(")")].rstrip())
+    assert [s.name for s in scan_symbols(after)] == ["A", "B", "C", "D"]
+    assert not list(lib_file.parent.glob("*.tmp"))
+
+
+def test_put_replaces_existing_span(lib_file):
+    writer = SymbolLibWriter(lib_file)
+    assert writer.put(_block("B", value="2")) == "updated"
+    writer.save()
+
+    text = lib_file.read_text(encoding="utf-8")
+    assert [s.name for s in scan_symbols(text)] == ["A", "B", "C"]
+    assert '"Value" "2"' in text
+    assert text.count(_block("A")) == 1 and text.count(_block("C")) == 1
+
+
+def test_put_skips_when_not_overwriting(lib_file):
+    writer = SymbolLibWriter(lib_file)
+    assert writer.put(_block("A", value="2"), overwrite=False) == "skipped"
+    assert not writer.modified
+
+
+def test_put_creates_new_library(tmp_path):
+    path = tmp_path / "New.kicad_sym"
+    writer = SymbolLibWriter(path)
+    assert writer.put(_block("A")) == "created"
+    writer.save()
+    text = path.read_text(encoding="utf-8")
+    assert text.startswith("(kicad_symbol_lib")
+    assert [s.name for s in scan_symbols(text)] == ["A"]
+
+
+def test_remove_symbol(lib_file):
+    writer = SymbolLibWriter(lib_file)
+    assert writer.remove("B")
+    assert not writer.remove("B")
+    writer.save()
+    text = lib_file.read_text(encoding="utf-8")
+    assert [s.name for s in scan_symbols(text)] == ["A", "C"]
+    assert text == _lib(_block("A"), _block("C"))
+
+
+def test_revert_restores_original(lib_file):
+    before = lib_file.read_text(encoding="utf-8")
+    writer = SymbolLibWriter(lib_file)
+    writer.put(_block("D"))
+    writer.save()
+    writer.revert()
+    assert lib_file.read_text(encoding="utf-8") == before
+
+
+def test_failed_put_leaves_file_untouched(lib_file):
+    before = lib_file.read_text(encoding="utf-8")
+    writer = SymbolLibWriter(lib_file)
+    with pytest.raises(ValueError):
+        writer.put('(symbol "D" (property "V" "1")')
+    writer.save()
+    assert lib_file.read_text(encoding="utf-8") == before
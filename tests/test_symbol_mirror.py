@@ -0,0 +1,291 @@
+"""Tests for the KiCad official symbol mirror - refresh, index and downloads."""
+
+import json
+import time
+import urllib.parse
+
+import pytest
+
+import KiCadGitLab
+from HttpSession import HttpError, HttpResponse
+from KiCadGitLab.mirror import SymbolMirror, read_symbol_fields, symbols_ref
+from SymbolLibFile import lib_version
+
+
+def _symbol(name, description="", keywords="", fp_filters=""):
+    return (
+        f'\t(symbol "{name}"\n'
+        f'\t\t(property "Reference" "U"\n\t\t\t(at 0 0 0)\n\t\t)\n'
+        f'\t\t(property "Description" "{description}"\n\t\t\t(at 0 0 0)\n\t\t)\n'
+        f'\t\t(property "ki_keywords" "{keywords}"\n\t\t\t(at 0 0 0)\n\t\t)\n'
+        f'\t\t(property "ki_fp_filters" "{fp_filters}"\n\t\t\t(at 0 0 0)\n\t\t)\n'
+        f'\t\t(symbol "{name}_1_1"\n\t\t\t(pin input line (at 0 0 0) (length 2.54))\n\t\t)\n'
+        f"\t)\n"
+    )
+
+
+def _library(*symbols, version=20241209):
+    return (
+        f'(kicad_symbol_lib\n\t(version {version})\n\t(generator "kicad_symbol_editor")\n'
+        + "".join(symbols) + ")\n"
+    )
+
+
+class FakeGitLab:
+    """Stands in for the HttpSession; serves a repository of library files."""
+
+    def __init__(self, files, commit="c1"):
+        self.files = dict(files)
+        self.commit = commit
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        parsed = urllib.parse.urlparse(url)
+        if "/repository/branches/" in parsed.path:
+            return HttpResponse(200, {}, json.dumps({"commit": {"id": self.commit}}).encode(), url)
+        if parsed.path.endswith("/repository/tree"):
+            query = urllib.parse.parse_qs(parsed.query)
+            page, per_page = int(query["page"][0]), int(query["per_page"][0])
+            items = [
+                {"name": path, "path": path, "type": "blob", "id": f"blob-{hash(text)}"}
+                for path, text in sorted(self.files.items())
+            ]
+            chunk = items[(page - 1) * per_page : page * per_page]
+            return HttpResponse(200, {}, json.dumps(chunk).encode(), url)
+        if parsed.path.endswith("/raw"):
+            path = urllib.parse.unquote(parsed.path.split("/files/")[1][: -len("/raw")])
+            text = self.files[path]
+            etag = f'"{hash(text)}"'
+            if (headers or {}).get("If-None-Match") == etag:
+                raise HttpError("HTTP 304", 304, url)
+            return HttpResponse(200, {"etag": etag}, text.encode(), url)
+        raise AssertionError(f"unexpected URL {url}")
+
+    def raw_requests(self):
+        return [url for url, _ in self.requests if url.split("?")[0].endswith("/raw")]
+
+
+FILES = {
+    "Amplifier_Audio.kicad_sym": _library(
+        _symbol("LM386", "Low Voltage Audio Power Amplifier", "single audio amp", "DIP*W7.62mm* SOIC*"),
+        _symbol("TDA2003", "10W Car Radio Audio Amplifier", "audio amp"),
+    ),
+    "Regulator_Linear.kicad_sym": _library(
+        _symbol("LM7805_TO220", "Positive 1A 35V Linear Regulator, 5V", "voltage regulator 5V"),
+    ),
+}
+
+
+@pytest.fixture
+def gitlab():
+    return FakeGitLab(FILES)
+
+
+@pytest.fixture
+def mirror(tmp_path, gitlab):
+    mirror = SymbolMirror(tmp_path / "mirror", session=gitlab)
+    yield mirror
+    mirror.close()
+
+
+# ---------------------------------------------------------------------------
+# Index contents
+# ---------------------------------------------------------------------------
+
+def test_read_symbol_fields_uses_top_level_properties():
+    fields = read_symbol_fields(FILES["Amplifier_Audio.kicad_sym"])
+    assert [f["name"] for f in fields] == ["LM386", "TDA2003"]
+    assert fields[0]["description"] == "Low Voltage Audio Power Amplifier"
+    assert fields[0]["keywords"] == "single audio amp"
+    assert fields[0]["fp_filters"] == "DIP*W7.62mm* SOIC*"
+
+
+def test_search_covers_all_libraries_and_fields(mirror):
+    assert mirror.refresh() == 2
+    assert [r["name"] for r in mirror.search("lm")] == ["LM386", "LM7805_TO220"]
+    assert [r["name"] for r in mirror.search("audio amp")] == ["LM386", "TDA2003"]
+    assert [r["name"] for r in mirror.search("regulator 5v")] == ["LM7805_TO220"]
+    assert [r["name"] for r in mirror.search("soic")] == ["LM386"]
+    assert [r["name"] for r in mirror.search("", library="Amplifier_Audio")] == ["LM386", "TDA2003"]
+    assert mirror.search("100%") == []
+    assert [lib["name"] for lib in mirror.libraries()] == [
+        "Amplifier_Audio.kicad_sym", "Regulator_Linear.kicad_sym",
+    ]
+
+
+def test_exact_name_match_comes_first(gitlab, tmp_path):
+    gitlab.files["Extra.kicad_sym"] = _library(_symbol("ALM386X"), _symbol("LM386"))
+    mirror = SymbolMirror(tmp_path / "m", session=gitlab)
+    mirror.refresh()
+    found = [(r["library"], r["name"]) for r in mirror.search("LM386")]
+    assert found[:2] == [("Amplifier_Audio", "LM386"), ("Extra", "LM386")]
+    assert found[-1] == ("Extra", "ALM386X")
+    mirror.close()
+
+
+# ---------------------------------------------------------------------------
+# Refresh
+# ---------------------------------------------------------------------------
+
+def test_refresh_is_skipped_while_fresh(mirror, gitlab):
+    mirror.refresh()
+    count = len(gitlab.requests)
+    assert mirror.refresh() == 0
+    assert len(gitlab.requests) == count
+
+
+def test_unchanged_commit_lists_nothing(mirror, gitlab):
+    mirror.refresh()
+    gitlab.requests.clear()
+    assert mirror.refresh(force=True) == 0
+    assert len(gitlab.requests) == 1  # only the branch head
+
+
+def test_only_changed_libraries_are_downloaded(mirror, gitlab):
+    mirror.refresh()
+    gitlab.requests.clear()
+    gitlab.commit = "c2"
+    gitlab.files["Regulator_Linear.kicad_sym"] = _library(_symbol("LM317", "Adjustable regulator"))
+    del gitlab.files["Amplifier_Audio.kicad_sym"]
+
+    assert mirror.refresh(force=True) == 1
+    assert len(gitlab.raw_requests()) == 1
+    assert [r["name"] for r in mirror.search("lm")] == ["LM317"]
+    assert [lib["name"] for lib in mirror.libraries()] == ["Regulator_Linear.kicad_sym"]
+
+
+def test_changed_blob_with_same_content_costs_a_304(mirror, gitlab, monkeypatch):
+    mirror.refresh()
+    gitlab.commit = "c2"
+    original = gitlab.get
+
+    def renamed_blobs(url, headers=None, timeout=None):
+        response = original(url, headers, timeout)
+        if url.split("?")[0].endswith("/tree"):
+            items = [dict(item, id=item["id"] + "-new") for item in json.loads(response.body)]
+            response = response._replace(body=json.dumps(items).encode())
+        return response
+
+    monkeypatch.setattr(gitlab, "get", renamed_blobs)
+    gitlab.requests.clear()
+    assert mirror.refresh(force=True) == 0
+    raw = [h for url, h in gitlab.requests if url.split("?")[0].endswith("/raw")]
+    assert len(raw) == 2 and all("If-None-Match" in h for h in raw)
+
+
+def test_progress_is_reported(mirror):
+    steps = []
+    mirror.refresh(progress=lambda step, total, msg: steps.append((step, total, msg)))
+    assert steps == [(1, 2, "Amplifier_Audio"), (2, 2, "Regulator_Linear"), (0, 0, "")]
+
+
+@pytest.mark.parametrize("major, ref", [(8, "8.0"), (9, "9.0"), (10, "10.0"), (0, "master")])
+def test_branch_follows_installed_kicad(major, ref):
+    assert symbols_ref(major) == ref
+
+
+def test_mirror_follows_its_branch(tmp_path, gitlab):
+    mirror = SymbolMirror(tmp_path / "mirror", session=gitlab, ref="8.0")
+    mirror.refresh()
+    assert gitlab.requests[0][0].endswith("/repository/branches/8.0")
+    assert all("ref=8.0" in url for url, _ in gitlab.requests[1:])
+    mirror.close()
+
+    # Another branch starts from an empty index
+    gitlab.requests.clear()
+    mirror = SymbolMirror(tmp_path / "mirror", session=gitlab, ref="9.0")
+    assert not mirror.is_indexed() and mirror.libraries() == []
+    assert mirror.refresh() == 2
+    assert all("ref=9.0" in url for url in gitlab.raw_requests())
+    mirror.close()
+
+
+def test_mirror_persists_across_instances(mirror, tmp_path, gitlab):
+    mirror.refresh()
+    again = SymbolMirror(tmp_path / "mirror", session=gitlab)
+    assert again.is_indexed()
+    assert time.time() - again.last_refresh() < 60
+    assert [r["name"] for r in again.search("TDA")] == ["TDA2003"]
+    again.close()
+
+
+# ---------------------------------------------------------------------------
+# KiCadGitLab API on top of the mirror
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def shared_mirror(mirror, monkeypatch):
+    monkeypatch.setattr(KiCadGitLab, "get_symbol_mirror", lambda: mirror)
+    return mirror
+
+
+def test_download_symbol_is_served_from_mirror(shared_mirror, gitlab, tmp_path):
+    shared_mirror.refresh()
+    gitlab.requests.clear()
+    dest = tmp_path / "out" / "MyLib.kicad_sym"
+
+    assert KiCadGitLab.download_symbol("Amplifier_Audio", "LM386", str(dest))
+    assert KiCadGitLab.download_symbol("Regulator_Linear", "LM7805_TO220", str(dest))
+    assert not KiCadGitLab.download_symbol("Amplifier_Audio", "NOPE", str(dest))
+    assert gitlab.requests == []
+
+    text = dest.read_text(encoding="utf-8")
+    assert text.startswith("(kicad_symbol_lib\n\t(version 20241209)")
+    assert [f["name"] for f in read_symbol_fields(text)] == ["LM386", "LM7805_TO220"]
+
+
+def test_search_before_sync_mirrors_the_selected_library(shared_mirror, gitlab):
+    results = KiCadGitLab.search_symbols("tda", library="Amplifier_Audio")
+    assert [r["name"] for r in results] == ["TDA2003"]
+    assert len(gitlab.raw_requests()) == 1
+    assert not shared_mirror.is_indexed()
+
+    # A later full sync only revalidates it
+    gitlab.requests.clear()
+    assert shared_mirror.refresh() == 1
+    raw = {url.split("/files/")[1].split("/")[0]: h for url, h in gitlab.requests if "/raw" in url}
+    assert "If-None-Match" in raw["Amplifier_Audio.kicad_sym"]
+    assert "If-None-Match" not in raw["Regulator_Linear.kicad_sym"]
+
+
+class FakeCli:
+    """kicad-cli stand-in that upgrades libraries to a fixed version."""
+
+    def __init__(self, version=20241209):
+        self.version = version
+        self.upgrades = []
+
+    def upgrade_sym_lib_from_string(self, text):
+        self.upgrades.append(text)
+        return True, text.replace("(version 20231120)", f"(version {self.version})"), ""
+
+
+def test_newer_symbol_upgrades_an_older_library(shared_mirror, tmp_path, monkeypatch):
+    cli = FakeCli()
+    monkeypatch.setattr(KiCadGitLab, "cli", cli)
+    dest = tmp_path / "MyLib.kicad_sym"
+    dest.write_text(_library(_symbol("MINE"), version=20231120), encoding="utf-8")
+
+    assert KiCadGitLab.download_symbol("Amplifier_Audio", "LM386", str(dest))
+
+    text = dest.read_text(encoding="utf-8")
+    assert len(cli.upgrades) == 1
+    assert lib_version(text) == 20241209
+    assert [f["name"] for f in read_symbol_fields(text)] == ["MINE", "LM386"]
+
+
+def test_newer_symbol_is_refused_if_the_library_cannot_be_upgraded(
+    shared_mirror, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(KiCadGitLab, "cli", FakeCli(version=20231120))
+    dest = tmp_path / "MyLib.kicad_sym"
+    older = _library(_symbol("MINE"), version=20231120)
+    dest.write_text(older, encoding="utf-8")
+
+    assert not KiCadGitLab.download_symbol("Amplifier_Audio", "LM386", str(dest))
+    assert dest.read_text(encoding="utf-8") == older
+
+    monkeypatch.setattr(KiCadGitLab, "cli", None)
+    assert not KiCadGitLab.download_symbol("Amplifier_Audio", "LM386", str(dest))
+    assert dest.read_text(encoding="utf-8") == older
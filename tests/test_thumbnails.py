@@ -0,0 +1,214 @@
+"""Tests for the search tab thumbnail service - caching, priorities and cancellation."""
+
+import threading
+import time
+
+import pytest
+
+from ComponentSearch.thumbnails import ThumbnailService
+from HttpSession import HttpError
+from ResponseCache import ResponseCache
+
+
+class FakeFetch:
+    """Thumbnail fetch function that records its calls; can be held back."""
+
+    def __init__(self, images=None):
+        self.calls = []
+        self.images = images
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, lcsc_id):
+        self.calls.append(lcsc_id)
+        self.gate.wait(5)
+        if self.images is not None:
+            return self.images.get(lcsc_id)
+        return f"png-{lcsc_id}".encode()
+
+
+class Collector:
+    def __init__(self):
+        self.results = {}
+        self.done = threading.Event()
+
+    def __call__(self, lcsc_id, decoded):
+        self.results[lcsc_id] = decoded
+        self.done.set()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(cache_dir=tmp_path / "cache")
+    yield cache
+    cache.close()
+
+
+# ---------------------------------------------------------------------------
+# Caching
+# ---------------------------------------------------------------------------
+
+def test_thumbnail_is_fetched_once_and_kept_on_disk(cache):
+    fetch = FakeFetch()
+    service = ThumbnailService(fetch, decode=lambda data: data.upper(), cache=cache)
+    got = Collector()
+    service.request("C1", got)
+    assert got.done.wait(5)
+    assert got.results == {"C1": b"PNG-C1"}
+
+    # Served from memory, synchronously
+    again = Collector()
+    service.request("C1", again)
+    assert again.results == {"C1": b"PNG-C1"}
+    service.close()
+
+    # A new service (next session) reads it from disk
+    other = ThumbnailService(fetch, cache=cache)
+    from_disk = Collector()
+    other.request("C1", from_disk)
+    assert from_disk.done.wait(5)
+    assert from_disk.results == {"C1": b"png-C1"}
+    assert fetch.calls == ["C1"]
+    other.close()
+
+
+def test_missing_thumbnail_is_not_fetched_again(cache):
+    fetch = FakeFetch(images={})
+    service = ThumbnailService(fetch, cache=cache)
+    got = Collector()
+    service.request("C1", got)
+    assert got.done.wait(5)
+    assert got.results == {"C1": None}
+
+    service.request("C1", got)
+    service.prefetch(["C1"])
+    assert fetch.calls == ["C1"]
+    service.close()
+
+
+def test_thumbnail_404_is_not_fetched_again(cache):
+    def fetch(lcsc_id):
+        fetch.calls.append(lcsc_id)
+        raise HttpError("HTTP 404", 404)
+
+    fetch.calls = []
+    service = ThumbnailService(fetch, cache=cache)
+    got = Collector()
+    service.request("C1", got)
+    assert got.done.wait(5)
+    assert got.results == {"C1": None}
+
+    service.request("C1", got)
+    assert fetch.calls == ["C1"]
+    service.close()
+
+
+@pytest.mark.parametrize("error", [HttpError("timed out"), HttpError("HTTP 503", 503), ValueError("bad JSON")])
+def test_transient_fetch_error_is_retried(cache, error):
+    def fetch(lcsc_id):
+        fetch.calls.append(lcsc_id)
+        if len(fetch.calls) == 1:
+            raise error
+        return b"png"
+
+    fetch.calls = []
+    service = ThumbnailService(fetch, cache=cache)
+    first = Collector()
+    service.request("C1", first)
+    assert first.done.wait(5)
+    assert first.results == {"C1": None}
+
+    second = Collector()
+    service.request("C1", second)
+    assert second.done.wait(5)
+    assert second.results == {"C1": b"png"}
+    assert fetch.calls == ["C1", "C1"]
+    service.close()
+
+
+def test_memory_cache_is_bounded(cache):
+    service = ThumbnailService(FakeFetch(), cache=cache, memory_items=2)
+    for lcsc_id in ("C1", "C2", "C3"):
+        got = Collector()
+        service.request(lcsc_id, got)
+        assert got.done.wait(5)
+    assert service.get_cached("C1") is None
+    assert service.get_cached("C3") == b"png-C3"
+    service.close()
+
+
+def test_decoding_runs_off_the_calling_thread(cache):
+    threads = []
+
+    def decode(data):
+        threads.append(threading.current_thread())
+        return data
+
+    service = ThumbnailService(FakeFetch(), decode=decode, cache=cache)
+    got = Collector()
+    service.request("C1", got)
+    assert got.done.wait(5)
+    assert threads and threads[0] is not threading.current_thread()
+    service.close()
+
+
+# ---------------------------------------------------------------------------
+# Priorities and cancellation
+# ---------------------------------------------------------------------------
+
+def test_selected_row_jumps_ahead_of_prefetch(cache):
+    fetch = FakeFetch()
+    fetch.gate.clear()
+    service = ThumbnailService(fetch, cache=cache, max_workers=1)
+    service.prefetch(["C1", "C2", "C3"])
+    _wait_for(lambda: fetch.calls == ["C1"])
+
+    got = Collector()
+    service.request("C3", got)
+    fetch.gate.set()
+    assert got.done.wait(5)
+    _wait_for(lambda: len(fetch.calls) == 3)
+    assert fetch.calls == ["C1", "C3", "C2"]
+    service.close()
+
+
+def test_cancelled_request_is_not_fetched(cache):
+    fetch = FakeFetch()
+    fetch.gate.clear()
+    service = ThumbnailService(fetch, cache=cache, max_workers=1)
+    first, second, third = Collector(), Collector(), Collector()
+    service.request("C1", first)
+    _wait_for(lambda: fetch.calls == ["C1"])
+    service.request("C2", second)
+    service.request("C3", third)
+    service.cancel("C2")
+    fetch.gate.set()
+
+    assert third.done.wait(5)
+    assert fetch.calls == ["C1", "C3"]
+    assert second.results == {}
+    service.close()
+
+
+def test_cancel_prefetch_keeps_requested_rows(cache):
+    fetch = FakeFetch()
+    fetch.gate.clear()
+    service = ThumbnailService(fetch, cache=cache, max_workers=1)
+    service.prefetch(["C1", "C2", "C3"])
+    _wait_for(lambda: fetch.calls == ["C1"])
+    got = Collector()
+    service.request("C3", got)
+    service.cancel_prefetch()
+    fetch.gate.set()
+
+    assert got.done.wait(5)
+    time.sleep(0.05)
+    assert fetch.calls == ["C1", "C3"]
+    service.close()
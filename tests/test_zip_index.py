@@ -0,0 +1,119 @@
+"""Tests for the zip index and the table-driven vendor format detection."""
+
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Origen" / "kiutils" / "src"))
+
+import KiCadImport
+from KiCadImport import REMOTE_TYPES, VENDOR_RULES, LibImporter, VendorRule, find_in_zip
+from KiCadImport.zip_index import Find, ZipIndex
+
+
+def _zip(path, names):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name in names:
+            zf.writestr(name, "" if name.endswith("/") else "data")
+    return path
+
+
+def _identify(tmp_path, names):
+    with zipfile.ZipFile(_zip(tmp_path / "part.zip", names)) as zf:
+        remote_type, files = LibImporter().identify_remote_type(zf)
+        return remote_type, {k: v.at if v else None for k, v in files.items()}
+
+
+# ---------------------------------------------------------------------------
+# ZipIndex
+# ---------------------------------------------------------------------------
+
+NAMES = [
+    "b/x.step",
+    "a/KiCad/part.kicad_sym",
+    "a/KiCad/part.kicad_mod",
+    "readme.txt",
+    "a/3D/part.step",
+    "c.pretty/",
+    "c.pretty/fp.kicad_mod",
+    "b/y/z.kicad_sym",
+]
+
+
+@pytest.mark.parametrize("suffix", [".step", ".kicad_sym", ".kicad_mod", "KiCad", ".pretty", "part.step", ".txt", ".dcm"])
+def test_find_matches_recursive_walk(tmp_path, suffix):
+    with zipfile.ZipFile(_zip(tmp_path / "t.zip", NAMES)) as zf:
+        expected = find_in_zip(zipfile.Path(zf), suffix)
+        found = ZipIndex(zf).find(Find(suffix))
+        assert (found.path if found else None) == (expected.at.rstrip("/") if expected else None)
+
+
+def test_implied_directories_and_scoped_lookups(tmp_path):
+    with zipfile.ZipFile(_zip(tmp_path / "t.zip", NAMES)) as zf:
+        index = ZipIndex(zf)
+        kicad = index.find(Find("KiCad", is_dir=True))
+        assert kicad.path == "a/KiCad" and kicad.is_dir
+        assert index.find(Find(".kicad_sym"), under=kicad).path == "a/KiCad/part.kicad_sym"
+        assert index.find(Find(".step"), under=kicad) is None
+        assert index.find(Find(".pretty", top_level=True, is_dir=True)).path == "c.pretty"
+        assert index.find(Find(".kicad_mod", top_level=True)) is None
+        assert index.path(kicad).is_dir()
+
+
+# ---------------------------------------------------------------------------
+# Vendor rules
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "names, remote_type, expected",
+    [
+        (
+            ["lib/device.lib", "lib/device.dcm", "P.pretty/P.kicad_mod", "3d/P.step"],
+            REMOTE_TYPES.Octopart,
+            {"symbol": "lib/device.lib", "dcm": "lib/device.dcm", "footprint": "P.pretty/", "model": "3d/P.step"},
+        ),
+        (
+            ["P/KiCad/P.lib", "P/KiCad/P.dcm", "P/KiCad/P.kicad_mod", "P/3D/P.stp"],
+            REMOTE_TYPES.Samacsys,
+            {"symbol": "P/KiCad/P.lib", "dcm": "P/KiCad/P.dcm", "footprint": "P/KiCad/", "model": "P/3D/P.stp"},
+        ),
+        (
+            ["KiCAD/P.kicad_sym", "KiCAD/P.pretty/P.kicad_mod"],
+            REMOTE_TYPES.UltraLibrarian,
+            {"symbol": "KiCAD/P.kicad_sym", "dcm": None, "footprint": "KiCAD/P.pretty/", "model": None},
+        ),
+        (
+            ["P.kicad_sym", "P.kicad_mod", "P.wrl"],
+            REMOTE_TYPES.Snapeda,
+            {"symbol": "P.kicad_sym", "dcm": None, "footprint": "P.kicad_mod", "model": "P.wrl"},
+        ),
+        (
+            ["models/P.step"],
+            REMOTE_TYPES.Partial,
+            {"symbol": None, "dcm": None, "footprint": None, "model": "models/P.step"},
+        ),
+    ],
+)
+def test_vendor_layouts(tmp_path, names, remote_type, expected):
+    assert _identify(tmp_path, names) == (remote_type, expected)
+
+
+def test_unknown_layout_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        _identify(tmp_path, ["readme.txt"])
+
+
+def test_new_vendor_is_a_new_rule(tmp_path, monkeypatch):
+    rule = VendorRule(
+        REMOTE_TYPES.Snapeda,
+        anchor=Find("Vendor-KiCad8", is_dir=True),
+        symbol=(Find(".kicad_sym"),),
+        footprint=(Find(".kicad_mod"),),
+    )
+    monkeypatch.setattr(KiCadImport, "VENDOR_RULES", [rule] + VENDOR_RULES)
+    remote_type, files = _identify(
+        tmp_path, ["other/X.kicad_sym", "Vendor-KiCad8/P.kicad_sym", "Vendor-KiCad8/P.kicad_mod"]
+    )
+    assert files["symbol"] == "Vendor-KiCad8/P.kicad_sym"